@@ -1,5 +1,4 @@
 import dspy
-import asyncio
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import logging
@@ -227,13 +226,11 @@ class OpportunityAnalysisPipeline(dspy.Module):
                     'limit': 20
                 }
                 
-                # Call data ingestion service to fetch fresh data
+                # Call data ingestion service to fetch fresh data; this returns
+                # once every ingestion task has completed and been stored
                 ingestion_result = await self.data_service.ingest_all_sources(ingestion_params)
                 logger.info(f"Fresh data ingestion completed: {ingestion_result.get('total_processed', 0)} new signals")
                 
-                # Wait a moment for data to be processed and stored
-                await asyncio.sleep(2)
-                
                 # Now search for market signals related to the topic in database (including fresh data)
                 async with get_db_session() as session:
                     # Query recent market signals related to the topic
@@ -73,6 +73,14 @@ async def lifespan(app: FastAPI):
         
         # Store event manager in app state for access in endpoints
         app.state.event_manager = event_manager
+        
+        # Keep cached opportunity rankings in step with opportunity changes
+        from shared.services.ranking_system import opportunity_ranking_system
+        await opportunity_ranking_system.subscribe_to_invalidations(event_manager.event_bus)
+        
+        # Keep the keyword and facet search indexes in step as well
+        from shared.services.opportunity_service import opportunity_service
+        await opportunity_service.subscribe_to_index_updates(event_manager.event_bus)
     except Exception as e:
         logger.error(f"❌ Failed to initialize event bus system: {e}")
         # Don't fail startup - let health checks handle it
@@ -116,12 +124,27 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Agent orchestrator started")
     except Exception as e:
         logger.error(f"❌ Failed to start agent orchestrator: {e}")
+    
+    # Start the collaborative filtering similarity refresh job
+    try:
+        from shared.services.recommendation_service import recommendation_service
+        await recommendation_service.start_similarity_refresh()
+        logger.info("✅ User similarity refresh started")
+    except Exception as e:
+        logger.error(f"❌ Failed to start user similarity refresh: {e}")
 
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down AI Opportunity Browser API")
     
+    # Stop the similarity refresh job before its database connections close
+    try:
+        from shared.services.recommendation_service import recommendation_service
+        await recommendation_service.stop_similarity_refresh()
+    except Exception as e:
+        logger.error(f"❌ Error stopping user similarity refresh: {e}")
+    
     # Shutdown event bus system
     try:
         if hasattr(app.state, 'event_manager'):
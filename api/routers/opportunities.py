@@ -429,12 +429,19 @@ async def search_opportunities(
     Advanced opportunity search with complex filtering.
     
     Supports Requirements 3.1-3.2 (Advanced search and filtering).
+    With ``search_mode`` set to ``bm25`` or ``hybrid`` the query is ranked by
+    keyword relevance, optionally fused with vector similarity.
     """
     try:
         # Search opportunities
-        opportunities, total_count = await opportunity_service.search_opportunities(
-            db, search_request, current_user.id if current_user else None
-        )
+        if search_request.search_mode in ("bm25", "hybrid"):
+            opportunities, total_count = await opportunity_service.hybrid_search_opportunities(
+                db, search_request, current_user.id if current_user else None
+            )
+        else:
+            opportunities, total_count = await opportunity_service.search_opportunities(
+                db, search_request, current_user.id if current_user else None
+            )
         
         # Convert to response format
         opportunity_responses = [
@@ -452,6 +459,7 @@ async def search_opportunities(
         logger.info(
             "Advanced opportunity search completed",
             query=search_request.query,
+            search_mode=search_request.search_mode,
             total_count=total_count,
             returned_count=len(opportunity_responses),
             user_id=current_user.id if current_user else None
@@ -461,7 +469,8 @@ async def search_opportunities(
             items=opportunity_responses,
             pagination=pagination,
             total_count=total_count,
-            filters_applied=search_request.dict(exclude_none=True)
+            filters_applied=search_request.dict(exclude_none=True),
+            metadata={"search_type": search_request.search_mode}
         )
         
     except Exception as e:
@@ -493,10 +502,12 @@ async def semantic_search_opportunities(
             )
         
         # Perform semantic search
-        opportunities, total_count = await opportunity_service.semantic_search_opportunities(
+        opportunities, total_count, truncated = await opportunity_service.semantic_search_opportunities(
             db, search_request, current_user.id if current_user else None
         )
         
+        next_cursor = opportunity_service.semantic_search_cursor(search_request, opportunities)
+        
         # Convert to response format
         opportunity_responses = [
             OpportunityResponse.model_validate(opp) for opp in opportunities
@@ -525,12 +536,20 @@ async def semantic_search_opportunities(
             filters_applied=search_request.dict(exclude_none=True),
             metadata={
                 "search_type": "semantic",
-                "embedding_based": True
+                "embedding_based": True,
+                "next_cursor": next_cursor,
+                # total_count is a lower bound when more matches exist
+                "results_truncated": truncated
             }
         )
         
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error("Error in semantic opportunity search", error=str(e))
         raise HTTPException(
@@ -3,6 +3,7 @@
 This package provides a comprehensive data ingestion system with:
 - Plugin-based architecture for multiple data sources
 - Async task queue for processing pipeline
+- Bounded-queue streaming pipeline with per-stage concurrency
 - Data cleaning and normalization
 - Duplicate detection and deduplication
 - Quality scoring and assessment
@@ -26,6 +27,7 @@ Usage:
 
 from .plugin_manager import PluginManager, plugin_manager
 from .processing.task_queue import TaskQueue, task_queue
+from .processing.pipeline import StreamingPipeline, PipelineStage
 from .processing.data_cleaning import DataNormalizer, clean_data_task, batch_clean_data_task
 from .processing.duplicate_detection import DeduplicationService, detect_duplicates_task, batch_deduplicate_task
 from .processing.quality_scoring import QualityScorer, quality_scoring_task, batch_quality_scoring_task
@@ -36,6 +38,8 @@ __all__ = [
     'plugin_manager',
     'TaskQueue', 
     'task_queue',
+    'StreamingPipeline',
+    'PipelineStage',
     'DataNormalizer',
     'DeduplicationService',
     'QualityScorer',
@@ -3,8 +3,10 @@
 import asyncio
 import importlib
 import logging
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Type, Any
+from typing import AsyncIterator, Dict, List, Optional, Type, Any
 from datetime import datetime, timedelta
 
 try:
@@ -31,6 +33,20 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class FanOutResult:
+    """Result of a concurrent fetch across several plugins.
+    
+    ``data`` holds every item received before each plugin's deadline, so
+    late plugins contribute the partial results they produced in time.
+    """
+    data: Dict[str, List[RawData]] = field(default_factory=dict)
+    completed: List[str] = field(default_factory=list)
+    late: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+
 class PluginManager:
     """Manages data source plugins with dynamic loading and lifecycle management."""
     
@@ -182,6 +198,18 @@ class PluginManager:
         params: Dict[str, Any]
     ) -> List[RawData]:
         """Fetch data from a specific plugin."""
+        return [item async for item in self.stream_data_from_plugin(plugin_name, params)]
+    
+    async def stream_data_from_plugin(
+        self,
+        plugin_name: str,
+        params: Dict[str, Any]
+    ) -> AsyncIterator[RawData]:
+        """Stream data from a specific plugin without buffering it.
+        
+        Items are yielded as the plugin produces them, so a slow consumer
+        naturally throttles the underlying ``fetch_data`` iterator.
+        """
         if plugin_name not in self._plugins:
             raise PluginError(f"Plugin {plugin_name} not loaded")
         
@@ -191,16 +219,27 @@ class PluginManager:
             raise PluginError(f"Plugin {plugin_name} is not active (status: {plugin.status})")
         
         try:
-            data = []
             async for item in plugin.fetch_data(params):
-                data.append(item)
-            return data
+                yield item
         except Exception as e:
             await plugin.set_status(PluginStatus.ERROR, str(e))
             raise PluginError(f"Error fetching data from {plugin_name}: {e}")
     
-    async def fetch_data_from_all_plugins(self, params: Dict[str, Any]) -> Dict[str, List[RawData]]:
-        """Fetch data from all active plugins."""
+    async def fetch_data_from_all_plugins(
+        self,
+        params: Dict[str, Any],
+        concurrent: bool = False,
+        timeout_seconds: Optional[float] = None
+    ) -> Dict[str, List[RawData]]:
+        """Fetch data from all active plugins.
+        
+        With ``concurrent`` enabled the plugins are queried in parallel via
+        :meth:`fan_out_fetch`, bounded by ``timeout_seconds`` per plugin.
+        """
+        if concurrent:
+            fan_out = await self.fan_out_fetch(params, timeout_seconds=timeout_seconds)
+            return fan_out.data
+        
         results = {}
         
         for plugin_name, plugin in self._plugins.items():
@@ -213,6 +252,67 @@ class PluginManager:
         
         return results
     
+    async def fan_out_fetch(
+        self,
+        params: Dict[str, Any],
+        timeout_seconds: Optional[float] = None,
+        plugin_timeouts: Optional[Dict[str, float]] = None,
+        plugin_names: Optional[List[str]] = None
+    ) -> FanOutResult:
+        """Fetch from several active plugins concurrently with per-plugin deadlines.
+        
+        Args:
+            params: Fetch parameters passed to every plugin
+            timeout_seconds: Default deadline for each plugin; ``None`` falls
+                back to the plugin's configured ``timeout_seconds``
+            plugin_timeouts: Optional per-plugin deadline overrides
+            plugin_names: Restrict the fan-out to these plugins
+            
+        Returns:
+            FanOutResult with data per plugin and the completed/late/failed split
+        """
+        plugin_timeouts = plugin_timeouts or {}
+        names = plugin_names if plugin_names is not None else list(self._plugins.keys())
+        active = [
+            name for name in names
+            if name in self._plugins and self._plugins[name].status == PluginStatus.ACTIVE
+        ]
+        
+        result = FanOutResult(data={name: [] for name in active})
+        start_time = time.monotonic()
+        
+        async def collect(plugin_name: str) -> None:
+            async for item in self.stream_data_from_plugin(plugin_name, params):
+                result.data[plugin_name].append(item)
+        
+        deadlines = []
+        for plugin_name in active:
+            deadline = plugin_timeouts.get(plugin_name, timeout_seconds)
+            if deadline is None:
+                deadline = self._plugins[plugin_name].config.timeout_seconds
+            deadlines.append(deadline)
+        
+        outcomes = await asyncio.gather(
+            *(asyncio.wait_for(collect(name), timeout=deadline) for name, deadline in zip(active, deadlines)),
+            return_exceptions=True
+        )
+        
+        for plugin_name, outcome in zip(active, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                result.late.append(plugin_name)
+                logger.warning(
+                    f"Plugin {plugin_name} missed its deadline, returning "
+                    f"{len(result.data[plugin_name])} partial items"
+                )
+            elif isinstance(outcome, Exception):
+                result.failed[plugin_name] = str(outcome)
+                logger.error(f"Error fetching from plugin {plugin_name}: {outcome}")
+            else:
+                result.completed.append(plugin_name)
+        
+        result.elapsed_seconds = time.monotonic() - start_time
+        return result
+    
     async def _discover_plugins(self) -> None:
         """Discover and register available plugins."""
         plugins_dir = Path(__file__).parent / "plugins"
@@ -1,18 +1,35 @@
 """Duplicate detection and deduplication for market signals."""
 
 import hashlib
+import heapq
+import json
 import logging
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set, Tuple, Any
 from dataclasses import dataclass
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from scipy.sparse import csc_matrix, csr_matrix, vstack
 import numpy as np
 
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; model saves then run without a file lock
+    fcntl = None
+
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from plugins.base import RawData
+from processing.near_duplicate_index import (
+    MinHasher,
+    MinHashLSHIndex,
+    RedisHashStore,
+    RedisMinHashLSHIndex,
+    TTLHashStore
+)
 from shared.vector_db import VectorDBService
 
 
@@ -50,8 +67,8 @@ class ContentHasher:
     def generate_fuzzy_hash(self, raw_data: RawData) -> str:
         """Generate a fuzzy hash for near-duplicate detection."""
         # More aggressive normalization for fuzzy matching
-        content = self._aggressive_normalize(raw_data.content)
-        title = self._aggressive_normalize(raw_data.title or "")
+        content = self.aggressive_normalize(raw_data.content)
+        title = self.aggressive_normalize(raw_data.title or "")
         
         combined_content = f"{title}\n{content}"
         
@@ -81,7 +98,7 @@ class ContentHasher:
         
         return text.strip()
     
-    def _aggressive_normalize(self, text: str) -> str:
+    def aggressive_normalize(self, text: str) -> str:
         """More aggressive normalization for fuzzy matching."""
         if not text:
             return ""
@@ -103,24 +120,72 @@ class ContentHasher:
         return ' '.join(filtered_words)
 
 
+@dataclass
+class _Segment:
+    """Term-major document vectors for a run of consecutively added documents."""
+    doc_ids: List[str]
+    first_seq: int
+    vectors: csc_matrix
+    
+    @property
+    def end_seq(self) -> int:
+        return self.first_seq + len(self.doc_ids)
+
+
 class SemanticMatcher:
-    """Semantic similarity matching using TF-IDF and cosine similarity."""
+    """Semantic similarity matching using incremental TF-IDF and cosine similarity.
     
-    def __init__(self, similarity_threshold: float = 0.8):
+    Terms are mapped with a stateless ``HashingVectorizer``, so there is no
+    vocabulary to refit. Document frequencies are updated as batches arrive;
+    ``save_model`` merges this instance's new counts into the shared files
+    and ``load_model`` memory-maps them copy-on-write so workers start with
+    the shared corpus statistics. Document vectors are weighted with the IDF
+    at the time they were added and stored term-major (CSC) in a logarithmic
+    number of segments, so a query only reads the postings of its own terms.
+    """
+    
+    def __init__(
+        self,
+        similarity_threshold: float = 0.8,
+        n_features: int = 2 ** 18,
+        max_documents: int = 50000,
+        model_path: Optional[str] = None
+    ):
         self.similarity_threshold = similarity_threshold
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
+        self.n_features = n_features
+        self.max_documents = max_documents
+        self.model_path = model_path
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
             stop_words='english',
             ngram_range=(1, 2),
-            min_df=1,
-            max_df=0.95
+            alternate_sign=False,
+            norm=None
         )
-        self._fitted = False
-        self._document_vectors = None
-        self._document_ids = []
+        self._doc_freq = np.zeros(n_features, dtype=np.float64)
+        self._n_docs = 0
+        # Counts added since the last save; save_model merges them into the shared files
+        self._unsaved_doc_freq = np.zeros(n_features, dtype=np.float64)
+        self._unsaved_docs = 0
+        self._segments: List[_Segment] = []
+        self._next_seq = 0
+        
+        if model_path:
+            self.load_model(model_path)
     
-    def fit_documents(self, documents: List[Tuple[str, str]]) -> None:
-        """Fit the vectorizer on a collection of documents.
+    @property
+    def _corpus_size(self) -> int:
+        return min(self._next_seq, self.max_documents)
+    
+    @property
+    def _fitted(self) -> bool:
+        return self._corpus_size > 0
+    
+    def add_documents(self, documents: List[Tuple[str, str]]) -> None:
+        """Add documents to the corpus and update document frequencies.
+        
+        Cost is proportional to the size of the batch (plus amortized
+        logarithmic segment merging), not of the corpus.
         
         Args:
             documents: List of (doc_id, content) tuples
@@ -128,39 +193,57 @@ class SemanticMatcher:
         if not documents:
             return
         
-        self._document_ids = [doc_id for doc_id, _ in documents]
+        doc_ids = [doc_id for doc_id, _ in documents]
         contents = [content for _, content in documents]
         
         try:
-            self._document_vectors = self.vectorizer.fit_transform(contents)
-            self._fitted = True
-            logger.info(f"Fitted semantic matcher on {len(documents)} documents")
+            counts = self.vectorizer.transform(contents)
+            np.add.at(self._doc_freq, counts.indices, 1)
+            np.add.at(self._unsaved_doc_freq, counts.indices, 1)
+            self._n_docs += len(documents)
+            self._unsaved_docs += len(documents)
+            
+            self._segments.append(_Segment(doc_ids, self._next_seq, self._weight(counts).tocsc()))
+            self._next_seq += len(doc_ids)
+            self._merge_segments()
+            
+            logger.info(f"Added {len(documents)} documents to semantic matcher ({self._corpus_size} indexed)")
         except Exception as e:
-            logger.error(f"Failed to fit semantic matcher: {e}")
-            self._fitted = False
+            logger.error(f"Failed to add documents to semantic matcher: {e}")
     
-    def find_similar_documents(self, content: str, doc_id: str) -> List[Tuple[str, float]]:
-        """Find semantically similar documents."""
+    def fit_documents(self, documents: List[Tuple[str, str]]) -> None:
+        """Incrementally add documents (kept for backward compatibility)."""
+        self.add_documents(documents)
+    
+    def find_similar_documents(self, content: str, doc_id: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """Find the top-k semantically similar documents above the threshold."""
         if not self._fitted or not content:
             return []
         
         try:
-            # Transform the query content
-            query_vector = self.vectorizer.transform([content])
-            
-            # Calculate cosine similarity
-            similarities = cosine_similarity(query_vector, self._document_vectors).flatten()
+            query_vector = self._weight(self.vectorizer.transform([content]))
+            if not query_vector.nnz:
+                return []
+            oldest = self._next_seq - self.max_documents
             
-            # Find similar documents above threshold
-            similar_docs = []
-            for i, similarity in enumerate(similarities):
-                if similarity >= self.similarity_threshold and self._document_ids[i] != doc_id:
-                    similar_docs.append((self._document_ids[i], float(similarity)))
+            candidates = []
+            for segment in self._segments:
+                # Column slice of a CSC matrix: only the postings of the query's terms are read
+                postings = segment.vectors[:, query_vector.indices]
+                if not postings.nnz:
+                    continue
+                
+                contributions = postings.data * np.repeat(query_vector.data, np.diff(postings.indptr))
+                rows, positions = np.unique(postings.indices, return_inverse=True)
+                scores = np.bincount(positions, weights=contributions)
+                
+                # Rows before ``oldest`` belong to evicted documents not yet merged away
+                keep = (scores >= self.similarity_threshold) & (rows >= oldest - segment.first_seq)
+                for row, similarity in zip(rows[keep], scores[keep]):
+                    if segment.doc_ids[row] != doc_id:
+                        candidates.append((segment.doc_ids[row], float(similarity)))
             
-            # Sort by similarity (highest first)
-            similar_docs.sort(key=lambda x: x[1], reverse=True)
-            
-            return similar_docs
+            return heapq.nlargest(top_k, candidates, key=lambda x: x[1])
             
         except Exception as e:
             logger.error(f"Error finding similar documents: {e}")
@@ -172,36 +255,165 @@ class SemanticMatcher:
             return 0.0
         
         try:
-            # Transform both contents
-            vectors = self.vectorizer.fit_transform([content1, content2])
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-            
-            return float(similarity)
+            vectors = self._weight(self.vectorizer.transform([content1, content2]))
+            return float(vectors[0].multiply(vectors[1]).sum())
             
         except Exception as e:
             logger.error(f"Error calculating similarity: {e}")
             return 0.0
+    
+    def save_model(self, path: Optional[str] = None) -> None:
+        """Merge this instance's document frequencies into the shared model files.
+        
+        Only the counts added since the last save are added to what is on
+        disk, so workers sharing ``path`` accumulate each other's statistics
+        instead of overwriting them. The read-merge-write runs under an
+        exclusive file lock (where ``fcntl`` is available) and both files are
+        replaced atomically.
+        """
+        path = path or self.model_path
+        if not path:
+            return
+        
+        os.makedirs(path, exist_ok=True)
+        with self._model_lock(path):
+            doc_freq, n_docs = self._read_model(path)
+            if doc_freq is None:
+                doc_freq, n_docs = np.array(self._doc_freq), self._n_docs
+            else:
+                doc_freq = doc_freq + self._unsaved_doc_freq
+                n_docs += self._unsaved_docs
+            
+            self._write_atomic(path, "doc_freq.npy", lambda f: np.save(f, doc_freq))
+            meta = json.dumps({"n_docs": n_docs, "n_features": self.n_features})
+            self._write_atomic(path, "meta.json", lambda f: f.write(meta.encode('utf-8')))
+        
+        self._doc_freq = doc_freq
+        self._n_docs = n_docs
+        self._unsaved_doc_freq = np.zeros(self.n_features, dtype=np.float64)
+        self._unsaved_docs = 0
+        
+        logger.info(f"Saved semantic model ({n_docs} documents) to {path}")
+    
+    def load_model(self, path: str) -> bool:
+        """Memory-map persisted document frequencies (copy-on-write)."""
+        try:
+            doc_freq, n_docs = self._read_model(path, mmap_mode='c')
+            if doc_freq is None:
+                return False
+            
+            if self._unsaved_docs:
+                # Keep counting documents added before the load
+                doc_freq = doc_freq + self._unsaved_doc_freq
+                n_docs += self._unsaved_docs
+            self._doc_freq = doc_freq
+            self._n_docs = n_docs
+            logger.info(f"Loaded semantic model ({self._n_docs} documents) from {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to load semantic model from {path}: {e}")
+            return False
+    
+    def _read_model(self, path: str, mmap_mode: Optional[str] = None) -> Tuple[Optional[np.ndarray], int]:
+        """Read persisted document frequencies; returns (None, 0) if there are none."""
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            if meta.get("n_features") != self.n_features:
+                logger.warning(f"Ignoring semantic model at {path}: feature size mismatch")
+                return None, 0
+            return np.load(os.path.join(path, "doc_freq.npy"), mmap_mode=mmap_mode), meta.get("n_docs", 0)
+        except FileNotFoundError:
+            return None, 0
+    
+    @staticmethod
+    @contextmanager
+    def _model_lock(path: str):
+        """Hold an exclusive lock on the model directory (released on close)."""
+        with open(os.path.join(path, "model.lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+    
+    @staticmethod
+    def _write_atomic(path: str, name: str, write) -> None:
+        """Write a model file next to its destination and rename it into place."""
+        tmp_path = os.path.join(path, f"{name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, os.path.join(path, name))
+    
+    def _merge_segments(self) -> None:
+        """Drop evicted segments and merge the newest ones like a binary counter.
+        
+        A segment is merged into its predecessor once it is at least as large,
+        so every document is copied O(log n) times and a query visits O(log n)
+        segments.
+        """
+        oldest = self._next_seq - self.max_documents
+        self._segments = [segment for segment in self._segments if segment.end_seq > oldest]
+        
+        while len(self._segments) > 1 and len(self._segments[-2].doc_ids) <= len(self._segments[-1].doc_ids):
+            newer = self._segments.pop()
+            older = self._segments.pop()
+            # Evicted rows at the head of the older segment are dropped while copying
+            skip = max(0, oldest - older.first_seq)
+            self._segments.append(_Segment(
+                older.doc_ids[skip:] + newer.doc_ids,
+                older.first_seq + skip,
+                vstack([older.vectors[skip:], newer.vectors], format='csc')
+            ))
+    
+    def _weight(self, counts: csr_matrix) -> csr_matrix:
+        """Apply the current smoothed IDF and L2-normalize term count rows."""
+        weighted = counts.astype(np.float64)
+        idf = np.log((1 + self._n_docs) / (1 + self._doc_freq[weighted.indices])) + 1
+        weighted.data *= idf
+        return normalize(weighted, norm='l2', copy=False)
 
 
 class DuplicateDetector:
-    """Main duplicate detection system."""
+    """Main duplicate detection system.
     
-    def __init__(self, vector_db: Optional[VectorDBService] = None):
+    Exact matches use TTL-bounded hash stores and near-duplicates use a
+    MinHash LSH index. Passing a ``redis_client`` backs both with Redis so
+    every ingestion worker shares the same view of recently seen content.
+    """
+    
+    def __init__(
+        self,
+        vector_db: Optional[VectorDBService] = None,
+        redis_client=None,
+        cache_ttl_hours: int = 24,
+        max_entries: int = 100000,
+        key_prefix: str = "dedup",
+        semantic_model_path: Optional[str] = None
+    ):
         self.hasher = ContentHasher()
-        self.semantic_matcher = SemanticMatcher()
+        self.semantic_matcher = SemanticMatcher(model_path=semantic_model_path)
         self.vector_db = vector_db
-        
-        # In-memory caches for recent data
-        self._content_hashes: Dict[str, str] = {}  # hash -> data_id
-        self._fuzzy_hashes: Dict[str, str] = {}    # fuzzy_hash -> data_id
-        self._source_hashes: Dict[str, str] = {}   # source_hash -> data_id
+        self.minhasher = MinHasher()
         
         # Configuration
         self.semantic_threshold = 0.8
         self.fuzzy_threshold = 0.9
-        self.cache_ttl_hours = 24
+        self.cache_ttl_hours = cache_ttl_hours
+        
+        ttl_seconds = cache_ttl_hours * 3600
+        if redis_client is not None:
+            self.backend = "redis"
+            self._content_hashes = RedisHashStore(redis_client, f"{key_prefix}:content", ttl_seconds)
+            self._source_hashes = RedisHashStore(redis_client, f"{key_prefix}:source", ttl_seconds)
+            self._near_duplicates = RedisMinHashLSHIndex(
+                redis_client, f"{key_prefix}:lsh", hasher=self.minhasher, ttl_seconds=ttl_seconds
+            )
+        else:
+            self.backend = "memory"
+            self._content_hashes = TTLHashStore(ttl_seconds, max_entries)
+            self._source_hashes = TTLHashStore(ttl_seconds, max_entries)
+            self._near_duplicates = MinHashLSHIndex(
+                hasher=self.minhasher, ttl_seconds=ttl_seconds, max_entries=max_entries
+            )
         
     async def detect_duplicates(self, raw_data: RawData) -> List[DuplicateMatch]:
         """Detect duplicates for a single data item."""
@@ -210,24 +422,21 @@ class DuplicateDetector:
         
         # 1. Exact content hash matching
         content_hash = self.hasher.generate_content_hash(raw_data)
-        if content_hash in self._content_hashes:
-            original_id = self._content_hashes[content_hash]
-            if original_id != data_id:
-                duplicates.append(DuplicateMatch(
-                    original_id=original_id,
-                    duplicate_id=data_id,
-                    similarity_score=1.0,
-                    match_type="exact",
-                    confidence=1.0
-                ))
-        else:
-            self._content_hashes[content_hash] = data_id
+        original_id = await self._content_hashes.get_or_set(content_hash, data_id)
+        if original_id and original_id != data_id:
+            duplicates.append(DuplicateMatch(
+                original_id=original_id,
+                duplicate_id=data_id,
+                similarity_score=1.0,
+                match_type="exact",
+                confidence=1.0
+            ))
         
         # 2. Source-based duplicate detection
         source_hash = self.hasher.generate_source_hash(raw_data)
-        if source_hash and source_hash in self._source_hashes:
-            original_id = self._source_hashes[source_hash]
-            if original_id != data_id:
+        if source_hash:
+            original_id = await self._source_hashes.get_or_set(source_hash, data_id)
+            if original_id and original_id != data_id:
                 duplicates.append(DuplicateMatch(
                     original_id=original_id,
                     duplicate_id=data_id,
@@ -235,24 +444,11 @@ class DuplicateDetector:
                     match_type="exact",
                     confidence=1.0
                 ))
-        elif source_hash:
-            self._source_hashes[source_hash] = data_id
         
-        # 3. Fuzzy hash matching (near-duplicates)
+        # 3. MinHash LSH matching (near-duplicates)
         if not duplicates:  # Only check if no exact duplicates found
-            fuzzy_hash = self.hasher.generate_fuzzy_hash(raw_data)
-            if fuzzy_hash in self._fuzzy_hashes:
-                original_id = self._fuzzy_hashes[fuzzy_hash]
-                if original_id != data_id:
-                    duplicates.append(DuplicateMatch(
-                        original_id=original_id,
-                        duplicate_id=data_id,
-                        similarity_score=0.95,
-                        match_type="near_exact",
-                        confidence=0.9
-                    ))
-            else:
-                self._fuzzy_hashes[fuzzy_hash] = data_id
+            near_duplicates = await self._find_near_duplicates(raw_data, data_id)
+            duplicates.extend(near_duplicates)
         
         # 4. Semantic similarity matching
         if not duplicates and self.vector_db:  # Only if no other duplicates found
@@ -272,20 +468,61 @@ class DuplicateDetector:
             content = f"{raw_data.title or ''}\n{raw_data.content}"
             documents.append((data_id, content))
         
-        # Fit semantic matcher
+        # Incrementally add the batch to the semantic matcher's corpus
         if documents:
-            self.semantic_matcher.fit_documents(documents)
+            self.semantic_matcher.add_documents(documents)
+        batch_positions = {data_id: position for position, (data_id, _) in enumerate(documents)}
         
         # Process each item
-        for raw_data in raw_data_list:
-            data_id = f"{raw_data.source}:{raw_data.source_id}"
+        for position, raw_data in enumerate(raw_data_list):
+            data_id, content = documents[position]
             duplicates = await self.detect_duplicates(raw_data)
+            
+            if not duplicates:
+                # Only earlier items (previous batches or earlier in this one) count as originals
+                for original_id, similarity in self.semantic_matcher.find_similar_documents(content, data_id):
+                    if batch_positions.get(original_id, -1) < position:
+                        duplicates.append(DuplicateMatch(
+                            original_id=original_id,
+                            duplicate_id=data_id,
+                            similarity_score=similarity,
+                            match_type="semantic",
+                            confidence=similarity
+                        ))
+            
             if duplicates:
                 results[data_id] = duplicates
         
         logger.info(f"Found duplicates for {len(results)}/{len(raw_data_list)} items")
         return results
     
+    async def _find_near_duplicates(self, raw_data: RawData, data_id: str) -> List[DuplicateMatch]:
+        """Find near-duplicates via MinHash LSH and index the item if it is new."""
+        normalized = self.hasher.aggressive_normalize(
+            f"{raw_data.title or ''} {raw_data.content}"
+        )
+        signature = self.minhasher.signature(normalized)
+        if signature is None:
+            return []
+        
+        matches = await self._near_duplicates.query(signature, self.fuzzy_threshold)
+        duplicates = [
+            DuplicateMatch(
+                original_id=original_id,
+                duplicate_id=data_id,
+                similarity_score=similarity,
+                match_type="near_exact",
+                confidence=similarity
+            )
+            for original_id, similarity in matches
+            if original_id != data_id
+        ]
+        
+        if not duplicates:
+            await self._near_duplicates.insert(data_id, signature)
+        
+        return duplicates
+    
     async def _find_semantic_duplicates(self, raw_data: RawData, data_id: str) -> List[DuplicateMatch]:
         """Find semantic duplicates using vector database."""
         if not self.vector_db:
@@ -327,38 +564,43 @@ class DuplicateDetector:
     
     def get_deduplication_stats(self) -> Dict[str, Any]:
         """Get statistics about duplicate detection."""
-        return {
-            "content_hashes": len(self._content_hashes),
-            "fuzzy_hashes": len(self._fuzzy_hashes),
-            "source_hashes": len(self._source_hashes),
+        stats = {
+            "backend": self.backend,
             "semantic_threshold": self.semantic_threshold,
-            "fuzzy_threshold": self.fuzzy_threshold
+            "fuzzy_threshold": self.fuzzy_threshold,
+            "cache_ttl_hours": self.cache_ttl_hours
         }
+        
+        # Redis-backed indexes are shared and sized by Redis itself
+        if self.backend == "memory":
+            stats.update({
+                "content_hashes": len(self._content_hashes),
+                "fuzzy_hashes": len(self._near_duplicates),
+                "source_hashes": len(self._source_hashes)
+            })
+        
+        return stats
     
     def cleanup_old_hashes(self, hours: int = 24) -> None:
-        """Clean up old hash entries (this is a simplified version)."""
-        # In a real implementation, you'd track timestamps and remove old entries
-        # For now, we'll just clear everything if it gets too large
-        max_size = 10000
-        
-        if len(self._content_hashes) > max_size:
-            self._content_hashes.clear()
-            logger.info("Cleared content hashes cache")
-        
-        if len(self._fuzzy_hashes) > max_size:
-            self._fuzzy_hashes.clear()
-            logger.info("Cleared fuzzy hashes cache")
-        
-        if len(self._source_hashes) > max_size:
-            self._source_hashes.clear()
-            logger.info("Cleared source hashes cache")
+        """Evict hash and signature entries older than the configured TTL.
+        
+        Lookups already evict lazily; this just reclaims memory eagerly.
+        Redis-backed indexes expire through key TTLs.
+        """
+        evicted = (
+            self._content_hashes.evict_expired() +
+            self._source_hashes.evict_expired() +
+            self._near_duplicates.evict_expired()
+        )
+        if evicted:
+            logger.info(f"Evicted {evicted} expired deduplication entries")
 
 
 class DeduplicationService:
     """Service for managing deduplication across the system."""
     
-    def __init__(self, vector_db: Optional[VectorDBService] = None):
-        self.detector = DuplicateDetector(vector_db)
+    def __init__(self, vector_db: Optional[VectorDBService] = None, redis_client=None, **detector_options):
+        self.detector = DuplicateDetector(vector_db, redis_client=redis_client, **detector_options)
         self.duplicate_store: Dict[str, List[DuplicateMatch]] = {}
     
     async def process_raw_data(self, raw_data: RawData) -> Tuple[bool, List[DuplicateMatch]]:
@@ -390,6 +632,10 @@ class DeduplicationService:
         logger.info(f"Deduplicated {len(raw_data_list)} -> {len(unique_data)} items")
         return unique_data, duplicate_results
     
+    def save_state(self) -> None:
+        """Persist the semantic matcher's document frequencies, if configured."""
+        self.detector.semantic_matcher.save_model()
+    
     def get_duplicate_info(self, data_id: str) -> Optional[List[DuplicateMatch]]:
         """Get duplicate information for a data item."""
         return self.duplicate_store.get(data_id)
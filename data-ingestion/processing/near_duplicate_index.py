@@ -0,0 +1,281 @@
+"""Bounded, TTL-evicting indexes used for duplicate detection.
+
+Provides:
+- MinHasher: MinHash signatures over word shingles (stable across processes)
+- TTLHashStore / RedisHashStore: exact hash -> data_id lookups with expiry
+- MinHashLSHIndex / RedisMinHashLSHIndex: LSH banding index for near-duplicates
+
+The Redis-backed variants let every ingestion worker share a single view of
+recently seen content; the in-memory variants are bounded by both TTL and a
+maximum entry count so they never grow without limit.
+"""
+
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+class MinHasher:
+    """Computes MinHash signatures from word shingles.
+
+    Shingles are hashed with CRC32 and permuted with seeded universal hash
+    functions, so signatures are identical in every process.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._b = generator.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+
+    def shingles(self, text: str) -> Set[str]:
+        """Split text into overlapping word shingles."""
+        words = text.split()
+        if len(words) < self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {
+            ' '.join(words[i:i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Compute the MinHash signature of a text, or None if it has no shingles."""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) % _MERSENNE_PRIME for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def jaccard(signature1: np.ndarray, signature2: np.ndarray) -> float:
+        """Estimate Jaccard similarity from two signatures."""
+        return float(np.count_nonzero(signature1 == signature2)) / len(signature1)
+
+
+def _band_keys(signature: np.ndarray, bands: int) -> List[str]:
+    """Hash each band of a signature into a bucket key."""
+    rows = len(signature) // bands
+    return [
+        f"{band}:{zlib.crc32(signature[band * rows:(band + 1) * rows].tobytes()):08x}"
+        for band in range(bands)
+    ]
+
+
+class TTLHashStore:
+    """In-memory hash -> data_id store with TTL and size-bounded eviction."""
+
+    def __init__(self, ttl_seconds: float = 86400, max_entries: int = 100000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    async def get_or_set(self, key: str, data_id: str) -> Optional[str]:
+        """Return the data_id already stored for ``key``, or store ``data_id``."""
+        self.evict_expired()
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry[0]
+
+        self._entries[key] = (data_id, time.monotonic() + self.ttl_seconds)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return None
+
+    def evict_expired(self) -> int:
+        """Drop expired entries; entries are kept in expiry order."""
+        now = time.monotonic()
+        evicted = 0
+        while self._entries:
+            key, (_, expires_at) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisHashStore:
+    """Redis-backed hash -> data_id store shared by all ingestion workers."""
+
+    def __init__(self, redis_client, key_prefix: str, ttl_seconds: float = 86400):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.ttl_seconds = int(ttl_seconds)
+
+    async def get_or_set(self, key: str, data_id: str) -> Optional[str]:
+        """Atomically claim ``key`` for ``data_id``; return the prior owner if any."""
+        redis_key = f"{self.key_prefix}:{key}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(redis_key, data_id, nx=True, ex=self.ttl_seconds)
+            pipe.get(redis_key)
+            created, owner = await pipe.execute()
+
+        if created:
+            return None
+        return owner.decode() if isinstance(owner, bytes) else owner
+
+    def evict_expired(self) -> int:
+        """Expiry is handled by Redis key TTLs."""
+        return 0
+
+
+class MinHashLSHIndex:
+    """In-memory MinHash LSH index with TTL and size-bounded eviction."""
+
+    def __init__(
+        self,
+        hasher: Optional[MinHasher] = None,
+        bands: int = 16,
+        ttl_seconds: float = 86400,
+        max_entries: int = 100000
+    ):
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError("num_perm must be divisible by the number of bands")
+        self.bands = bands
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._signatures: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._buckets: Dict[str, Set[str]] = {}
+
+    async def query(self, signature: np.ndarray, threshold: float) -> List[Tuple[str, float]]:
+        """Return (data_id, estimated_jaccard) pairs at or above ``threshold``."""
+        self.evict_expired()
+        candidates: Set[str] = set()
+        for key in _band_keys(signature, self.bands):
+            candidates.update(self._buckets.get(key, ()))
+
+        matches = []
+        for data_id in candidates:
+            similarity = MinHasher.jaccard(signature, self._signatures[data_id][0])
+            if similarity >= threshold:
+                matches.append((data_id, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    async def insert(self, data_id: str, signature: np.ndarray) -> None:
+        """Add (or refresh) a signature in the index."""
+        if data_id in self._signatures:
+            self._remove(data_id)
+
+        self._signatures[data_id] = (signature, time.monotonic() + self.ttl_seconds)
+        for key in _band_keys(signature, self.bands):
+            self._buckets.setdefault(key, set()).add(data_id)
+
+        while len(self._signatures) > self.max_entries:
+            self._remove(next(iter(self._signatures)))
+
+    def evict_expired(self) -> int:
+        """Drop expired signatures; entries are kept in expiry order."""
+        now = time.monotonic()
+        evicted = 0
+        while self._signatures:
+            data_id, (_, expires_at) = next(iter(self._signatures.items()))
+            if expires_at > now:
+                break
+            self._remove(data_id)
+            evicted += 1
+        return evicted
+
+    def _remove(self, data_id: str) -> None:
+        signature, _ = self._signatures.pop(data_id)
+        for key in _band_keys(signature, self.bands):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(data_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+class RedisMinHashLSHIndex:
+    """Redis-backed MinHash LSH index shared by all ingestion workers.
+
+    Signatures are stored as hex-encoded uint32 arrays (so clients created
+    with ``decode_responses=True`` work too) with the index TTL. Band buckets
+    are sorted sets scored by insertion time: members older than the TTL are
+    ignored by queries and trimmed on every insert, so a busy bucket whose key
+    never expires still stays bounded.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        key_prefix: str,
+        hasher: Optional[MinHasher] = None,
+        bands: int = 16,
+        ttl_seconds: float = 86400
+    ):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError("num_perm must be divisible by the number of bands")
+        self.bands = bands
+        self.ttl_seconds = int(ttl_seconds)
+
+    async def query(self, signature: np.ndarray, threshold: float) -> List[Tuple[str, float]]:
+        """Return (data_id, estimated_jaccard) pairs at or above ``threshold``."""
+        oldest = time.time() - self.ttl_seconds
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in _band_keys(signature, self.bands):
+                pipe.zrangebyscore(f"{self.key_prefix}:bucket:{key}", f"({oldest}", "+inf")
+            buckets = await pipe.execute()
+
+        candidates = sorted({
+            member.decode() if isinstance(member, bytes) else member
+            for bucket in buckets for member in bucket
+        })
+        if not candidates:
+            return []
+
+        stored = await self.redis.mget([f"{self.key_prefix}:sig:{data_id}" for data_id in candidates])
+
+        matches = []
+        for data_id, raw_signature in zip(candidates, stored):
+            if raw_signature is None:
+                continue
+            if isinstance(raw_signature, bytes):
+                raw_signature = raw_signature.decode()
+            other = np.frombuffer(bytes.fromhex(raw_signature), dtype=np.uint32)
+            if len(other) != len(signature):
+                continue
+            similarity = MinHasher.jaccard(signature, other)
+            if similarity >= threshold:
+                matches.append((data_id, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    async def insert(self, data_id: str, signature: np.ndarray) -> None:
+        """Add (or refresh) a signature in the index in a single round-trip."""
+        now = time.time()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(f"{self.key_prefix}:sig:{data_id}", signature.tobytes().hex(), ex=self.ttl_seconds)
+            for key in _band_keys(signature, self.bands):
+                bucket_key = f"{self.key_prefix}:bucket:{key}"
+                pipe.zadd(bucket_key, {data_id: now})
+                pipe.zremrangebyscore(bucket_key, "-inf", now - self.ttl_seconds)
+                pipe.expire(bucket_key, self.ttl_seconds)
+            await pipe.execute()
+
+    def evict_expired(self) -> int:
+        """Expiry is handled by Redis key TTLs and per-member bucket scores."""
+        return 0
@@ -0,0 +1,165 @@
+"""Bounded-queue streaming pipeline for the data ingestion service.
+
+Items flow from an async source (typically a plugin's ``fetch_data``
+iterator) through a chain of stages. Each stage owns a bounded
+``asyncio.Queue`` and a configurable number of workers, so a slow stage
+fills its queue and the upstream stages (and ultimately the source
+iterator) block instead of buffering the whole crawl in memory.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineStage:
+    """A single processing stage.
+
+    The handler receives an item and returns the item to pass downstream,
+    or ``None`` to drop it (e.g. a duplicate or low-quality signal).
+    """
+    name: str
+    handler: Callable[[Any], Awaitable[Optional[Any]]]
+    concurrency: int = 1
+    queue_size: int = 100
+
+
+@dataclass
+class StageStats:
+    """Counters collected for a single stage."""
+    processed: int = 0
+    passed: int = 0
+    dropped: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+
+
+@dataclass
+class PipelineStats:
+    """Aggregate statistics for a pipeline run."""
+    items_in: int = 0
+    items_out: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    first_output_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+
+    @property
+    def time_to_first_output(self) -> Optional[float]:
+        if self.first_output_at is None:
+            return None
+        return self.first_output_at - self.started_at
+
+    @property
+    def execution_time(self) -> Optional[float]:
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+class StreamingPipeline:
+    """Runs items through bounded-queue stages with per-stage concurrency."""
+
+    def __init__(self, stages: List[PipelineStage]):
+        if not stages:
+            raise ValueError("Pipeline requires at least one stage")
+        self.stages = stages
+
+    async def run(self, source: AsyncIterator[Any]) -> PipelineStats:
+        """Drain ``source`` through all stages and return run statistics.
+
+        Errors raised by the source are propagated after the stages have
+        been shut down; errors raised by stage handlers are counted and
+        the offending item is dropped.
+        """
+        stats = PipelineStats()
+        queues = [asyncio.Queue(maxsize=max(1, stage.queue_size)) for stage in self.stages]
+        workers: List[List[asyncio.Task]] = []
+
+        for index, stage in enumerate(self.stages):
+            stage_stats = stats.stages.setdefault(stage.name, StageStats())
+            downstream = queues[index + 1] if index + 1 < len(queues) else None
+            workers.append([
+                asyncio.create_task(
+                    self._stage_worker(stage, queues[index], downstream, stage_stats, stats)
+                )
+                for _ in range(max(1, stage.concurrency))
+            ])
+
+        try:
+            async for item in source:
+                stats.items_in += 1
+                # Blocks when the first stage is saturated, which in turn
+                # stops the source iterator from being advanced.
+                await queues[0].put(item)
+
+            # Drain stages in order: once a stage's queue is joined every
+            # item it accepted has been handed to the next stage.
+            for index, queue in enumerate(queues):
+                await queue.join()
+                self._cancel(workers[index])
+        finally:
+            for stage_workers in workers:
+                self._cancel(stage_workers)
+            await asyncio.gather(
+                *(task for stage_workers in workers for task in stage_workers),
+                return_exceptions=True
+            )
+            stats.finished_at = time.monotonic()
+
+        logger.info(
+            f"Pipeline processed {stats.items_in} items, {stats.items_out} reached the final stage "
+            f"in {stats.execution_time:.2f}s"
+        )
+        return stats
+
+    async def _stage_worker(
+        self,
+        stage: PipelineStage,
+        inbound: asyncio.Queue,
+        outbound: Optional[asyncio.Queue],
+        stage_stats: StageStats,
+        stats: PipelineStats
+    ) -> None:
+        """Consume items for a stage until cancelled."""
+        while True:
+            item = await inbound.get()
+            try:
+                started = time.monotonic()
+                try:
+                    result = await stage.handler(item)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    stage_stats.errors += 1
+                    logger.error(f"Pipeline stage {stage.name} failed: {e}")
+                    continue
+                finally:
+                    stage_stats.processed += 1
+                    stage_stats.busy_seconds += time.monotonic() - started
+
+                if result is None:
+                    stage_stats.dropped += 1
+                    continue
+
+                stage_stats.passed += 1
+                if outbound is not None:
+                    await outbound.put(result)
+                else:
+                    stats.items_out += 1
+                    if stats.first_output_at is None:
+                        stats.first_output_at = time.monotonic()
+            finally:
+                inbound.task_done()
+
+    @staticmethod
+    def _cancel(tasks: List[asyncio.Task]) -> None:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
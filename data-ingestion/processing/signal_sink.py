@@ -0,0 +1,140 @@
+"""Batched bulk sink for market signals produced by the ingestion pipeline."""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from shared.database import get_db_session
+
+
+logger = logging.getLogger(__name__)
+
+# Failures that say nothing about the rows themselves; splitting the batch
+# would only repeat the same failing round-trip for every half
+OUTAGE_ERRORS = (
+    OperationalError,
+    InterfaceError,
+    DisconnectionError,
+    PoolTimeoutError,
+    ConnectionError,
+    asyncio.TimeoutError,
+)
+
+
+@dataclass
+class SinkStats:
+    """Counters for a bulk signal sink."""
+    batches: int = 0
+    written: int = 0
+    failed: int = 0
+    vectors_written: int = 0
+    vector_failures: int = 0
+
+
+class MarketSignalBulkSink:
+    """Accumulates accepted market signals and writes them in batches.
+
+    Each flush persists the whole buffer in a single transaction (the ORM
+    emits one multi-row INSERT per flush), embeds all signal texts with one
+    ``generate_text_embeddings`` call and upserts them with one
+    ``upsert_vectors`` call. If the transaction fails because of a bad
+    row, the batch is retried in halves down to single rows so one bad
+    signal only loses itself; connection and operational failures drop the
+    batch without retrying.
+    """
+
+    def __init__(
+        self,
+        vector_db=None,
+        ai_service=None,
+        batch_size: int = 100,
+        index_name: str = "market-signals"
+    ):
+        self.vector_db = vector_db
+        self.ai_service = ai_service
+        self.batch_size = max(1, batch_size)
+        self.index_name = index_name
+        self.stats = SinkStats()
+        self._buffer: List[Tuple[Any, str, Dict[str, Any]]] = []
+        self._flush_lock = asyncio.Lock()
+
+    async def add(self, market_signal, embedding_text: str, metadata: Dict[str, Any]) -> None:
+        """Buffer a signal, flushing once the batch is full."""
+        self._buffer.append((market_signal, embedding_text, metadata))
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered signals and return how many were persisted."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+
+            batch, self._buffer = self._buffer, []
+            persisted = await self._persist(batch)
+
+            self.stats.batches += 1
+            self.stats.written += len(persisted)
+            self.stats.failed += len(batch) - len(persisted)
+
+            if persisted:
+                await self._upsert_vectors(persisted)
+
+            logger.info(f"Flushed {len(persisted)} of {len(batch)} market signals")
+            return len(persisted)
+
+    async def close(self) -> SinkStats:
+        """Flush any remaining signals and return the sink statistics."""
+        await self.flush()
+        return self.stats
+
+    async def _persist(self, batch: List[Tuple[Any, str, Dict[str, Any]]]) -> List[Tuple[Any, str, Dict[str, Any]]]:
+        """Insert a batch in one transaction, splitting it on failure; returns the stored entries."""
+        try:
+            async with get_db_session() as session:
+                session.add_all([signal for signal, _, _ in batch])
+            return batch
+        except OUTAGE_ERRORS as e:
+            logger.error(f"Database unavailable, dropping batch of {len(batch)} market signals: {e}")
+            return []
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Insert of market signal {getattr(batch[0][0], 'id', None)} failed: {e}")
+                return []
+            logger.warning(f"Bulk insert of {len(batch)} market signals failed, retrying in smaller batches: {e}")
+
+        middle = len(batch) // 2
+        return await self._persist(batch[:middle]) + await self._persist(batch[middle:])
+
+    async def _upsert_vectors(self, batch: List[Tuple[Any, str, Dict[str, Any]]]) -> None:
+        """Embed and upsert a persisted batch in one round-trip each."""
+        if not self.vector_db or not self.ai_service:
+            return
+
+        try:
+            embeddings = await self.ai_service.generate_text_embeddings([text for _, text, _ in batch])
+
+            vectors = []
+            for (signal, _, metadata), embedding in zip(batch, embeddings):
+                vectors.append({
+                    "id": signal.id,
+                    "values": embedding,
+                    "metadata": {
+                        **{key: value for key, value in metadata.items() if value is not None},
+                        "id": signal.id
+                    }
+                })
+
+            if await self.vector_db.upsert_vectors(self.index_name, vectors):
+                self.stats.vectors_written += len(vectors)
+            else:
+                self.stats.vector_failures += len(vectors)
+
+        except Exception as e:
+            # Don't fail the batch if vector storage fails
+            self.stats.vector_failures += len(batch)
+            logger.error(f"Error storing batch in vector database: {e}")
@@ -3,6 +3,8 @@
 import asyncio
 import json
 import logging
+import time
+import zlib
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Dict, List, Optional, Any, Callable, Awaitable
@@ -16,6 +18,57 @@ from pydantic import BaseModel
 logger = logging.getLogger(__name__)
 
 
+# Atomically pop the highest-priority ready task and record it in the
+# processing set (scored by claim time) so a crashed worker's task can be
+# recovered. Returns {task_id, task_data} or nil when the queue is empty.
+CLAIM_TASK_SCRIPT = """
+local popped = redis.call('ZPOPMAX', KEYS[1])
+if #popped == 0 then
+    return nil
+end
+local task_id = popped[1]
+redis.call('ZADD', KEYS[2], ARGV[1], task_id)
+return {task_id, redis.call('HGET', KEYS[3], task_id)}
+"""
+
+# Ready-queue scores order by priority first, then FIFO within a priority
+_PRIORITY_SCORE_SPAN = 10 ** 13
+
+# Stored task/result blobs start with a format byte; anything else is
+# legacy pydantic JSON written before the packed encoding was introduced
+_FORMAT_PACKED = b'\x01'
+_FORMAT_PACKED_ZLIB = b'\x02'
+_COMPRESS_THRESHOLD = 512
+
+
+def _pack_value(value: Any) -> bytes:
+    """Encode a JSON-compatible value compactly, compressing large blobs."""
+    body = json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+    if len(body) > _COMPRESS_THRESHOLD:
+        return _FORMAT_PACKED_ZLIB + zlib.compress(body, 1)
+    return _FORMAT_PACKED + body
+
+
+def _unpack_value(data: Any) -> Any:
+    """Decode a value written by :func:`_pack_value` (or legacy JSON)."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    marker, body = data[:1], data[1:]
+    if marker == _FORMAT_PACKED_ZLIB:
+        return json.loads(zlib.decompress(body))
+    if marker == _FORMAT_PACKED:
+        return json.loads(body)
+    return json.loads(data)
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value else None
+
+
+def _from_timestamp(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value) if value is not None else None
+
+
 class TaskStatus(str, Enum):
     """Task status enumeration."""
     PENDING = "pending"
@@ -34,6 +87,9 @@ class TaskPriority(int, Enum):
     CRITICAL = 4
 
 
+TERMINAL_STATUSES = {TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED}
+
+
 @dataclass
 class TaskResult:
     """Task execution result."""
@@ -65,6 +121,49 @@ class Task(BaseModel):
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
+    
+    def pack(self) -> bytes:
+        """Encode the task as a compact positional blob for Redis storage."""
+        return _pack_value([
+            self.id,
+            self.name,
+            self.payload,
+            self.priority.value,
+            self.max_retries,
+            self.retry_count,
+            self.timeout_seconds,
+            _timestamp(self.created_at),
+            _timestamp(self.scheduled_at),
+            _timestamp(self.started_at),
+            _timestamp(self.completed_at),
+            self.status.value,
+            self.error
+        ])
+    
+    @classmethod
+    def unpack(cls, data: Any) -> "Task":
+        """Decode a task stored by :meth:`pack` or as legacy JSON."""
+        value = _unpack_value(data)
+        if isinstance(value, dict):
+            return cls.parse_obj(value)
+        
+        (task_id, name, payload, priority, max_retries, retry_count, timeout_seconds,
+         created_at, scheduled_at, started_at, completed_at, status, error) = value
+        return cls(
+            id=task_id,
+            name=name,
+            payload=payload,
+            priority=TaskPriority(priority),
+            max_retries=max_retries,
+            retry_count=retry_count,
+            timeout_seconds=timeout_seconds,
+            created_at=_from_timestamp(created_at),
+            scheduled_at=_from_timestamp(scheduled_at),
+            started_at=_from_timestamp(started_at),
+            completed_at=_from_timestamp(completed_at),
+            status=TaskStatus(status),
+            error=error
+        )
 
 
 class TaskQueue:
@@ -78,12 +177,70 @@ class TaskQueue:
         self._handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {}
         self._running = False
         self._worker_count = 4
+        self._claim_script = None
+        
+        # Idle workers block on the wakeup list for at most this long
+        self.block_timeout_seconds = 5
+        # Extra time beyond a task's timeout before it is considered abandoned
+        self.recovery_grace_seconds = 60
+        # Finished tasks and their results are kept this long, then compacted
+        self.retention_seconds = 86400
+        self.compaction_interval_seconds = 60
+        self.compaction_batch_size = 500
+        
+    @property
+    def _ready_key(self) -> str:
+        return f"{self.queue_name}:ready"
+    
+    @property
+    def _processing_key(self) -> str:
+        return f"{self.queue_name}:processing"
+    
+    @property
+    def _wakeup_key(self) -> str:
+        return f"{self.queue_name}:wakeup"
+    
+    @property
+    def _events_channel(self) -> str:
+        return f"{self.queue_name}:events"
+    
+    @property
+    def _finished_key(self) -> str:
+        return f"{self.queue_name}:finished"
+    
+    @property
+    def _counters_key(self) -> str:
+        return f"{self.queue_name}:counters"
+    
+    def _finish_task(self, pipe, task: Task) -> None:
+        """Add the commands recording a task's terminal state to a pipeline.
+        
+        Stores the task, indexes it for retention by completion time, bumps
+        the aggregate counter for its status and publishes a completion event.
+        """
+        pipe.hset(f"{self.queue_name}:tasks", task.id, task.pack())
+        pipe.zadd(self._finished_key, {task.id: datetime.now().timestamp()})
+        pipe.hincrby(self._counters_key, task.status.value, 1)
+        pipe.publish(self._events_channel, json.dumps({'task_id': task.id, 'status': task.status.value}))
+    
+    @staticmethod
+    def _ready_score(priority: TaskPriority) -> float:
+        """Score for the ready set: higher priority first, then oldest first."""
+        now_ms = int(datetime.now().timestamp() * 1000)
+        return priority.value * _PRIORITY_SCORE_SPAN + (_PRIORITY_SCORE_SPAN - now_ms)
+    
+    def _queue_ready(self, pipe, task: Task) -> None:
+        """Add ready-queue and wakeup commands for a task to a pipeline."""
+        pipe.zadd(self._ready_key, {task.id: self._ready_score(task.priority)})
+        pipe.lpush(self._wakeup_key, 1)
+        pipe.ltrim(self._wakeup_key, 0, max(self._worker_count, 1) - 1)
         
     async def initialize(self) -> None:
         """Initialize Redis connection and task queue."""
         try:
             self._redis = redis.from_url(self.redis_url)
             await self._redis.ping()
+            self._claim_script = self._redis.register_script(CLAIM_TASK_SCRIPT)
             logger.info(f"Connected to Redis at {self.redis_url}")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
@@ -136,35 +293,117 @@ class TaskQueue:
             scheduled_at=scheduled_at
         )
         
-        # Store task data
-        await self._redis.hset(
-            f"{self.queue_name}:tasks",
-            task.id,
-            task.json()
-        )
-        
-        # Add to appropriate queue
-        if scheduled_at and scheduled_at > datetime.now():
-            # Scheduled task
-            score = scheduled_at.timestamp()
-            await self._redis.zadd(f"{self.queue_name}:scheduled", {task.id: score})
-        else:
-            # Immediate task
-            queue_key = f"{self.queue_name}:priority:{priority.value}"
-            await self._redis.lpush(queue_key, task.id)
+        # Store task data and queue it in a single round-trip
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(f"{self.queue_name}:tasks", task.id, task.pack())
+            pipe.hincrby(self._counters_key, "enqueued", 1)
+            
+            if scheduled_at and scheduled_at > datetime.now():
+                # Scheduled task
+                pipe.zadd(f"{self.queue_name}:scheduled", {task.id: scheduled_at.timestamp()})
+            else:
+                # Immediate task
+                self._queue_ready(pipe, task)
+            
+            await pipe.execute()
         
         logger.info(f"Enqueued task {task.id} ({task_name}) with priority {priority}")
         return task.id
     
     async def get_task_status(self, task_id: str) -> Optional[Task]:
-        """Get task status and details."""
+        """Get task status and details.
+        
+        Claimed tasks are not rewritten when a worker picks them up; their
+        PROCESSING state is derived from membership of the processing set.
+        """
         if not self._redis:
             return None
         
-        task_data = await self._redis.hget(f"{self.queue_name}:tasks", task_id)
-        if task_data:
-            return Task.parse_raw(task_data)
-        return None
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hget(f"{self.queue_name}:tasks", task_id)
+            pipe.zscore(self._processing_key, task_id)
+            task_data, claimed_at = await pipe.execute()
+        
+        if not task_data:
+            return None
+        
+        task = Task.unpack(task_data)
+        if claimed_at is not None and task.status in (TaskStatus.PENDING, TaskStatus.RETRYING):
+            task.status = TaskStatus.PROCESSING
+            task.started_at = datetime.fromtimestamp(claimed_at)
+        return task
+    
+    async def wait_for_tasks(
+        self,
+        task_ids: List[str],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Optional[Task]]:
+        """Wait until the given tasks reach a terminal state.
+        
+        Subscribes to the queue's completion events instead of polling, so
+        callers resume as soon as the last task finishes.
+        
+        Args:
+            task_ids: IDs of the tasks to wait for
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+            
+        Returns:
+            Mapping of task ID to its latest Task (None if unknown); tasks that
+            did not finish in time keep their non-terminal status
+        """
+        if not self._redis:
+            raise RuntimeError("Task queue not initialized")
+        
+        pending = set(task_ids)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        pubsub = self._redis.pubsub()
+        try:
+            # Subscribe before checking current state so no completion is missed
+            await pubsub.subscribe(self._events_channel)
+            
+            tasks = await self._get_tasks(list(pending))
+            pending -= {task_id for task_id, task in tasks.items() if not task or task.status in TERMINAL_STATUSES}
+            
+            while pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=self.block_timeout_seconds if remaining is None else min(remaining, self.block_timeout_seconds)
+                )
+                if not message:
+                    continue
+                
+                event = json.loads(message['data'])
+                if event.get('task_id') in pending and TaskStatus(event['status']) in TERMINAL_STATUSES:
+                    pending.discard(event['task_id'])
+        finally:
+            await pubsub.unsubscribe(self._events_channel)
+            await pubsub.close()
+        
+        return await self._get_tasks(task_ids)
+    
+    async def _get_tasks(self, task_ids: List[str]) -> Dict[str, Optional[Task]]:
+        """Load several tasks in one round-trip."""
+        if not task_ids:
+            return {}
+        
+        task_data = await self._redis.hmget(f"{self.queue_name}:tasks", task_ids)
+        return {
+            task_id: Task.unpack(data) if data else None
+            for task_id, data in zip(task_ids, task_data)
+        }
+    
+    async def get_task_result(self, task_id: str) -> Optional[Any]:
+        """Get the stored result of a completed task, if still retained."""
+        if not self._redis:
+            return None
+        
+        data = await self._redis.hget(f"{self.queue_name}:results", task_id)
+        return _unpack_value(data) if data else None
     
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel a pending task."""
@@ -175,19 +414,13 @@ class TaskQueue:
         if not task or task.status != TaskStatus.PENDING:
             return False
         
-        # Update task status
+        # Update task status and remove it from the queues
         task.status = TaskStatus.CANCELLED
-        await self._redis.hset(
-            f"{self.queue_name}:tasks",
-            task_id,
-            task.json()
-        )
-        
-        # Remove from queues
-        for priority in TaskPriority:
-            await self._redis.lrem(f"{self.queue_name}:priority:{priority.value}", 0, task_id)
-        
-        await self._redis.zrem(f"{self.queue_name}:scheduled", task_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._ready_key, task_id)
+            pipe.zrem(f"{self.queue_name}:scheduled", task_id)
+            self._finish_task(pipe, task)
+            await pipe.execute()
         
         logger.info(f"Cancelled task {task_id}")
         return True
@@ -197,8 +430,9 @@ class TaskQueue:
         self._worker_count = worker_count
         self._running = True
         
-        # Start scheduled task processor
+        # Start scheduled task processor and retention compactor
         self._workers.append(asyncio.create_task(self._scheduled_task_processor()))
+        self._workers.append(asyncio.create_task(self._compactor_loop()))
         
         # Start worker tasks
         for i in range(worker_count):
@@ -208,7 +442,11 @@ class TaskQueue:
         logger.info(f"Started {worker_count} workers")
     
     async def get_queue_stats(self) -> Dict[str, Any]:
-        """Get queue statistics."""
+        """Get queue statistics.
+        
+        Every lookup is O(1) (or O(log n) for priority bands); lifetime totals
+        come from the aggregate counters rather than scanning stored tasks.
+        """
         if not self._redis:
             return {}
         
@@ -218,19 +456,30 @@ class TaskQueue:
             "queues": {}
         }
         
-        # Count tasks in each priority queue
-        for priority in TaskPriority:
-            queue_key = f"{self.queue_name}:priority:{priority.value}"
-            count = await self._redis.llen(queue_key)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            # Count tasks in each priority band of the ready set
+            for priority in TaskPriority:
+                pipe.zcount(
+                    self._ready_key,
+                    priority.value * _PRIORITY_SCORE_SPAN,
+                    f"({(priority.value + 1) * _PRIORITY_SCORE_SPAN}"
+                )
+            pipe.zcard(f"{self.queue_name}:scheduled")
+            pipe.zcard(self._processing_key)
+            pipe.hlen(f"{self.queue_name}:tasks")
+            pipe.zcard(self._finished_key)
+            pipe.hgetall(self._counters_key)
+            counts = await pipe.execute()
+        
+        for priority, count in zip(TaskPriority, counts):
             stats["queues"][priority.name.lower()] = count
         
-        # Count scheduled tasks
-        scheduled_count = await self._redis.zcard(f"{self.queue_name}:scheduled")
-        stats["scheduled"] = scheduled_count
-        
-        # Count total tasks
-        total_tasks = await self._redis.hlen(f"{self.queue_name}:tasks")
-        stats["total_tasks"] = total_tasks
+        (stats["scheduled"], stats["processing"], stats["total_tasks"],
+         stats["retained_finished"], counters) = counts[len(TaskPriority):]
+        stats["counters"] = {
+            (key.decode() if isinstance(key, bytes) else key): int(value)
+            for key, value in counters.items()
+        }
         
         return stats
     
@@ -240,12 +489,12 @@ class TaskQueue:
         
         while self._running:
             try:
-                task_id = await self._get_next_task()
-                if task_id:
-                    await self._process_task(task_id, worker_name)
+                task = await self._claim_next_task()
+                if task:
+                    await self._process_task(task, worker_name)
                 else:
-                    # No tasks available, wait a bit
-                    await asyncio.sleep(1)
+                    # No tasks available, block until one is enqueued
+                    await self._redis.blpop(self._wakeup_key, timeout=self.block_timeout_seconds)
                     
             except asyncio.CancelledError:
                 break
@@ -255,45 +504,45 @@ class TaskQueue:
         
         logger.info(f"Worker {worker_name} stopped")
     
-    async def _get_next_task(self) -> Optional[str]:
-        """Get the next task from priority queues."""
+    async def _claim_next_task(self) -> Optional[Task]:
+        """Atomically claim the highest-priority ready task."""
         if not self._redis:
             return None
         
-        # Check queues in priority order (highest first)
-        for priority in sorted(TaskPriority, key=lambda x: x.value, reverse=True):
-            queue_key = f"{self.queue_name}:priority:{priority.value}"
-            task_id = await self._redis.rpop(queue_key)
-            if task_id:
-                return task_id.decode() if isinstance(task_id, bytes) else task_id
-        
-        return None
+        while True:
+            claimed = await self._claim_script(
+                keys=[self._ready_key, self._processing_key, f"{self.queue_name}:tasks"],
+                args=[datetime.now().timestamp()]
+            )
+            if not claimed:
+                return None
+            
+            task_id, task_data = claimed[0], claimed[1] if len(claimed) > 1 else None
+            if isinstance(task_id, bytes):
+                task_id = task_id.decode()
+            
+            if not task_data:
+                logger.warning(f"Task {task_id} not found")
+                await self._redis.zrem(self._processing_key, task_id)
+                continue
+            
+            task = Task.unpack(task_data)
+            
+            # Check if task is cancelled
+            if task.status == TaskStatus.CANCELLED:
+                await self._redis.zrem(self._processing_key, task_id)
+                continue
+            
+            task.status = TaskStatus.PROCESSING
+            task.started_at = datetime.now()
+            return task
     
-    async def _process_task(self, task_id: str, worker_name: str) -> None:
-        """Process a single task."""
+    async def _process_task(self, task: Task, worker_name: str) -> None:
+        """Process a single claimed task."""
         if not self._redis:
             return
         
-        # Get task details
-        task = await self.get_task_status(task_id)
-        if not task:
-            logger.warning(f"Task {task_id} not found")
-            return
-        
-        # Check if task is cancelled
-        if task.status == TaskStatus.CANCELLED:
-            return
-        
-        # Update task status to processing
-        task.status = TaskStatus.PROCESSING
-        task.started_at = datetime.now()
-        await self._redis.hset(
-            f"{self.queue_name}:tasks",
-            task_id,
-            task.json()
-        )
-        
-        logger.info(f"Worker {worker_name} processing task {task_id} ({task.name})")
+        logger.info(f"Worker {worker_name} processing task {task.id} ({task.name})")
         
         try:
             # Get handler
@@ -309,24 +558,17 @@ class TaskQueue:
             )
             execution_time = (datetime.now() - start_time).total_seconds()
             
-            # Update task as completed
+            # Mark completed, store the result and release the claim together
             task.status = TaskStatus.COMPLETED
             task.completed_at = datetime.now()
-            await self._redis.hset(
-                f"{self.queue_name}:tasks",
-                task_id,
-                task.json()
-            )
-            
-            # Store result
-            if result is not None:
-                await self._redis.hset(
-                    f"{self.queue_name}:results",
-                    task_id,
-                    json.dumps(result, default=str)
-                )
+            async with self._redis.pipeline(transaction=True) as pipe:
+                if result is not None:
+                    pipe.hset(f"{self.queue_name}:results", task.id, _pack_value(result))
+                pipe.zrem(self._processing_key, task.id)
+                self._finish_task(pipe, task)
+                await pipe.execute()
             
-            logger.info(f"Task {task_id} completed in {execution_time:.2f}s")
+            logger.info(f"Task {task.id} completed in {execution_time:.2f}s")
             
         except asyncio.TimeoutError:
             await self._handle_task_failure(task, "Task timeout")
@@ -350,16 +592,13 @@ class TaskQueue:
             scheduled_at = datetime.now() + timedelta(seconds=delay_seconds)
             task.scheduled_at = scheduled_at
             
-            # Update task
-            await self._redis.hset(
-                f"{self.queue_name}:tasks",
-                task.id,
-                task.json()
-            )
-            
-            # Schedule retry
-            score = scheduled_at.timestamp()
-            await self._redis.zadd(f"{self.queue_name}:scheduled", {task.id: score})
+            # Update task, schedule the retry and release the claim together
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hset(f"{self.queue_name}:tasks", task.id, task.pack())
+                pipe.zadd(f"{self.queue_name}:scheduled", {task.id: scheduled_at.timestamp()})
+                pipe.zrem(self._processing_key, task.id)
+                pipe.hincrby(self._counters_key, "retried", 1)
+                await pipe.execute()
             
             logger.warning(f"Task {task.id} failed, retrying in {delay_seconds}s (attempt {task.retry_count}/{task.max_retries})")
         else:
@@ -367,16 +606,15 @@ class TaskQueue:
             task.status = TaskStatus.FAILED
             task.completed_at = datetime.now()
             
-            await self._redis.hset(
-                f"{self.queue_name}:tasks",
-                task.id,
-                task.json()
-            )
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.zrem(self._processing_key, task.id)
+                self._finish_task(pipe, task)
+                await pipe.execute()
             
             logger.error(f"Task {task.id} failed permanently after {task.retry_count} attempts: {error}")
     
     async def _scheduled_task_processor(self) -> None:
-        """Process scheduled tasks."""
+        """Promote due scheduled tasks and recover tasks from crashed workers."""
         logger.info("Scheduled task processor started")
         
         while self._running:
@@ -385,39 +623,8 @@ class TaskQueue:
                     await asyncio.sleep(10)
                     continue
                 
-                now = datetime.now().timestamp()
-                
-                # Get tasks that are ready to run
-                ready_tasks = await self._redis.zrangebyscore(
-                    f"{self.queue_name}:scheduled",
-                    0, now, withscores=False
-                )
-                
-                for task_id in ready_tasks:
-                    if isinstance(task_id, bytes):
-                        task_id = task_id.decode()
-                    
-                    # Get task details
-                    task = await self.get_task_status(task_id)
-                    if not task:
-                        continue
-                    
-                    # Remove from scheduled queue
-                    await self._redis.zrem(f"{self.queue_name}:scheduled", task_id)
-                    
-                    # Add to appropriate priority queue
-                    task.status = TaskStatus.PENDING
-                    task.scheduled_at = None
-                    await self._redis.hset(
-                        f"{self.queue_name}:tasks",
-                        task_id,
-                        task.json()
-                    )
-                    
-                    queue_key = f"{self.queue_name}:priority:{task.priority.value}"
-                    await self._redis.lpush(queue_key, task_id)
-                    
-                    logger.info(f"Scheduled task {task_id} is now ready for processing")
+                await self._promote_scheduled_tasks()
+                await self._recover_abandoned_tasks()
                 
                 await asyncio.sleep(10)  # Check every 10 seconds
                 
@@ -428,6 +635,118 @@ class TaskQueue:
                 await asyncio.sleep(30)
         
         logger.info("Scheduled task processor stopped")
+    
+    async def _promote_scheduled_tasks(self) -> None:
+        """Move scheduled tasks that are due onto the ready set."""
+        now = datetime.now().timestamp()
+        
+        # Get tasks that are ready to run
+        ready_ids = await self._redis.zrangebyscore(
+            f"{self.queue_name}:scheduled",
+            0, now, withscores=False
+        )
+        if not ready_ids:
+            return
+        
+        ready_ids = [task_id.decode() if isinstance(task_id, bytes) else task_id for task_id in ready_ids]
+        task_data = await self._redis.hmget(f"{self.queue_name}:tasks", ready_ids)
+        
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for task_id, data in zip(ready_ids, task_data):
+                pipe.zrem(f"{self.queue_name}:scheduled", task_id)
+                if not data:
+                    continue
+                
+                task = Task.unpack(data)
+                task.status = TaskStatus.PENDING
+                task.scheduled_at = None
+                pipe.hset(f"{self.queue_name}:tasks", task_id, task.pack())
+                self._queue_ready(pipe, task)
+            
+            await pipe.execute()
+        
+        logger.info(f"Promoted {len(ready_ids)} scheduled tasks to the ready queue")
+    
+    async def _recover_abandoned_tasks(self) -> None:
+        """Requeue claimed tasks whose worker died before finishing them."""
+        cutoff = datetime.now().timestamp() - self.recovery_grace_seconds
+        claimed = await self._redis.zrangebyscore(self._processing_key, 0, cutoff, withscores=True)
+        if not claimed:
+            return
+        
+        task_ids = [task_id.decode() if isinstance(task_id, bytes) else task_id for task_id, _ in claimed]
+        task_data = await self._redis.hmget(f"{self.queue_name}:tasks", task_ids)
+        
+        for (task_id, (_, claimed_at)), data in zip(zip(task_ids, claimed), task_data):
+            task = Task.unpack(data) if data else None
+            if task and claimed_at + task.timeout_seconds > cutoff:
+                continue  # Still within its execution budget
+            
+            # Only the processor that removes the claim requeues the task
+            if not await self._redis.zrem(self._processing_key, task_id) or not task:
+                continue
+            
+            async with self._redis.pipeline(transaction=True) as pipe:
+                self._queue_ready(pipe, task)
+                await pipe.execute()
+            
+            logger.warning(f"Recovered abandoned task {task_id} ({task.name})")
+    
+    async def _compactor_loop(self) -> None:
+        """Periodically drop finished tasks that are past their retention."""
+        logger.info("Task compactor started")
+        
+        while self._running:
+            try:
+                if self._redis:
+                    await self.compact()
+                
+                await asyncio.sleep(self.compaction_interval_seconds)
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Task compactor error: {e}")
+                await asyncio.sleep(self.compaction_interval_seconds)
+        
+        logger.info("Task compactor stopped")
+    
+    async def compact(self) -> int:
+        """Delete finished tasks and results older than the retention period.
+        
+        Works in bounded batches so a large backlog never blocks Redis.
+        
+        Returns:
+            Number of tasks removed
+        """
+        if not self._redis:
+            return 0
+        
+        cutoff = datetime.now().timestamp() - self.retention_seconds
+        removed = 0
+        
+        while True:
+            expired = await self._redis.zrangebyscore(
+                self._finished_key, 0, cutoff,
+                start=0, num=self.compaction_batch_size
+            )
+            if not expired:
+                break
+            
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hdel(f"{self.queue_name}:tasks", *expired)
+                pipe.hdel(f"{self.queue_name}:results", *expired)
+                pipe.zrem(self._finished_key, *expired)
+                pipe.hincrby(self._counters_key, "compacted", len(expired))
+                await pipe.execute()
+            
+            removed += len(expired)
+            if len(expired) < self.compaction_batch_size:
+                break
+        
+        if removed:
+            logger.info(f"Compacted {removed} finished tasks past retention")
+        return removed
 
 
 # Global task queue instance
@@ -3,12 +3,16 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import asdict
+from typing import AsyncIterator, Dict, List, Optional, Any
+from dataclasses import asdict, dataclass
+
+import redis.asyncio as redis
 
 # Use absolute imports to avoid relative import issues
 from plugin_manager import PluginManager
 from processing.task_queue import TaskQueue, TaskPriority
+from processing.pipeline import StreamingPipeline, PipelineStage
+from processing.signal_sink import MarketSignalBulkSink
 from processing.data_cleaning import DataNormalizer, clean_data_task, batch_clean_data_task
 from processing.duplicate_detection import DeduplicationService, detect_duplicates_task, batch_deduplicate_task
 from processing.quality_scoring import QualityScorer, quality_scoring_task, batch_quality_scoring_task
@@ -21,11 +25,19 @@ from plugins.ycombinator_plugin import YCombinatorPlugin, YCombinatorConfig
 from shared.database import get_db_session
 from shared.models.market_signal import MarketSignal, SignalType
 from shared.vector_db import VectorDBService
+from shared.services.ai_service import ai_service
 
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _StreamItem:
+    """State carried by a single item through the streaming pipeline."""
+    raw_data: RawData
+    quality_metrics: Any = None
+
+
 class DataIngestionService:
     """Main service for orchestrating data ingestion pipeline."""
     
@@ -33,16 +45,30 @@ class DataIngestionService:
         self.config = config or {}
         self.plugin_manager = PluginManager()
         self.task_queue = TaskQueue()
+        self.task_queue.retention_seconds = self.config.get('task_retention_hours', 24) * 3600
         self.data_normalizer = DataNormalizer()
-        self.dedup_service = DeduplicationService()
+        self.dedup_service = self._create_dedup_service(self.config.get('deduplication', {}))
         self.quality_scorer = QualityScorer()
         self.vector_db = VectorDBService()
+        self.ai_service = ai_service
         
         # Processing configuration
         self.batch_size = self.config.get('batch_size', 100)
         self.max_concurrent_tasks = self.config.get('max_concurrent_tasks', 10)
         self.quality_threshold = self.config.get('quality_threshold', 4.5)
         
+        # Streaming pipeline configuration
+        pipeline_config = self.config.get('pipeline', {})
+        self.streaming_enabled = self.config.get('streaming', False)
+        self.stage_queue_size = pipeline_config.get('queue_size', self.batch_size)
+        self.stage_concurrency = {
+            'normalize': 2,
+            'deduplicate': 1,
+            'quality': 2,
+            'store': 1,
+            **pipeline_config.get('concurrency', {})
+        }
+        
         # Statistics tracking
         self.stats = {
             'total_processed': 0,
@@ -53,6 +79,16 @@ class DataIngestionService:
             'last_run': None
         }
     
+    def _create_dedup_service(self, dedup_config: Dict[str, Any]) -> DeduplicationService:
+        """Create the deduplication service, shared through Redis if configured."""
+        redis_url = dedup_config.get('redis_url')
+        return DeduplicationService(
+            redis_client=redis.from_url(redis_url) if redis_url else None,
+            cache_ttl_hours=dedup_config.get('ttl_hours', 24),
+            max_entries=dedup_config.get('max_entries', 100000),
+            semantic_model_path=dedup_config.get('semantic_model_path')
+        )
+    
     async def initialize(self) -> None:
         """Initialize all components of the data ingestion service."""
         logger.info("Initializing Data Ingestion Service")
@@ -96,6 +132,7 @@ class DataIngestionService:
         try:
             await self.plugin_manager.shutdown()
             await self.task_queue.shutdown()
+            self.dedup_service.save_state()
             await self.vector_db.shutdown()
             
             logger.info("Data Ingestion Service shut down successfully")
@@ -127,17 +164,18 @@ class DataIngestionService:
                 )
                 tasks.append((plugin_name, task_id))
             
-            # Wait for all ingestion tasks to complete
+            # Wait for all ingestion tasks to complete via completion events
+            finished = await self.task_queue.wait_for_tasks(
+                [task_id for _, task_id in tasks],
+                timeout=self.config.get('ingestion_timeout')
+            )
+            
             for plugin_name, task_id in tasks:
-                # Poll for task completion (in a real system, you'd use callbacks)
-                while True:
-                    task = await self.task_queue.get_task_status(task_id)
-                    if task and task.status.value in ['completed', 'failed']:
-                        break
-                    await asyncio.sleep(1)
-                
+                task = finished.get(task_id)
                 if task and task.status.value == 'completed':
                     results[plugin_name] = {'status': 'success', 'task_id': task_id}
+                elif task and task.status.value not in ['failed', 'cancelled']:
+                    results[plugin_name] = {'status': 'timeout', 'task_id': task_id}
                 else:
                     results[plugin_name] = {'status': 'failed', 'task_id': task_id, 'error': task.error if task else 'Unknown error'}
             
@@ -164,15 +202,35 @@ class DataIngestionService:
                 'results': results
             }
     
-    async def ingest_from_plugin(self, plugin_name: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Ingest data from a specific plugin."""
+    async def ingest_from_plugin(
+        self,
+        plugin_name: str,
+        params: Optional[Dict[str, Any]] = None,
+        streaming: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Ingest data from a specific plugin.
+        
+        When ``streaming`` is enabled (per call or via the ``streaming``
+        config key) items are fed straight from the plugin iterator into
+        the bounded-queue pipeline instead of being collected first.
+        """
         logger.info(f"Starting ingestion from plugin: {plugin_name}")
         
+        if streaming is None:
+            streaming = self.streaming_enabled
+        
         try:
             plugin = self.plugin_manager.get_plugin(plugin_name)
             if not plugin:
                 raise ValueError(f"Plugin {plugin_name} not found or not loaded")
             
+            if streaming:
+                result = await self._process_raw_data_stream(
+                    self.plugin_manager.stream_data_from_plugin(plugin_name, params or {})
+                )
+                logger.info(f"Streamed {result['processed_count']} items from {plugin_name}, accepted {result['accepted_count']}")
+                return result
+            
             # Fetch raw data from plugin
             raw_data_list = await self.plugin_manager.fetch_data_from_plugin(plugin_name, params or {})
             
@@ -194,20 +252,10 @@ class DataIngestionService:
     async def process_raw_data(self, raw_data: RawData) -> Dict[str, Any]:
         """Process a single raw data item through the full pipeline."""
         try:
-            # Step 1: Data cleaning and normalization
-            normalized_data = self.data_normalizer.normalize_raw_data(raw_data)
-            if not normalized_data:
-                return {'success': False, 'reason': 'Failed normalization'}
-            
-            # Step 2: Duplicate detection
-            is_duplicate, duplicates = await self.dedup_service.process_raw_data(normalized_data)
-            if is_duplicate:
-                return {'success': False, 'reason': 'Duplicate detected', 'duplicates': len(duplicates)}
-            
-            # Step 3: Quality scoring
-            quality_metrics = self.quality_scorer.calculate_quality_score(normalized_data)
-            if quality_metrics.overall_score < self.quality_threshold:
-                return {'success': False, 'reason': 'Low quality score', 'score': quality_metrics.overall_score}
+            # Steps 1-3: normalization, duplicate detection and quality scoring
+            normalized_data, quality_metrics, rejection = await self._screen_raw_data(raw_data)
+            if rejection:
+                return rejection
             
             # Step 4: Store in database
             market_signal = await self._create_market_signal(normalized_data, quality_metrics)
@@ -226,24 +274,68 @@ class DataIngestionService:
             logger.error(f"Error processing raw data: {e}")
             return {'success': False, 'error': str(e)}
     
+    async def _screen_raw_data(self, raw_data: RawData):
+        """Run normalization, duplicate detection and quality scoring.
+        
+        Returns:
+            Tuple of (normalized_data, quality_metrics, rejection); rejection is
+            None when the item should be stored, otherwise a result dict.
+        """
+        # Step 1: Data cleaning and normalization
+        normalized_data = self.data_normalizer.normalize_raw_data(raw_data)
+        if not normalized_data:
+            return None, None, {'success': False, 'reason': 'Failed normalization'}
+        
+        # Step 2: Duplicate detection
+        is_duplicate, duplicates = await self.dedup_service.process_raw_data(normalized_data)
+        if is_duplicate:
+            return None, None, {'success': False, 'reason': 'Duplicate detected', 'duplicates': len(duplicates)}
+        
+        # Step 3: Quality scoring
+        quality_metrics = self.quality_scorer.calculate_quality_score(normalized_data)
+        if quality_metrics.overall_score < self.quality_threshold:
+            return None, None, {'success': False, 'reason': 'Low quality score', 'score': quality_metrics.overall_score}
+        
+        return normalized_data, quality_metrics, None
+    
+    def _create_bulk_sink(self) -> MarketSignalBulkSink:
+        """Create a bulk sink that writes accepted signals in batches."""
+        return MarketSignalBulkSink(
+            vector_db=self.vector_db,
+            ai_service=self.ai_service,
+            batch_size=self.batch_size
+        )
+    
+    async def _sink_market_signal(self, sink: MarketSignalBulkSink, raw_data: RawData, quality_metrics) -> None:
+        """Build a market signal and hand it to the bulk sink."""
+        market_signal = self._build_market_signal(raw_data, quality_metrics)
+        content, metadata = self._vector_payload(market_signal, raw_data)
+        await sink.add(market_signal, content, metadata)
+    
     async def _process_raw_data_batch(self, raw_data_list: List[RawData]) -> Dict[str, Any]:
-        """Process a batch of raw data items."""
+        """Process a batch of raw data items.
+        
+        Items are screened concurrently; accepted ones are written through a
+        bulk sink, so each batch costs one transaction and one embedding and
+        vector upsert call instead of one of each per item.
+        """
         logger.info(f"Processing batch of {len(raw_data_list)} items")
         
         processed_count = 0
-        accepted_count = 0
         rejected_count = 0
         duplicate_count = 0
         error_count = 0
         
+        sink = self._create_bulk_sink()
+        
         # Process in smaller batches to avoid overwhelming the system
         for i in range(0, len(raw_data_list), self.batch_size):
             batch = raw_data_list[i:i + self.batch_size]
             
-            # Process each item in the batch
+            # Screen each item in the batch
             tasks = []
             for raw_data in batch:
-                task = asyncio.create_task(self.process_raw_data(raw_data))
+                task = asyncio.create_task(self._screen_raw_data(raw_data))
                 tasks.append(task)
             
             # Wait for batch to complete
@@ -256,13 +348,22 @@ class DataIngestionService:
                 if isinstance(result, Exception):
                     error_count += 1
                     logger.error(f"Processing error: {result}")
-                elif result.get('success'):
-                    accepted_count += 1
-                else:
+                    continue
+                
+                normalized_data, quality_metrics, rejection = result
+                if rejection:
                     rejected_count += 1
-                    reason = result.get('reason', 'Unknown')
+                    reason = rejection.get('reason', 'Unknown')
                     if 'duplicate' in reason.lower():
                         duplicate_count += 1
+                else:
+                    await self._sink_market_signal(sink, normalized_data, quality_metrics)
+            
+            await sink.flush()
+        
+        sink_stats = await sink.close()
+        accepted_count = sink_stats.written
+        error_count += sink_stats.failed
         
         # Update statistics
         self.stats['total_processed'] += processed_count
@@ -280,51 +381,128 @@ class DataIngestionService:
             'error_count': error_count
         }
     
+    async def _process_raw_data_stream(self, source: AsyncIterator[RawData]) -> Dict[str, Any]:
+        """Process raw data items through the bounded-queue streaming pipeline."""
+        
+        async def wrap_source() -> AsyncIterator[_StreamItem]:
+            async for raw_data in source:
+                yield _StreamItem(raw_data=raw_data)
+        
+        sink = self._create_bulk_sink()
+        
+        async def store_stage(item: _StreamItem) -> _StreamItem:
+            await self._sink_market_signal(sink, item.raw_data, item.quality_metrics)
+            return item
+        
+        stages = [
+            PipelineStage('normalize', self._normalize_stage),
+            PipelineStage('deduplicate', self._deduplicate_stage),
+            PipelineStage('quality', self._quality_stage),
+            PipelineStage('store', store_stage),
+        ]
+        for stage in stages:
+            stage.concurrency = self.stage_concurrency.get(stage.name, 1)
+            stage.queue_size = self.stage_queue_size
+        
+        try:
+            run_stats = await StreamingPipeline(stages).run(wrap_source())
+        finally:
+            sink_stats = await sink.close()
+        stage_stats = run_stats.stages
+        
+        processed_count = run_stats.items_in
+        accepted_count = sink_stats.written
+        duplicate_count = stage_stats['deduplicate'].dropped
+        rejected_count = sum(stage_stats[name].dropped for name in ('normalize', 'deduplicate', 'quality'))
+        error_count = sum(stats.errors for stats in stage_stats.values()) + sink_stats.failed
+        
+        # Update statistics
+        self.stats['total_processed'] += processed_count
+        self.stats['total_accepted'] += accepted_count
+        self.stats['total_rejected'] += rejected_count
+        self.stats['total_duplicates'] += duplicate_count
+        self.stats['processing_errors'] += error_count
+        
+        return {
+            'success': True,
+            'processed_count': processed_count,
+            'accepted_count': accepted_count,
+            'rejected_count': rejected_count,
+            'duplicate_count': duplicate_count,
+            'error_count': error_count,
+            'time_to_first_signal': run_stats.time_to_first_output,
+            'stage_stats': {name: asdict(stats) for name, stats in stage_stats.items()},
+            'sink_stats': asdict(sink_stats)
+        }
+    
+    async def _normalize_stage(self, item: _StreamItem) -> Optional[_StreamItem]:
+        """Pipeline stage: data cleaning and normalization."""
+        normalized_data = self.data_normalizer.normalize_raw_data(item.raw_data)
+        if not normalized_data:
+            return None
+        item.raw_data = normalized_data
+        return item
+    
+    async def _deduplicate_stage(self, item: _StreamItem) -> Optional[_StreamItem]:
+        """Pipeline stage: duplicate detection."""
+        is_duplicate, _ = await self.dedup_service.process_raw_data(item.raw_data)
+        return None if is_duplicate else item
+    
+    async def _quality_stage(self, item: _StreamItem) -> Optional[_StreamItem]:
+        """Pipeline stage: quality scoring."""
+        item.quality_metrics = self.quality_scorer.calculate_quality_score(item.raw_data)
+        if item.quality_metrics.overall_score < self.quality_threshold:
+            return None
+        return item
+    
+    def _build_market_signal(self, raw_data: RawData, quality_metrics) -> MarketSignal:
+        """Build an unsaved MarketSignal from normalized raw data."""
+        # Map signal type
+        signal_type_mapping = {
+            'pain_point': SignalType.PAIN_POINT,
+            'feature_request': SignalType.FEATURE_REQUEST,
+            'complaint': SignalType.COMPLAINT,
+            'opportunity': SignalType.OPPORTUNITY,
+            'trend': SignalType.TREND,
+            'discussion': SignalType.DISCUSSION
+        }
+        
+        signal_type = signal_type_mapping.get(
+            raw_data.metadata.get('signal_type', 'discussion'),
+            SignalType.DISCUSSION
+        )
+        
+        return MarketSignal(
+            source=raw_data.source,
+            source_id=raw_data.source_id,
+            source_url=raw_data.source_url,
+            signal_type=signal_type,
+            title=raw_data.title,
+            content=raw_data.content,
+            raw_content=raw_data.raw_content,
+            author=raw_data.author,
+            author_reputation=raw_data.author_reputation,
+            upvotes=raw_data.upvotes,
+            downvotes=raw_data.downvotes,
+            comments_count=raw_data.comments_count,
+            shares_count=raw_data.shares_count,
+            views_count=raw_data.views_count,
+            sentiment_score=0.0,  # Will be calculated by AI agents later
+            confidence_level=quality_metrics.confidence_level,
+            pain_point_intensity=None,  # Will be calculated by AI agents later
+            market_validation_signals=raw_data.metadata.get('validation_signals'),
+            extracted_at=raw_data.extracted_at,
+            processed_at=datetime.now(),
+            processing_version="1.0",
+            keywords=raw_data.metadata.get('keywords'),
+            categories=None,  # Will be categorized by AI agents later
+            ai_relevance_score=quality_metrics.relevance_score
+        )
+    
     async def _create_market_signal(self, raw_data: RawData, quality_metrics) -> MarketSignal:
         """Create and store a MarketSignal in the database."""
         async with get_db_session() as session:
-            # Map signal type
-            signal_type_mapping = {
-                'pain_point': SignalType.PAIN_POINT,
-                'feature_request': SignalType.FEATURE_REQUEST,
-                'complaint': SignalType.COMPLAINT,
-                'opportunity': SignalType.OPPORTUNITY,
-                'trend': SignalType.TREND,
-                'discussion': SignalType.DISCUSSION
-            }
-            
-            signal_type = signal_type_mapping.get(
-                raw_data.metadata.get('signal_type', 'discussion'),
-                SignalType.DISCUSSION
-            )
-            
-            # Create MarketSignal
-            market_signal = MarketSignal(
-                source=raw_data.source,
-                source_id=raw_data.source_id,
-                source_url=raw_data.source_url,
-                signal_type=signal_type,
-                title=raw_data.title,
-                content=raw_data.content,
-                raw_content=raw_data.raw_content,
-                author=raw_data.author,
-                author_reputation=raw_data.author_reputation,
-                upvotes=raw_data.upvotes,
-                downvotes=raw_data.downvotes,
-                comments_count=raw_data.comments_count,
-                shares_count=raw_data.shares_count,
-                views_count=raw_data.views_count,
-                sentiment_score=0.0,  # Will be calculated by AI agents later
-                confidence_level=quality_metrics.confidence_level,
-                pain_point_intensity=None,  # Will be calculated by AI agents later
-                market_validation_signals=raw_data.metadata.get('validation_signals'),
-                extracted_at=raw_data.extracted_at,
-                processed_at=datetime.now(),
-                processing_version="1.0",
-                keywords=raw_data.metadata.get('keywords'),
-                categories=None,  # Will be categorized by AI agents later
-                ai_relevance_score=quality_metrics.relevance_score
-            )
+            market_signal = self._build_market_signal(raw_data, quality_metrics)
             
             session.add(market_signal)
             await session.commit()
@@ -332,22 +510,28 @@ class DataIngestionService:
             
             return market_signal
     
+    def _vector_payload(self, market_signal: MarketSignal, raw_data: RawData):
+        """Build the embedding text and vector metadata for a market signal."""
+        # Create content for embedding
+        content = f"{market_signal.title or ''}\n{market_signal.content}"
+        
+        # Create metadata
+        metadata = {
+            'id': market_signal.id,
+            'source': market_signal.source,
+            'signal_type': market_signal.signal_type.value,
+            'author': market_signal.author,
+            'created_at': market_signal.extracted_at.isoformat(),
+            'quality_score': raw_data.metadata.get('relevance_score', 0),
+            'keywords': raw_data.metadata.get('keywords', [])
+        }
+        
+        return content, metadata
+    
     async def _store_in_vector_db(self, market_signal: MarketSignal, raw_data: RawData) -> None:
         """Store market signal in vector database for similarity search."""
         try:
-            # Create content for embedding
-            content = f"{market_signal.title or ''}\n{market_signal.content}"
-            
-            # Create metadata
-            metadata = {
-                'id': market_signal.id,
-                'source': market_signal.source,
-                'signal_type': market_signal.signal_type.value,
-                'author': market_signal.author,
-                'created_at': market_signal.extracted_at.isoformat(),
-                'quality_score': raw_data.metadata.get('relevance_score', 0),
-                'keywords': raw_data.metadata.get('keywords', [])
-            }
+            content, metadata = self._vector_payload(market_signal, raw_data)
             
             # Store in vector database
             await self.vector_db.upsert(
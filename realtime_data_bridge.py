@@ -3,14 +3,28 @@
 import asyncio
 import json
 import logging
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
 import sys
 import os
 
 # Add data-ingestion to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'data-ingestion'))
 
+try:
+    from plugin_manager import FanOutResult
+except ImportError:
+    # Same shape as plugin_manager.FanOutResult so fan-out works without plugins
+    @dataclass
+    class FanOutResult:
+        data: Dict[str, List[Any]] = field(default_factory=dict)
+        completed: List[str] = field(default_factory=list)
+        late: List[str] = field(default_factory=list)
+        failed: Dict[str, str] = field(default_factory=dict)
+        elapsed_seconds: float = 0.0
+
 try:
     from plugins.reddit_plugin import RedditPlugin, RedditConfig
     from plugins.github_plugin import GitHubPlugin, GitHubConfig
@@ -43,6 +57,11 @@ class RealTimeDataBridge:
         self.update_interval = 3600  # 1 hour
         self.initialized = False
         
+        # Per-source deadline for concurrent fan-out; sources that miss it
+        # are left out of the response and listed as late in the fan-out
+        # report (see ``get_trending_topics_with_report``)
+        self.source_timeout = float(os.getenv('DATA_BRIDGE_SOURCE_TIMEOUT', '15'))
+        
     async def initialize(self) -> bool:
         """Initialize all data source plugins."""
         try:
@@ -126,59 +145,77 @@ class RealTimeDataBridge:
             print(f"❌ Data Bridge initialization failed: {e}")
             return False
     
-    async def get_trending_topics(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get trending topics from all data sources."""
+    async def get_trending_topics(self, limit: int = 10, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Get trending topics from all data sources.
+        
+        Sources are queried concurrently; each one gets ``timeout`` seconds
+        (defaults to ``source_timeout``) and late sources are skipped.
+        """
+        trending_data, _ = await self.get_trending_topics_with_report(limit, timeout)
+        return trending_data
+    
+    async def get_trending_topics_with_report(
+        self,
+        limit: int = 10,
+        timeout: Optional[float] = None
+    ) -> Tuple[List[Dict[str, Any]], FanOutResult]:
+        """Like :meth:`get_trending_topics`, also returning the FanOutResult
+        that lists the completed, late and failed sources."""
         if not self.initialized:
             await self.initialize()
         
-        trending_data = []
-        
-        # Fetch from Hacker News
+        fetchers = {}
         if 'hackernews' in self.plugins:
-            try:
-                hn_trends = await self._fetch_hackernews_trends(limit)
-                trending_data.extend(hn_trends)
-            except Exception as e:
-                print(f"HN trends error: {e}")
-        
-        # Fetch from Reddit
+            fetchers['hackernews'] = lambda: self._fetch_hackernews_trends(limit)
         if 'reddit' in self.plugins:
-            try:
-                reddit_trends = await self._fetch_reddit_trends(limit)
-                trending_data.extend(reddit_trends)
-            except Exception as e:
-                print(f"Reddit trends error: {e}")
-        
-        # Fetch from Y Combinator
+            fetchers['reddit'] = lambda: self._fetch_reddit_trends(limit)
         if 'ycombinator' in self.plugins:
-            try:
-                yc_trends = await self._fetch_yc_trends(limit)
-                trending_data.extend(yc_trends)
-            except Exception as e:
-                print(f"YC trends error: {e}")
+            fetchers['ycombinator'] = lambda: self._fetch_yc_trends(limit)
+        
+        fan_out = await self._fan_out(fetchers, timeout)
+        trending_data = [trend for trends in fan_out.data.values() for trend in trends]
         
         # Sort by relevance/engagement and return top items
         trending_data.sort(key=lambda x: x.get('engagement_score', 0), reverse=True)
-        return trending_data[:limit]
+        return trending_data[:limit], fan_out
     
-    async def get_market_signals(self, keywords: List[str], limit: int = 20) -> List[Dict[str, Any]]:
-        """Get market signals based on keywords."""
+    async def get_market_signals(
+        self,
+        keywords: List[str],
+        limit: int = 20,
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Get market signals based on keywords.
+        
+        All available plugins are queried concurrently under a per-source
+        deadline; see :meth:`get_trending_topics`.
+        """
+        signals, _ = await self.get_market_signals_with_report(keywords, limit, timeout)
+        return signals
+    
+    async def get_market_signals_with_report(
+        self,
+        keywords: List[str],
+        limit: int = 20,
+        timeout: Optional[float] = None
+    ) -> Tuple[List[Dict[str, Any]], FanOutResult]:
+        """Like :meth:`get_market_signals`, also returning the FanOutResult
+        that lists the completed, late and failed sources."""
         if not self.initialized:
             await self.initialize()
         
-        signals = []
+        per_source_limit = limit // max(1, len(self.plugins))
+        fetchers = {
+            source_name: (lambda plugin=plugin: self._fetch_source_signals(plugin, keywords, per_source_limit))
+            for source_name, plugin in self.plugins.items()
+        }
         
-        # Fetch from all available plugins
-        for source_name, plugin in self.plugins.items():
-            try:
-                source_signals = await self._fetch_source_signals(plugin, keywords, limit // len(self.plugins))
-                signals.extend(source_signals)
-            except Exception as e:
-                print(f"Error fetching from {source_name}: {e}")
+        fan_out = await self._fan_out(fetchers, timeout)
+        signals = [signal for source_signals in fan_out.data.values() for signal in source_signals]
         
         # Sort by relevance and return
         signals.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-        return signals[:limit]
+        return signals[:limit], fan_out
     
     async def get_startup_opportunities(self, limit: int = 15) -> List[Dict[str, Any]]:
         """Get startup opportunities from YC, Product Hunt, and other sources."""
@@ -205,6 +242,40 @@ class RealTimeDataBridge:
         
         return opportunities[:limit]
     
+    async def _fan_out(
+        self,
+        fetchers: Dict[str, Callable[[], Awaitable[List[Dict[str, Any]]]]],
+        timeout: Optional[float] = None
+    ) -> FanOutResult:
+        """Run source fetchers concurrently, each bounded by its own deadline.
+        
+        Returns a FanOutResult whose ``data`` holds the results of sources
+        that finished in time, alongside the completed/late/failed split.
+        """
+        deadline = self.source_timeout if timeout is None else timeout
+        start_time = time.monotonic()
+        
+        names = list(fetchers.keys())
+        outcomes = await asyncio.gather(
+            *(asyncio.wait_for(fetchers[name](), timeout=deadline) for name in names),
+            return_exceptions=True
+        )
+        
+        result = FanOutResult()
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                result.late.append(name)
+                print(f"⏱️  {name} missed the {deadline:.1f}s deadline")
+            elif isinstance(outcome, Exception):
+                result.failed[name] = str(outcome)
+                print(f"Error fetching from {name}: {outcome}")
+            else:
+                result.data[name] = outcome
+                result.completed.append(name)
+        
+        result.elapsed_seconds = time.monotonic() - start_time
+        return result
+    
     async def _fetch_hackernews_trends(self, limit: int) -> List[Dict[str, Any]]:
         """Fetch trending topics from Hacker News."""
         plugin = self.plugins['hackernews']
@@ -446,11 +517,24 @@ async def get_trending_market_data(limit: int = 10) -> List[Dict[str, Any]]:
     return await data_bridge.get_trending_topics(limit)
 
 
+async def get_trending_market_data_with_report(limit: int = 10) -> Tuple[List[Dict[str, Any]], FanOutResult]:
+    """Get trending market data plus the report of late and failed sources."""
+    return await data_bridge.get_trending_topics_with_report(limit)
+
+
 async def get_market_signals_by_keywords(keywords: List[str], limit: int = 20) -> List[Dict[str, Any]]:
     """Get market signals based on keywords for AI agents."""
     return await data_bridge.get_market_signals(keywords, limit)
 
 
+async def get_market_signals_by_keywords_with_report(
+    keywords: List[str],
+    limit: int = 20
+) -> Tuple[List[Dict[str, Any]], FanOutResult]:
+    """Get market signals plus the report of late and failed sources."""
+    return await data_bridge.get_market_signals_with_report(keywords, limit)
+
+
 async def get_startup_validation_data(limit: int = 15) -> List[Dict[str, Any]]:
     """Get startup validation data for AI agents."""
     return await data_bridge.get_startup_opportunities(limit)
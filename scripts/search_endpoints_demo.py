@@ -15,6 +15,7 @@ import json
 import sys
 import os
 from datetime import datetime
+from itertools import cycle
 from unittest.mock import AsyncMock, MagicMock, patch
 
 # Add parent directory to path for imports
@@ -113,14 +114,26 @@ def create_sample_opportunities():
     ]
 
 
+def mock_semantic_search_db(opportunities):
+    """Mock session answering a semantic search's id re-check, then its page load."""
+    id_result = MagicMock()
+    id_result.scalars.return_value.all.return_value = [opp.id for opp in opportunities]
+    page_result = MagicMock()
+    page_result.scalars.return_value.all.return_value = opportunities
+    
+    mock_db = AsyncMock()
+    results = cycle([id_result, page_result])
+    mock_db.execute.side_effect = lambda *args, **kwargs: next(results)
+    return mock_db
+
+
 async def demo_semantic_search():
     """Demonstrate semantic search functionality."""
     print("=" * 60)
     print("SEMANTIC SEARCH DEMONSTRATION")
     print("=" * 60)
     
-    # Create mock database and sample data
-    mock_db = AsyncMock()
+    # Create sample data
     sample_opportunities = create_sample_opportunities()
     
     # Mock AI service embedding generation
@@ -137,14 +150,12 @@ async def demo_semantic_search():
          patch.object(opportunity_vector_service, 'find_similar_opportunities', return_value=mock_vector_results), \
          patch('shared.services.opportunity_service.select') as mock_select:
         
-        # Mock database query
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [
+        # Mock database queries
+        mock_db = mock_semantic_search_db([
             sample_opportunities[0],  # opp-1
             sample_opportunities[3],  # opp-4
             sample_opportunities[1]   # opp-2
-        ]
-        mock_db.execute.return_value = mock_result
+        ])
         
         # Test different search queries
         search_queries = [
@@ -166,7 +177,7 @@ async def demo_semantic_search():
             )
             
             # Execute semantic search
-            opportunities, total_count = await opportunity_service.semantic_search_opportunities(
+            opportunities, total_count, _ = await opportunity_service.semantic_search_opportunities(
                 mock_db, search_request, "demo-user"
             )
             
@@ -301,7 +312,6 @@ async def demo_search_with_filters():
     print("SEARCH WITH FILTERS DEMONSTRATION")
     print("=" * 60)
     
-    mock_db = AsyncMock()
     sample_opportunities = create_sample_opportunities()
     
     # Mock vector search and database
@@ -315,9 +325,7 @@ async def demo_search_with_filters():
          patch.object(opportunity_vector_service, 'find_similar_opportunities', return_value=mock_vector_results), \
          patch('shared.services.opportunity_service.select') as mock_select:
         
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = sample_opportunities[:2]
-        mock_db.execute.return_value = mock_result
+        mock_db = mock_semantic_search_db(sample_opportunities[:2])
         
         # Test different filter combinations
         filter_tests = [
@@ -364,7 +372,7 @@ async def demo_search_with_filters():
                     print(f"  • {key}: {value}")
             
             # Execute search
-            opportunities, total_count = await opportunity_service.semantic_search_opportunities(
+            opportunities, total_count, _ = await opportunity_service.semantic_search_opportunities(
                 mock_db, search_request, "demo-user"
             )
             
@@ -1,15 +1,68 @@
 """Redis cache configuration and utilities."""
 
+import hashlib
 import json
 import os
-from typing import Any, Optional, Union, Dict, List
-from datetime import timedelta
+from dataclasses import asdict, is_dataclass
+from enum import Enum
+from typing import Any, Iterable, Optional, Union, Dict, List
+from datetime import date, datetime, timedelta
 import redis.asyncio as redis
 from redis.asyncio import Redis
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Bump when the shape of cached values changes so old entries are ignored
+CACHE_KEY_VERSION = 1
+
+# KEYS: value key, then tag set keys; ARGV: value, expiry seconds (0 = none).
+# A tag set lives as long as its longest-lived member: a non-expiring member
+# makes it persistent, and later expiring members never put a TTL back on it.
+SET_TAGGED_SCRIPT = """
+local expire = tonumber(ARGV[2])
+if expire > 0 then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', expire)
+else
+    redis.call('SET', KEYS[1], ARGV[1])
+end
+for i = 2, #KEYS do
+    local tag_ttl = redis.call('TTL', KEYS[i])
+    redis.call('SADD', KEYS[i], KEYS[1])
+    if expire == 0 then
+        redis.call('PERSIST', KEYS[i])
+    elseif tag_ttl == -2 or (tag_ttl >= 0 and tag_ttl < expire) then
+        redis.call('EXPIRE', KEYS[i], expire)
+    end
+end
+return 1
+"""
+
+
+def _canonical_default(value: Any) -> Any:
+    """JSON fallback for values that appear in cache key payloads."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def canonical_hash(payload: Any) -> str:
+    """Deterministic hash of a JSON-compatible payload.
+    
+    Unlike the built-in ``hash()``, the result is identical in every
+    process, so API workers share cache entries.
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_canonical_default)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
 
 class CacheKeys:
     """Cache key constants and utilities."""
@@ -26,7 +79,8 @@ class CacheKeys:
     # Opportunity-related cache keys
     OPPORTUNITY_DETAILS = "opportunity:details:{opportunity_id}"
     OPPORTUNITY_SEARCH = "opportunity:search:{query_hash}"
-    OPPORTUNITY_RECOMMENDATIONS = "opportunity:recommendations:{user_id}"
+    OPPORTUNITY_RECOMMENDATIONS = "opportunity:recommendations:{user_id}:{query_hash}"
+    OPPORTUNITY_RANKING = "opportunity:ranking:{query_hash}:page_{page}:size_{page_size}"
     
     # Validation-related cache keys
     VALIDATION_RESULTS = "validation:results:{opportunity_id}"
@@ -68,7 +122,43 @@ class CacheKeys:
         except KeyError as e:
             logger.error("Cache key formatting failed", template=template, kwargs=kwargs, error=str(e))
             # Return a safe fallback key
-            return f"cache:error:{hash(str(kwargs))}"
+            return f"cache:error:{canonical_hash(kwargs)}"
+    
+    @classmethod
+    def hashed_key(cls, template: str, payload: Any, **kwargs) -> str:
+        """Format a key template whose ``{query_hash}`` is a canonical hash of ``payload``.
+        
+        The hash is versioned with ``CACHE_KEY_VERSION``.
+        
+        Args:
+            template: Cache key template containing ``{query_hash}``
+            payload: Query parameters identifying the cached result
+            **kwargs: Other values to substitute in template
+            
+        Returns:
+            Formatted cache key
+        """
+        query_hash = f"v{CACHE_KEY_VERSION}:{canonical_hash(payload)}"
+        return cls.format_key(template, query_hash=query_hash, **kwargs)
+
+
+class CacheTags:
+    """Tags used to invalidate groups of cache entries together."""
+    
+    # Any result derived from the set of opportunities (rankings, search, recommendations)
+    OPPORTUNITIES = "opportunities"
+    
+    @staticmethod
+    def opportunity(opportunity_id: str) -> str:
+        return f"opportunity:{opportunity_id}"
+    
+    @staticmethod
+    def user(user_id: str) -> str:
+        return f"user:{user_id}"
+    
+    @staticmethod
+    def key(tag: str) -> str:
+        return f"cache:tag:{tag}"
 
 
 class CacheManager:
@@ -84,6 +174,7 @@ class CacheManager:
         self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self.redis_client: Optional[Redis] = None
         self._connection_pool = None
+        self._set_tagged_script = None
     
     async def initialize(self):
         """Initialize Redis connection pool."""
@@ -102,6 +193,7 @@ class CacheManager:
                 connection_pool=self._connection_pool,
                 decode_responses=True,
             )
+            self._set_tagged_script = None
             
             # Test connection
             await self.redis_client.ping()
@@ -142,9 +234,14 @@ class CacheManager:
         self, 
         key: str, 
         value: Any, 
-        expire: Optional[Union[int, timedelta]] = None
+        expire: Optional[Union[int, timedelta]] = None,
+        tags: Optional[Iterable[str]] = None
     ) -> bool:
-        """Set value in cache with optional expiration."""
+        """Set value in cache with optional expiration.
+        
+        Keys set with ``tags`` are removed by ``invalidate_tags``; each tag
+        set lives at least as long as its longest-lived member.
+        """
         if not self.redis_client:
             await self.initialize()
         
@@ -159,13 +256,106 @@ class CacheManager:
             if isinstance(expire, timedelta):
                 expire = int(expire.total_seconds())
             
-            result = await self.redis_client.set(key, serialized_value, ex=expire)
+            if not tags:
+                result = await self.redis_client.set(key, serialized_value, ex=expire)
+                return bool(result)
+            
+            if self._set_tagged_script is None:
+                self._set_tagged_script = self.redis_client.register_script(SET_TAGGED_SCRIPT)
+            result = await self._set_tagged_script(
+                keys=[key, *(CacheTags.key(tag) for tag in tags)],
+                args=[serialized_value, expire or 0]
+            )
             return bool(result)
             
         except Exception as e:
             logger.error("Cache set failed", key=key, error=str(e))
             return False
     
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round-trip; missing keys yield None."""
+        if not keys:
+            return []
+        if not self.redis_client:
+            await self.initialize()
+        
+        try:
+            values = await self.redis_client.mget(keys)
+        except Exception as e:
+            logger.error("Cache get_many failed", key_count=len(keys), error=str(e))
+            return [None] * len(keys)
+        
+        results = []
+        for value in values:
+            if isinstance(value, bytes):
+                value = value.decode("utf-8")
+            try:
+                results.append(json.loads(value) if value is not None else None)
+            except (json.JSONDecodeError, TypeError):
+                results.append(value)
+        return results
+    
+    async def set_many(
+        self,
+        values: Dict[str, Any],
+        expire: Optional[Union[int, timedelta]] = None
+    ) -> bool:
+        """Set several values with a shared expiration in one round-trip."""
+        if not values:
+            return True
+        if not self.redis_client:
+            await self.initialize()
+        
+        if isinstance(expire, timedelta):
+            expire = int(expire.total_seconds())
+        
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    if isinstance(value, (dict, list, tuple)):
+                        value = json.dumps(value, default=str)
+                    pipe.set(key, value if isinstance(value, str) else str(value), ex=expire)
+                results = await pipe.execute()
+            return all(results)
+            
+        except Exception as e:
+            logger.error("Cache set_many failed", key_count=len(values), error=str(e))
+            return False
+    
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every key set with any of ``tags``; returns the number deleted."""
+        if not tags:
+            return 0
+        if not self.redis_client:
+            await self.initialize()
+        
+        try:
+            tag_keys = [CacheTags.key(tag) for tag in tags]
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+            
+            keys = set().union(*members)
+            if not keys:
+                return 0
+            
+            # Remove only the members read above so keys tagged meanwhile survive
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(*keys)
+                for tag_key, tag_members in zip(tag_keys, members):
+                    if tag_members:
+                        pipe.srem(tag_key, *tag_members)
+                results = await pipe.execute()
+            
+            deleted = results[0]
+            logger.debug("Cache tags invalidated", tags=list(tags), deleted=deleted)
+            return deleted
+            
+        except Exception as e:
+            logger.error("Cache tag invalidation failed", tags=list(tags), error=str(e))
+            return 0
+    
     async def delete(self, key: str) -> bool:
         """Delete key from cache."""
         if not self.redis_client:
@@ -210,6 +210,25 @@ VECTOR_DB_CONFIG_SCHEMA: Dict[str, ConfigMetadata] = {
         default_value="ai-opportunities",
         required=False
     ),
+    "VECTOR_DB_BACKEND": ConfigMetadata(
+        description="Vector database backend: pinecone or local (defaults to local when no Pinecone API key is set)",
+        config_type=ConfigType.STRING,
+        default_value=None,
+        required=False
+    ),
+    "VECTOR_DB_PATH": ConfigMetadata(
+        description="Directory where the local vector backend persists its indexes",
+        config_type=ConfigType.STRING,
+        default_value="./data/vector_index",
+        required=False
+    ),
+    "VECTOR_DB_DTYPE": ConfigMetadata(
+        description="Storage precision of vectors in the local backend",
+        config_type=ConfigType.STRING,
+        default_value="float32",
+        required=False,
+        allowed_values=["float32", "float16"]
+    ),
     "VECTOR_DIMENSION": ConfigMetadata(
         description="Vector embedding dimension size",
         config_type=ConfigType.INTEGER,
@@ -10,15 +10,19 @@ Features:
 - Event replay capabilities
 - Event persistence for audit trails
 - Type-safe event handling
+- Concurrent, per-key ordered handler dispatch
 - Async/await support
 """
 
 import asyncio
+import heapq
 import json
 import logging
+import time
 import uuid
+import zlib
 from datetime import datetime, timezone
-from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -108,6 +112,87 @@ class EventHandler:
         )
 
 
+@dataclass
+class HandlerMetrics:
+    """Dispatch metrics for a single event handler."""
+    
+    processed: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    
+    def to_dict(self, backlog: int) -> Dict[str, Any]:
+        """Convert metrics to dictionary, including the current backlog."""
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "backlog": backlog,
+            "avg_latency_ms": (self.total_latency / self.processed * 1000) if self.processed else 0.0,
+            "max_latency_ms": self.max_latency * 1000
+        }
+
+
+class _HandlerWorkerPool:
+    """
+    Bounded worker pool that runs a single handler.
+    
+    Events are routed to a worker by a hash of their ordering key, so events
+    sharing a key are handled in publish order while different keys run
+    concurrently. Each worker has a bounded queue; when it is full the
+    dispatcher waits, applying backpressure to the subscription loop.
+    """
+    
+    def __init__(self, handler: EventHandler, concurrency: int, queue_size: int):
+        self.handler = handler
+        self.metrics = HandlerMetrics()
+        self._queues: List[asyncio.Queue] = [
+            asyncio.Queue(maxsize=queue_size) for _ in range(max(1, concurrency))
+        ]
+        self._workers = [asyncio.create_task(self._worker(queue)) for queue in self._queues]
+    
+    @property
+    def backlog(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+    
+    async def submit(self, event: Event, key: str) -> None:
+        """Queue an event on the worker that owns its ordering key."""
+        queue = self._queues[zlib.crc32(key.encode('utf-8')) % len(self._queues)]
+        await queue.put(event)
+    
+    async def join(self) -> None:
+        """Wait until every queued event has been handled."""
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+    
+    async def close(self) -> None:
+        """Stop the pool's workers."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+    
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            event = await queue.get()
+            started = time.monotonic()
+            try:
+                await self.handler.handle(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.metrics.errors += 1
+                try:
+                    await self.handler.on_error(event, e)
+                except Exception as error_handler_error:
+                    logger.error(
+                        f"Error handler of {self.handler.handler_id} failed: {error_handler_error}"
+                    )
+            finally:
+                latency = time.monotonic() - started
+                self.metrics.processed += 1
+                self.metrics.total_latency += latency
+                self.metrics.max_latency = max(self.metrics.max_latency, latency)
+                queue.task_done()
+
+
 class EventBus:
     """
     Redis-based event bus for decoupled service communication.
@@ -120,14 +205,21 @@ class EventBus:
         self,
         redis_url: str = "redis://localhost:6379/0",
         event_ttl: int = 86400 * 7,  # 7 days
-        max_retries: int = 3
+        max_retries: int = 3,
+        handler_concurrency: int = 4,
+        handler_queue_size: int = 1000
     ):
         self.redis_url = redis_url
         self.event_ttl = event_ttl
         self.max_retries = max_retries
+        self.handler_concurrency = handler_concurrency
+        self.handler_queue_size = handler_queue_size
         self._redis_client: Optional[redis.Redis] = None
         self._subscribers: Dict[str, List[EventHandler]] = {}
         self._subscription_tasks: List[asyncio.Task] = []
+        self._handler_pools: Dict[EventHandler, _HandlerWorkerPool] = {}
+        self._pubsub = None
+        self._subscribed_channels: set = set()
         self._running = False
         
         self.logger = logging.getLogger(__name__)
@@ -162,6 +254,11 @@ class EventBus:
         if self._subscription_tasks:
             await asyncio.gather(*self._subscription_tasks, return_exceptions=True)
         
+        # Stop handler workers
+        for pool in self._handler_pools.values():
+            await pool.close()
+        self._handler_pools.clear()
+        
         # Close Redis connection
         if self._redis_client:
             await self._redis_client.close()
@@ -192,16 +289,8 @@ class EventBus:
         if not self._redis_client:
             raise RuntimeError("Event bus not initialized")
         
-        event_id = str(uuid.uuid4())
-        event = Event(
-            id=event_id,
-            event_type=str(event_type),
-            payload=payload,
-            timestamp=datetime.now(timezone.utc),
-            source=source,
-            correlation_id=correlation_id,
-            metadata=metadata or {}
-        )
+        event = self._build_event(event_type, payload, source, correlation_id, metadata)
+        event_id = event.id
         
         try:
             # Serialize event
@@ -230,6 +319,83 @@ class EventBus:
             self.logger.error(f"Failed to publish event: {e}")
             raise
     
+    async def publish_many(self, events: List[Dict[str, Any]]) -> List[str]:
+        """
+        Publish a batch of events in a single Redis round-trip.
+        
+        All PUBLISH/SETEX/ZADD commands for the batch are sent in one
+        MULTI/EXEC pipeline, with one EXPIRE per touched timeline.
+        
+        Args:
+            events: Event specs with the keyword arguments of publish_event
+                (event_type, payload, source and optional correlation_id,
+                metadata); Kafka-only keys such as partition_key are ignored
+            
+        Returns:
+            Event IDs in the order the events were given
+        """
+        if not self._redis_client:
+            raise RuntimeError("Event bus not initialized")
+        
+        if not events:
+            return []
+        
+        built = [
+            self._build_event(
+                spec["event_type"],
+                spec["payload"],
+                spec["source"],
+                spec.get("correlation_id"),
+                spec.get("metadata")
+            )
+            for spec in events
+        ]
+        
+        try:
+            timeline_keys = set()
+            async with self._redis_client.pipeline(transaction=True) as pipe:
+                for spec, event in zip(events, built):
+                    event_type = spec["event_type"]
+                    event_data = json.dumps(event.to_dict())
+                    
+                    pipe.publish(f"events:{event_type}", event_data)
+                    pipe.setex(f"event:{event.id}", self.event_ttl, event_data)
+                    
+                    timeline_key = f"timeline:{event_type}"
+                    pipe.zadd(timeline_key, {event.id: event.timestamp.timestamp()})
+                    timeline_keys.add(timeline_key)
+                
+                for timeline_key in timeline_keys:
+                    pipe.expire(timeline_key, self.event_ttl)
+                
+                await pipe.execute()
+            
+            self.logger.debug(f"Published batch of {len(built)} events")
+            return [event.id for event in built]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to publish event batch: {e}")
+            raise
+    
+    @staticmethod
+    def _build_event(
+        event_type: Union[str, EventType],
+        payload: Dict[str, Any],
+        source: str,
+        correlation_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Event:
+        """Create a new event with a fresh ID and timestamp."""
+        return Event(
+            id=str(uuid.uuid4()),
+            event_type=str(event_type),
+            payload=payload,
+            timestamp=datetime.now(timezone.utc),
+            source=source,
+            correlation_id=correlation_id,
+            metadata=metadata or {}
+        )
+    
     async def subscribe_to_events(
         self,
         event_types: List[Union[str, EventType]],
@@ -252,11 +418,25 @@ class EventBus:
                 self._subscribers[event_type_str] = []
             self._subscribers[event_type_str].append(handler)
         
+        if handler not in self._handler_pools:
+            self._handler_pools[handler] = _HandlerWorkerPool(
+                handler, self.handler_concurrency, self.handler_queue_size
+            )
+        
         # Start subscription task if not already running
         if not self._running:
             self._running = True
             task = asyncio.create_task(self._subscription_loop())
             self._subscription_tasks.append(task)
+        elif self._pubsub is not None:
+            # Loop already listening: subscribe to any new channels now
+            new_channels = [
+                f"events:{event_type}" for event_type in self._subscribers.keys()
+                if f"events:{event_type}" not in self._subscribed_channels
+            ]
+            if new_channels:
+                self._subscribed_channels.update(new_channels)
+                await self._pubsub.subscribe(*new_channels)
         
         self.logger.info(
             f"Subscribed handler {handler.handler_id} to events: {event_types}"
@@ -267,8 +447,11 @@ class EventBus:
         try:
             pubsub = self._redis_client.pubsub()
             
-            # Subscribe to all event channels
+            # Subscribe to all event channels; channels for event types
+            # registered later are added by subscribe_to_events
             channels = [f"events:{event_type}" for event_type in self._subscribers.keys()]
+            self._subscribed_channels = set(channels)
+            self._pubsub = pubsub
             if channels:
                 await pubsub.subscribe(*channels)
             
@@ -286,11 +469,12 @@ class EventBus:
         except Exception as e:
             self.logger.error(f"Error in subscription loop: {e}")
         finally:
+            self._pubsub = None
             if 'pubsub' in locals():
                 await pubsub.close()
     
     async def _process_message(self, message: Dict[str, Any]) -> None:
-        """Process a received message from Redis pub/sub."""
+        """Dispatch a received message from Redis pub/sub to handler pools."""
         try:
             # Parse event data
             event_data = json.loads(message['data'])
@@ -298,30 +482,57 @@ class EventBus:
             
             # Get handlers for this event type
             handlers = self._subscribers.get(event.event_type, [])
+            key = self._ordering_key(event)
             
-            # Process event with each handler
+            # Hand the event to each handler's workers; only blocks when a
+            # handler's queue is full
             for handler in handlers:
-                try:
-                    await handler.handle(event)
-                except Exception as e:
-                    await handler.on_error(event, e)
+                await self._handler_pools[handler].submit(event, key)
                     
         except Exception as e:
             self.logger.error(f"Error processing message: {e}")
     
+    @staticmethod
+    def _ordering_key(event: Event) -> str:
+        """Key whose events must be handled in order (the aggregate, if any)."""
+        metadata = event.metadata or {}
+        return str(metadata.get('aggregate_id') or metadata.get('partition_key') or event.id)
+    
+    async def drain_handlers(self) -> None:
+        """Wait until all dispatched events have been handled."""
+        await asyncio.gather(*(pool.join() for pool in self._handler_pools.values()))
+    
+    def get_handler_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-handler latency, error and backlog metrics."""
+        return {
+            handler.handler_id: pool.metrics.to_dict(pool.backlog)
+            for handler, pool in self._handler_pools.items()
+        }
+    
     async def replay_events(
         self,
-        event_type: Union[str, EventType],
+        event_type: Union[str, EventType, List[Union[str, EventType]]],
         from_timestamp: datetime,
-        to_timestamp: Optional[datetime] = None
+        to_timestamp: Optional[datetime] = None,
+        chunk_size: int = 500,
+        prefetch: int = 2
     ) -> AsyncIterator[Event]:
         """
-        Replay events of a specific type from a given timestamp.
+        Replay events of one or more types from a given timestamp.
+        
+        Event IDs are paged from each timeline by score (keyset paging with
+        ZRANGEBYSCORE from the last score seen) and bodies are fetched with
+        one MGET per page, so a replay costs two round-trips per
+        ``chunk_size`` events. Up to ``prefetch`` pages per
+        type are fetched ahead while the caller consumes the current one.
         
         Args:
-            event_type: Type of events to replay
+            event_type: Type of events to replay, or a list of types to merge
+                into a single time-ordered stream
             from_timestamp: Start timestamp for replay
             to_timestamp: End timestamp for replay (optional)
+            chunk_size: Number of events fetched per page
+            prefetch: Number of pages fetched ahead of the consumer
             
         Yields:
             Event objects in chronological order
@@ -329,29 +540,114 @@ class EventBus:
         if not self._redis_client:
             raise RuntimeError("Event bus not initialized")
         
-        timeline_key = f"timeline:{event_type}"
+        event_types = event_type if isinstance(event_type, (list, tuple)) else [event_type]
         min_score = from_timestamp.timestamp()
         max_score = to_timestamp.timestamp() if to_timestamp else "+inf"
         
+        streams = [
+            self._replay_timeline(f"timeline:{et}", min_score, max_score, chunk_size, prefetch)
+            for et in event_types
+        ]
+        
         try:
-            # Get event IDs in time range
-            event_ids = await self._redis_client.zrangebyscore(
-                timeline_key, min_score, max_score
-            )
-            
-            # Fetch and yield events
-            for event_id in event_ids:
-                event_key = f"event:{event_id}"
-                event_data = await self._redis_client.get(event_key)
-                
-                if event_data:
-                    event_dict = json.loads(event_data)
-                    event = Event.from_dict(event_dict)
+            if len(streams) == 1:
+                async for event in streams[0]:
+                    yield event
+            else:
+                async for event in self._merge_by_timestamp(streams):
                     yield event
                     
         except Exception as e:
             self.logger.error(f"Error replaying events: {e}")
             raise
+        finally:
+            for stream in streams:
+                await stream.aclose()
+    
+    async def _replay_timeline(
+        self,
+        timeline_key: str,
+        min_score: float,
+        max_score: Union[float, str],
+        chunk_size: int,
+        prefetch: int
+    ) -> AsyncIterator[Event]:
+        """Stream the events of one timeline page by page with read-ahead.
+        
+        Each page starts at the last score already read instead of an
+        offset, so it costs O(log N + chunk_size) in Redis, and events added
+        during the replay never shift later pages. IDs already yielded at
+        that boundary score are skipped.
+        """
+        chunk_size = max(1, chunk_size)
+        pages: asyncio.Queue = asyncio.Queue(maxsize=max(1, prefetch))
+        
+        async def fetch_pages() -> None:
+            lower = min_score
+            seen_at_lower: Set[str] = set()
+            try:
+                while True:
+                    limit = chunk_size + len(seen_at_lower)
+                    entries = await self._redis_client.zrangebyscore(
+                        timeline_key, lower, max_score,
+                        start=0, num=limit, withscores=True
+                    )
+                    event_ids = [
+                        event_id for event_id, score in entries
+                        if not (score == lower and event_id in seen_at_lower)
+                    ]
+                    if not event_ids:
+                        break
+                    
+                    bodies = await self._redis_client.mget([f"event:{event_id}" for event_id in event_ids])
+                    await pages.put([
+                        Event.from_dict(json.loads(event_data))
+                        for event_data in bodies if event_data
+                    ])
+                    
+                    if len(entries) < limit:
+                        break
+                    last_score = entries[-1][1]
+                    if last_score != lower:
+                        lower = last_score
+                        seen_at_lower = set()
+                    seen_at_lower.update(event_id for event_id, score in entries if score == lower)
+                
+                await pages.put(None)
+            except Exception as e:
+                await pages.put(e)
+        
+        fetcher = asyncio.create_task(fetch_pages())
+        try:
+            while True:
+                page = await pages.get()
+                if page is None:
+                    break
+                if isinstance(page, Exception):
+                    raise page
+                for event in page:
+                    yield event
+        finally:
+            fetcher.cancel()
+            await asyncio.gather(fetcher, return_exceptions=True)
+    
+    @staticmethod
+    async def _merge_by_timestamp(streams: List[AsyncIterator[Event]]) -> AsyncIterator[Event]:
+        """K-way merge of chronologically ordered event streams."""
+        heap = []
+        for index, stream in enumerate(streams):
+            event = await anext(stream, None)
+            if event is not None:
+                heap.append((event.timestamp, index, event))
+        heapq.heapify(heap)
+        
+        while heap:
+            _, index, event = heapq.heappop(heap)
+            yield event
+            
+            next_event = await anext(streams[index], None)
+            if next_event is not None:
+                heapq.heappush(heap, (next_event.timestamp, index, next_event))
     
     async def get_event_stats(self) -> Dict[str, Any]:
         """Get statistics about events in the system."""
@@ -362,7 +658,8 @@ class EventBus:
             "total_events": 0,
             "events_by_type": {},
             "active_subscribers": len(self._subscribers),
-            "subscription_tasks": len(self._subscription_tasks)
+            "subscription_tasks": len(self._subscription_tasks),
+            "handlers": self.get_handler_metrics()
         }
         
         try:
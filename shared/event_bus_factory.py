@@ -59,7 +59,9 @@ class EventBusFactory:
         config = {
             "redis_url": os.getenv("REDIS_URL", "redis://localhost:6379/0"),
             "event_ttl": int(os.getenv("EVENT_TTL_SECONDS", "604800")),  # 7 days
-            "max_retries": int(os.getenv("EVENT_MAX_RETRIES", "3"))
+            "max_retries": int(os.getenv("EVENT_MAX_RETRIES", "3")),
+            "handler_concurrency": int(os.getenv("EVENT_HANDLER_CONCURRENCY", "4")),
+            "handler_queue_size": int(os.getenv("EVENT_HANDLER_QUEUE_SIZE", "1000"))
         }
         config.update(kwargs)
         
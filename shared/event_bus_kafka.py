@@ -212,6 +212,59 @@ class KafkaEventBus:
             self.logger.error(f"Failed to publish event to Kafka: {e}")
             raise
     
+    async def publish_many(self, events: List[Dict[str, Any]]) -> List[str]:
+        """
+        Publish a batch of events to Kafka.
+        
+        Every record is handed to the producer before any acknowledgement is
+        awaited, so the producer packs them into as few requests as possible.
+        
+        Args:
+            events: Event specs with the keyword arguments of publish_event
+                (event_type, payload, source and optional correlation_id,
+                metadata, partition_key)
+            
+        Returns:
+            Event IDs in the order the events were given
+        """
+        if not self._producer:
+            raise RuntimeError("Kafka event bus not initialized")
+        
+        if not events:
+            return []
+        
+        try:
+            event_ids = []
+            deliveries = []
+            for spec in events:
+                event_id = str(uuid.uuid4())
+                event = Event(
+                    id=event_id,
+                    event_type=str(spec["event_type"]),
+                    payload=spec["payload"],
+                    timestamp=datetime.now(timezone.utc),
+                    source=spec["source"],
+                    correlation_id=spec.get("correlation_id"),
+                    metadata=spec.get("metadata") or {}
+                )
+                
+                deliveries.append(await self._producer.send(
+                    self._get_topic_name(str(spec["event_type"])),
+                    value=event.to_dict(),
+                    key=spec.get("partition_key") or event_id
+                ))
+                event_ids.append(event_id)
+            
+            # Wait for all acknowledgements together
+            await asyncio.gather(*deliveries)
+            
+            self.logger.debug(f"Published batch of {len(event_ids)} events to Kafka")
+            return event_ids
+            
+        except Exception as e:
+            self.logger.error(f"Failed to publish event batch to Kafka: {e}")
+            raise
+    
     async def subscribe_to_events(
         self,
         event_types: List[Union[str, EventType]],
@@ -6,9 +6,11 @@ with standardized payloads and automatic correlation tracking.
 """
 
 import asyncio
+import inspect
 import logging
 import uuid
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 from contextlib import asynccontextmanager
 
@@ -18,6 +20,15 @@ from .event_bus_factory import get_global_event_bus
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _accepts_partition_key(event_bus_type: type) -> bool:
+    """Check once per event bus class whether publish_event takes a partition key."""
+    publish_event = getattr(event_bus_type, 'publish_event', None)
+    if publish_event is None:
+        return False
+    return 'partition_key' in inspect.signature(publish_event).parameters
+
+
 class EventPublisher:
     """High-level event publisher with convenience methods."""
     
@@ -70,12 +81,8 @@ class EventPublisher:
         }
         
         # Add partition key for Kafka
-        if hasattr(event_bus, 'publish_event') and partition_key:
-            # Check if it's KafkaEventBus by checking method signature
-            import inspect
-            sig = inspect.signature(event_bus.publish_event)
-            if 'partition_key' in sig.parameters:
-                publish_kwargs['partition_key'] = partition_key
+        if partition_key and _accepts_partition_key(type(event_bus)):
+            publish_kwargs['partition_key'] = partition_key
         
         return await event_bus.publish_event(**publish_kwargs)
 
@@ -551,36 +558,48 @@ class BatchEventPublisher:
             await self.flush()
     
     async def flush(self) -> List[str]:
-        """Flush all buffered events."""
+        """Flush all buffered events.
+        
+        Uses the bus's ``publish_many`` when available so the whole buffer is
+        sent in one batch; otherwise events are published one at a time.
+        """
         if not self._events_buffer:
             return []
         
         event_bus = await get_global_event_bus()
         event_ids = []
+        accepts_partition_key = _accepts_partition_key(type(event_bus))
         
-        # Publish all events
+        batch = []
         for event_data in self._events_buffer:
+            publish_kwargs = {
+                "event_type": event_data["event_type"],
+                "payload": event_data["payload"],
+                "source": self.source,
+                "correlation_id": self.correlation_id,
+                "metadata": event_data.get("metadata")
+            }
+            
+            # Add partition key for Kafka
+            if accepts_partition_key and event_data.get("partition_key"):
+                publish_kwargs['partition_key'] = event_data["partition_key"]
+            
+            batch.append(publish_kwargs)
+        
+        if hasattr(event_bus, 'publish_many'):
             try:
-                publish_kwargs = {
-                    "event_type": event_data["event_type"],
-                    "payload": event_data["payload"],
-                    "source": self.source,
-                    "correlation_id": self.correlation_id,
-                    "metadata": event_data.get("metadata")
-                }
-                
-                # Add partition key for Kafka
-                if hasattr(event_bus, 'publish_event') and event_data.get("partition_key"):
-                    import inspect
-                    sig = inspect.signature(event_bus.publish_event)
-                    if 'partition_key' in sig.parameters:
-                        publish_kwargs['partition_key'] = event_data["partition_key"]
-                
-                event_id = await event_bus.publish_event(**publish_kwargs)
-                event_ids.append(event_id)
-                
+                event_ids = await event_bus.publish_many(batch)
             except Exception as e:
-                logger.error(f"Failed to publish batched event: {e}")
+                logger.error(f"Failed to publish batch of {len(batch)} events: {e}")
+        else:
+            # Publish all events
+            for publish_kwargs in batch:
+                try:
+                    event_id = await event_bus.publish_event(**publish_kwargs)
+                    event_ids.append(event_id)
+                    
+                except Exception as e:
+                    logger.error(f"Failed to publish batched event: {e}")
         
         # Clear buffer
         self._events_buffer.clear()
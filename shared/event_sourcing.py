@@ -12,11 +12,15 @@ Event sourcing provides:
 """
 
 import asyncio
+import copy
 import json
 import logging
+import time
 import uuid
+import zlib
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from typing import Any, AsyncIterator, Dict, List, Optional, Union, Callable, Type
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Set, Tuple, Union, Callable, Type
 from dataclasses import dataclass, asdict
 from enum import Enum
 from abc import ABC, abstractmethod
@@ -90,6 +94,43 @@ class EventCheckpoint:
     metadata: Optional[Dict[str, Any]] = None
 
 
+@dataclass
+class SnapshotPolicy:
+    """When to snapshot an aggregate automatically.
+    
+    A snapshot is due once ``every_n_events`` events have been applied since
+    the last snapshot, or ``every_seconds`` have passed since it was taken
+    (if set). Only dict-shaped aggregate states can be snapshotted.
+    """
+    
+    every_n_events: int = 100
+    every_seconds: Optional[float] = None
+    
+    def is_due(self, events_since_snapshot: int, seconds_since_snapshot: Optional[float]) -> bool:
+        if events_since_snapshot <= 0:
+            return False
+        if events_since_snapshot >= self.every_n_events:
+            return True
+        return (
+            self.every_seconds is not None
+            and seconds_since_snapshot is not None
+            and seconds_since_snapshot >= self.every_seconds
+        )
+
+
+@dataclass
+class CachedAggregate:
+    """A rebuilt aggregate kept in memory and advanced from committed bus events."""
+    
+    state: Any
+    version: int
+    builder: Callable[..., Any]
+    builder_key: Tuple[str, int]
+    aggregate_type: Optional[str] = None
+    events_since_snapshot: int = 0
+    snapshot_at: Optional[float] = None
+
+
 class EventMigrator(ABC):
     """Abstract base class for event migrations."""
     
@@ -116,6 +157,97 @@ class EventMigrator(ABC):
         pass
 
 
+class GroupCommitWriter:
+    """
+    Async group-commit writer.
+    
+    Rows are buffered until ``max_batch_size`` rows are pending or
+    ``max_delay_ms`` has passed since the first buffered row, then written
+    with a single ``write_rows`` call (one transaction). Batches commit one
+    at a time in submission order, so rows for the same aggregate are
+    committed in the order they were submitted. Submitting waits only when
+    ``max_pending`` rows are already in flight.
+    """
+    
+    def __init__(
+        self,
+        write_rows: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        max_batch_size: int = 500,
+        max_delay_ms: float = 5.0,
+        max_pending: int = 10000
+    ):
+        self.write_rows = write_rows
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_delay_ms = max_delay_ms
+        self.batches_written = 0
+        self.rows_written = 0
+        self._buffer: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._capacity = asyncio.Semaphore(max(max_pending, self.max_batch_size))
+        self._write_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+    
+    async def submit(self, row: Dict[str, Any]) -> asyncio.Future:
+        """
+        Buffer a row for the next group commit.
+        
+        Returns:
+            Future resolved once the row's transaction has committed (or
+            failed with the write error)
+        """
+        await self._capacity.acquire()
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._buffer.append((row, future))
+        
+        if len(self._buffer) >= self.max_batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay_ms / 1000, self._start_flush)
+        
+        return future
+    
+    async def flush(self) -> None:
+        """Write any buffered rows and wait for all in-flight batches."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*list(self._flushes), return_exceptions=True)
+    
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        if not self._buffer:
+            return
+        
+        batch, self._buffer = self._buffer, []
+        task = asyncio.get_running_loop().create_task(self._write(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+    
+    async def _write(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        # The lock is FIFO, so batches commit in the order they were cut
+        async with self._write_lock:
+            try:
+                await self.write_rows([row for row, _ in batch])
+            except Exception as e:
+                logger.error(f"Group commit of {len(batch)} rows failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                self.batches_written += 1
+                self.rows_written += len(batch)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+            finally:
+                for _ in batch:
+                    self._capacity.release()
+
+
 class EventStore:
     """
     Event store implementation for event sourcing.
@@ -125,12 +257,26 @@ class EventStore:
     - Event retrieval by aggregate or time range
     - Snapshot management
     - Event migration and versioning
+    - Group-committed, multi-row event inserts
     """
     
-    def __init__(self, table_prefix: str = "event_store"):
+    # Columns written for every stored event
+    EVENT_COLUMNS = (
+        'id', 'event_type', 'aggregate_id', 'aggregate_type', 'aggregate_version',
+        'version', 'timestamp', 'payload', 'metadata', 'source', 'correlation_id',
+        'causation_id', 'command_id'
+    )
+    
+    def __init__(
+        self,
+        table_prefix: str = "event_store",
+        batch_size: int = 500,
+        batch_delay_ms: float = 5.0
+    ):
         self.table_prefix = table_prefix
         self.migrators: List[EventMigrator] = []
         self._initialized = False
+        self._writer = GroupCommitWriter(self._insert_events, batch_size, batch_delay_ms)
     
     async def initialize(self) -> None:
         """Initialize the event store."""
@@ -210,6 +356,12 @@ class EventStore:
                 ON {self.table_prefix}_events(correlation_id);
             """)
             
+            # Keyset index for global (timestamp, id) ordered replay
+            await session.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{self.table_prefix}_events_time_id 
+                ON {self.table_prefix}_events(timestamp, id);
+            """)
+            
             await session.commit()
     
     def register_migrator(self, migrator: EventMigrator) -> None:
@@ -229,6 +381,9 @@ class EventStore:
         """
         Store an event in the event store.
         
+        Concurrent calls are group-committed; this returns once the
+        transaction containing the event has committed.
+        
         Args:
             event: Event to store
             aggregate_id: ID of the aggregate this event belongs to
@@ -237,43 +392,80 @@ class EventStore:
             causation_id: ID of the event that caused this event
             command_id: ID of the command that generated this event
         """
+        acknowledgement = await self.enqueue_event(
+            event,
+            aggregate_id=aggregate_id,
+            aggregate_type=aggregate_type,
+            aggregate_version=aggregate_version,
+            causation_id=causation_id,
+            command_id=command_id
+        )
+        await acknowledgement
+    
+    async def enqueue_event(
+        self,
+        event: Event,
+        aggregate_id: Optional[str] = None,
+        aggregate_type: Optional[str] = None,
+        aggregate_version: Optional[int] = None,
+        causation_id: Optional[str] = None,
+        command_id: Optional[str] = None
+    ) -> asyncio.Future:
+        """
+        Queue an event for the next group commit without waiting for it.
+        
+        Events are committed in the order they are queued.
+        
+        Returns:
+            Future resolved once the event is durably stored
+        """
         if not self._initialized:
             await self.initialize()
         
+        # Extract metadata
+        metadata = event.metadata or {}
+        version = metadata.get('version', EventVersion.V1_0)
+        
+        return await self._writer.submit({
+            'id': event.id,
+            'event_type': event.event_type,
+            'aggregate_id': aggregate_id,
+            'aggregate_type': aggregate_type,
+            'aggregate_version': aggregate_version,
+            'version': version,
+            'timestamp': event.timestamp,
+            'payload': json.dumps(event.payload),
+            'metadata': json.dumps(metadata),
+            'source': event.source,
+            'correlation_id': event.correlation_id,
+            'causation_id': causation_id,
+            'command_id': command_id
+        })
+    
+    async def flush(self) -> None:
+        """Commit all queued events."""
+        await self._writer.flush()
+    
+    async def _insert_events(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert a group of events with one multi-row INSERT in one transaction."""
+        values = []
+        params: Dict[str, Any] = {}
+        for index, row in enumerate(rows):
+            values.append("(" + ", ".join(f":{column}_{index}" for column in self.EVENT_COLUMNS) + ")")
+            for column in self.EVENT_COLUMNS:
+                params[f"{column}_{index}"] = row[column]
+        
         async with get_db_session() as session:
-            # Extract metadata
-            metadata = event.metadata or {}
-            version = metadata.get('version', EventVersion.V1_0)
-            
-            # Insert event
+            # Re-delivered events are skipped so one duplicate cannot fail the group
             await session.execute(f"""
                 INSERT INTO {self.table_prefix}_events (
-                    id, event_type, aggregate_id, aggregate_type, aggregate_version,
-                    version, timestamp, payload, metadata, source, correlation_id,
-                    causation_id, command_id
-                ) VALUES (
-                    :id, :event_type, :aggregate_id, :aggregate_type, :aggregate_version,
-                    :version, :timestamp, :payload, :metadata, :source, :correlation_id,
-                    :causation_id, :command_id
-                )
-            """, {
-                'id': event.id,
-                'event_type': event.event_type,
-                'aggregate_id': aggregate_id,
-                'aggregate_type': aggregate_type,
-                'aggregate_version': aggregate_version,
-                'version': version,
-                'timestamp': event.timestamp,
-                'payload': json.dumps(event.payload),
-                'metadata': json.dumps(metadata),
-                'source': event.source,
-                'correlation_id': event.correlation_id,
-                'causation_id': causation_id,
-                'command_id': command_id
-            })
+                    {", ".join(self.EVENT_COLUMNS)}
+                ) VALUES {", ".join(values)}
+                ON CONFLICT (id) DO NOTHING
+            """, params)
             
             await session.commit()
-            logger.debug(f"Stored event {event.id} in event store")
+            logger.debug(f"Stored {len(rows)} events in event store")
     
     async def get_events_by_aggregate(
         self,
@@ -323,15 +515,7 @@ class EventStore:
             
             events = []
             for row in rows:
-                event = Event(
-                    id=row.id,
-                    event_type=row.event_type,
-                    payload=json.loads(row.payload),
-                    timestamp=row.timestamp,
-                    source=row.source,
-                    correlation_id=row.correlation_id,
-                    metadata=json.loads(row.metadata) if row.metadata else {}
-                )
+                event = self._row_to_event(row)
                 
                 if apply_migrations:
                     event = await self._apply_migrations(event)
@@ -393,15 +577,7 @@ class EventStore:
             
             events = []
             for row in rows:
-                event = Event(
-                    id=row.id,
-                    event_type=row.event_type,
-                    payload=json.loads(row.payload),
-                    timestamp=row.timestamp,
-                    source=row.source,
-                    correlation_id=row.correlation_id,
-                    metadata=json.loads(row.metadata) if row.metadata else {}
-                )
+                event = self._row_to_event(row)
                 
                 if apply_migrations:
                     event = await self._apply_migrations(event)
@@ -410,6 +586,107 @@ class EventStore:
             
             return events
     
+    async def iter_events(
+        self,
+        event_types: Optional[List[Union[str, EventType]]] = None,
+        from_timestamp: Optional[datetime] = None,
+        to_timestamp: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        page_size: int = 500,
+        apply_migrations: bool = True
+    ) -> AsyncIterator[Event]:
+        """
+        Stream events across types in global (timestamp, id) order.
+        
+        Pages are fetched with keyset pagination on (timestamp, id), so
+        memory stays bounded by ``page_size`` and each page is an index
+        range scan regardless of how far into the history it starts.
+        
+        Args:
+            event_types: Event types to include (all types if None)
+            from_timestamp: Start timestamp (inclusive)
+            to_timestamp: End timestamp (inclusive)
+            after: Exclusive (timestamp, event_id) position to resume after
+            page_size: Number of rows fetched per query
+            apply_migrations: Whether to apply event migrations
+            
+        Yields:
+            Events ordered by (timestamp, id)
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        base_query = f"""
+            SELECT id, event_type, aggregate_id, aggregate_type, aggregate_version,
+                   version, timestamp, payload, metadata, source, correlation_id,
+                   causation_id, command_id
+            FROM {self.table_prefix}_events
+            WHERE TRUE
+        """
+        base_params: Dict[str, Any] = {}
+        
+        if event_types:
+            base_query += " AND event_type = ANY(:event_types)"
+            base_params['event_types'] = [str(event_type) for event_type in event_types]
+        
+        if from_timestamp:
+            base_query += " AND timestamp >= :from_timestamp"
+            base_params['from_timestamp'] = from_timestamp
+        
+        if to_timestamp:
+            base_query += " AND timestamp <= :to_timestamp"
+            base_params['to_timestamp'] = to_timestamp
+        
+        position = after
+        while True:
+            query = base_query
+            params = dict(base_params)
+            
+            if position:
+                query += " AND (timestamp, id) > (:after_timestamp, :after_id)"
+                params['after_timestamp'], params['after_id'] = position
+            
+            query += f" ORDER BY timestamp ASC, id ASC LIMIT {int(page_size)}"
+            
+            async with get_db_session() as session:
+                result = await session.execute(query, params)
+                rows = result.fetchall()
+            
+            for row in rows:
+                event = self._row_to_event(row)
+                
+                if apply_migrations:
+                    event = await self._apply_migrations(event)
+                
+                yield event
+            
+            if len(rows) < page_size:
+                break
+            position = (rows[-1].timestamp, rows[-1].id)
+    
+    @staticmethod
+    def _row_to_event(row: Any) -> Event:
+        """Convert an events table row to an Event.
+        
+        The aggregate columns are copied into the event metadata so readers
+        see the stored aggregate id, type and version in one place.
+        """
+        metadata = json.loads(row.metadata) if row.metadata else {}
+        for column in ('aggregate_id', 'aggregate_type', 'aggregate_version'):
+            value = getattr(row, column, None)
+            if value is not None:
+                metadata[column] = value
+        
+        return Event(
+            id=row.id,
+            event_type=row.event_type,
+            payload=json.loads(row.payload),
+            timestamp=row.timestamp,
+            source=row.source,
+            correlation_id=row.correlation_id,
+            metadata=metadata
+        )
+    
     async def _apply_migrations(self, event: Event) -> Event:
         """Apply migrations to bring event to current version."""
         current_event = event
@@ -560,10 +837,19 @@ class EventSourcingService:
     - Migration handling
     """
     
-    def __init__(self, event_store: Optional[EventStore] = None):
+    def __init__(
+        self,
+        event_store: Optional[EventStore] = None,
+        snapshot_policy: Optional[SnapshotPolicy] = None,
+        aggregate_cache_size: int = 1000
+    ):
         self.event_store = event_store or EventStore()
+        self.snapshot_policy = snapshot_policy or SnapshotPolicy()
+        self.aggregate_cache_size = aggregate_cache_size
         self.event_bus = None
         self._initialized = False
+        self._aggregate_cache: "OrderedDict[str, CachedAggregate]" = OrderedDict()
+        self._aggregate_builders: Dict[str, Tuple[Callable[..., Any], int]] = {}
     
     async def initialize(self) -> None:
         """Initialize the event sourcing service."""
@@ -584,9 +870,18 @@ class EventSourcingService:
         from .event_bus import EventHandler
         
         class EventStorageHandler(EventHandler):
-            def __init__(self, event_store: EventStore):
+            def __init__(
+                self,
+                event_store: EventStore,
+                on_stored: Callable[[Event], Awaitable[None]],
+                on_failed: Callable[[Event], None]
+            ):
                 super().__init__("event_storage_handler")
                 self.event_store = event_store
+                self.on_stored = on_stored
+                self.on_failed = on_failed
+                self._acknowledgements: asyncio.Queue = asyncio.Queue()
+                self._committer: Optional[asyncio.Task] = None
             
             async def handle(self, event: Event) -> None:
                 """Store event in event store."""
@@ -599,7 +894,9 @@ class EventSourcingService:
                     causation_id = metadata.get('causation_id')
                     command_id = metadata.get('command_id')
                     
-                    await self.event_store.store_event(
+                    # Don't wait for the commit so bursts share group commits;
+                    # bus events arrive in order, so aggregates stay ordered
+                    acknowledgement = await self.event_store.enqueue_event(
                         event,
                         aggregate_id=aggregate_id,
                         aggregate_type=aggregate_type,
@@ -607,11 +904,38 @@ class EventSourcingService:
                         causation_id=causation_id,
                         command_id=command_id
                     )
+                    
+                    # Cached aggregates (and the snapshots taken from them) may
+                    # only include events that actually committed
+                    self._acknowledgements.put_nowait((event, acknowledgement))
+                    if self._committer is None or self._committer.done():
+                        self._committer = asyncio.create_task(self._process_acknowledgements())
                 except Exception as e:
                     self.logger.error(f"Failed to store event {event.id}: {e}")
+            
+            async def _process_acknowledgements(self) -> None:
+                """Apply committed events in queue order; exits once the queue is empty."""
+                while not self._acknowledgements.empty():
+                    event, acknowledgement = self._acknowledgements.get_nowait()
+                    try:
+                        await acknowledgement
+                    except Exception as e:
+                        self.logger.error(f"Failed to store event {event.id}: {e}")
+                        self.on_failed(event)
+                    else:
+                        try:
+                            await self.on_stored(event)
+                        except Exception as e:
+                            self.logger.error(f"Failed to apply stored event {event.id}: {e}")
+                    finally:
+                        self._acknowledgements.task_done()
         
         # Subscribe to all event types
-        handler = EventStorageHandler(self.event_store)
+        handler = EventStorageHandler(
+            self.event_store,
+            self._advance_cached_aggregate,
+            lambda event: self.invalidate_aggregate((event.metadata or {}).get('aggregate_id'))
+        )
         await self.event_bus.subscribe_to_events(list(EventType), handler)
     
     async def replay_events(
@@ -621,11 +945,17 @@ class EventSourcingService:
         to_timestamp: Optional[datetime] = None,
         event_types: Optional[List[Union[str, EventType]]] = None,
         checkpoint_name: Optional[str] = None,
-        batch_size: int = 100
+        batch_size: int = 100,
+        parallelism: int = 1
     ) -> str:
         """
         Replay events with a custom handler.
         
+        Events of all requested types are streamed in global (timestamp, id)
+        order with constant memory. After each batch the checkpoint records
+        the exact position of the batch's last event, so a resumed replay
+        continues with the next event without repeating any.
+        
         Args:
             replay_handler: Function to handle each replayed event
             from_timestamp: Start timestamp for replay
@@ -633,6 +963,8 @@ class EventSourcingService:
             event_types: Specific event types to replay
             checkpoint_name: Name of checkpoint to track progress
             batch_size: Number of events to process in each batch
+            parallelism: Number of concurrent partitions; events are
+                partitioned by aggregate_id so each aggregate stays ordered
             
         Returns:
             Replay ID for tracking
@@ -645,57 +977,38 @@ class EventSourcingService:
         
         try:
             # Get checkpoint if specified
-            checkpoint = None
+            after = None
             if checkpoint_name:
                 checkpoint = await self.event_store.get_checkpoint(checkpoint_name)
                 if checkpoint:
-                    from_timestamp = checkpoint.timestamp
+                    after = (checkpoint.timestamp, checkpoint.last_event_id)
                     logger.info(f"Resuming replay from checkpoint {checkpoint_name}")
             
             # Determine event types to replay
             types_to_replay = event_types or list(EventType)
             
             total_events = 0
-            last_event_id = None
-            
-            # Replay events for each type
-            for event_type in types_to_replay:
-                events = await self.event_store.get_events_by_type(
-                    event_type,
-                    from_timestamp=from_timestamp,
-                    to_timestamp=to_timestamp,
-                    apply_migrations=True
+            batch: List[Event] = []
+            
+            async for event in self.event_store.iter_events(
+                types_to_replay,
+                from_timestamp=from_timestamp,
+                to_timestamp=to_timestamp,
+                after=after,
+                page_size=batch_size,
+                apply_migrations=True
+            ):
+                batch.append(event)
+                if len(batch) >= batch_size:
+                    total_events += await self._replay_batch(
+                        batch, replay_handler, replay_id, parallelism, checkpoint_name, total_events
+                    )
+                    batch = []
+            
+            if batch:
+                total_events += await self._replay_batch(
+                    batch, replay_handler, replay_id, parallelism, checkpoint_name, total_events
                 )
-                
-                # Process events in batches
-                for i in range(0, len(events), batch_size):
-                    batch = events[i:i + batch_size]
-                    
-                    for event in batch:
-                        try:
-                            # Add replay metadata
-                            event.metadata = event.metadata or {}
-                            event.metadata['replay_id'] = replay_id
-                            
-                            await replay_handler(event)
-                            last_event_id = event.id
-                            total_events += 1
-                            
-                        except Exception as e:
-                            logger.error(f"Error replaying event {event.id}: {e}")
-                            raise EventReplayError(f"Replay failed at event {event.id}: {e}")
-                    
-                    # Update checkpoint after each batch
-                    if checkpoint_name and last_event_id:
-                        checkpoint = EventCheckpoint(
-                            id=str(uuid.uuid4()),
-                            name=checkpoint_name,
-                            timestamp=datetime.now(timezone.utc),
-                            last_event_id=last_event_id,
-                            event_count=total_events,
-                            metadata={'replay_id': replay_id}
-                        )
-                        await self.event_store.create_checkpoint(checkpoint)
             
             logger.info(f"Event replay {replay_id} completed: {total_events} events processed")
             return replay_id
@@ -704,19 +1017,108 @@ class EventSourcingService:
             logger.error(f"Event replay {replay_id} failed: {e}")
             raise
     
+    async def _replay_batch(
+        self,
+        batch: List[Event],
+        replay_handler: Callable[[Event], None],
+        replay_id: str,
+        parallelism: int,
+        checkpoint_name: Optional[str],
+        events_before: int
+    ) -> int:
+        """Replay one batch, then checkpoint at its last event."""
+        
+        async def replay_partition(events: List[Event]) -> None:
+            for event in events:
+                try:
+                    # Add replay metadata
+                    event.metadata = event.metadata or {}
+                    event.metadata['replay_id'] = replay_id
+                    
+                    await replay_handler(event)
+                    
+                except Exception as e:
+                    logger.error(f"Error replaying event {event.id}: {e}")
+                    raise EventReplayError(f"Replay failed at event {event.id}: {e}")
+        
+        if parallelism <= 1:
+            await replay_partition(batch)
+        else:
+            partitions: Dict[int, List[Event]] = {}
+            for event in batch:
+                key = str((event.metadata or {}).get('aggregate_id') or event.id)
+                partitions.setdefault(zlib.crc32(key.encode('utf-8')) % parallelism, []).append(event)
+            await asyncio.gather(*(replay_partition(events) for events in partitions.values()))
+        
+        # Update checkpoint after each batch
+        if checkpoint_name:
+            last_event = batch[-1]
+            checkpoint = EventCheckpoint(
+                id=str(uuid.uuid4()),
+                name=checkpoint_name,
+                timestamp=last_event.timestamp,
+                last_event_id=last_event.id,
+                event_count=events_before + len(batch),
+                metadata={'replay_id': replay_id}
+            )
+            await self.event_store.create_checkpoint(checkpoint)
+        
+        return len(batch)
+    
+    def register_aggregate_builder(
+        self,
+        name: str,
+        builder: Callable[..., Any],
+        version: int = 1
+    ) -> None:
+        """
+        Register an aggregate builder under a name and version.
+        
+        Only registered builders use the aggregate cache, which is keyed on
+        ``(name, version)``. Bump the version whenever the builder's output
+        changes so aggregates cached by the old one are rebuilt.
+        """
+        self._aggregate_builders[name] = (builder, version)
+    
+    def _resolve_builder(
+        self,
+        aggregate_builder: Union[str, Callable[..., Any]]
+    ) -> Tuple[Callable[..., Any], Optional[Tuple[str, int]]]:
+        """Return the builder and its cache key (None for unregistered builders)."""
+        if isinstance(aggregate_builder, str):
+            if aggregate_builder not in self._aggregate_builders:
+                raise ValueError(f"No aggregate builder registered as {aggregate_builder!r}")
+            builder, version = self._aggregate_builders[aggregate_builder]
+            return builder, (aggregate_builder, version)
+        
+        for name, (builder, version) in self._aggregate_builders.items():
+            if builder is aggregate_builder:
+                return builder, (name, version)
+        return aggregate_builder, None
+    
     async def rebuild_aggregate(
         self,
         aggregate_id: str,
-        aggregate_builder: Callable[[List[Event]], Any],
-        use_snapshots: bool = True
+        aggregate_builder: Union[str, Callable[[List[Event]], Any]],
+        use_snapshots: bool = True,
+        use_cache: bool = True
     ) -> Any:
         """
         Rebuild an aggregate from its event history.
         
+        Aggregates rebuilt with a registered builder (see
+        ``register_aggregate_builder``) are served from an in-memory LRU
+        cache keyed on the aggregate ID and the builder's name and version.
+        Cached aggregates are advanced as new events for them are committed
+        from the bus, and a snapshot is written automatically whenever the
+        snapshot policy is due.
+        
         Args:
             aggregate_id: ID of the aggregate to rebuild
-            aggregate_builder: Function that builds aggregate from events
+            aggregate_builder: Registered builder name, or a function that
+                builds the aggregate from events (and optionally a base state)
             use_snapshots: Whether to use snapshots for optimization
+            use_cache: Whether to serve and populate the aggregate cache
             
         Returns:
             Rebuilt aggregate
@@ -724,8 +1126,18 @@ class EventSourcingService:
         if not self._initialized:
             await self.initialize()
         
+        aggregate_builder, builder_key = self._resolve_builder(aggregate_builder)
+        use_cache = use_cache and builder_key is not None
+        if use_cache:
+            cached = self._aggregate_cache.get(aggregate_id)
+            if cached and cached.builder_key == builder_key:
+                self._aggregate_cache.move_to_end(aggregate_id)
+                logger.debug(f"Serving aggregate {aggregate_id} version {cached.version} from cache")
+                return copy.deepcopy(cached.state)
+        
         start_version = 0
         base_state = None
+        snapshot = None
         
         # Try to get latest snapshot if enabled
         if use_snapshots:
@@ -749,14 +1161,96 @@ class EventSourcingService:
         elif events:
             # Build from events only
             aggregate = aggregate_builder(events)
+        elif base_state:
+            # Snapshot is already up to date
+            aggregate = base_state
         else:
             # No events found
             logger.warning(f"No events found for aggregate {aggregate_id}")
             return None
         
+        version = (events[-1].metadata or {}).get('aggregate_version') if events else snapshot.version
+        aggregate_type = (
+            (events[-1].metadata or {}).get('aggregate_type') if events else snapshot.aggregate_type
+        )
+        
+        # Snapshot automatically once enough history has accumulated
+        snapshot_at = None
+        if snapshot:
+            snapshot_at = time.monotonic() - (datetime.now(timezone.utc) - snapshot.timestamp).total_seconds()
+        seconds_since_snapshot = time.monotonic() - snapshot_at if snapshot_at is not None else None
+        events_since_snapshot = len(events)
+        
+        if (
+            version is not None
+            and isinstance(aggregate, dict)
+            and self.snapshot_policy.is_due(events_since_snapshot, seconds_since_snapshot)
+        ):
+            await self.create_snapshot(aggregate_id, aggregate_type or "unknown", version, copy.deepcopy(aggregate))
+            events_since_snapshot = 0
+            snapshot_at = time.monotonic()
+        
+        if use_cache and version is not None:
+            self._aggregate_cache[aggregate_id] = CachedAggregate(
+                state=copy.deepcopy(aggregate),
+                version=version,
+                builder=aggregate_builder,
+                builder_key=builder_key,
+                aggregate_type=aggregate_type,
+                events_since_snapshot=events_since_snapshot,
+                snapshot_at=snapshot_at
+            )
+            self._aggregate_cache.move_to_end(aggregate_id)
+            while len(self._aggregate_cache) > self.aggregate_cache_size:
+                self._aggregate_cache.popitem(last=False)
+        
         logger.info(f"Rebuilt aggregate {aggregate_id} from {len(events)} events")
         return aggregate
     
+    async def _advance_cached_aggregate(self, event: Event) -> None:
+        """Apply a committed bus event to its cached aggregate, if one is cached.
+        
+        The event must carry the next aggregate version; on a gap the cached
+        entry is dropped so the next rebuild reloads it from the store.
+        """
+        metadata = event.metadata or {}
+        aggregate_id = metadata.get('aggregate_id')
+        cached = self._aggregate_cache.get(aggregate_id) if aggregate_id else None
+        if cached is None:
+            return
+        
+        version = metadata.get('aggregate_version')
+        if version is not None and version <= cached.version:
+            return  # Already applied
+        
+        if version != cached.version + 1:
+            self._aggregate_cache.pop(aggregate_id, None)
+            logger.debug(f"Dropped cached aggregate {aggregate_id}: expected version {cached.version + 1}, got {version}")
+            return
+        
+        try:
+            migrated = await self.event_store._apply_migrations(event)
+            cached.state = cached.builder([migrated], cached.state)
+        except Exception as e:
+            self._aggregate_cache.pop(aggregate_id, None)
+            logger.error(f"Failed to advance cached aggregate {aggregate_id}: {e}")
+            return
+        
+        cached.version = version
+        cached.events_since_snapshot += 1
+        
+        seconds_since_snapshot = time.monotonic() - cached.snapshot_at if cached.snapshot_at is not None else None
+        if isinstance(cached.state, dict) and self.snapshot_policy.is_due(cached.events_since_snapshot, seconds_since_snapshot):
+            await self.create_snapshot(
+                aggregate_id, cached.aggregate_type or "unknown", cached.version, copy.deepcopy(cached.state)
+            )
+            cached.events_since_snapshot = 0
+            cached.snapshot_at = time.monotonic()
+    
+    def invalidate_aggregate(self, aggregate_id: Optional[str]) -> None:
+        """Drop an aggregate from the in-memory cache."""
+        self._aggregate_cache.pop(aggregate_id, None)
+    
     async def create_snapshot(
         self,
         aggregate_id: str,
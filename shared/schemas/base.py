@@ -88,6 +88,7 @@ class PaginatedResponse(BaseSchema):
     pagination: PaginationResponse
     total_count: int
     filters_applied: Optional[dict] = None
+    metadata: Optional[dict] = None
 
 
 class APIResponse(BaseSchema, Generic[T]):
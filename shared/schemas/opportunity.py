@@ -101,6 +101,14 @@ class OpportunitySearchRequest(PaginationRequest):
     implementation_complexity: Optional[List[str]] = Field(None, description="Filter by complexity")
     tags: Optional[List[str]] = Field(None, description="Filter by tags")
     geographic_scope: Optional[str] = Field(None, description="Filter by geographic scope")
+    cursor: Optional[str] = Field(
+        None, description="Semantic search cursor from the previous page (overrides page)"
+    )
+    search_mode: str = Field(
+        "keyword",
+        pattern="^(keyword|bm25|hybrid)$",
+        description="keyword: filter and substring match; bm25: keyword relevance; hybrid: BM25 fused with vector similarity"
+    )
     
     @validator('max_validation_score')
     def validate_score_range(cls, v, values):
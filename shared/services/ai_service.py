@@ -3,12 +3,20 @@
 Supports multi-provider AI integration for semantic search and analysis.
 """
 
+import asyncio
 import os
 from typing import List, Optional, Dict, Any
 from abc import ABC, abstractmethod
 import openai
 import structlog
 
+from shared.services.embedding_cache import EmbeddingBatcher, EmbeddingCache, decode_embedding, encode_embedding
+
+try:
+    from shared.cache import cache_manager
+except ImportError:
+    cache_manager = None
+
 logger = structlog.get_logger(__name__)
 
 
@@ -68,6 +76,9 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         except Exception as e:
             logger.error("Failed to generate OpenAI embeddings", error=str(e), exc_info=True)
             raise
+    
+    def get_dimension(self) -> int:
+        return self.dimension
 
 
 class MockEmbeddingProvider(EmbeddingProvider):
@@ -105,6 +116,12 @@ class AIService:
     def __init__(self):
         self.embedding_provider: Optional[EmbeddingProvider] = None
         self._initialize_embedding_provider()
+        
+        # Identical texts are embedded once: cached by content hash, shared
+        # while in flight, and single-text calls are merged into batches
+        self.embedding_cache = EmbeddingCache(cache_manager)
+        self._embedding_batcher = EmbeddingBatcher(self.generate_text_embeddings)
+        self._inflight_embeddings: Dict[str, asyncio.Task] = {}
     
     def _initialize_embedding_provider(self):
         """Initialize the embedding provider based on available API keys."""
@@ -126,15 +143,64 @@ class AIService:
         if not self.embedding_provider:
             raise RuntimeError("No embedding provider available")
         
-        embeddings = await self.embedding_provider.generate_embeddings([text])
-        return embeddings[0]
+        return await self._embedding_batcher.embed(text)
     
     async def generate_text_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts."""
         if not self.embedding_provider:
             raise RuntimeError("No embedding provider available")
         
-        return await self.embedding_provider.generate_embeddings(texts)
+        namespace = self._embedding_namespace()
+        keys = [EmbeddingCache.key(namespace, text) for text in texts]
+        embeddings = await self.embedding_cache.get_many(list(dict.fromkeys(keys)))
+        
+        # Texts another caller is already embedding are awaited, not re-requested
+        waiting = {}
+        to_embed: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in embeddings or key in to_embed:
+                continue
+            if key in self._inflight_embeddings:
+                waiting[key] = self._inflight_embeddings[key]
+            else:
+                to_embed[key] = text
+        
+        if to_embed:
+            # The provider call runs in its own task, so cancelling this
+            # caller doesn't cancel the other callers waiting on these texts
+            task = asyncio.ensure_future(self._embed_and_cache(to_embed))
+            # Waiters re-raise a failure; don't warn when there are none
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            for key in to_embed:
+                self._inflight_embeddings[key] = task
+                waiting[key] = task
+        
+        for key, task in waiting.items():
+            embeddings[key] = (await asyncio.shield(task))[key]
+        
+        return [embeddings[key] for key in keys]
+    
+    async def _embed_and_cache(self, to_embed: Dict[str, str]) -> Dict[str, List[float]]:
+        """Embed texts keyed by cache key, cache them and clear their in-flight entries."""
+        try:
+            generated = await self.embedding_provider.generate_embeddings(list(to_embed.values()))
+            # Return the float16 round-trip the cache serves, so a text gets the
+            # same vector whether it was a hit or a miss
+            new_embeddings = {
+                key: decode_embedding(encode_embedding(embedding))
+                for key, embedding in zip(to_embed, generated)
+            }
+            await self.embedding_cache.set_many(new_embeddings)
+            return new_embeddings
+        finally:
+            for key in to_embed:
+                self._inflight_embeddings.pop(key, None)
+    
+    def _embedding_namespace(self) -> str:
+        """Identifies the provider model so embeddings from different models never mix."""
+        provider = self.embedding_provider
+        model = getattr(provider, "model", type(provider).__name__)
+        return f"{model}:{provider.get_dimension()}"
     
     async def generate_opportunity_embedding(self, opportunity_data: Dict[str, Any]) -> List[float]:
         """Generate embedding for an opportunity based on its content."""
@@ -206,13 +272,18 @@ class AIService:
     async def health_check(self) -> Dict[str, Any]:
         """Check AI service health."""
         try:
-            # Test embedding generation with a simple text
-            test_embedding = await self.generate_text_embedding("test")
+            # Test embedding generation with a simple text, bypassing the cache
+            test_embedding = (await self.embedding_provider.generate_embeddings(["test"]))[0]
             
             return {
                 "status": "healthy",
                 "provider": type(self.embedding_provider).__name__,
                 "embedding_dimension": len(test_embedding),
+                "embedding_cache": {
+                    "entries": len(self.embedding_cache),
+                    "hits": self.embedding_cache.hits,
+                    "misses": self.embedding_cache.misses
+                },
                 "message": "AI service is working correctly"
             }
             
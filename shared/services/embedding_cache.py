@@ -0,0 +1,179 @@
+"""Content-addressed embedding cache and request coalescing for the AI service.
+
+Provides:
+- EmbeddingCache: in-process LRU in front of Redis, keyed by a hash of the
+  provider model and the exact text, storing vectors as float16 bytes
+- EmbeddingBatcher: merges concurrent single-text requests into one
+  provider batch and coalesces identical texts within a batch window
+"""
+
+import asyncio
+import base64
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+def encode_embedding(embedding: List[float]) -> bytes:
+    """Pack an embedding as float16 bytes (half the size of float32)."""
+    return np.asarray(embedding, dtype=np.float16).tobytes()
+
+
+def decode_embedding(data: bytes) -> List[float]:
+    """Unpack float16 bytes produced by ``encode_embedding``."""
+    return np.frombuffer(data, dtype=np.float16).astype(np.float32).tolist()
+
+
+class EmbeddingCache:
+    """Two-level embedding cache: a bounded in-process LRU backed by Redis.
+
+    Redis values are base64 text so they round-trip through clients created
+    with ``decode_responses=True``. When Redis is unavailable the cache keeps
+    serving from the LRU and retries Redis after ``redis_retry_seconds``.
+    """
+
+    def __init__(
+        self,
+        cache_manager=None,
+        max_entries: int = 10000,
+        expire_seconds: int = 7 * 86400,
+        redis_retry_seconds: float = 30.0
+    ):
+        self.cache_manager = cache_manager
+        self.max_entries = max_entries
+        self.expire_seconds = expire_seconds
+        self.redis_retry_seconds = redis_retry_seconds
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._redis_retry_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(namespace: str, text: str) -> str:
+        """Cache key for ``text`` embedded by the model identified by ``namespace``."""
+        digest = hashlib.blake2b(f"{namespace}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+        return f"embedding:{digest}"
+
+    async def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Return the cached embeddings for whichever of ``keys`` are present."""
+        found: Dict[str, List[float]] = {}
+        missing = []
+        for key in keys:
+            data = self._entries.get(key)
+            if data is None:
+                missing.append(key)
+            else:
+                self._entries.move_to_end(key)
+                found[key] = decode_embedding(data)
+
+        if missing and self._redis_available():
+            try:
+                values = await self.cache_manager.get_many(missing)
+                for key, value in zip(missing, values):
+                    if isinstance(value, str):
+                        data = base64.b64decode(value)
+                        self._remember(key, data)
+                        found[key] = decode_embedding(data)
+            except Exception as e:
+                self._redis_failed(e)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def set_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """Store embeddings in the LRU and, when reachable, in Redis."""
+        encoded = {key: encode_embedding(embedding) for key, embedding in embeddings.items()}
+        for key, data in encoded.items():
+            self._remember(key, data)
+
+        if encoded and self._redis_available():
+            try:
+                await self.cache_manager.set_many(
+                    {key: base64.b64encode(data).decode("ascii") for key, data in encoded.items()},
+                    expire=self.expire_seconds
+                )
+            except Exception as e:
+                self._redis_failed(e)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _redis_available(self) -> bool:
+        return self.cache_manager is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, error: Exception) -> None:
+        self._redis_retry_at = time.monotonic() + self.redis_retry_seconds
+        logger.warning("Embedding cache Redis unavailable", error=str(error))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EmbeddingBatcher:
+    """Merges concurrent single-text embedding requests into batches.
+
+    Requests are collected for up to ``max_delay`` seconds (or until
+    ``max_batch_size`` distinct texts are waiting) and embedded with one call
+    to ``embed``; callers asking for the same text share one result.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[List[str]], Awaitable[List[List[float]]]],
+        max_batch_size: int = 64,
+        max_delay: float = 0.005
+    ):
+        self._embed = embed
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed ``text`` as part of the next batch."""
+        future = self._pending.get(text)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[text] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_delay, self._flush)
+
+        # Shield so one cancelled caller does not cancel the shared result
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending:
+            batch, self._pending = self._pending, {}
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: Dict[str, asyncio.Future]) -> None:
+        try:
+            embeddings = await self._embed(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, embedding in zip(batch.values(), embeddings):
+            if not future.done():
+                future.set_result(embedding)
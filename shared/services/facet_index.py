@@ -0,0 +1,92 @@
+"""
+Incrementally maintained facet counts for opportunity search.
+
+This module implements:
+- Per-facet value counters kept current as documents are added, changed
+  or removed, so catalog-wide facet counts are read without touching rows
+- A per-document record of facet values, used both to undo a document's
+  old contribution on update and to count facets over a subset of
+  documents (for example the matches of a text query)
+
+Reading the unfiltered counts costs O(distinct values); counting a subset
+costs O(subset size), independent of the catalog size.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+
+FacetValues = Mapping[str, Iterable[str]]
+
+
+class FacetIndex:
+    """
+    Value counts for a fixed set of facets over a document collection.
+
+    Each document maps facet names to the values it has (a single-valued
+    facet is a one-item list). Adding an existing id replaces it.
+    """
+
+    def __init__(self, facets: Sequence[str]):
+        self.facets = list(facets)
+        self._docs: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._counts: Dict[str, Counter] = {facet: Counter() for facet in self.facets}
+        self.built = False
+
+    def rebuild(self, documents: Iterable[Tuple[str, FacetValues]]) -> None:
+        """Replace the index contents with (doc_id, facet values) pairs."""
+        self._docs = {}
+        self._counts = {facet: Counter() for facet in self.facets}
+        for doc_id, values in documents:
+            self.add(doc_id, values)
+        self.built = True
+
+    def add(self, doc_id: str, values: FacetValues) -> None:
+        """Count a document's facet values, replacing any previous version."""
+        self.remove(doc_id)
+        record = {
+            facet: tuple(dict.fromkeys(str(value) for value in values.get(facet, ()) if value is not None))
+            for facet in self.facets
+        }
+        for facet, facet_values in record.items():
+            self._counts[facet].update(facet_values)
+        self._docs[doc_id] = record
+
+    def remove(self, doc_id: str) -> None:
+        """Stop counting a document; unknown ids are ignored."""
+        record = self._docs.pop(doc_id, None)
+        if record is None:
+            return
+        for facet, facet_values in record.items():
+            counts = self._counts[facet]
+            counts.subtract(facet_values)
+            for value in facet_values:
+                if counts[value] <= 0:
+                    del counts[value]
+
+    def counts(self, doc_ids: Optional[Iterable[str]] = None) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        """
+        Facet value counts over all documents, or over ``doc_ids`` only.
+
+        Returns (number of documents counted, {facet: {value: count}}).
+        Ids that are not in the index are skipped.
+        """
+        if doc_ids is None:
+            return len(self._docs), {facet: dict(counts) for facet, counts in self._counts.items()}
+
+        counts = {facet: Counter() for facet in self.facets}
+        total = 0
+        for doc_id in doc_ids:
+            record = self._docs.get(doc_id)
+            if record is None:
+                continue
+            total += 1
+            for facet, facet_values in record.items():
+                counts[facet].update(facet_values)
+        return total, {facet: dict(facet_counts) for facet, facet_counts in counts.items()}
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def __len__(self) -> int:
+        return len(self._docs)
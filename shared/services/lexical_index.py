@@ -0,0 +1,157 @@
+"""
+In-process BM25 keyword index for opportunity search.
+
+This module implements:
+- Tokenization into lower-case alphanumeric terms without stop words
+- An inverted index with per-document term frequencies and lengths
+- Okapi BM25 scoring over weighted fields (title counts more than body)
+- Reciprocal-rank fusion for merging rankings from different retrievers
+
+A query only touches the posting lists of its own terms, so keyword search
+cost follows the number of matching documents rather than the catalog size.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into",
+    "is", "it", "of", "on", "or", "that", "the", "this", "to", "with"
+})
+
+ScoredId = Tuple[str, float]
+
+
+def tokenize_terms(text: str) -> List[str]:
+    """Lower-case alphanumeric terms of ``text`` with stop words removed."""
+    if not text:
+        return []
+    return [term for term in _TOKEN_PATTERN.findall(text.lower()) if term not in STOP_WORDS]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[ScoredId]:
+    """
+    Fuse ranked id lists with reciprocal-rank fusion.
+
+    Each list contributes ``1 / (k + rank)`` (rank starting at 1) to the
+    ids it contains; ties are broken by id so the order is deterministic.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda entry: (-entry[1], entry[0]))
+
+
+class BM25Index:
+    """
+    Okapi BM25 index over documents made of weighted text fields.
+
+    Documents are ``{field: text}`` mappings; a field's term counts are
+    multiplied by its weight in ``field_weights`` (1.0 when not listed).
+    Adding an existing id replaces that document.
+    """
+
+    def __init__(self, field_weights: Optional[Mapping[str, float]] = None, k1: float = 1.2, b: float = 0.75):
+        self.field_weights = dict(field_weights or {})
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+        self.built = False
+
+    def rebuild(self, documents: Iterable[Tuple[str, Mapping[str, str]]]) -> None:
+        """Replace the index contents with (doc_id, fields) pairs."""
+        self._postings = {}
+        self._doc_terms = {}
+        self._doc_lengths = {}
+        self._total_length = 0.0
+        for doc_id, fields in documents:
+            self.add(doc_id, fields)
+        self.built = True
+
+    def add(self, doc_id: str, fields: Mapping[str, str]) -> None:
+        """Index a document, replacing any previous version of it."""
+        self.remove(doc_id)
+
+        frequencies: Counter = Counter()
+        for field_name, text in fields.items():
+            weight = self.field_weights.get(field_name, 1.0)
+            for term in tokenize_terms(text):
+                frequencies[term] += weight
+        if not frequencies:
+            return
+
+        terms = dict(frequencies)
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = sum(terms.values())
+        self._total_length += self._doc_lengths[doc_id]
+
+    def remove(self, doc_id: str) -> None:
+        """Drop a document; unknown ids are ignored."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+
+    def search(self, query: str, limit: Optional[int] = 100) -> List[ScoredId]:
+        """Best-matching documents for ``query`` as (doc_id, score), best first.
+
+        ``limit=None`` returns every document that contains a query term.
+        """
+        terms = set(tokenize_terms(query))
+        if not terms or not self._doc_lengths:
+            return []
+
+        count = len(self._doc_lengths)
+        average_length = self._total_length / count
+        scores: Dict[str, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1.0 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+
+        if limit is None:
+            return sorted(scores.items(), key=lambda entry: (-entry[1], entry[0]))
+        return heapq.nsmallest(limit, scores.items(), key=lambda entry: (-entry[1], entry[0]))
+
+    def matching(self, query: str) -> Set[str]:
+        """Ids of documents containing every term of ``query``.
+
+        A query without usable terms (empty or only stop words) matches
+        every document.
+        """
+        terms = set(tokenize_terms(query))
+        if not terms:
+            return set(self._doc_lengths)
+
+        postings = sorted((self._postings.get(term, {}) for term in terms), key=len)
+        matches = set(postings[0])
+        for term_postings in postings[1:]:
+            matches.intersection_update(term_postings)
+            if not matches:
+                break
+        return matches
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
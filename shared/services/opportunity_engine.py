@@ -15,6 +15,7 @@ import asyncio
 import json
 import logging
 import hashlib
+import re
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass
@@ -36,6 +37,7 @@ from shared.vector_db import (
     market_signal_vector_service
 )
 from shared.cache import cache_manager, CacheKeys
+from shared.services.similarity_join import tokenize, jaccard, candidate_pairs, TokenSetIndex, UnionFind
 from shared.services.scoring_algorithms import (
     advanced_scoring_engine,
     MarketValidationScorer,
@@ -45,6 +47,9 @@ from shared.services.scoring_algorithms import (
 
 logger = logging.getLogger(__name__)
 
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 @dataclass
 class SignalCluster:
@@ -88,6 +93,38 @@ class DuplicationResult:
     confidence: float = 0.0
 
 
+@dataclass
+class IndexedOpportunity:
+    """Pre-tokenized opportunity held in a deduplication index"""
+    opportunity_id: Optional[str]
+    words: frozenset
+    ai_solution_types: frozenset
+
+
+class OpportunityDedupIndex:
+    """
+    In-memory index of existing opportunities for one deduplication run.
+    
+    Holds a normalized-title hash map for exact matches and a token-set
+    index for semantic candidates, so each candidate is compared only with
+    opportunities that can reach the similarity threshold.
+    """
+    
+    def __init__(self, entries: List[IndexedOpportunity], titles: Dict[str, Optional[str]], min_jaccard: float):
+        self.entries = entries
+        self.titles = titles
+        self.token_index = TokenSetIndex(min_jaccard, [entry.words for entry in entries])
+    
+    def add(self, normalized_title: str, entry: IndexedOpportunity) -> None:
+        """Add an opportunity accepted during this run."""
+        self.titles.setdefault(normalized_title, entry.opportunity_id)
+        self.entries.append(entry)
+        self.token_index.add(entry.words)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
 class OpportunityEngine:
     """
     Core engine for converting market signals into validated opportunities.
@@ -107,6 +144,7 @@ class OpportunityEngine:
         self.exact_match_threshold = self.config.get("exact_match_threshold", 0.95)
         self.semantic_similarity_threshold = self.config.get("semantic_similarity_threshold", 0.80)
         self.partial_similarity_threshold = self.config.get("partial_similarity_threshold", 0.65)
+        self.dedup_lookback_days = self.config.get("dedup_lookback_days", 90)
         
         # AI solution type keywords for classification
         self.ai_solution_keywords = {
@@ -204,31 +242,22 @@ class OpportunityEngine:
         if not signals:
             return []
         
-        # Group signals by basic similarity first
+        # Tokenize each signal once; bonuses for matching type and source can
+        # add at most 0.15, so that bounds the Jaccard needed for a match
+        token_sets = [tokenize(signal.get("content", "")) for signal in signals]
+        min_jaccard = self.similarity_threshold - 0.15
+        
+        components = UnionFind(len(signals))
+        for i, j in candidate_pairs(token_sets, min_jaccard):
+            similarity = self._token_similarity(signals[i], signals[j], token_sets[i], token_sets[j])
+            if similarity >= self.similarity_threshold:
+                components.union(i, j)
+        
         clusters = []
-        processed_signals = set()
-        
-        for i, signal in enumerate(signals):
-            if i in processed_signals:
-                continue
-            
-            # Start new cluster with this signal
-            cluster_signals = [signal]
-            processed_signals.add(i)
-            
-            # Find similar signals
-            for j, other_signal in enumerate(signals[i+1:], i+1):
-                if j in processed_signals:
-                    continue
-                
-                similarity = await self._calculate_signal_similarity(signal, other_signal)
-                if similarity >= self.similarity_threshold:
-                    cluster_signals.append(other_signal)
-                    processed_signals.add(j)
-            
+        for members in components.groups():
             # Create cluster if it has enough signals
-            if len(cluster_signals) >= 2:  # Minimum cluster size
-                cluster = await self._create_signal_cluster(cluster_signals)
+            if len(members) >= 2:  # Minimum cluster size
+                cluster = await self._create_signal_cluster([signals[i] for i in members])
                 clusters.append(cluster)
         
         # Sort clusters by potential (highest first)
@@ -251,25 +280,26 @@ class OpportunityEngine:
         Returns:
             Similarity score (0.0 to 1.0)
         """
-        # Extract content for comparison
-        content1 = signal1.get("content", "").lower()
-        content2 = signal2.get("content", "").lower()
-        
-        if not content1 or not content2:
-            return 0.0
-        
+        return self._token_similarity(
+            signal1,
+            signal2,
+            tokenize(signal1.get("content", "")),
+            tokenize(signal2.get("content", ""))
+        )
+    
+    @staticmethod
+    def _token_similarity(
+        signal1: Dict[str, Any],
+        signal2: Dict[str, Any],
+        words1: frozenset,
+        words2: frozenset
+    ) -> float:
+        """Signal similarity from pre-tokenized content."""
         # Simple keyword-based similarity (in production, use embeddings)
-        words1 = set(content1.split())
-        words2 = set(content2.split())
-        
         if not words1 or not words2:
             return 0.0
         
-        # Jaccard similarity
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        jaccard_similarity = intersection / union if union > 0 else 0.0
+        jaccard_similarity = jaccard(words1, words2)
         
         # Boost similarity for same signal type
         type_bonus = 0.1 if signal1.get("signal_type") == signal2.get("signal_type") else 0.0
@@ -643,13 +673,22 @@ class OpportunityEngine:
         Returns:
             List of unique opportunity candidates
         """
+        if not candidates:
+            return []
+        
         unique_candidates = []
+        dedup_index = await self._load_dedup_index(db)
         
         for candidate in candidates:
-            duplication_result = await self._check_opportunity_duplication(db, candidate)
+            duplication_result = await self._check_opportunity_duplication(db, candidate, dedup_index)
             
             if not duplication_result.is_duplicate:
                 unique_candidates.append(candidate)
+                # Later candidates in the batch are checked against this one too
+                dedup_index.add(
+                    self._normalize_text(candidate.title),
+                    self._index_entry(None, candidate.title, candidate.description, candidate.ai_solution_types)
+                )
                 logger.debug(f"Opportunity candidate {candidate.candidate_id} is unique")
             else:
                 logger.info(
@@ -661,10 +700,71 @@ class OpportunityEngine:
         
         return unique_candidates
     
+    async def _load_dedup_index(self, db: AsyncSession) -> OpportunityDedupIndex:
+        """
+        Load non-rejected opportunities from the lookback window into an index.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            OpportunityDedupIndex reused for every candidate in the run
+        """
+        cutoff_date = datetime.utcnow() - timedelta(days=self.dedup_lookback_days)
+        
+        query = select(
+            Opportunity.id,
+            Opportunity.title,
+            Opportunity.description,
+            Opportunity.ai_solution_types
+        ).where(
+            and_(
+                Opportunity.created_at >= cutoff_date,
+                Opportunity.status != OpportunityStatus.REJECTED
+            )
+        ).order_by(desc(Opportunity.created_at))
+        
+        result = await db.execute(query)
+        
+        entries = []
+        titles: Dict[str, Optional[str]] = {}
+        for row in result.all():
+            # Rows come back newest first, so keep the newest exact match
+            titles.setdefault(self._normalize_text(row.title), row.id)
+            entries.append(self._index_entry(row.id, row.title, row.description, row.ai_solution_types))
+        
+        # Combined similarity is 0.7 * Jaccard + 0.3 * AI type overlap, so this
+        # is the lowest Jaccard that can still reach the partial threshold
+        min_jaccard = (self.partial_similarity_threshold - 0.3) / 0.7
+        
+        logger.debug(f"Loaded {len(entries)} opportunities into deduplication index")
+        return OpportunityDedupIndex(entries, titles, min_jaccard)
+    
+    @staticmethod
+    def _index_entry(
+        opportunity_id: Optional[str],
+        title: Optional[str],
+        description: Optional[str],
+        ai_solution_types: Any
+    ) -> IndexedOpportunity:
+        """Tokenize an opportunity once for the deduplication index."""
+        if isinstance(ai_solution_types, str):
+            try:
+                ai_solution_types = json.loads(ai_solution_types)
+            except json.JSONDecodeError:
+                ai_solution_types = []
+        
+        return IndexedOpportunity(
+            opportunity_id=opportunity_id,
+            words=tokenize(f"{title} {description}"),
+            ai_solution_types=frozenset(ai_solution_types or [])
+        )
+    
     async def _check_opportunity_duplication(
         self, 
         db: AsyncSession,
-        candidate: OpportunityCandidate
+        candidate: OpportunityCandidate,
+        dedup_index: Optional[OpportunityDedupIndex] = None
     ) -> DuplicationResult:
         """
         Check if opportunity candidate is a duplicate of existing opportunities.
@@ -672,68 +772,69 @@ class OpportunityEngine:
         Args:
             db: Database session
             candidate: Opportunity candidate to check
+            dedup_index: Index loaded for the current run (loaded if omitted)
             
         Returns:
             DuplicationResult with duplication analysis
         """
-        # Get recent opportunities for comparison (last 90 days)
-        cutoff_date = datetime.utcnow() - timedelta(days=90)
+        if dedup_index is None:
+            dedup_index = await self._load_dedup_index(db)
         
-        query = select(Opportunity).where(
-            and_(
-                Opportunity.created_at >= cutoff_date,
-                Opportunity.status != OpportunityStatus.REJECTED
-            )
-        ).order_by(desc(Opportunity.created_at)).limit(100)  # Limit for performance
+        if not len(dedup_index):
+            return DuplicationResult(is_duplicate=False, similarity_score=0.0)
         
-        result = await db.execute(query)
-        existing_opportunities = result.scalars().all()
+        # Exact title match
+        normalized_title = self._normalize_text(candidate.title)
+        if normalized_title in dedup_index.titles:
+            return DuplicationResult(
+                is_duplicate=True,
+                similarity_score=1.0,
+                existing_opportunity_id=dedup_index.titles[normalized_title],
+                similarity_type="exact",
+                confidence=1.0
+            )
         
-        if not existing_opportunities:
+        # Semantic similarity check against indexed candidates only
+        candidate_entry = self._index_entry(
+            None, candidate.title, candidate.description, candidate.ai_solution_types
+        )
+        best_similarity = 0.0
+        best_match = None
+        for position in dedup_index.token_index.candidates(candidate_entry.words):
+            existing = dedup_index.entries[position]
+            semantic_similarity = self._combined_similarity(candidate_entry, existing)
+            if semantic_similarity > best_similarity:
+                best_similarity = semantic_similarity
+                best_match = existing
+        
+        if best_match is None:
             return DuplicationResult(is_duplicate=False, similarity_score=0.0)
         
-        # Check for duplicates
-        for existing_opp in existing_opportunities:
-            # Exact title match
-            if self._normalize_text(candidate.title) == self._normalize_text(existing_opp.title):
-                return DuplicationResult(
-                    is_duplicate=True,
-                    similarity_score=1.0,
-                    existing_opportunity_id=existing_opp.id,
-                    similarity_type="exact",
-                    confidence=1.0
-                )
-            
-            # Semantic similarity check
-            semantic_similarity = await self._calculate_semantic_similarity(
-                candidate, existing_opp
+        if best_similarity >= self.exact_match_threshold:
+            return DuplicationResult(
+                is_duplicate=True,
+                similarity_score=best_similarity,
+                existing_opportunity_id=best_match.opportunity_id,
+                similarity_type="semantic",
+                confidence=0.9
+            )
+        elif best_similarity >= self.semantic_similarity_threshold:
+            return DuplicationResult(
+                is_duplicate=True,
+                similarity_score=best_similarity,
+                existing_opportunity_id=best_match.opportunity_id,
+                similarity_type="semantic",
+                confidence=0.8
+            )
+        elif best_similarity >= self.partial_similarity_threshold:
+            # Partial similarity - might be related but not duplicate
+            # For now, we'll allow it but log it
+            logger.info(
+                f"Partial similarity detected",
+                candidate_id=candidate.candidate_id,
+                existing_id=best_match.opportunity_id,
+                similarity=best_similarity
             )
-            
-            if semantic_similarity >= self.exact_match_threshold:
-                return DuplicationResult(
-                    is_duplicate=True,
-                    similarity_score=semantic_similarity,
-                    existing_opportunity_id=existing_opp.id,
-                    similarity_type="semantic",
-                    confidence=0.9
-                )
-            elif semantic_similarity >= self.semantic_similarity_threshold:
-                return DuplicationResult(
-                    is_duplicate=True,
-                    similarity_score=semantic_similarity,
-                    existing_opportunity_id=existing_opp.id,
-                    similarity_type="semantic",
-                    confidence=0.8
-                )
-            elif semantic_similarity >= self.partial_similarity_threshold:
-                # Partial similarity - might be related but not duplicate
-                # For now, we'll allow it but log it
-                logger.info(
-                    f"Partial similarity detected",
-                    candidate_id=candidate.candidate_id,
-                    existing_id=existing_opp.id,
-                    similarity=semantic_similarity
-                )
         
         return DuplicationResult(is_duplicate=False, similarity_score=0.0)
     
@@ -743,9 +844,8 @@ class OpportunityEngine:
             return ""
         
         # Convert to lowercase, remove extra spaces, remove punctuation
-        import re
-        normalized = re.sub(r'[^\w\s]', '', text.lower())
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        normalized = _PUNCTUATION_RE.sub('', text.lower())
+        normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
         return normalized
     
     async def _calculate_semantic_similarity(
@@ -765,37 +865,27 @@ class OpportunityEngine:
         """
         # For now, use simple text similarity
         # In production, this would use vector embeddings
-        
-        candidate_text = f"{candidate.title} {candidate.description}".lower()
-        existing_text = f"{existing_opportunity.title} {existing_opportunity.description}".lower()
-        
-        # Simple word-based similarity
-        candidate_words = set(candidate_text.split())
-        existing_words = set(existing_text.split())
-        
-        if not candidate_words or not existing_words:
+        return self._combined_similarity(
+            self._index_entry(None, candidate.title, candidate.description, candidate.ai_solution_types),
+            self._index_entry(
+                None,
+                existing_opportunity.title,
+                existing_opportunity.description,
+                existing_opportunity.ai_solution_types
+            )
+        )
+    
+    @staticmethod
+    def _combined_similarity(candidate: IndexedOpportunity, existing: IndexedOpportunity) -> float:
+        """Word Jaccard boosted by AI solution type overlap."""
+        if not candidate.words or not existing.words:
             return 0.0
         
-        intersection = len(candidate_words.intersection(existing_words))
-        union = len(candidate_words.union(existing_words))
-        
-        jaccard_similarity = intersection / union if union > 0 else 0.0
+        # Simple word-based similarity
+        jaccard_similarity = jaccard(candidate.words, existing.words)
         
         # Boost similarity for same AI solution types
-        candidate_ai_types = set(candidate.ai_solution_types)
-        existing_ai_types = set()
-        
-        if existing_opportunity.ai_solution_types:
-            try:
-                existing_ai_types = set(json.loads(existing_opportunity.ai_solution_types))
-            except json.JSONDecodeError:
-                pass
-        
-        ai_type_similarity = 0.0
-        if candidate_ai_types and existing_ai_types:
-            ai_intersection = len(candidate_ai_types.intersection(existing_ai_types))
-            ai_union = len(candidate_ai_types.union(existing_ai_types))
-            ai_type_similarity = ai_intersection / ai_union if ai_union > 0 else 0.0
+        ai_type_similarity = jaccard(candidate.ai_solution_types, existing.ai_solution_types)
         
         # Combined similarity
         combined_similarity = (jaccard_similarity * 0.7) + (ai_type_similarity * 0.3)
@@ -8,12 +8,18 @@ Requirements 7.1-7.5 (Implementation Guidance System),
 Requirements 8.1-8.5 (Business Intelligence and ROI Analysis).
 """
 
+import asyncio
+import base64
+import bisect
 import json
-from typing import List, Optional, Dict, Any, Tuple
+import time
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import List, Optional, Dict, Any, Sequence, Set, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, func, and_, or_, desc, asc
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import select, update, func, and_, or_, desc, asc, inspect as sa_inspect
+from sqlalchemy.orm import selectinload, joinedload, load_only
 
 from shared.models.opportunity import Opportunity, OpportunityStatus
 from shared.models.market_signal import MarketSignal
@@ -26,21 +32,160 @@ from shared.schemas.opportunity import (
     OpportunitySearchRequest,
     OpportunityRecommendationRequest
 )
-from shared.cache import CacheKeys
+from shared.cache import CacheKeys, CacheTags, canonical_hash
 try:
     from shared.cache import cache_manager
 except ImportError:
     cache_manager = None
 from shared.vector_db import opportunity_vector_service
 from shared.services.user_service import user_service
+from shared.services.lexical_index import BM25Index, reciprocal_rank_fusion
+from shared.services.facet_index import FacetIndex
+from shared.event_bus import EventHandler, EventType, Event
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _list_columns() -> Tuple[Any, ...]:
+    """Opportunity columns rendered by OpportunityResponse (no relationships)."""
+    return tuple(
+        getattr(Opportunity, column.key)
+        for column in sa_inspect(Opportunity).column_attrs
+        if column.key in OpportunityResponse.model_fields
+    )
+
+
+def _search_fingerprint(search_request: OpportunitySearchRequest) -> str:
+    """Hash of the query and filters, which a cursor must be used with."""
+    return canonical_hash(
+        search_request.model_dump(mode="json", exclude={"page", "page_size", "cursor"})
+    )[:16]
+
+
+SEARCH_FACETS = (
+    "status",
+    "ai_solution_types",
+    "target_industries",
+    "implementation_complexity",
+    "geographic_scope",
+    "validation_score_ranges",
+    "tags"
+)
+
+VALIDATION_SCORE_RANGES = ("0-2", "2-4", "4-6", "6-8", "8-10")
+
+
+def _validation_score_range(score: float) -> str:
+    """Facet bucket for a validation score (scores of 8 and above share the top bucket)."""
+    return VALIDATION_SCORE_RANGES[min(max(int(score // 2), 0), len(VALIDATION_SCORE_RANGES) - 1)]
+
+
+@lru_cache(maxsize=1)
+def _search_index_columns() -> Tuple[Any, ...]:
+    """Columns read to build the keyword and facet indexes."""
+    return (
+        Opportunity.id,
+        Opportunity.title,
+        Opportunity.summary,
+        Opportunity.description,
+        Opportunity.tags,
+        Opportunity.status,
+        Opportunity.validation_score,
+        Opportunity.ai_solution_types,
+        Opportunity.target_industries,
+        Opportunity.implementation_complexity,
+        Opportunity.geographic_scope
+    )
+
+
+def _parse_json_list(value: Optional[str]) -> List[str]:
+    """Parse a JSON list column, treating bad or missing data as empty."""
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+def _lexical_fields(opportunity: Any) -> Dict[str, str]:
+    """Weighted text fields of an opportunity for the keyword index."""
+    return {
+        "title": getattr(opportunity, "title", None) or "",
+        "summary": getattr(opportunity, "summary", None) or "",
+        "description": getattr(opportunity, "description", None) or "",
+        "tags": " ".join(str(tag) for tag in _parse_json_list(getattr(opportunity, "tags", None)))
+    }
+
+
+def _facet_values(opportunity: Any) -> Optional[Dict[str, List[Any]]]:
+    """Facet values of an opportunity, or None for rejected ones (never faceted)."""
+    status = getattr(opportunity, "status", None)
+    status = getattr(status, "value", status)
+    if status == OpportunityStatus.REJECTED.value:
+        return None
+    
+    return {
+        "status": [status],
+        "ai_solution_types": _parse_json_list(getattr(opportunity, "ai_solution_types", None)),
+        "target_industries": _parse_json_list(getattr(opportunity, "target_industries", None)),
+        "implementation_complexity": [getattr(opportunity, "implementation_complexity", None)],
+        "geographic_scope": [getattr(opportunity, "geographic_scope", None)],
+        "validation_score_ranges": [
+            _validation_score_range(getattr(opportunity, "validation_score", None) or 0)
+        ],
+        "tags": _parse_json_list(getattr(opportunity, "tags", None))
+    }
+
+
+def _encode_search_cursor(score: float, opportunity_id: str, fingerprint: str) -> str:
+    payload = json.dumps({"s": score, "id": opportunity_id, "q": fingerprint}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode_search_cursor(cursor: str, fingerprint: str) -> Tuple[float, str]:
+    """Return the (score, opportunity_id) position a cursor points after."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        position = (float(payload["s"]), str(payload["id"]))
+        cursor_fingerprint = payload["q"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid search cursor")
+    if cursor_fingerprint != fingerprint:
+        raise ValueError("Search cursor does not match the query and filters")
+    return position
+
+
 class OpportunityService:
     """Service for opportunity management and operations."""
     
+    # Ranked vector matches (ids and scores) fetched per round of a semantic
+    # search; the request doubles until the page is covered, up to
+    # ``semantic_search_max_results`` (the vector index's top_k limit)
+    semantic_search_batch_size = 1000
+    semantic_search_max_results = 10000
+    
+    # Keyword and facet index settings; opportunity events keep the indexes
+    # current, and a background rebuild after ``search_index_refresh_seconds``
+    # catches anything an event missed
+    lexical_field_weights = {"title": 3.0, "summary": 2.0, "tags": 2.0, "description": 1.0}
+    search_index_refresh_seconds = 600
+    search_filter_batch_size = 5000
+    rrf_k = 60
+    
+    def __init__(self):
+        self.lexical_index = BM25Index(field_weights=self.lexical_field_weights)
+        self.facet_index = FacetIndex(SEARCH_FACETS)
+        self._search_index_lock = asyncio.Lock()
+        self._search_index_built_at = 0.0
+        self._search_index_refresh_task: Optional[asyncio.Task] = None
+        # Index changes made while a rebuild runs, as (id, lexical fields, facet
+        # values) and replayed onto the new indexes
+        self._search_index_replay: Optional[List[Tuple[str, Any, Any]]] = None
+    
     async def create_opportunity(
         self, 
         db: AsyncSession, 
@@ -170,38 +315,45 @@ class OpportunityService:
             discovered_by=discovered_by_agent
         )
         
-        return CreatedOpportunity(
-            id=opportunity_id,
-            title=opportunity_data.title,
-            description=opportunity_data.description, 
-            summary=opportunity_data.summary or "",
-            created_at=created_row[1] if created_row else None
-        )
+        self._index_opportunity(SimpleNamespace(id=opportunity_id, **opportunity_dict))
         
-        # Publish opportunity created event
+        # Publish opportunity created event (drops cached rankings, among others)
         try:
             from shared.event_config import publish_opportunity_created
             await publish_opportunity_created(
-                opportunity_id=opportunity.id,
-                title=opportunity.title,
-                description=opportunity.description,
+                opportunity_id=opportunity_id,
+                title=opportunity_data.title,
+                description=opportunity_data.description,
+                ai_solution_type=(opportunity_data.ai_solution_types or [None])[0],
                 ai_solution_types=opportunity_data.ai_solution_types,
                 discovery_method=discovered_by_agent,
-                status=opportunity.status.value
+                status=opportunity_dict['status']
             )
         except Exception as e:
             logger.warning("Failed to publish opportunity created event", error=str(e))
         
-        # Clear relevant caches
+        # Clear relevant caches so cached searches pick up the new opportunity
         await self._clear_opportunity_caches()
         
-        # Generate and store embedding for semantic search
+        # Generate and store embedding so semantic and hybrid search can find it
+        opportunity.id = opportunity_id
+        if created_row:
+            opportunity.created_at, opportunity.updated_at = created_row[1], created_row[2]
         await self._generate_and_store_embedding(opportunity)
         
         # Initiate validation workflow (Requirement 2.1)
-        await self._initiate_validation_workflow(db, opportunity)
+        try:
+            await self._initiate_validation_workflow(db, opportunity)
+        except Exception as e:
+            logger.warning("Failed to initiate validation workflow", error=str(e))
         
-        return opportunity
+        return CreatedOpportunity(
+            id=opportunity_id,
+            title=opportunity_data.title,
+            description=opportunity_data.description, 
+            summary=opportunity_data.summary or "",
+            created_at=created_row[1] if created_row else None
+        )
     
     async def get_opportunity_by_id(
         self, 
@@ -306,6 +458,8 @@ class OpportunityService:
             updated_fields=list(update_data.keys())
         )
         
+        self._index_opportunity(opportunity)
+        
         # Publish opportunity updated event
         try:
             from shared.event_bus import EventType, publish_event
@@ -346,6 +500,19 @@ class OpportunityService:
         Returns:
             Tuple of (opportunities list, total count)
         """
+        # Try cache first; results are keyed on the request alone, so every
+        # worker shares them until an opportunity changes
+        cache_key = CacheKeys.hashed_key(CacheKeys.OPPORTUNITY_SEARCH, search_request.model_dump(mode="json"))
+        if cache_manager is not None:
+            try:
+                cached_search = await cache_manager.get(cache_key)
+                if cached_search:
+                    opportunities = await self._get_opportunities_in_order(db, cached_search["opportunity_ids"])
+                    return opportunities, cached_search["total_count"]
+            except Exception:
+                # If cache fails, continue to database query
+                pass
+        
         # Build base query
         query = select(Opportunity).options(
             selectinload(Opportunity.market_signals),
@@ -353,34 +520,7 @@ class OpportunityService:
         )
         
         # Apply filters
-        filters = []
-        
-        # Status filter
-        if search_request.status:
-            filters.append(Opportunity.status.in_(search_request.status))
-        else:
-            # Default to non-rejected opportunities
-            filters.append(Opportunity.status != OpportunityStatus.archived)
-        
-        # Validation score filter
-        if search_request.min_validation_score is not None:
-            filters.append(Opportunity.validation_score >= search_request.min_validation_score)
-        if search_request.max_validation_score is not None:
-            filters.append(Opportunity.validation_score <= search_request.max_validation_score)
-        
-        # Market size filter
-        if search_request.min_market_size is not None:
-            # This would require parsing the JSON market_size_estimate
-            # For now, we'll skip this complex filter
-            pass
-        
-        # Geographic scope filter
-        if search_request.geographic_scope:
-            filters.append(Opportunity.geographic_scope.ilike(f"%{search_request.geographic_scope}%"))
-        
-        # Implementation complexity filter
-        if search_request.implementation_complexity:
-            filters.append(Opportunity.implementation_complexity.in_(search_request.implementation_complexity))
+        filters = self._build_search_filters(search_request)
         
         # Apply all filters
         if filters:
@@ -390,7 +530,6 @@ class OpportunityService:
         if search_request.query:
             text_filter = or_(
                 Opportunity.title.ilike(f"%{search_request.query}%"),
-                Opportunity.description.ilike(f"%{search_request.query}%"),
                 Opportunity.description.ilike(f"%{search_request.query}%")
             )
             query = query.where(text_filter)
@@ -422,8 +561,339 @@ class OpportunityService:
             user_id=user_id
         )
         
+        if cache_manager is not None:
+            try:
+                await cache_manager.set(
+                    cache_key,
+                    {"opportunity_ids": [opp.id for opp in opportunities], "total_count": total_count},
+                    expire=300,  # 5 minutes
+                    tags=[CacheTags.OPPORTUNITIES]
+                )
+            except Exception:
+                # If cache fails, continue without caching
+                pass
+        
         return list(opportunities), total_count
     
+    def _build_search_filters(self, search_request: OpportunitySearchRequest) -> List[Any]:
+        """SQL column filters shared by keyword, BM25 and hybrid search."""
+        filters = []
+        
+        # Status filter
+        if search_request.status:
+            filters.append(Opportunity.status.in_(search_request.status))
+        else:
+            # Default to non-rejected opportunities
+            filters.append(Opportunity.status != OpportunityStatus.archived)
+        
+        # Validation score filter
+        if search_request.min_validation_score is not None:
+            filters.append(Opportunity.validation_score >= search_request.min_validation_score)
+        if search_request.max_validation_score is not None:
+            filters.append(Opportunity.validation_score <= search_request.max_validation_score)
+        
+        # Market size filter
+        if search_request.min_market_size is not None:
+            # This would require parsing the JSON market_size_estimate
+            # For now, we'll skip this complex filter
+            pass
+        
+        # Geographic scope filter
+        if search_request.geographic_scope:
+            filters.append(Opportunity.geographic_scope.ilike(f"%{search_request.geographic_scope}%"))
+        
+        # Implementation complexity filter
+        if search_request.implementation_complexity:
+            filters.append(Opportunity.implementation_complexity.in_(search_request.implementation_complexity))
+        
+        return filters
+    
+    async def hybrid_search_opportunities(
+        self,
+        db: AsyncSession,
+        search_request: OpportunitySearchRequest,
+        user_id: Optional[str] = None
+    ) -> Tuple[List[Opportunity], int]:
+        """Relevance-ranked search over the BM25 keyword index, optionally fused with vectors.
+        
+        Supports Requirements 3.1-3.2 and 6.1.2 (Searchable interface and
+        semantic search).
+        
+        In ``bm25`` mode results are ordered by keyword relevance. In
+        ``hybrid`` mode the keyword ranking and the vector similarity ranking
+        are merged with reciprocal-rank fusion; if vector retrieval fails the
+        keyword ranking is used alone. Every keyword match is scored (only the
+        vector ranking is capped at ``semantic_search_batch_size``), filters
+        are applied to all candidates before paging so the total counts every
+        filtered match, and only the page's rows are loaded.
+        
+        Args:
+            db: Database session
+            search_request: Search parameters with query and search_mode
+            user_id: Optional user ID for personalization
+            
+        Returns:
+            Tuple of (opportunities list, total count)
+        """
+        if not search_request.query:
+            return await self.search_opportunities(db, search_request, user_id)
+        
+        await self._ensure_search_indexes(db)
+        rankings = [[doc_id for doc_id, _ in self.lexical_index.search(search_request.query, limit=None)]]
+        
+        if search_request.search_mode == "hybrid":
+            try:
+                similar_opportunities = await opportunity_vector_service.find_similar_opportunities(
+                    query_embedding=await self._query_embedding(search_request),
+                    top_k=self.semantic_search_batch_size,
+                    filters=self._build_vector_filters(search_request),
+                    include_metadata=False
+                )
+                rankings.append([
+                    result["id"] for result in sorted(
+                        similar_opportunities, key=lambda result: (-result["score"], result["id"])
+                    )
+                ])
+            except Exception as e:
+                logger.warning("Vector retrieval failed, using keyword ranking only", error=str(e))
+        
+        fused = reciprocal_rank_fusion(rankings, k=self.rrf_k)
+        allowed_ids = await self._filter_candidate_ids(db, search_request, [doc_id for doc_id, _ in fused])
+        ranked = [(doc_id, score) for doc_id, score in fused if doc_id in allowed_ids]
+        
+        offset = search_request.get_offset()
+        page = ranked[offset:offset + search_request.page_size]
+        opportunities = []
+        if page:
+            result = await db.execute(
+                select(Opportunity).options(
+                    load_only(*_list_columns())
+                ).where(Opportunity.id.in_([doc_id for doc_id, _ in page]))
+            )
+            opportunities_dict = {opp.id: opp for opp in result.scalars().all()}
+            for doc_id, score in page:
+                opp = opportunities_dict.get(doc_id)
+                if opp is not None:
+                    opp._search_score = score
+                    opportunities.append(opp)
+        
+        logger.info(
+            "Hybrid search completed",
+            query=search_request.query,
+            search_mode=search_request.search_mode,
+            keyword_results=len(rankings[0]),
+            vector_results=len(rankings[1]) if len(rankings) > 1 else 0,
+            total_count=len(ranked),
+            user_id=user_id
+        )
+        
+        return opportunities, len(ranked)
+    
+    async def _filter_candidate_ids(
+        self,
+        db: AsyncSession,
+        search_request: OpportunitySearchRequest,
+        candidate_ids: List[str]
+    ) -> Set[str]:
+        """Subset of ``candidate_ids`` that passes the search filters.
+        
+        Column filters run in SQL against the primary key lookup, in batches
+        of ``search_filter_batch_size`` ids to stay under driver parameter
+        limits; the JSON list filters (AI types, industries, tags) match when
+        any value is shared, like the vector metadata filters.
+        """
+        filters = self._build_search_filters(search_request)
+        list_filters = [
+            (position, set(values)) for position, values in (
+                (1, search_request.ai_solution_types),
+                (2, search_request.target_industries),
+                (3, search_request.tags)
+            ) if values
+        ]
+        
+        allowed_ids = set()
+        for start in range(0, len(candidate_ids), self.search_filter_batch_size):
+            result = await db.execute(
+                select(
+                    Opportunity.id,
+                    Opportunity.ai_solution_types,
+                    Opportunity.target_industries,
+                    Opportunity.tags
+                ).where(
+                    Opportunity.id.in_(candidate_ids[start:start + self.search_filter_batch_size]),
+                    *filters
+                )
+            )
+            allowed_ids.update(
+                row[0] for row in result.all()
+                if all(wanted.intersection(_parse_json_list(row[position])) for position, wanted in list_filters)
+            )
+        return allowed_ids
+    
+    async def _ensure_search_indexes(self, db: AsyncSession) -> None:
+        """Build the keyword and facet indexes on first use and refresh them once stale.
+        
+        Only the first build makes a search wait. Once the indexes are stale
+        a background task rebuilds them, and searches keep using the old
+        indexes until the new ones are swapped in.
+        """
+        if self.lexical_index.built and self.facet_index.built:
+            stale = time.monotonic() - self._search_index_built_at >= self.search_index_refresh_seconds
+            if stale and (self._search_index_refresh_task is None or self._search_index_refresh_task.done()):
+                self._search_index_refresh_task = asyncio.create_task(self._refresh_search_indexes())
+            return
+        
+        async with self._search_index_lock:
+            if not (self.lexical_index.built and self.facet_index.built):
+                await self._rebuild_search_indexes(db)
+    
+    async def _refresh_search_indexes(self) -> None:
+        """Rebuild stale search indexes in the background with a session of its own."""
+        from shared.database import get_db_session
+        
+        try:
+            async with self._search_index_lock:
+                async with get_db_session() as db:
+                    await self._rebuild_search_indexes(db)
+        except Exception as e:
+            logger.warning("Failed to refresh search indexes", error=str(e))
+    
+    async def _rebuild_search_indexes(self, db: AsyncSession) -> None:
+        """Rebuild both indexes from one scan of the indexed columns; the caller holds the lock.
+        
+        The indexes are built in a worker thread. Index changes made after
+        the scan starts are replayed onto the new indexes before the swap,
+        so updates that arrive during the rebuild are not lost.
+        """
+        self._search_index_replay = []
+        try:
+            result = await db.execute(select(*_search_index_columns()))
+            lexical_index, facet_index = await asyncio.to_thread(
+                self._build_search_indexes, result.all()
+            )
+            
+            for change in self._search_index_replay:
+                self._apply_search_index_update(lexical_index, facet_index, *change)
+            
+            self.lexical_index = lexical_index
+            self.facet_index = facet_index
+            self._search_index_built_at = time.monotonic()
+        finally:
+            self._search_index_replay = None
+        
+        logger.info(
+            "Search indexes rebuilt",
+            keyword_documents=len(lexical_index),
+            facet_documents=len(facet_index)
+        )
+    
+    def _build_search_indexes(self, rows: Sequence[Any]) -> Tuple[BM25Index, FacetIndex]:
+        """Fresh keyword and facet indexes over the scanned rows."""
+        lexical_index = BM25Index(field_weights=self.lexical_field_weights)
+        lexical_index.rebuild((str(row.id), _lexical_fields(row)) for row in rows)
+        facet_index = FacetIndex(SEARCH_FACETS)
+        facet_index.rebuild(
+            (str(row.id), facet_values) for row in rows
+            if (facet_values := _facet_values(row)) is not None
+        )
+        return lexical_index, facet_index
+    
+    async def refresh_search_index_entry(self, opportunity_id: str) -> None:
+        """Re-read one opportunity into the keyword and facet indexes.
+        
+        Called for opportunity events, including those raised by other
+        workers; does nothing until the indexes are built or being built.
+        """
+        if not self.lexical_index.built and self._search_index_replay is None:
+            return
+        
+        from shared.database import get_db_session
+        
+        async with get_db_session() as db:
+            result = await db.execute(
+                select(*_search_index_columns()).where(Opportunity.id == opportunity_id)
+            )
+            row = result.first()
+        
+        if row is None:
+            self._update_search_indexes(opportunity_id, None, None)
+        else:
+            self._index_opportunity(row)
+    
+    async def subscribe_to_index_updates(self, event_bus) -> None:
+        """Keep the search indexes current as opportunities change."""
+        await event_bus.subscribe_to_events(
+            [
+                EventType.OPPORTUNITY_CREATED,
+                EventType.OPPORTUNITY_UPDATED,
+                EventType.OPPORTUNITY_DELETED,
+                EventType.OPPORTUNITY_VALIDATED
+            ],
+            SearchIndexUpdateHandler(self)
+        )
+    
+    def _index_opportunity(self, opportunity: Any) -> None:
+        """Add or replace one opportunity (a model, row or namespace) in the live search indexes.
+        
+        Does nothing until the indexes are built or being built.
+        """
+        if not self.lexical_index.built and self._search_index_replay is None:
+            return
+        
+        self._update_search_indexes(
+            str(opportunity.id), _lexical_fields(opportunity), _facet_values(opportunity)
+        )
+    
+    def _update_search_indexes(
+        self,
+        opportunity_id: str,
+        lexical_fields: Optional[Dict[str, str]],
+        facet_values: Optional[Dict[str, List[Any]]]
+    ) -> None:
+        """Apply one change to the live indexes and record it for a rebuild in progress."""
+        if self._search_index_replay is not None:
+            self._search_index_replay.append((opportunity_id, lexical_fields, facet_values))
+        if self.lexical_index.built:
+            self._apply_search_index_update(
+                self.lexical_index, self.facet_index, opportunity_id, lexical_fields, facet_values
+            )
+    
+    @staticmethod
+    def _apply_search_index_update(
+        lexical_index: BM25Index,
+        facet_index: FacetIndex,
+        opportunity_id: str,
+        lexical_fields: Optional[Dict[str, str]],
+        facet_values: Optional[Dict[str, List[Any]]]
+    ) -> None:
+        """Index or drop one opportunity; ``None`` removes it from that index."""
+        if lexical_fields is None:
+            lexical_index.remove(opportunity_id)
+        else:
+            lexical_index.add(opportunity_id, lexical_fields)
+        if facet_values is None:
+            facet_index.remove(opportunity_id)
+        else:
+            facet_index.add(opportunity_id, facet_values)
+    
+    async def _get_opportunities_in_order(
+        self,
+        db: AsyncSession,
+        opportunity_ids: List[str]
+    ) -> List[Opportunity]:
+        """Load opportunities by ID, keeping the given order."""
+        if not opportunity_ids:
+            return []
+        
+        query = select(Opportunity).options(
+            selectinload(Opportunity.market_signals),
+            selectinload(Opportunity.validations)
+        ).where(Opportunity.id.in_(opportunity_ids))
+        result = await db.execute(query)
+        
+        id_to_opp = {opp.id: opp for opp in result.scalars().all()}
+        return [id_to_opp[opp_id] for opp_id in opportunity_ids if opp_id in id_to_opp]
+    
     async def get_personalized_recommendations(
         self, 
         db: AsyncSession, 
@@ -517,6 +987,8 @@ class OpportunityService:
                 validation_count=validation_count,
                 status=opportunity.status
             )
+            
+            self._index_opportunity(opportunity)
         
         # Clear caches
         await self._clear_opportunity_caches(opportunity_id)
@@ -740,119 +1212,227 @@ class OpportunityService:
         db: AsyncSession, 
         search_request: OpportunitySearchRequest,
         user_id: Optional[str] = None
-    ) -> Tuple[List[Opportunity], int]:
+    ) -> Tuple[List[Opportunity], int, bool]:
         """Semantic search opportunities using vector similarity.
         
         Supports Requirements 6.1.2 (Semantic search with vector similarity).
         
+        Every filter is pushed into the vector query. Vector metadata can lag
+        behind the database, so the column filters are re-checked for every
+        ranked match (ids only) before paging and counting. Pages are cut from
+        that ranking either by page number or, when ``search_request.cursor``
+        is set, by the (score, id) position of the previous page's last
+        result, which stays stable while opportunities are added or rescored.
+        The vector query starts at ``semantic_search_batch_size`` matches and
+        doubles until it covers the page or reaches
+        ``semantic_search_max_results``; when matches remain beyond the last
+        fetch the total is a lower bound and the result is flagged as
+        truncated. Only the current page's rows are loaded, without
+        relationships.
+        
         Args:
             db: Database session
             search_request: Search parameters with query
             user_id: Optional user ID for personalization
             
         Returns:
-            Tuple of (opportunities list, total count)
+            Tuple of (opportunities list, total count, whether more matches
+            may exist beyond those counted)
+            
+        Raises:
+            ValueError: If the query is missing or the cursor is invalid
         """
         if not search_request.query:
             raise ValueError("Query is required for semantic search")
         
+        after = None
+        if search_request.cursor:
+            after = _decode_search_cursor(search_request.cursor, _search_fingerprint(search_request))
+        
         try:
-            # Generate embedding for search query
-            from shared.services.ai_service import ai_service
+            query_embedding = await self._query_embedding(search_request)
+            vector_filters = self._build_vector_filters(search_request)
+            db_filters = self._build_semantic_db_filters(search_request)
             
-            # Create filter context for embedding
-            filter_context = {}
-            if search_request.ai_solution_types:
-                filter_context["ai_solution_types"] = search_request.ai_solution_types
-            if search_request.target_industries:
-                filter_context["target_industries"] = search_request.target_industries
-            if search_request.tags:
-                filter_context["tags"] = search_request.tags
-            
-            query_embedding = await ai_service.generate_search_query_embedding(
-                search_request.query, filter_context
-            )
-            
-            # Build vector search filters
-            vector_filters = {}
-            if search_request.status:
-                vector_filters["status"] = {"$in": [s.value for s in search_request.status]}
-            if search_request.min_validation_score is not None:
-                vector_filters["validation_score"] = {"$gte": search_request.min_validation_score}
-            if search_request.geographic_scope:
-                vector_filters["geographic_scope"] = search_request.geographic_scope
-            
-            # Perform vector similarity search
-            similar_opportunities = await opportunity_vector_service.find_similar_opportunities(
-                query_embedding=query_embedding,
-                top_k=min(search_request.page_size * 3, 100),  # Get more results for filtering
-                filters=vector_filters
-            )
-            
-            # Extract opportunity IDs and similarity scores
-            opportunity_ids = [result["id"] for result in similar_opportunities]
-            similarity_scores = {result["id"]: result["score"] for result in similar_opportunities}
+            top_k = min(self.semantic_search_batch_size, self.semantic_search_max_results)
+            checked: Dict[str, bool] = {}
+            while True:
+                # Perform vector similarity search with every filter applied in the index
+                similar_opportunities = await opportunity_vector_service.find_similar_opportunities(
+                    query_embedding=query_embedding,
+                    top_k=top_k,
+                    filters=vector_filters,
+                    include_metadata=False
+                )
+                truncated = len(similar_opportunities) >= top_k
+                
+                # Vector metadata can lag behind the database, so re-check the
+                # column filters (and that the row still exists) for new matches
+                unchecked = [result["id"] for result in similar_opportunities if result["id"] not in checked]
+                allowed_ids = await self._filter_semantic_ids(db, db_filters, unchecked)
+                checked.update((opp_id, opp_id in allowed_ids) for opp_id in unchecked)
+                
+                # Rank by score, then id, so equal scores page deterministically
+                ranked = sorted(
+                    (
+                        (round(float(result["score"]), 6), result["id"])
+                        for result in similar_opportunities if checked[result["id"]]
+                    ),
+                    key=lambda entry: (-entry[0], entry[1])
+                )
+                
+                if after is not None:
+                    sort_keys = [(-score, opp_id) for score, opp_id in ranked]
+                    position = bisect.bisect_right(sort_keys, (-after[0], after[1]))
+                else:
+                    position = search_request.get_offset()
+                
+                covered = position + search_request.page_size <= len(ranked)
+                if covered or not truncated or top_k >= self.semantic_search_max_results:
+                    break
+                top_k = min(top_k * 2, self.semantic_search_max_results)
             
-            if not opportunity_ids:
+            total_count = len(ranked)
+            if not ranked:
                 logger.info("No similar opportunities found in vector search", query=search_request.query)
-                return [], 0
-            
-            # Fetch full opportunity data from database
-            query = select(Opportunity).options(
-                selectinload(Opportunity.market_signals),
-                selectinload(Opportunity.validations)
-            ).where(Opportunity.id.in_(opportunity_ids))
-            
-            # Apply additional filters
-            filters = []
-            
-            if search_request.max_validation_score is not None:
-                filters.append(Opportunity.validation_score <= search_request.max_validation_score)
-            
-            if search_request.implementation_complexity:
-                filters.append(Opportunity.implementation_complexity.in_(search_request.implementation_complexity))
-            
-            if filters:
-                query = query.where(and_(*filters))
+                return [], 0, truncated
             
-            # Execute query
-            result = await db.execute(query)
-            opportunities = result.scalars().all()
-            
-            # Sort by similarity score (vector search results are already sorted)
-            opportunities_dict = {opp.id: opp for opp in opportunities}
-            sorted_opportunities = []
-            
-            for opp_id in opportunity_ids:
-                if opp_id in opportunities_dict:
-                    opp = opportunities_dict[opp_id]
-                    # Add similarity score as metadata (could be used for ranking)
-                    opp._similarity_score = similarity_scores[opp_id]
-                    sorted_opportunities.append(opp)
-            
-            # Apply pagination
-            total_count = len(sorted_opportunities)
-            start_idx = search_request.get_offset()
-            end_idx = start_idx + search_request.page_size
-            paginated_opportunities = sorted_opportunities[start_idx:end_idx]
+            page: List[Opportunity] = []
+            batch = ranked[position:position + search_request.page_size]
+            if batch:
+                result = await db.execute(
+                    select(Opportunity).options(
+                        load_only(*_list_columns())
+                    ).where(Opportunity.id.in_([opp_id for _, opp_id in batch]))
+                )
+                opportunities_dict = {opp.id: opp for opp in result.scalars().all()}
+                
+                for score, opp_id in batch:
+                    opp = opportunities_dict.get(opp_id)
+                    if opp is not None:
+                        # Similarity score is used to build the next page's cursor
+                        opp._similarity_score = score
+                        page.append(opp)
             
             logger.info(
                 "Semantic search completed",
                 query=search_request.query,
                 vector_results=len(similar_opportunities),
-                db_results=len(opportunities),
-                final_results=len(paginated_opportunities),
+                final_results=len(page),
                 total_count=total_count,
+                truncated=truncated,
+                cursor=bool(search_request.cursor),
                 user_id=user_id
             )
             
-            return paginated_opportunities, total_count
+            return page, total_count, truncated
             
         except Exception as e:
             logger.error("Semantic search failed", error=str(e), query=search_request.query)
             # Fall back to regular text search
             logger.info("Falling back to regular text search")
-            return await self.search_opportunities(db, search_request, user_id)
+            opportunities, total_count = await self.search_opportunities(db, search_request, user_id)
+            return opportunities, total_count, False
+    
+    async def _filter_semantic_ids(
+        self,
+        db: AsyncSession,
+        db_filters: List[Any],
+        candidate_ids: List[str]
+    ) -> Set[str]:
+        """Subset of ``candidate_ids`` that still exists and passes ``db_filters``.
+        
+        Checked in batches of ``search_filter_batch_size`` ids to stay under
+        driver parameter limits.
+        """
+        allowed_ids = set()
+        for start in range(0, len(candidate_ids), self.search_filter_batch_size):
+            result = await db.execute(
+                select(Opportunity.id).where(
+                    Opportunity.id.in_(candidate_ids[start:start + self.search_filter_batch_size]),
+                    *db_filters
+                )
+            )
+            allowed_ids.update(str(opp_id) for opp_id in result.scalars().all())
+        return allowed_ids
+    
+    async def _query_embedding(self, search_request: OpportunitySearchRequest) -> List[float]:
+        """Embed the search query, with the list filters as context."""
+        from shared.services.ai_service import ai_service
+        
+        # Create filter context for embedding
+        filter_context = {}
+        if search_request.ai_solution_types:
+            filter_context["ai_solution_types"] = search_request.ai_solution_types
+        if search_request.target_industries:
+            filter_context["target_industries"] = search_request.target_industries
+        if search_request.tags:
+            filter_context["tags"] = search_request.tags
+        
+        return await ai_service.generate_search_query_embedding(
+            search_request.query, filter_context
+        )
+    
+    def semantic_search_cursor(
+        self,
+        search_request: OpportunitySearchRequest,
+        opportunities: List[Opportunity]
+    ) -> Optional[str]:
+        """Cursor for the page after ``opportunities``, or None on the last page.
+        
+        Results from the text-search fallback carry no similarity score and
+        get no cursor.
+        """
+        if not opportunities or len(opportunities) < search_request.page_size:
+            return None
+        score = getattr(opportunities[-1], "_similarity_score", None)
+        if not isinstance(score, (int, float)):
+            return None
+        return _encode_search_cursor(score, opportunities[-1].id, _search_fingerprint(search_request))
+    
+    def _build_vector_filters(self, search_request: OpportunitySearchRequest) -> Dict[str, Any]:
+        """Translate search filters into a vector metadata filter."""
+        vector_filters: Dict[str, Any] = {}
+        if search_request.status:
+            vector_filters["status"] = {"$in": [s.value for s in search_request.status]}
+        
+        score_range = {}
+        if search_request.min_validation_score is not None:
+            score_range["$gte"] = search_request.min_validation_score
+        if search_request.max_validation_score is not None:
+            score_range["$lte"] = search_request.max_validation_score
+        if score_range:
+            vector_filters["validation_score"] = score_range
+        
+        if search_request.geographic_scope:
+            vector_filters["geographic_scope"] = search_request.geographic_scope
+        if search_request.implementation_complexity:
+            vector_filters["implementation_complexity"] = {"$in": search_request.implementation_complexity}
+        
+        # List metadata matches when any stored value is in the requested set
+        if search_request.ai_solution_types:
+            vector_filters["ai_solution_types"] = {"$in": search_request.ai_solution_types}
+        if search_request.target_industries:
+            vector_filters["target_industries"] = {"$in": search_request.target_industries}
+        if search_request.tags:
+            vector_filters["tags"] = {"$in": search_request.tags}
+        
+        return vector_filters
+    
+    def _build_semantic_db_filters(self, search_request: OpportunitySearchRequest) -> List[Any]:
+        """Column filters re-checked against the database for a semantic page."""
+        filters = []
+        if search_request.status:
+            filters.append(Opportunity.status.in_(search_request.status))
+        if search_request.min_validation_score is not None:
+            filters.append(Opportunity.validation_score >= search_request.min_validation_score)
+        if search_request.max_validation_score is not None:
+            filters.append(Opportunity.validation_score <= search_request.max_validation_score)
+        if search_request.geographic_scope:
+            filters.append(Opportunity.geographic_scope == search_request.geographic_scope)
+        if search_request.implementation_complexity:
+            filters.append(Opportunity.implementation_complexity.in_(search_request.implementation_complexity))
+        return filters
     
     async def get_search_facets(
         self, 
@@ -863,6 +1443,11 @@ class OpportunityService:
         
         Supports Requirements 6.1.2 (Faceted search capabilities).
         
+        A query narrows the counts to opportunities whose title, summary,
+        description or tags contain every query term as a whole word (case
+        insensitive, stop words ignored). Partial words do not match:
+        "automat" does not count an opportunity about "automation".
+        
         Args:
             db: Database session
             query: Optional query to filter facets
@@ -871,109 +1456,30 @@ class OpportunityService:
             Dictionary of facet data with counts
         """
         try:
-            # Build base query
-            base_query = select(Opportunity).where(
-                Opportunity.status != OpportunityStatus.REJECTED
-            )
+            await self._ensure_search_indexes(db)
             
-            # Apply text filter if query provided
-            if query:
-                text_filter = or_(
-                    Opportunity.title.ilike(f"%{query}%"),
-                    Opportunity.description.ilike(f"%{query}%"),
-                    Opportunity.summary.ilike(f"%{query}%")
-                )
-                base_query = base_query.where(text_filter)
-            
-            # Get all opportunities for facet calculation
-            result = await db.execute(base_query)
-            opportunities = result.scalars().all()
-            
-            # Calculate facets
-            facets = {
-                "status": {},
-                "ai_solution_types": {},
-                "target_industries": {},
-                "implementation_complexity": {},
-                "geographic_scope": {},
-                "validation_score_ranges": {
-                    "0-2": 0,
-                    "2-4": 0,
-                    "4-6": 0,
-                    "6-8": 0,
-                    "8-10": 0
-                },
-                "tags": {}
-            }
+            # Without a query the maintained counters are read directly; with
+            # one, only the keyword index's matches (documents containing
+            # every query term) are counted
+            matching_ids = self.lexical_index.matching(query) if query else None
+            total_opportunities, counts = self.facet_index.counts(matching_ids)
             
-            for opp in opportunities:
-                # Status facet
-                status_key = opp.status.value
-                facets["status"][status_key] = facets["status"].get(status_key, 0) + 1
-                
-                # Implementation complexity facet
-                if opp.implementation_complexity:
-                    complexity = opp.implementation_complexity
-                    facets["implementation_complexity"][complexity] = facets["implementation_complexity"].get(complexity, 0) + 1
-                
-                # Geographic scope facet
-                if opp.geographic_scope:
-                    scope = opp.geographic_scope
-                    facets["geographic_scope"][scope] = facets["geographic_scope"].get(scope, 0) + 1
-                
-                # Validation score ranges
-                score = opp.validation_score or 0
-                if score < 2:
-                    facets["validation_score_ranges"]["0-2"] += 1
-                elif score < 4:
-                    facets["validation_score_ranges"]["2-4"] += 1
-                elif score < 6:
-                    facets["validation_score_ranges"]["4-6"] += 1
-                elif score < 8:
-                    facets["validation_score_ranges"]["6-8"] += 1
+            facets = {}
+            for facet_name in SEARCH_FACETS:
+                facet_counts = counts.get(facet_name, {})
+                if facet_name == "validation_score_ranges":
+                    facets[facet_name] = {
+                        score_range: facet_counts.get(score_range, 0)
+                        for score_range in VALIDATION_SCORE_RANGES
+                    }
                 else:
-                    facets["validation_score_ranges"]["8-10"] += 1
-                
-                # AI solution types facet (JSON field)
-                if opp.ai_solution_types:
-                    try:
-                        ai_types = json.loads(opp.ai_solution_types)
-                        if isinstance(ai_types, list):
-                            for ai_type in ai_types:
-                                facets["ai_solution_types"][ai_type] = facets["ai_solution_types"].get(ai_type, 0) + 1
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                
-                # Target industries facet (JSON field)
-                if opp.target_industries:
-                    try:
-                        industries = json.loads(opp.target_industries)
-                        if isinstance(industries, list):
-                            for industry in industries:
-                                facets["target_industries"][industry] = facets["target_industries"].get(industry, 0) + 1
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                
-                # Tags facet (JSON field)
-                if opp.tags:
-                    try:
-                        tags = json.loads(opp.tags)
-                        if isinstance(tags, list):
-                            for tag in tags:
-                                facets["tags"][tag] = facets["tags"].get(tag, 0) + 1
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-            
-            # Sort facets by count (descending) and limit to top items
-            for facet_name, facet_data in facets.items():
-                if facet_name != "validation_score_ranges" and isinstance(facet_data, dict):
                     # Sort by count and take top 20
-                    sorted_items = sorted(facet_data.items(), key=lambda x: x[1], reverse=True)[:20]
+                    sorted_items = sorted(facet_counts.items(), key=lambda x: (-x[1], x[0]))[:20]
                     facets[facet_name] = dict(sorted_items)
             
             # Add metadata
             facets["_metadata"] = {
-                "total_opportunities": len(opportunities),
+                "total_opportunities": total_opportunities,
                 "query": query,
                 "generated_at": datetime.utcnow().isoformat()
             }
@@ -981,7 +1487,7 @@ class OpportunityService:
             logger.info(
                 "Search facets calculated",
                 query=query,
-                total_opportunities=len(opportunities),
+                total_opportunities=total_opportunities,
                 facet_categories=len([k for k in facets.keys() if not k.startswith("_")])
             )
             
@@ -1029,10 +1535,33 @@ class OpportunityService:
                 # If cache fails, continue without clearing
                 pass
         
-        # Clear general caches (would need pattern matching in production)
-        # For now, we'll just log the cache clear
+        # Clear cached rankings, searches and recommendations
+        if cache_manager is not None:
+            tags = [CacheTags.OPPORTUNITIES]
+            if opportunity_id:
+                tags.append(CacheTags.opportunity(opportunity_id))
+            try:
+                await cache_manager.invalidate_tags(*tags)
+            except Exception:
+                # If cache fails, continue without clearing
+                pass
+        
         logger.debug("Opportunity caches cleared", opportunity_id=opportunity_id)
 
 
+class SearchIndexUpdateHandler(EventHandler):
+    """Updates the keyword and facet indexes when opportunity events arrive."""
+    
+    def __init__(self, service: OpportunityService):
+        super().__init__("search_index_update_handler")
+        self.service = service
+    
+    async def handle(self, event: Event) -> None:
+        opportunity_id = event.payload.get("opportunity_id")
+        if opportunity_id:
+            await self.service.refresh_search_index_entry(str(opportunity_id))
+            self.logger.debug(f"Refreshed search indexes for opportunity {opportunity_id}")
+
+
 # Global opportunity service instance
 opportunity_service = OpportunityService()
\ No newline at end of file
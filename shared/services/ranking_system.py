@@ -17,13 +17,16 @@ import asyncio
 import json
 import logging
 import statistics
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple, Set, Union
 from dataclasses import dataclass, asdict
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from enum import Enum
 import math
 
+import numpy as np
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func, desc, asc, text
 from sqlalchemy.orm import selectinload
@@ -31,7 +34,8 @@ from sqlalchemy.orm import selectinload
 from shared.models.opportunity import Opportunity, OpportunityStatus
 from shared.models.user import User
 from shared.models.validation import ValidationResult
-from shared.cache import cache_manager, CacheKeys
+from shared.cache import cache_manager, CacheKeys, CacheTags, canonical_hash
+from shared.event_bus import EventHandler, EventType, Event
 from shared.services.scoring_algorithms import advanced_scoring_engine
 
 logger = logging.getLogger(__name__)
@@ -239,6 +243,143 @@ class RankingResult:
         self.total_pages = math.ceil(self.total_count / self.page_size)
 
 
+@dataclass
+class OpportunityProfile:
+    """Pre-parsed attributes used for personalization."""
+    
+    opportunity_id: str
+    ai_solution_types: frozenset
+    target_industries: frozenset
+    implementation_complexity: Optional[str]
+
+
+class OpportunityFeatureIndex:
+    """
+    Columnar store of precomputed per-opportunity ranking features.
+    
+    Each opportunity occupies one row of a float matrix holding its static
+    criteria metrics, creation/update timestamps and trending score, so the
+    scores of any candidate set can be computed in a single vectorized pass.
+    Rows are only recomputed when invalidated; the time dependent trending
+    column is refreshed in place by ``update_column``.
+    """
+    
+    STATIC_CRITERIA = (
+        RankingCriteria.VALIDATION_SCORE,
+        RankingCriteria.AI_FEASIBILITY,
+        RankingCriteria.OVERALL_SCORE,
+        RankingCriteria.MARKET_SIZE,
+        RankingCriteria.COMPETITION_LEVEL,
+        RankingCriteria.IMPLEMENTATION_COMPLEXITY,
+        RankingCriteria.ENGAGEMENT_SCORE,
+    )
+    COLUMNS = tuple(criteria.value for criteria in STATIC_CRITERIA) + ("created_ts", "updated_ts", "trending_score")
+    
+    def __init__(self, capacity: int = 1024):
+        self._column_positions = {name: i for i, name in enumerate(self.COLUMNS)}
+        self._matrix = np.zeros((capacity, len(self.COLUMNS)), dtype=np.float64)
+        self._profiles: List[Optional[OpportunityProfile]] = [None] * capacity
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._next_row = 0
+    
+    def column(self, name: str) -> int:
+        return self._column_positions[name]
+    
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix
+    
+    def profile(self, row: int) -> OpportunityProfile:
+        return self._profiles[row]
+    
+    def upsert(self, values: Dict[str, float], profile: OpportunityProfile) -> int:
+        """Store (or replace) the features of one opportunity."""
+        row = self._rows.get(profile.opportunity_id)
+        if row is None:
+            row = self._allocate_row()
+            self._rows[profile.opportunity_id] = row
+        
+        self._matrix[row] = [values[name] for name in self.COLUMNS]
+        self._profiles[row] = profile
+        return row
+    
+    def discard(self, opportunity_id: str) -> None:
+        row = self._rows.pop(opportunity_id, None)
+        if row is not None:
+            self._profiles[row] = None
+            self._free_rows.append(row)
+    
+    def update_column(self, name: str, values: Dict[str, float], default: float = 0.0) -> None:
+        """Overwrite one column for every stored row; rows absent from ``values`` get ``default``."""
+        position = self._column_positions[name]
+        for opportunity_id, row in self._rows.items():
+            self._matrix[row, position] = values.get(opportunity_id, default)
+    
+    def clear(self) -> None:
+        self._rows.clear()
+        self._free_rows.clear()
+        self._profiles = [None] * len(self._profiles)
+        self._next_row = 0
+    
+    def lookup(self, opportunity_ids: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """Return the rows of ``opportunity_ids`` and the ids that need loading."""
+        rows = np.full(len(opportunity_ids), -1, dtype=np.int64)
+        missing = []
+        for i, opportunity_id in enumerate(opportunity_ids):
+            row = self._rows.get(opportunity_id)
+            if row is None:
+                missing.append(opportunity_id)
+            else:
+                rows[i] = row
+        return rows, missing
+    
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._next_row == len(self._matrix):
+            capacity = len(self._matrix) * 2
+            self._matrix = np.resize(self._matrix, (capacity, len(self.COLUMNS)))
+            self._profiles.extend([None] * (capacity - len(self._profiles)))
+        row = self._next_row
+        self._next_row += 1
+        return row
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+@dataclass
+class ScoredCandidates:
+    """Scores for every opportunity matching one filter/config combination."""
+    
+    opportunity_ids: List[str]
+    final_scores: np.ndarray
+    base_scores: np.ndarray
+    personalization_scores: np.ndarray
+    freshness_scores: np.ndarray
+    trending_scores: np.ndarray
+    scored_at: float
+    
+    def top_k(self, k: int, descending: bool = True) -> np.ndarray:
+        """Positions of the best ``k`` candidates in rank order.
+        
+        Uses a partial sort, so only the requested prefix is fully ordered;
+        ties are broken by candidate position (opportunity id order).
+        """
+        count = len(self.opportunity_ids)
+        k = min(k, count)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        
+        keys = -self.final_scores if descending else self.final_scores
+        if k < count:
+            positions = np.argpartition(keys, k - 1)[:k]
+        else:
+            positions = np.arange(count)
+        return positions[np.lexsort((positions, keys[positions]))]
+
+
 class OpportunityRankingSystem:
     """
     Advanced opportunity ranking system with filtering and personalization.
@@ -265,6 +406,15 @@ class OpportunityRankingSystem:
         self.enable_learning = self.config.get("enable_learning", True)
         self.learning_update_interval = self.config.get("learning_interval", 3600)  # 1 hour
         
+        # Global ranking engine settings
+        self.feature_ttl = self.config.get("feature_ttl", 300)  # Refresh trending every 5 minutes
+        self._trending_refreshed_at = time.monotonic()
+        self._trending_refresh_task: Optional[asyncio.Task] = None
+        self.max_cached_rankings = self.config.get("max_cached_rankings", 128)
+        self.feature_index = OpportunityFeatureIndex()
+        self._scored_cache: "OrderedDict[str, ScoredCandidates]" = OrderedDict()
+        self._generation = 0  # Bumped by invalidate()
+        
         logger.info("OpportunityRankingSystem initialized", config=self.config)
     
     async def rank_opportunities(
@@ -304,19 +454,34 @@ class OpportunityRankingSystem:
             cached_result = await cache_manager.get(cache_key)
             if cached_result:
                 logger.debug("Cache hit for ranking query", cache_key=cache_key)
-                cached_result["cache_hit"] = True
-                return RankingResult(**cached_result)
+                return RankingResult(
+                    ranked_opportunities=await self._load_cached_page(db, cached_result["ranked_opportunities"]),
+                    total_count=cached_result["total_count"],
+                    filter_criteria=filter_criteria,
+                    ranking_config=ranking_config,
+                    user_preferences=user_preferences,
+                    ranking_time_ms=(datetime.utcnow() - start_time).total_seconds() * 1000,
+                    cache_hit=True,
+                    page=page,
+                    page_size=page_size
+                )
         
         try:
-            # Get filtered opportunities
-            opportunities, total_count = await self._get_filtered_opportunities(
-                db, filter_criteria, page, page_size
+            # Score every matching opportunity, then page from a partial sort
+            scored = await self._get_scored_candidates(
+                db, filter_criteria, ranking_config, user_preferences
             )
+            total_count = len(scored.opportunity_ids)
+            
+            page_positions = scored.top_k(
+                page * page_size,
+                descending=ranking_config.sort_order == SortOrder.DESC
+            )[(page - 1) * page_size:]
             
-            if not opportunities:
+            if not len(page_positions):
                 return RankingResult(
                     ranked_opportunities=[],
-                    total_count=0,
+                    total_count=total_count,
                     filter_criteria=filter_criteria,
                     ranking_config=ranking_config,
                     user_preferences=user_preferences,
@@ -326,16 +491,7 @@ class OpportunityRankingSystem:
                     page_size=page_size
                 )
             
-            # Calculate ranking scores
-            ranked_opportunities = await self._calculate_ranking_scores(
-                opportunities, ranking_config, user_preferences
-            )
-            
-            # Sort by rank score
-            if ranking_config.sort_order == SortOrder.DESC:
-                ranked_opportunities.sort(key=lambda x: x.rank_score, reverse=True)
-            else:
-                ranked_opportunities.sort(key=lambda x: x.rank_score)
+            ranked_opportunities = await self._load_ranked_page(db, scored, page_positions)
             
             # Assign rank positions
             for i, ranked_opp in enumerate(ranked_opportunities, 1):
@@ -362,15 +518,10 @@ class OpportunityRankingSystem:
                     cache_key,
                     {
                         "ranked_opportunities": [opp.to_dict() for opp in ranked_opportunities],
-                        "total_count": total_count,
-                        "filter_criteria": filter_criteria.to_dict(),
-                        "ranking_config": asdict(ranking_config),
-                        "user_preferences": asdict(user_preferences) if user_preferences else None,
-                        "ranking_time_ms": ranking_time_ms,
-                        "page": page,
-                        "page_size": page_size
+                        "total_count": total_count
                     },
-                    ttl=self.cache_ttl
+                    expire=self.cache_ttl,
+                    tags=[CacheTags.OPPORTUNITIES]
                 )
             
             logger.info(
@@ -387,22 +538,8 @@ class OpportunityRankingSystem:
             logger.error(f"Opportunity ranking failed: {e}", exc_info=True)
             raise
     
-    async def _get_filtered_opportunities(
-        self,
-        db: AsyncSession,
-        filter_criteria: FilterCriteria,
-        page: int,
-        page_size: int
-    ) -> Tuple[List[Opportunity], int]:
-        """Get opportunities matching filter criteria."""
-        
-        # Build base query
-        query = select(Opportunity).options(
-            selectinload(Opportunity.market_signals),
-            selectinload(Opportunity.validations)
-        )
-        
-        # Apply filters
+    def _build_filter_conditions(self, filter_criteria: FilterCriteria) -> List[Any]:
+        """Translate filter criteria into SQL conditions."""
         conditions = []
         
         # Status filter
@@ -479,111 +616,335 @@ class OpportunityRankingSystem:
             )
             conditions.append(search_condition)
         
-        # Apply all conditions
+        return conditions
+    
+    async def _get_scored_candidates(
+        self,
+        db: AsyncSession,
+        filter_criteria: FilterCriteria,
+        ranking_config: RankingConfig,
+        user_preferences: Optional[UserPreferences]
+    ) -> ScoredCandidates:
+        """Score all opportunities matching the filters, reusing cached scores."""
+        self._maybe_refresh_trending()
+        cache_key = self._ranking_cache_key(filter_criteria, ranking_config, user_preferences)
+        scored = self._scored_cache.get(cache_key) if self.enable_caching else None
+        if scored is not None and time.monotonic() - scored.scored_at < self.cache_ttl:
+            self._scored_cache.move_to_end(cache_key)
+            return scored
+        
+        generation = self._generation
+        
+        # Only ids are needed to decide membership; features come from the index
+        query = select(Opportunity.id)
+        conditions = self._build_filter_conditions(filter_criteria)
         if conditions:
             query = query.where(and_(*conditions))
+        result = await db.execute(query.order_by(Opportunity.id))
+        opportunity_ids = [str(opportunity_id) for opportunity_id in result.scalars().all()]
+        
+        rows, missing = self.feature_index.lookup(opportunity_ids)
+        for _ in range(3):
+            if not missing:
+                break
+            loading = self._generation
+            await self._load_features(db, missing)
+            rows, missing = self.feature_index.lookup(opportunity_ids)
+            if self._generation == loading:
+                break
+            # invalidate() ran during the load and may have dropped rows we
+            # just computed, so reload those instead of treating them as deleted
+        if missing:
+            # Deleted between the two queries
+            keep = rows >= 0
+            rows = rows[keep]
+            opportunity_ids = [opportunity_id for opportunity_id, kept in zip(opportunity_ids, keep) if kept]
+        
+        scored = self._score_candidates(opportunity_ids, rows, ranking_config, user_preferences)
+        if not self.enable_caching or self._generation != generation:
+            # Computed across an invalidation; the next call recomputes it
+            return scored
+        
+        self._scored_cache[cache_key] = scored
+        self._scored_cache.move_to_end(cache_key)
+        while len(self._scored_cache) > self.max_cached_rankings:
+            self._scored_cache.popitem(last=False)
+        
+        return scored
+    
+    async def _load_features(self, db: AsyncSession, opportunity_ids: List[str]) -> None:
+        """Compute and store features for opportunities in batches."""
+        for start in range(0, len(opportunity_ids), self.batch_size):
+            batch = opportunity_ids[start:start + self.batch_size]
+            query = select(Opportunity).options(
+                selectinload(Opportunity.market_signals),
+                selectinload(Opportunity.validations)
+            ).where(Opportunity.id.in_(batch))
+            result = await db.execute(query)
+            
+            for opportunity in result.scalars().all():
+                values = {
+                    criteria.value: self._get_opportunity_metric(opportunity, criteria)
+                    for criteria in OpportunityFeatureIndex.STATIC_CRITERIA
+                }
+                values["created_ts"] = self._timestamp(opportunity.created_at)
+                values["updated_ts"] = self._timestamp(opportunity.updated_at)
+                values["trending_score"] = await self._calculate_trending_score(opportunity)
+                self.feature_index.upsert(values, self._build_profile(opportunity))
+        
+        logger.debug(f"Computed ranking features for {len(opportunity_ids)} opportunities")
+    
+    def _maybe_refresh_trending(self) -> None:
+        """Start a background trending refresh once the trending column is stale."""
+        if time.monotonic() - self._trending_refreshed_at < self.feature_ttl:
+            return
+        if self._trending_refresh_task is None or self._trending_refresh_task.done():
+            self._trending_refreshed_at = time.monotonic()
+            self._trending_refresh_task = asyncio.create_task(self._refresh_trending())
+    
+    async def _refresh_trending(self) -> None:
+        """
+        Recompute trending scores for every indexed opportunity from one
+        aggregate query over recent validations, using a session of its own.
         
-        # Get total count
-        count_query = select(func.count(Opportunity.id))
-        if conditions:
-            count_query = count_query.where(and_(*conditions))
+        Mirrors ``_calculate_trending_score``: volume and average quality of
+        the validations from the last 7 days.
+        """
+        from shared.database import get_db_session
+        
+        cutoff_date = datetime.utcnow() - timedelta(days=7)
+        try:
+            async with get_db_session() as db:
+                result = await db.execute(
+                    select(
+                        ValidationResult.opportunity_id,
+                        func.count(ValidationResult.id),
+                        func.avg(ValidationResult.score)
+                    )
+                    .where(ValidationResult.validated_at >= cutoff_date)
+                    .group_by(ValidationResult.opportunity_id)
+                )
+                trending_scores = {
+                    str(opportunity_id): min(100.0, (count * 10) + (float(avg_score or 0.0) * 5))
+                    for opportunity_id, count, avg_score in result.all()
+                }
+        except Exception as e:
+            logger.warning(f"Failed to refresh trending scores: {e}")
+            return
+        
+        self.feature_index.update_column("trending_score", trending_scores)
+        self._scored_cache.clear()
+        logger.debug(f"Refreshed trending scores for {len(self.feature_index)} opportunities")
+    
+    def _score_candidates(
+        self,
+        opportunity_ids: List[str],
+        rows: np.ndarray,
+        ranking_config: RankingConfig,
+        user_preferences: Optional[UserPreferences]
+    ) -> ScoredCandidates:
+        """Compute weighted scores for all candidates in one vectorized pass."""
+        index = self.feature_index
+        features = index.matrix[rows]
+        count = len(opportunity_ids)
+        
+        now = datetime.utcnow().replace(tzinfo=timezone.utc).timestamp()
+        created_days = np.floor((now - features[:, index.column("created_ts")]) / 86400)
+        updated_days = np.floor((now - features[:, index.column("updated_ts")]) / 86400)
+        
+        def metric(criteria: RankingCriteria) -> np.ndarray:
+            if criteria == RankingCriteria.CREATED_DATE:
+                return np.maximum(0.0, 100.0 - created_days)
+            if criteria == RankingCriteria.UPDATED_DATE:
+                return np.maximum(0.0, 100.0 - updated_days)
+            if criteria.value in index.COLUMNS:
+                return features[:, index.column(criteria.value)]
+            return np.zeros(count)
+        
+        # Base score from primary and secondary criteria
+        weighted = metric(ranking_config.primary_criteria) * ranking_config.primary_weight
+        for criteria, weight in ranking_config.secondary_criteria.items():
+            weighted = weighted + metric(RankingCriteria(criteria)) * weight
+        base_scores = np.clip(weighted, 0.0, 100.0)
+        
+        personalization_scores = np.zeros(count)
+        if ranking_config.enable_personalization and user_preferences:
+            personalization_scores = np.fromiter(
+                (
+                    self._profile_personalization_score(index.profile(row), user_preferences)
+                    for row in rows
+                ),
+                dtype=np.float64,
+                count=count
+            )
         
-        count_result = await db.execute(count_query)
-        total_count = count_result.scalar()
+        freshness_scores = np.zeros(count)
+        if ranking_config.enable_freshness_boost:
+            freshness_scores = (
+                np.maximum(0.0, 100.0 - created_days * 2) * 0.3 +
+                np.maximum(0.0, 100.0 - updated_days) * 0.7
+            )
         
-        # Apply pagination
-        query = query.offset((page - 1) * page_size).limit(page_size)
+        trending_scores = np.zeros(count)
+        if ranking_config.enable_trending_boost:
+            trending_scores = features[:, index.column("trending_score")].copy()
         
-        # Execute query
-        result = await db.execute(query)
-        opportunities = result.scalars().all()
+        final_scores = (
+            base_scores * (1.0 - ranking_config.personalization_weight -
+                           ranking_config.freshness_weight - ranking_config.trending_weight) +
+            personalization_scores * ranking_config.personalization_weight +
+            freshness_scores * ranking_config.freshness_weight +
+            trending_scores * ranking_config.trending_weight
+        )
         
-        return list(opportunities), total_count
+        return ScoredCandidates(
+            opportunity_ids=opportunity_ids,
+            final_scores=final_scores,
+            base_scores=base_scores,
+            personalization_scores=personalization_scores,
+            freshness_scores=freshness_scores,
+            trending_scores=trending_scores,
+            scored_at=time.monotonic()
+        )
     
-    async def _calculate_ranking_scores(
+    async def _load_ranked_page(
         self,
-        opportunities: List[Opportunity],
-        ranking_config: RankingConfig,
-        user_preferences: UserPreferences = None
+        db: AsyncSession,
+        scored: ScoredCandidates,
+        positions: np.ndarray
     ) -> List[RankedOpportunity]:
-        """Calculate ranking scores for opportunities."""
+        """Load the opportunities of one page and attach their scores."""
+        page_ids = [scored.opportunity_ids[position] for position in positions]
+        result = await db.execute(select(Opportunity).where(Opportunity.id.in_(page_ids)))
+        opportunities = {str(opportunity.id): opportunity for opportunity in result.scalars().all()}
         
         ranked_opportunities = []
-        
-        for opportunity in opportunities:
-            # Calculate base score from opportunity metrics
-            base_score = await self._calculate_base_score(opportunity, ranking_config)
-            
-            # Calculate personalization score
-            personalization_score = 0.0
-            if ranking_config.enable_personalization and user_preferences:
-                personalization_score = await self._calculate_personalization_score(
-                    opportunity, user_preferences
-                )
-            
-            # Calculate freshness score
-            freshness_score = 0.0
-            if ranking_config.enable_freshness_boost:
-                freshness_score = self._calculate_freshness_score(opportunity)
-            
-            # Calculate trending score
-            trending_score = 0.0
-            if ranking_config.enable_trending_boost:
-                trending_score = await self._calculate_trending_score(opportunity)
-            
-            # Combine scores with weights
-            final_score = (
-                base_score * (1.0 - ranking_config.personalization_weight - 
-                             ranking_config.freshness_weight - ranking_config.trending_weight) +
-                personalization_score * ranking_config.personalization_weight +
-                freshness_score * ranking_config.freshness_weight +
-                trending_score * ranking_config.trending_weight
-            )
+        for position, opportunity_id in zip(positions, page_ids):
+            opportunity = opportunities.get(opportunity_id)
+            if opportunity is None:
+                continue
             
-            # Create ranking factors for transparency
-            ranking_factors = {
-                "base_score": base_score,
-                "personalization_score": personalization_score,
-                "freshness_score": freshness_score,
-                "trending_score": trending_score,
-                "validation_score": opportunity.validation_score,
-                "ai_feasibility_score": opportunity.ai_feasibility_score,
-                "confidence_rating": opportunity.confidence_rating
-            }
-            
-            ranked_opportunity = RankedOpportunity(
+            ranked_opportunities.append(RankedOpportunity(
                 opportunity=opportunity,
-                rank_score=final_score,
-                rank_position=0,  # Will be set after sorting
-                base_score=base_score,
-                personalization_score=personalization_score,
-                freshness_score=freshness_score,
-                trending_score=trending_score,
-                ranking_factors=ranking_factors
-            )
-            
-            ranked_opportunities.append(ranked_opportunity)
+                rank_score=float(scored.final_scores[position]),
+                rank_position=0,  # Set by the caller
+                base_score=float(scored.base_scores[position]),
+                personalization_score=float(scored.personalization_scores[position]),
+                freshness_score=float(scored.freshness_scores[position]),
+                trending_score=float(scored.trending_scores[position]),
+                ranking_factors={
+                    "base_score": float(scored.base_scores[position]),
+                    "personalization_score": float(scored.personalization_scores[position]),
+                    "freshness_score": float(scored.freshness_scores[position]),
+                    "trending_score": float(scored.trending_scores[position]),
+                    "validation_score": opportunity.validation_score,
+                    "ai_feasibility_score": opportunity.ai_feasibility_score,
+                    "confidence_rating": opportunity.confidence_rating
+                }
+            ))
         
         return ranked_opportunities
     
-    async def _calculate_base_score(
+    async def _load_cached_page(
         self,
-        opportunity: Opportunity,
-        ranking_config: RankingConfig
-    ) -> float:
-        """Calculate base ranking score from opportunity metrics."""
-        
-        # Get primary score
-        primary_score = self._get_opportunity_metric(opportunity, ranking_config.primary_criteria)
-        weighted_score = primary_score * ranking_config.primary_weight
-        
-        # Add secondary scores
-        for criteria, weight in ranking_config.secondary_criteria.items():
-            secondary_score = self._get_opportunity_metric(opportunity, criteria)
-            weighted_score += secondary_score * weight
+        db: AsyncSession,
+        cached_entries: List[Dict[str, Any]]
+    ) -> List[RankedOpportunity]:
+        """Rebuild a cached page from its stored scores and fresh opportunity rows."""
+        if not cached_entries:
+            return []
+        
+        page_ids = [entry["opportunity_id"] for entry in cached_entries]
+        result = await db.execute(select(Opportunity).where(Opportunity.id.in_(page_ids)))
+        opportunities = {str(opportunity.id): opportunity for opportunity in result.scalars().all()}
+        
+        return [
+            RankedOpportunity(
+                opportunity=opportunities[str(entry["opportunity_id"])],
+                rank_score=entry["rank_score"],
+                rank_position=entry["rank_position"],
+                base_score=entry["base_score"],
+                personalization_score=entry["personalization_score"],
+                freshness_score=entry["freshness_score"],
+                trending_score=entry["trending_score"],
+                ranking_factors=entry["ranking_factors"]
+            )
+            for entry in cached_entries
+            if str(entry["opportunity_id"]) in opportunities
+        ]
+    
+    def invalidate(self, opportunity_id: Optional[str] = None) -> None:
+        """
+        Drop cached rankings after an opportunity changes.
         
-        # Normalize to 0-100 scale
-        return min(100.0, max(0.0, weighted_score))
+        Any change can move an opportunity in or out of a filtered set, so all
+        cached score sets are cleared; only the changed opportunity's features
+        are recomputed (or all of them when no id is given).
+        """
+        self._generation += 1
+        self._scored_cache.clear()
+        if opportunity_id is None:
+            self.feature_index.clear()
+        else:
+            self.feature_index.discard(str(opportunity_id))
+    
+    async def subscribe_to_invalidations(self, event_bus) -> None:
+        """Invalidate cached rankings whenever opportunities change."""
+        await event_bus.subscribe_to_events(
+            [
+                EventType.OPPORTUNITY_CREATED,
+                EventType.OPPORTUNITY_UPDATED,
+                EventType.OPPORTUNITY_DELETED,
+                EventType.OPPORTUNITY_VALIDATED
+            ],
+            RankingInvalidationHandler(self)
+        )
+    
+    @staticmethod
+    def _ranking_query(
+        filter_criteria: FilterCriteria,
+        ranking_config: RankingConfig,
+        user_preferences: Optional[UserPreferences]
+    ) -> Dict[str, Any]:
+        """Everything that affects scores (but not the page)."""
+        return {
+            "filters": filter_criteria.to_dict(),
+            "config": asdict(ranking_config),
+            "preferences": asdict(user_preferences) if user_preferences else None
+        }
+    
+    def _ranking_cache_key(
+        self,
+        filter_criteria: FilterCriteria,
+        ranking_config: RankingConfig,
+        user_preferences: Optional[UserPreferences]
+    ) -> str:
+        return canonical_hash(self._ranking_query(filter_criteria, ranking_config, user_preferences))
+    
+    @staticmethod
+    def _timestamp(value: Optional[datetime]) -> float:
+        """Epoch seconds of a (naive UTC or aware) datetime."""
+        if value is None:
+            return 0.0
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    
+    @staticmethod
+    def _parse_json_list(value: Any) -> List[Any]:
+        try:
+            parsed = json.loads(value) if isinstance(value, str) else value
+        except (TypeError, ValueError):
+            return []
+        return parsed if isinstance(parsed, list) else []
+    
+    def _build_profile(self, opportunity: Opportunity) -> OpportunityProfile:
+        return OpportunityProfile(
+            opportunity_id=str(opportunity.id),
+            ai_solution_types=frozenset(self._parse_json_list(opportunity.ai_solution_types)),
+            target_industries=frozenset(self._parse_json_list(opportunity.target_industries)),
+            implementation_complexity=opportunity.implementation_complexity
+        )
     
     def _get_opportunity_metric(self, opportunity: Opportunity, criteria: RankingCriteria) -> float:
         """Get specific metric value from opportunity."""
@@ -643,72 +1004,40 @@ class OpportunityRankingSystem:
         else:
             return 0.0
     
-    async def _calculate_personalization_score(
-        self,
-        opportunity: Opportunity,
+    @staticmethod
+    def _profile_personalization_score(
+        profile: OpportunityProfile,
         user_preferences: UserPreferences
     ) -> float:
-        """Calculate personalization score based on user preferences."""
-        
-        if not user_preferences:
-            return 0.0
-        
+        """Personalization score from pre-parsed opportunity attributes."""
         personalization_score = 0.0
         
         # AI solution type preference
-        if user_preferences.preferred_ai_types and opportunity.ai_solution_types:
-            try:
-                opp_ai_types = json.loads(opportunity.ai_solution_types) if isinstance(opportunity.ai_solution_types, str) else opportunity.ai_solution_types
-                if opp_ai_types:
-                    ai_match = len(set(user_preferences.preferred_ai_types) & set(opp_ai_types))
-                    ai_score = (ai_match / len(user_preferences.preferred_ai_types)) * 100
-                    personalization_score += ai_score * user_preferences.ai_type_weight
-            except:
-                pass
+        if user_preferences.preferred_ai_types and profile.ai_solution_types:
+            ai_match = len(profile.ai_solution_types.intersection(user_preferences.preferred_ai_types))
+            ai_score = (ai_match / len(user_preferences.preferred_ai_types)) * 100
+            personalization_score += ai_score * user_preferences.ai_type_weight
         
         # Industry preference
-        if user_preferences.preferred_industries and opportunity.target_industries:
-            try:
-                opp_industries = json.loads(opportunity.target_industries) if isinstance(opportunity.target_industries, str) else opportunity.target_industries
-                if opp_industries:
-                    industry_match = len(set(user_preferences.preferred_industries) & set(opp_industries))
-                    industry_score = (industry_match / len(user_preferences.preferred_industries)) * 100
-                    personalization_score += industry_score * user_preferences.industry_weight
-            except:
-                pass
+        if user_preferences.preferred_industries and profile.target_industries:
+            industry_match = len(profile.target_industries.intersection(user_preferences.preferred_industries))
+            industry_score = (industry_match / len(user_preferences.preferred_industries)) * 100
+            personalization_score += industry_score * user_preferences.industry_weight
         
         # Complexity preference
-        if user_preferences.preferred_complexity_levels and opportunity.implementation_complexity:
-            if opportunity.implementation_complexity in user_preferences.preferred_complexity_levels:
+        if user_preferences.preferred_complexity_levels and profile.implementation_complexity:
+            if profile.implementation_complexity in user_preferences.preferred_complexity_levels:
                 personalization_score += 100.0 * user_preferences.complexity_weight
         
         # Interaction history boost
-        if opportunity.id in user_preferences.bookmarked_opportunities:
+        if profile.opportunity_id in user_preferences.bookmarked_opportunities:
             personalization_score += 20.0  # Boost for bookmarked opportunities
         
-        if opportunity.id in user_preferences.validated_opportunities:
+        if profile.opportunity_id in user_preferences.validated_opportunities:
             personalization_score += 15.0  # Boost for previously validated opportunities
         
         return min(100.0, personalization_score)
     
-    def _calculate_freshness_score(self, opportunity: Opportunity) -> float:
-        """Calculate freshness score based on creation and update times."""
-        
-        now = datetime.utcnow()
-        
-        # Score based on creation time (more recent = higher score)
-        created_days_ago = (now - opportunity.created_at).days
-        creation_score = max(0.0, 100.0 - created_days_ago * 2)  # Decay by 2 points per day
-        
-        # Score based on update time
-        updated_days_ago = (now - opportunity.updated_at).days
-        update_score = max(0.0, 100.0 - updated_days_ago * 1)  # Decay by 1 point per day
-        
-        # Combine scores (favor recent updates)
-        freshness_score = (creation_score * 0.3) + (update_score * 0.7)
-        
-        return freshness_score
-    
     async def _calculate_trending_score(self, opportunity: Opportunity) -> float:
         """Calculate trending score based on recent validation activity."""
         
@@ -742,18 +1071,13 @@ class OpportunityRankingSystem:
         page: int,
         page_size: int
     ) -> str:
-        """Generate cache key for ranking query."""
-        
-        key_parts = [
-            "ranking",
-            str(hash(json.dumps(filter_criteria.to_dict(), sort_keys=True))),
-            str(hash(json.dumps(asdict(ranking_config), sort_keys=True))),
-            str(hash(json.dumps(asdict(user_preferences), sort_keys=True))) if user_preferences else "no_prefs",
-            f"page_{page}",
-            f"size_{page_size}"
-        ]
-        
-        return ":".join(key_parts)
+        """Generate a cache key for a ranking page that is stable across processes."""
+        return CacheKeys.hashed_key(
+            CacheKeys.OPPORTUNITY_RANKING,
+            self._ranking_query(filter_criteria, ranking_config, user_preferences),
+            page=page,
+            page_size=page_size
+        )
     
     async def get_user_preferences(
         self,
@@ -788,7 +1112,7 @@ class OpportunityRankingSystem:
         await cache_manager.set(
             cache_key,
             asdict(preferences),
-            ttl=self.learning_update_interval
+            expire=self.learning_update_interval
         )
         
         return preferences
@@ -806,7 +1130,7 @@ class OpportunityRankingSystem:
         await cache_manager.set(
             cache_key,
             asdict(preferences),
-            ttl=self.learning_update_interval
+            expire=self.learning_update_interval
         )
         
         # TODO: Persist preferences to database if needed
@@ -885,5 +1209,18 @@ class OpportunityRankingSystem:
         return result.ranked_opportunities
 
 
+class RankingInvalidationHandler(EventHandler):
+    """Clears cached rankings when opportunity events arrive."""
+    
+    def __init__(self, ranking_system: OpportunityRankingSystem):
+        super().__init__("ranking_invalidation_handler")
+        self.ranking_system = ranking_system
+    
+    async def handle(self, event: Event) -> None:
+        opportunity_id = event.payload.get("opportunity_id")
+        self.ranking_system.invalidate(opportunity_id)
+        self.logger.debug(f"Invalidated rankings for opportunity {opportunity_id}")
+
+
 # Global ranking system instance
 opportunity_ranking_system = OpportunityRankingSystem()
\ No newline at end of file
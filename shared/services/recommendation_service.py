@@ -3,8 +3,10 @@
 Supports Requirements 6.1.3 (Personalized recommendation engine and user preference learning).
 """
 
+import asyncio
 import json
 import math
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,17 +17,77 @@ from shared.models.user import User
 from shared.models.opportunity import Opportunity, OpportunityStatus
 from shared.models.user_interaction import UserInteraction, UserPreference, InteractionType, RecommendationFeedback
 from shared.schemas.opportunity import OpportunityRecommendationRequest
-from shared.cache import cache_manager, CacheKeys
+from shared.cache import cache_manager, CacheKeys, CacheTags
 from shared.vector_db import opportunity_vector_service
 from shared.services.ai_service import ai_service
+from shared.services.user_similarity import UserSimilarityIndex
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
+def _parse_json(value: Optional[str], expected_type: type) -> Any:
+    """Parse a JSON text column, falling back to an empty ``expected_type``."""
+    if not value:
+        return expected_type()
+    try:
+        parsed = json.loads(value)
+    except (TypeError, json.JSONDecodeError):
+        return expected_type()
+    return parsed if isinstance(parsed, expected_type) else expected_type()
+
+
+@dataclass
+class OpportunityFeatures:
+    """Parsed opportunity attributes used by the recommendation scorers."""
+    ai_solution_types: List[str]
+    target_industries: List[str]
+    implementation_complexity: Optional[str]
+    validation_score: float
+    interaction_count: int
+    created_at: Optional[datetime]
+
+
+@dataclass
+class RecommendationFeatures:
+    """Feature bundle loaded once per request and shared by every scorer."""
+    preferred_ai_types: Dict[str, float]
+    preferred_industries: Dict[str, float]
+    preferred_complexity: Optional[str]
+    min_validation_score: float
+    opportunities: Dict[str, OpportunityFeatures]
+    similar_users: Dict[str, float] = field(default_factory=dict)
+    neighbor_interactions: List[Tuple[str, str, InteractionType]] = field(default_factory=list)
+    recent_search_queries: List[str] = field(default_factory=list)
+
+
 class RecommendationService:
     """Service for generating personalized opportunity recommendations."""
     
+    def __init__(self, similarity_refresh_seconds: float = 3600, similar_users_top_k: int = 50):
+        # Collaborative filtering reads neighbours from a precomputed index that
+        # a background job rebuilds and record_interaction keeps current
+        self.user_similarity = UserSimilarityIndex(top_k=similar_users_top_k)
+        self.similarity_refresh_seconds = similarity_refresh_seconds
+        self._similarity_lock = asyncio.Lock()
+        self._similarity_refresh_task: Optional[asyncio.Task] = None
+        # Interactions recorded while a rebuild runs, replayed onto the new index
+        self._similarity_replay: Optional[List[Tuple[str, str]]] = None
+        
+        # Hybrid scorer weights and per-scorer time budgets (seconds). The
+        # other scorers work on the preloaded features without awaiting, so a
+        # timeout could never interrupt them; only the semantic scorer, which
+        # calls the embedding provider and the vector index, gets a budget
+        self.algorithm_weights = {
+            "collaborative_filtering": 0.3,
+            "content_based": 0.4,
+            "popularity_based": 0.2,
+            "semantic_similarity": 0.1
+        }
+        self.algorithm_budgets = {
+            "semantic_similarity": 1.5
+        }
+    
     async def get_personalized_recommendations(
         self, 
         db: AsyncSession, 
@@ -43,12 +105,15 @@ class RecommendationService:
             List of recommended opportunities
         """
         # Try cache first
-        cache_key = CacheKeys.format_key(
-            CacheKeys.OPPORTUNITY_RECOMMENDATIONS, 
-            user_id=request.user_id,
-            limit=request.limit,
-            ai_types=str(sorted(request.ai_solution_types or [])),
-            industries=str(sorted(request.industries or []))
+        cache_key = CacheKeys.hashed_key(
+            CacheKeys.OPPORTUNITY_RECOMMENDATIONS,
+            {
+                "limit": request.limit,
+                "include_viewed": request.include_viewed,
+                "ai_types": sorted(request.ai_solution_types or []),
+                "industries": sorted(request.industries or [])
+            },
+            user_id=request.user_id
         )
         
         cached_recommendations = None
@@ -89,7 +154,12 @@ class RecommendationService:
                     "generated_at": datetime.utcnow().isoformat(),
                     "algorithm": "hybrid"
                 }
-                await cache_manager.set(cache_key, cache_data, expire=1800)  # 30 minutes
+                await cache_manager.set(
+                    cache_key,
+                    cache_data,
+                    expire=1800,  # 30 minutes
+                    tags=[CacheTags.OPPORTUNITIES, CacheTags.user(request.user_id)]
+                )
             except Exception as e:
                 logger.warning("Failed to cache recommendations", error=str(e))
         
@@ -116,39 +186,36 @@ class RecommendationService:
         if not base_opportunities:
             return []
         
-        # Apply different recommendation algorithms
-        algorithms = [
-            ("collaborative_filtering", 0.3),
-            ("content_based", 0.4),
-            ("popularity_based", 0.2),
-            ("semantic_similarity", 0.1)
-        ]
+        # Load everything the scorers need up front; the session cannot be
+        # shared by concurrently running scorers
+        features = await self._load_recommendation_features(db, request.user_id, base_opportunities, user_preferences)
         
-        # Score opportunities using each algorithm
-        opportunity_scores = {}
+        scorers = {
+            "collaborative_filtering": self._collaborative_filtering_scores,
+            "content_based": self._content_based_scores,
+            "popularity_based": self._popularity_based_scores,
+            "semantic_similarity": self._semantic_similarity_scores
+        }
         
-        for algorithm, weight in algorithms:
-            try:
-                if algorithm == "collaborative_filtering":
-                    scores = await self._collaborative_filtering_scores(db, request.user_id, base_opportunities)
-                elif algorithm == "content_based":
-                    scores = await self._content_based_scores(db, request.user_id, base_opportunities, user_preferences)
-                elif algorithm == "popularity_based":
-                    scores = await self._popularity_based_scores(base_opportunities)
-                elif algorithm == "semantic_similarity":
-                    scores = await self._semantic_similarity_scores(db, request.user_id, base_opportunities)
-                else:
-                    continue
-                
-                # Apply weight and combine scores
-                for opp_id, score in scores.items():
-                    if opp_id not in opportunity_scores:
-                        opportunity_scores[opp_id] = 0.0
-                    opportunity_scores[opp_id] += score * weight
-                    
-            except Exception as e:
-                logger.warning(f"Failed to apply {algorithm} algorithm", error=str(e))
-                continue
+        # Run all scorers concurrently; budgeted ones are cut off when late
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(scorer(features), timeout=self.algorithm_budgets.get(algorithm))
+                for algorithm, scorer in scorers.items()
+            ),
+            return_exceptions=True
+        )
+        
+        completed = {}
+        for algorithm, scores in zip(scorers, results):
+            if isinstance(scores, asyncio.TimeoutError):
+                logger.warning(f"{algorithm} algorithm exceeded its time budget", budget_seconds=self.algorithm_budgets[algorithm])
+            elif isinstance(scores, Exception):
+                logger.warning(f"Failed to apply {algorithm} algorithm", error=str(scores))
+            else:
+                completed[algorithm] = scores
+        
+        opportunity_scores = self._combine_scores(completed)
         
         # Sort opportunities by combined score
         sorted_opportunities = sorted(
@@ -159,11 +226,25 @@ class RecommendationService:
         
         # Apply diversity and freshness factors
         final_recommendations = await self._apply_diversity_and_freshness(
-            db, sorted_opportunities, request, user_preferences
+            db, sorted_opportunities, request, user_preferences, features
         )
         
         return final_recommendations[:request.limit]
     
+    def _combine_scores(self, completed: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+        """Weighted sum of the scorers that finished.
+        
+        Late or failed scorers drop out; the remaining weights are rescaled
+        so combined scores stay on the same scale.
+        """
+        total_weight = sum(self.algorithm_weights[algorithm] for algorithm in completed)
+        opportunity_scores = {}
+        for algorithm, scores in completed.items():
+            weight = self.algorithm_weights[algorithm] / total_weight
+            for opp_id, score in scores.items():
+                opportunity_scores[opp_id] = opportunity_scores.get(opp_id, 0.0) + score * weight
+        return opportunity_scores
+    
     async def _get_base_opportunities(
         self,
         db: AsyncSession,
@@ -173,8 +254,7 @@ class RecommendationService:
         """Get base set of high-quality opportunities for recommendation."""
         
         query = select(Opportunity).options(
-            selectinload(Opportunity.validations),
-            selectinload(Opportunity.interactions)
+            selectinload(Opportunity.validations)
         ).where(
             and_(
                 Opportunity.status.in_([OpportunityStatus.VALIDATED, OpportunityStatus.VALIDATING]),
@@ -214,140 +294,132 @@ class RecommendationService:
         result = await db.execute(query)
         return list(result.scalars().all())
     
-    async def _collaborative_filtering_scores(
+    async def _load_recommendation_features(
         self,
         db: AsyncSession,
         user_id: str,
-        opportunities: List[Opportunity]
-    ) -> Dict[str, float]:
-        """Generate scores based on collaborative filtering (users with similar preferences)."""
-        
-        # Find users with similar interaction patterns
-        similar_users = await self._find_similar_users(db, user_id)
+        opportunities: List[Opportunity],
+        user_preferences: UserPreference
+    ) -> RecommendationFeatures:
+        """Load and parse everything the recommendation scorers share."""
         
-        if not similar_users:
-            return {opp.id: 0.0 for opp in opportunities}
+        opportunity_ids = [opp.id for opp in opportunities]
         
-        # Get interactions from similar users
-        similar_user_ids = [user["user_id"] for user in similar_users]
+        # Interaction totals per opportunity, aggregated in the database
+        result = await db.execute(
+            select(UserInteraction.opportunity_id, func.count(UserInteraction.id)).where(
+                UserInteraction.opportunity_id.in_(opportunity_ids)
+            ).group_by(UserInteraction.opportunity_id)
+        )
+        interaction_counts = dict(result.all())
         
-        interactions_query = select(UserInteraction).where(
-            and_(
-                UserInteraction.user_id.in_(similar_user_ids),
-                UserInteraction.opportunity_id.in_([opp.id for opp in opportunities]),
-                UserInteraction.interaction_type.in_([InteractionType.VIEW, InteractionType.CLICK, InteractionType.BOOKMARK])
+        # Interactions of similar users with the candidate opportunities
+        similar_users = await self._find_similar_users(db, user_id)
+        neighbor_interactions = []
+        if similar_users:
+            result = await db.execute(
+                select(
+                    UserInteraction.user_id,
+                    UserInteraction.opportunity_id,
+                    UserInteraction.interaction_type
+                ).where(
+                    and_(
+                        UserInteraction.user_id.in_([user["user_id"] for user in similar_users]),
+                        UserInteraction.opportunity_id.in_(opportunity_ids),
+                        UserInteraction.interaction_type.in_([InteractionType.VIEW, InteractionType.CLICK, InteractionType.BOOKMARK])
+                    )
+                )
             )
-        )
+            neighbor_interactions = [tuple(row) for row in result.all()]
         
-        result = await db.execute(interactions_query)
-        interactions = result.scalars().all()
+        # User's recent searches, newest first
+        result = await db.execute(
+            select(UserInteraction.search_query).where(
+                and_(
+                    UserInteraction.user_id == user_id,
+                    UserInteraction.search_query.isnot(None),
+                    UserInteraction.interaction_type == InteractionType.SEARCH
+                )
+            ).order_by(desc(UserInteraction.created_at)).limit(10)
+        )
+        recent_search_queries = [query for query in result.scalars().all() if query]
+        
+        return RecommendationFeatures(
+            preferred_ai_types=_parse_json(user_preferences.preferred_ai_types, dict),
+            preferred_industries=_parse_json(user_preferences.preferred_industries, dict),
+            preferred_complexity=user_preferences.preferred_complexity,
+            min_validation_score=user_preferences.min_validation_score,
+            opportunities={
+                opp.id: OpportunityFeatures(
+                    ai_solution_types=_parse_json(opp.ai_solution_types, list),
+                    target_industries=_parse_json(opp.target_industries, list),
+                    implementation_complexity=opp.implementation_complexity,
+                    validation_score=opp.validation_score,
+                    interaction_count=interaction_counts.get(opp.id, 0),
+                    created_at=opp.created_at
+                )
+                for opp in opportunities
+            },
+            similar_users={user["user_id"]: user["similarity"] for user in similar_users},
+            neighbor_interactions=neighbor_interactions,
+            recent_search_queries=recent_search_queries
+        )
+    
+    async def _collaborative_filtering_scores(self, features: RecommendationFeatures) -> Dict[str, float]:
+        """Generate scores based on collaborative filtering (users with similar preferences)."""
         
-        # Calculate scores based on similar user interactions
-        scores = {}
-        for opp in opportunities:
-            score = 0.0
-            interaction_count = 0
-            
-            for interaction in interactions:
-                if interaction.opportunity_id == opp.id:
-                    # Find similarity weight for this user
-                    user_similarity = next(
-                        (u["similarity"] for u in similar_users if u["user_id"] == interaction.user_id),
-                        0.0
-                    )
-                    
-                    # Weight by interaction type and user similarity
-                    interaction_weight = {
-                        InteractionType.VIEW: 1.0,
-                        InteractionType.CLICK: 2.0,
-                        InteractionType.BOOKMARK: 3.0
-                    }.get(interaction.interaction_type, 1.0)
-                    
-                    score += user_similarity * interaction_weight
-                    interaction_count += 1
-            
-            # Normalize by interaction count
-            if interaction_count > 0:
-                score = score / interaction_count
-            
-            scores[opp.id] = min(1.0, score)  # Cap at 1.0
+        interaction_weights = {
+            InteractionType.VIEW: 1.0,
+            InteractionType.CLICK: 2.0,
+            InteractionType.BOOKMARK: 3.0
+        }
         
-        return scores
+        # Accumulate similarity-weighted interactions per opportunity in one pass
+        totals: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        for interaction_user_id, opportunity_id, interaction_type in features.neighbor_interactions:
+            weight = interaction_weights.get(interaction_type, 1.0)
+            totals[opportunity_id] = totals.get(opportunity_id, 0.0) + features.similar_users.get(interaction_user_id, 0.0) * weight
+            counts[opportunity_id] = counts.get(opportunity_id, 0) + 1
+        
+        # Normalize by interaction count and cap at 1.0
+        return {
+            opp_id: min(1.0, totals[opp_id] / counts[opp_id]) if opp_id in counts else 0.0
+            for opp_id in features.opportunities
+        }
     
-    async def _content_based_scores(
-        self,
-        db: AsyncSession,
-        user_id: str,
-        opportunities: List[Opportunity],
-        user_preferences: UserPreference
-    ) -> Dict[str, float]:
+    async def _content_based_scores(self, features: RecommendationFeatures) -> Dict[str, float]:
         """Generate scores based on content similarity to user preferences."""
         
         scores = {}
+        preferred_ai_types = features.preferred_ai_types
+        preferred_industries = features.preferred_industries
         
-        # Parse user preferences
-        preferred_ai_types = {}
-        preferred_industries = {}
-        
-        if user_preferences.preferred_ai_types:
-            try:
-                preferred_ai_types = json.loads(user_preferences.preferred_ai_types)
-            except json.JSONDecodeError:
-                pass
-        
-        if user_preferences.preferred_industries:
-            try:
-                preferred_industries = json.loads(user_preferences.preferred_industries)
-            except json.JSONDecodeError:
-                pass
-        
-        for opp in opportunities:
+        for opp_id, opp in features.opportunities.items():
             score = 0.0
             factors = 0
             
             # AI solution type matching
             if preferred_ai_types and opp.ai_solution_types:
-                try:
-                    opp_ai_types = json.loads(opp.ai_solution_types)
-                    if isinstance(opp_ai_types, list):
-                        ai_score = 0.0
-                        for ai_type in opp_ai_types:
-                            if ai_type in preferred_ai_types:
-                                ai_score += preferred_ai_types[ai_type]
-                        
-                        if len(opp_ai_types) > 0:
-                            ai_score = ai_score / len(opp_ai_types)
-                            score += ai_score
-                            factors += 1
-                except json.JSONDecodeError:
-                    pass
+                ai_score = sum(preferred_ai_types.get(ai_type, 0.0) for ai_type in opp.ai_solution_types)
+                score += ai_score / len(opp.ai_solution_types)
+                factors += 1
             
             # Industry matching
             if preferred_industries and opp.target_industries:
-                try:
-                    opp_industries = json.loads(opp.target_industries)
-                    if isinstance(opp_industries, list):
-                        industry_score = 0.0
-                        for industry in opp_industries:
-                            if industry in preferred_industries:
-                                industry_score += preferred_industries[industry]
-                        
-                        if len(opp_industries) > 0:
-                            industry_score = industry_score / len(opp_industries)
-                            score += industry_score
-                            factors += 1
-                except json.JSONDecodeError:
-                    pass
+                industry_score = sum(preferred_industries.get(industry, 0.0) for industry in opp.target_industries)
+                score += industry_score / len(opp.target_industries)
+                factors += 1
             
             # Complexity preference
-            if user_preferences.preferred_complexity and opp.implementation_complexity:
-                if user_preferences.preferred_complexity == opp.implementation_complexity:
+            if features.preferred_complexity and opp.implementation_complexity:
+                if features.preferred_complexity == opp.implementation_complexity:
                     score += 1.0
                     factors += 1
             
             # Validation score preference (higher is better)
-            if opp.validation_score >= user_preferences.min_validation_score:
-                validation_bonus = min(1.0, (opp.validation_score - user_preferences.min_validation_score) / 5.0)
+            if opp.validation_score >= features.min_validation_score:
+                validation_bonus = min(1.0, (opp.validation_score - features.min_validation_score) / 5.0)
                 score += validation_bonus
                 factors += 1
             
@@ -355,133 +427,72 @@ class RecommendationService:
             if factors > 0:
                 score = score / factors
             
-            scores[opp.id] = min(1.0, score)
+            scores[opp_id] = min(1.0, score)
         
         return scores
     
-    async def _popularity_based_scores(self, opportunities: List[Opportunity]) -> Dict[str, float]:
+    async def _popularity_based_scores(self, features: RecommendationFeatures) -> Dict[str, float]:
         """Generate scores based on opportunity popularity metrics."""
         
         scores = {}
+        opportunities = features.opportunities
         
         # Calculate popularity metrics
-        max_validation_score = max((opp.validation_score for opp in opportunities), default=1.0)
-        max_interaction_count = max(
-            (len(opp.interactions) for opp in opportunities), 
-            default=1
-        )
+        max_validation_score = max((opp.validation_score for opp in opportunities.values()), default=1.0)
+        max_interaction_count = max((opp.interaction_count for opp in opportunities.values()), default=1)
         
-        for opp in opportunities:
+        for opp_id, opp in opportunities.items():
             # Combine validation score and interaction count
             validation_factor = opp.validation_score / max_validation_score if max_validation_score > 0 else 0
-            interaction_factor = len(opp.interactions) / max_interaction_count if max_interaction_count > 0 else 0
+            interaction_factor = opp.interaction_count / max_interaction_count if max_interaction_count > 0 else 0
             
             # Weight validation more heavily than interactions
             popularity_score = (validation_factor * 0.7) + (interaction_factor * 0.3)
             
-            scores[opp.id] = min(1.0, popularity_score)
+            scores[opp_id] = min(1.0, popularity_score)
         
         return scores
     
-    async def _semantic_similarity_scores(
-        self,
-        db: AsyncSession,
-        user_id: str,
-        opportunities: List[Opportunity]
-    ) -> Dict[str, float]:
-        """Generate scores based on semantic similarity to user's past interactions."""
+    async def _semantic_similarity_scores(self, features: RecommendationFeatures) -> Dict[str, float]:
+        """Generate scores based on semantic similarity to user's past searches."""
         
-        # Get user's past interactions to understand their interests
-        interactions_query = select(UserInteraction).where(
-            and_(
-                UserInteraction.user_id == user_id,
-                UserInteraction.search_query.isnot(None),
-                UserInteraction.interaction_type == InteractionType.SEARCH
-            )
-        ).order_by(desc(UserInteraction.created_at)).limit(10)
+        scores = {opp_id: 0.0 for opp_id in features.opportunities}
         
-        result = await db.execute(interactions_query)
-        past_interactions = result.scalars().all()
+        if not features.recent_search_queries:
+            return scores
         
-        if not past_interactions:
-            return {opp.id: 0.0 for opp in opportunities}
+        # Use the 3 most recent searches, joined oldest first
+        combined_query = " ".join(reversed(features.recent_search_queries[:3]))
         
-        try:
-            # Combine recent search queries
-            search_queries = [interaction.search_query for interaction in past_interactions if interaction.search_query]
-            
-            if not search_queries:
-                return {opp.id: 0.0 for opp in opportunities}
-            
-            combined_query = " ".join(search_queries[-3:])  # Use last 3 searches
-            
-            # Generate embedding for user's search pattern
-            query_embedding = await ai_service.generate_search_query_embedding(combined_query)
-            
-            # Find similar opportunities using vector search
-            similar_opportunities = await opportunity_vector_service.find_similar_opportunities(
-                query_embedding=query_embedding,
-                top_k=len(opportunities),
-                filters={"id": {"$in": [opp.id for opp in opportunities]}}
-            )
-            
-            # Convert to scores
-            scores = {}
-            for result in similar_opportunities:
+        # Generate embedding for user's search pattern
+        query_embedding = await ai_service.generate_search_query_embedding(combined_query)
+        
+        # Find similar opportunities using vector search
+        similar_opportunities = await opportunity_vector_service.find_similar_opportunities(
+            query_embedding=query_embedding,
+            top_k=len(scores),
+            filters={"id": {"$in": list(scores)}}
+        )
+        
+        for result in similar_opportunities:
+            if result["id"] in scores:
                 scores[result["id"]] = result["score"]
-            
-            # Fill in missing scores
-            for opp in opportunities:
-                if opp.id not in scores:
-                    scores[opp.id] = 0.0
-            
-            return scores
-            
-        except Exception as e:
-            logger.warning("Failed to generate semantic similarity scores", error=str(e))
-            return {opp.id: 0.0 for opp in opportunities}
+        
+        return scores
     
     async def _apply_diversity_and_freshness(
         self,
         db: AsyncSession,
         opportunities: List[Opportunity],
         request: OpportunityRecommendationRequest,
-        user_preferences: UserPreference
+        user_preferences: UserPreference,
+        features: RecommendationFeatures
     ) -> List[Opportunity]:
         """Apply diversity and freshness factors to recommendations."""
         
         if not opportunities:
             return []
         
-        # Group opportunities by AI solution type and industry for diversity
-        ai_type_groups = {}
-        industry_groups = {}
-        
-        for opp in opportunities:
-            # Group by AI types
-            if opp.ai_solution_types:
-                try:
-                    ai_types = json.loads(opp.ai_solution_types)
-                    if isinstance(ai_types, list):
-                        for ai_type in ai_types:
-                            if ai_type not in ai_type_groups:
-                                ai_type_groups[ai_type] = []
-                            ai_type_groups[ai_type].append(opp)
-                except json.JSONDecodeError:
-                    pass
-            
-            # Group by industries
-            if opp.target_industries:
-                try:
-                    industries = json.loads(opp.target_industries)
-                    if isinstance(industries, list):
-                        for industry in industries:
-                            if industry not in industry_groups:
-                                industry_groups[industry] = []
-                            industry_groups[industry].append(opp)
-                except json.JSONDecodeError:
-                    pass
-        
         # Select diverse recommendations
         selected = []
         used_ai_types = set()
@@ -493,24 +504,9 @@ class RecommendationService:
                 break
             
             # Check diversity constraints
-            opp_ai_types = set()
-            opp_industries = set()
-            
-            if opp.ai_solution_types:
-                try:
-                    ai_types = json.loads(opp.ai_solution_types)
-                    if isinstance(ai_types, list):
-                        opp_ai_types = set(ai_types)
-                except json.JSONDecodeError:
-                    pass
-            
-            if opp.target_industries:
-                try:
-                    industries = json.loads(opp.target_industries)
-                    if isinstance(industries, list):
-                        opp_industries = set(industries)
-                except json.JSONDecodeError:
-                    pass
+            opp_features = features.opportunities[opp.id]
+            opp_ai_types = set(opp_features.ai_solution_types)
+            opp_industries = set(opp_features.target_industries)
             
             # Apply diversity rules (allow some overlap but prefer diversity)
             ai_overlap = len(opp_ai_types & used_ai_types)
@@ -548,78 +544,84 @@ class RecommendationService:
     async def _find_similar_users(self, db: AsyncSession, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Find users with similar interaction patterns."""
         
-        # Get current user's interactions
-        user_interactions_query = select(UserInteraction).where(
-            and_(
-                UserInteraction.user_id == user_id,
-                UserInteraction.opportunity_id.isnot(None)
-            )
-        )
-        
-        result = await db.execute(user_interactions_query)
-        user_interactions = result.scalars().all()
+        if not self.user_similarity.built:
+            await self.rebuild_user_similarity(db, only_if_unbuilt=True)
         
-        if not user_interactions:
-            return []
-        
-        user_opportunity_ids = set(interaction.opportunity_id for interaction in user_interactions)
-        
-        # Find other users who interacted with similar opportunities
-        similar_interactions_query = select(UserInteraction).where(
-            and_(
-                UserInteraction.user_id != user_id,
-                UserInteraction.opportunity_id.in_(list(user_opportunity_ids))
-            )
-        )
-        
-        result = await db.execute(similar_interactions_query)
-        similar_interactions = result.scalars().all()
-        
-        # Calculate similarity scores
-        user_similarities = {}
+        return [
+            {"user_id": other_user_id, "similarity": similarity}
+            for other_user_id, similarity in self.user_similarity.neighbors(user_id, limit)
+        ]
+    
+    async def rebuild_user_similarity(self, db: AsyncSession, only_if_unbuilt: bool = False) -> None:
+        """Rebuild the user-user similarity index from all recorded interactions.
         
-        for interaction in similar_interactions:
-            other_user_id = interaction.user_id
-            
-            if other_user_id not in user_similarities:
-                user_similarities[other_user_id] = {
-                    "user_id": other_user_id,
-                    "common_opportunities": set(),
-                    "total_interactions": 0
-                }
-            
-            user_similarities[other_user_id]["common_opportunities"].add(interaction.opportunity_id)
-            user_similarities[other_user_id]["total_interactions"] += 1
+        The matrix work runs in a worker thread on a fresh index, so the event
+        loop keeps serving requests from the current one until it is swapped.
+        With ``only_if_unbuilt`` the rebuild is skipped when another caller
+        built the index while this one waited for the lock.
+        """
         
-        # Calculate Jaccard similarity
-        similar_users = []
-        for other_user_id, data in user_similarities.items():
-            common_count = len(data["common_opportunities"])
+        async with self._similarity_lock:
+            if only_if_unbuilt and self.user_similarity.built:
+                return
             
-            # Get total opportunities for other user
-            other_user_query = select(func.count(UserInteraction.opportunity_id.distinct())).where(
-                and_(
-                    UserInteraction.user_id == other_user_id,
-                    UserInteraction.opportunity_id.isnot(None)
+            started = datetime.utcnow()
+            self._similarity_replay = []
+            try:
+                result = await db.execute(
+                    select(UserInteraction.user_id, UserInteraction.opportunity_id).where(
+                        UserInteraction.opportunity_id.isnot(None)
+                    ).distinct()
                 )
-            )
-            result = await db.execute(other_user_query)
-            other_user_total = result.scalar() or 0
+                current = self.user_similarity
+                index = UserSimilarityIndex(
+                    top_k=current.top_k,
+                    min_similarity=current.min_similarity,
+                    block_size=current.block_size
+                )
+                await asyncio.to_thread(index.rebuild, result.all())
+                
+                # Interactions recorded since the query started may be missing
+                for user_id, opportunity_id in self._similarity_replay:
+                    index.add_interaction(user_id, opportunity_id)
+                self.user_similarity = index
+            finally:
+                self._similarity_replay = None
             
-            # Calculate Jaccard similarity
-            union_size = len(user_opportunity_ids) + other_user_total - common_count
-            similarity = common_count / union_size if union_size > 0 else 0.0
+            logger.info(
+                "Rebuilt user similarity index",
+                user_count=len(self.user_similarity),
+                duration_seconds=(datetime.utcnow() - started).total_seconds()
+            )
+    
+    async def start_similarity_refresh(self) -> None:
+        """Start the background job that periodically rebuilds the similarity index."""
+        if self._similarity_refresh_task is None or self._similarity_refresh_task.done():
+            self._similarity_refresh_task = asyncio.create_task(self._similarity_refresh_loop())
+    
+    async def stop_similarity_refresh(self) -> None:
+        """Stop the background similarity refresh job."""
+        if self._similarity_refresh_task is not None:
+            self._similarity_refresh_task.cancel()
+            try:
+                await self._similarity_refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._similarity_refresh_task = None
+    
+    async def _similarity_refresh_loop(self) -> None:
+        from shared.database import get_db_session
+        
+        while True:
+            try:
+                async with get_db_session() as db:
+                    await self.rebuild_user_similarity(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Failed to rebuild user similarity index", error=str(e))
             
-            if similarity > 0.1:  # Minimum similarity threshold
-                similar_users.append({
-                    "user_id": other_user_id,
-                    "similarity": similarity,
-                    "common_opportunities": common_count
-                })
-        
-        # Sort by similarity and return top users
-        similar_users.sort(key=lambda x: x["similarity"], reverse=True)
-        return similar_users[:limit]
+            await asyncio.sleep(self.similarity_refresh_seconds)
     
     async def get_or_create_user_preferences(
         self, 
@@ -762,6 +764,14 @@ class RecommendationService:
             await db.commit()
             await db.refresh(preferences)
             
+            # Recommendations cached under the old preferences are stale now
+            if cache_manager is not None:
+                try:
+                    await cache_manager.invalidate_tags(CacheTags.user(user_id))
+                except Exception as e:
+                    # The preferences are committed; stale entries expire on their own
+                    logger.warning("Failed to invalidate cached recommendations", user_id=user_id, error=str(e))
+            
             logger.info(
                 "Updated user preferences from interactions",
                 user_id=user_id,
@@ -799,6 +809,13 @@ class RecommendationService:
         await db.commit()
         await db.refresh(interaction)
         
+        # Keep collaborative filtering neighbours current between rebuilds
+        if opportunity_id:
+            if self.user_similarity.built:
+                self.user_similarity.add_interaction(user_id, opportunity_id)
+            if self._similarity_replay is not None:
+                self._similarity_replay.append((user_id, opportunity_id))
+        
         # Periodically update user preferences (every 10 interactions)
         interaction_count = await db.execute(
             select(func.count(UserInteraction.id)).where(UserInteraction.user_id == user_id)
@@ -0,0 +1,173 @@
+"""
+Token-set similarity join helpers for the AI Opportunity Browser system.
+
+This module implements:
+- Tokenization shared by signal clustering and opportunity deduplication
+- An exact Jaccard similarity join using prefix filtering over an inverted index
+- TokenSetIndex for probing a stored collection with new token sets
+- Union-find for grouping matched pairs into connected components
+
+Prefix filtering only compares records that share one of their rarest tokens,
+so the join scales close to linearly with the number of records on typical
+text instead of comparing every pair.
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterator, List, Sequence, Tuple
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Lower-case and whitespace-split text into a token set."""
+    return frozenset(text.lower().split()) if text else frozenset()
+
+
+def jaccard(tokens1: FrozenSet[str], tokens2: FrozenSet[str]) -> float:
+    """Jaccard similarity of two token sets (0.0 when either is empty)."""
+    if not tokens1 or not tokens2:
+        return 0.0
+    intersection = len(tokens1 & tokens2)
+    return intersection / (len(tokens1) + len(tokens2) - intersection)
+
+
+def _prefix_length(size: int, min_jaccard: float) -> int:
+    """Number of leading (rarest) tokens two records must overlap in."""
+    return size - math.ceil(min_jaccard * size - 1e-9) + 1
+
+
+def candidate_pairs(
+    token_sets: Sequence[FrozenSet[str]],
+    min_jaccard: float
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield index pairs (i < j) that may reach ``min_jaccard``.
+
+    Every pair whose Jaccard similarity is at least ``min_jaccard`` is
+    yielded exactly once; callers verify the exact similarity. Records are
+    probed in increasing size order and only their prefix of globally rarest
+    tokens is indexed. A non-positive threshold matches everything, so all
+    pairs are yielded.
+    """
+    count = len(token_sets)
+    if min_jaccard <= 0:
+        for i in range(count):
+            for j in range(i + 1, count):
+                yield i, j
+        return
+
+    frequency: Dict[str, int] = defaultdict(int)
+    for tokens in token_sets:
+        for token in tokens:
+            frequency[token] += 1
+
+    ordered = [sorted(tokens, key=lambda token: (frequency[token], token)) for tokens in token_sets]
+    index: Dict[str, List[int]] = defaultdict(list)
+
+    for position in sorted(range(count), key=lambda i: len(ordered[i])):
+        tokens = ordered[position]
+        if not tokens:
+            continue
+
+        size = len(tokens)
+        min_size = min_jaccard * size - 1e-9
+        seen = set()
+        prefix = tokens[:_prefix_length(size, min_jaccard)]
+
+        for token in prefix:
+            for other in index.get(token, ()):
+                if other not in seen and len(ordered[other]) >= min_size:
+                    seen.add(other)
+                    yield (other, position) if other < position else (position, other)
+
+        for token in prefix:
+            index[token].append(position)
+
+
+class TokenSetIndex:
+    """
+    Inverted index over token sets for Jaccard threshold lookups.
+
+    Token order (rarest first) is fixed from the sets the index is built
+    with; tokens seen later sort as rarest, which keeps the prefix filter
+    exact as more sets are added.
+    """
+
+    def __init__(self, min_jaccard: float, token_sets: Sequence[FrozenSet[str]] = ()):
+        self.min_jaccard = min_jaccard
+        self._frequency: Dict[str, int] = defaultdict(int)
+        for tokens in token_sets:
+            for token in tokens:
+                self._frequency[token] += 1
+        self._frequency = dict(self._frequency)
+        self._sizes: List[int] = []
+        self._index: Dict[str, List[int]] = defaultdict(list)
+
+        for tokens in token_sets:
+            self.add(tokens)
+
+    def add(self, tokens: FrozenSet[str]) -> int:
+        """Index a token set and return its position."""
+        position = len(self._sizes)
+        self._sizes.append(len(tokens))
+        for token in self._prefix(tokens):
+            self._index[token].append(position)
+        return position
+
+    def candidates(self, tokens: FrozenSet[str]) -> List[int]:
+        """Positions of stored sets that may reach ``min_jaccard`` with ``tokens``."""
+        if not tokens:
+            return []
+        if self.min_jaccard <= 0:
+            return list(range(len(self._sizes)))
+
+        size = len(tokens)
+        min_size = self.min_jaccard * size - 1e-9
+        max_size = size / self.min_jaccard + 1e-9
+        seen = set()
+        for token in self._prefix(tokens):
+            for position in self._index.get(token, ()):
+                if position not in seen and min_size <= self._sizes[position] <= max_size:
+                    seen.add(position)
+        return sorted(seen)
+
+    def _prefix(self, tokens: FrozenSet[str]) -> List[str]:
+        if not tokens:
+            return []
+        ordered = sorted(tokens, key=lambda token: (self._frequency.get(token, 0), token))
+        if self.min_jaccard <= 0:
+            return ordered
+        return ordered[:_prefix_length(len(ordered), self.min_jaccard)]
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+
+class UnionFind:
+    """Disjoint-set forest with path halving and union by size."""
+
+    def __init__(self, size: int):
+        self._parent = list(range(size))
+        self._size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, item1: int, item2: int) -> None:
+        root1, root2 = self.find(item1), self.find(item2)
+        if root1 == root2:
+            return
+        if self._size[root1] < self._size[root2]:
+            root1, root2 = root2, root1
+        self._parent[root2] = root1
+        self._size[root1] += self._size[root2]
+
+    def groups(self) -> List[List[int]]:
+        """Connected components, each in index order, ordered by first member."""
+        components: Dict[int, List[int]] = {}
+        for item in range(len(self._parent)):
+            components.setdefault(self.find(item), []).append(item)
+        return list(components.values())
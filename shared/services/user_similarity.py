@@ -0,0 +1,134 @@
+"""
+User-user similarity index for collaborative filtering.
+
+This module implements:
+- A sparse user x opportunity interaction matrix
+- Top-k Jaccard neighbour tables computed with sparse matrix products
+- Incremental updates as new interactions are recorded
+
+The full rebuild multiplies the binary interaction matrix by its transpose
+in row blocks, so memory stays bounded by the block size and only pairs of
+users that share an opportunity are ever materialised. Between rebuilds,
+``add_interaction`` keeps the neighbour lists of the affected users current.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+Neighbor = Tuple[str, float]
+
+
+class UserSimilarityIndex:
+    """
+    Top-k Jaccard neighbours over users' interacted opportunities.
+
+    Incremental updates recompute the changed user's row exactly and
+    upsert it into its neighbours' lists; a neighbour list that loses an
+    entry this way is only refilled by the next rebuild.
+    """
+
+    def __init__(self, top_k: int = 20, min_similarity: float = 0.1, block_size: int = 1024):
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        self.block_size = block_size
+        self._user_items: Dict[str, Set[str]] = {}
+        self._item_users: Dict[str, Set[str]] = {}
+        self._neighbors: Dict[str, List[Neighbor]] = {}
+        self.built = False
+
+    def rebuild(self, interactions: Iterable[Tuple[str, str]]) -> None:
+        """Rebuild the matrix and every neighbour table from (user_id, opportunity_id) pairs."""
+        user_items: Dict[str, Set[str]] = {}
+        item_users: Dict[str, Set[str]] = {}
+        for user_id, opportunity_id in interactions:
+            user_items.setdefault(user_id, set()).add(opportunity_id)
+            item_users.setdefault(opportunity_id, set()).add(user_id)
+
+        users = list(user_items)
+        user_index = {user_id: row for row, user_id in enumerate(users)}
+        item_index = {opportunity_id: column for column, opportunity_id in enumerate(item_users)}
+
+        rows, columns = [], []
+        for user_id, items in user_items.items():
+            for opportunity_id in items:
+                rows.append(user_index[user_id])
+                columns.append(item_index[opportunity_id])
+
+        matrix = csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, columns)),
+            shape=(len(users), len(item_index))
+        )
+        transposed = matrix.T.tocsr()
+        sizes = np.asarray(matrix.sum(axis=1)).ravel()
+
+        neighbors: Dict[str, List[Neighbor]] = {}
+        for start in range(0, len(users), self.block_size):
+            stop = min(start + self.block_size, len(users))
+            # Intersection sizes between this block of users and everyone else
+            overlap = (matrix[start:stop] @ transposed).tocsr()
+            for offset in range(stop - start):
+                row = start + offset
+                columns_slice = slice(overlap.indptr[offset], overlap.indptr[offset + 1])
+                others = overlap.indices[columns_slice]
+                common = overlap.data[columns_slice]
+                similarities = common / (sizes[row] + sizes[others] - common)
+                neighbors[users[row]] = self._top_k(
+                    (users[other], float(similarity))
+                    for other, similarity in zip(others, similarities)
+                    if other != row
+                )
+
+        self._user_items = user_items
+        self._item_users = item_users
+        self._neighbors = neighbors
+        self.built = True
+
+    def add_interaction(self, user_id: str, opportunity_id: str) -> None:
+        """Record an interaction and refresh the affected neighbour lists."""
+        items = self._user_items.setdefault(user_id, set())
+        if opportunity_id in items:
+            return
+        items.add(opportunity_id)
+        self._item_users.setdefault(opportunity_id, set()).add(user_id)
+
+        similarities = self._row_similarities(user_id)
+        self._neighbors[user_id] = self._top_k(similarities.items())
+
+        # The user's set grew, so its similarity to every overlapping user changed
+        for other_id, similarity in similarities.items():
+            entries = [entry for entry in self._neighbors.get(other_id, []) if entry[0] != user_id]
+            entries.append((user_id, similarity))
+            self._neighbors[other_id] = self._top_k(entries)
+
+    def neighbors(self, user_id: str, limit: Optional[int] = None) -> List[Neighbor]:
+        """Most similar users as (user_id, similarity), best first."""
+        entries = self._neighbors.get(user_id, [])
+        return entries[:limit] if limit is not None else list(entries)
+
+    def _row_similarities(self, user_id: str) -> Dict[str, float]:
+        """Exact Jaccard similarity from ``user_id`` to every overlapping user."""
+        items = self._user_items.get(user_id, set())
+        common = Counter(
+            other_id
+            for opportunity_id in items
+            for other_id in self._item_users.get(opportunity_id, ())
+            if other_id != user_id
+        )
+        return {
+            other_id: count / (len(items) + len(self._user_items[other_id]) - count)
+            for other_id, count in common.items()
+        }
+
+    def _top_k(self, candidates: Iterable[Neighbor]) -> List[Neighbor]:
+        ranked = sorted(
+            (entry for entry in candidates if entry[1] > self.min_similarity),
+            key=lambda entry: (-entry[1], entry[0])
+        )
+        return ranked[:self.top_k]
+
+    def __len__(self) -> int:
+        return len(self._user_items)
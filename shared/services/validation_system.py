@@ -666,7 +666,7 @@ class ValidationSystem:
                 CacheKeys.VALIDATION_CONSENSUS, 
                 opportunity_id=workflow.opportunity_id
             )
-            await cache_manager.set(cache_key, consensus, ttl=3600)
+            await cache_manager.set(cache_key, consensus, expire=3600)
             
             logger.info(
                 "Validation workflow finalized",
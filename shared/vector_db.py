@@ -4,8 +4,13 @@ Supports the design document's vector database requirements:
 - Opportunity embeddings for semantic search
 - Market signal embeddings for similarity detection
 - User preference embeddings for personalization
+
+Set ``VECTOR_DB_BACKEND=local`` (the default when no Pinecone API key is
+configured) to use the in-process, disk-persisted index from
+``shared.vector_index`` instead of Pinecone.
 """
 
+import asyncio
 import os
 import json
 from typing import List, Dict, Any, Optional, Tuple
@@ -13,6 +18,8 @@ from datetime import datetime
 import pinecone
 import structlog
 
+from shared.vector_index import LocalVectorIndex
+
 logger = structlog.get_logger(__name__)
 
 
@@ -28,7 +35,12 @@ class VectorDatabaseManager:
     def __init__(self):
         self.api_key = os.getenv("PINECONE_API_KEY")
         self.environment = os.getenv("PINECONE_ENVIRONMENT", "gcp-starter")
+        self.backend = os.getenv("VECTOR_DB_BACKEND", "pinecone" if self.api_key else "local")
+        self.local_path = os.getenv("VECTOR_DB_PATH", "./data/vector_index")
+        self.local_dtype = os.getenv("VECTOR_DB_DTYPE", "float32")
         self.pc: Optional[Pinecone] = None
+        self._local_indexes: Dict[str, LocalVectorIndex] = {}
+        self._local_lock = asyncio.Lock()
         
         # Index configurations based on design document requirements
         self.indexes = {
@@ -51,6 +63,10 @@ class VectorDatabaseManager:
     
     async def initialize(self):
         """Initialize Pinecone connection and create indexes if needed."""
+        if self.backend == "local":
+            await self._initialize_local()
+            return
+        
         if not self.api_key:
             raise ValueError("PINECONE_API_KEY environment variable is required")
         
@@ -59,13 +75,14 @@ class VectorDatabaseManager:
             self.pc = pinecone.Pinecone(api_key=self.api_key)
             
             # Create indexes if they don't exist
-            existing_indexes = [index.name for index in self.pc.list_indexes()]
+            existing_indexes = [index.name for index in await asyncio.to_thread(self.pc.list_indexes)]
             
             for index_name, config in self.indexes.items():
                 if index_name not in existing_indexes:
                     logger.info("Creating Pinecone index", index_name=index_name)
                     
-                    self.pc.create_index(
+                    await asyncio.to_thread(
+                        self.pc.create_index,
                         name=index_name,
                         dimension=config["dimension"],
                         metric=config["metric"],
@@ -81,14 +98,44 @@ class VectorDatabaseManager:
             logger.error("Failed to initialize Pinecone", error=str(e), exc_info=True)
             raise
     
+    async def _initialize_local(self):
+        """Open (or create) the on-disk local indexes."""
+        try:
+            async with self._local_lock:
+                for index_name, config in self.indexes.items():
+                    if index_name not in self._local_indexes:
+                        self._local_indexes[index_name] = await asyncio.to_thread(
+                            LocalVectorIndex,
+                            os.path.join(self.local_path, index_name),
+                            config["dimension"],
+                            self.local_dtype
+                        )
+            
+            logger.info("Local vector database initialized successfully", path=self.local_path)
+            
+        except Exception as e:
+            logger.error("Failed to initialize local vector database", error=str(e), exc_info=True)
+            raise
+    
+    async def _open_index(self, index_name: str):
+        """Get an index, opening the local backend on first use."""
+        if self.backend == "local" and not self._local_indexes:
+            await self._initialize_local()
+        return self.get_index(index_name)
+    
     def get_index(self, index_name: str):
-        """Get Pinecone index instance."""
-        if not self.pc:
-            raise RuntimeError("Pinecone not initialized. Call initialize() first.")
-        
+        """Get Pinecone (or local) index instance."""
         if index_name not in self.indexes:
             raise ValueError(f"Unknown index: {index_name}")
         
+        if self.backend == "local":
+            if index_name not in self._local_indexes:
+                raise RuntimeError("Local vector database not initialized. Call initialize() first.")
+            return self._local_indexes[index_name]
+        
+        if not self.pc:
+            raise RuntimeError("Pinecone not initialized. Call initialize() first.")
+        
         return self.pc.Index(index_name)
     
     async def upsert_vectors(
@@ -106,13 +153,13 @@ class VectorDatabaseManager:
             True if successful, False otherwise
         """
         try:
-            index = self.get_index(index_name)
+            index = await self._open_index(index_name)
             
             # Batch upsert for better performance
             batch_size = 100
             for i in range(0, len(vectors), batch_size):
                 batch = vectors[i:i + batch_size]
-                index.upsert(vectors=batch)
+                await asyncio.to_thread(index.upsert, vectors=batch)
             
             logger.info(
                 "Vectors upserted successfully", 
@@ -153,9 +200,10 @@ class VectorDatabaseManager:
             List of similar vectors with scores and metadata
         """
         try:
-            index = self.get_index(index_name)
+            index = await self._open_index(index_name)
             
-            response = index.query(
+            response = await asyncio.to_thread(
+                index.query,
                 vector=query_vector,
                 top_k=top_k,
                 filter=filter_dict,
@@ -210,8 +258,8 @@ class VectorDatabaseManager:
             True if successful, False otherwise
         """
         try:
-            index = self.get_index(index_name)
-            index.delete(ids=ids)
+            index = await self._open_index(index_name)
+            await asyncio.to_thread(index.delete, ids=ids)
             
             logger.info(
                 "Vectors deleted successfully", 
@@ -239,8 +287,8 @@ class VectorDatabaseManager:
             Index statistics dictionary
         """
         try:
-            index = self.get_index(index_name)
-            stats = index.describe_index_stats()
+            index = await self._open_index(index_name)
+            stats = await asyncio.to_thread(index.describe_index_stats)
             
             return {
                 "total_vector_count": stats.total_vector_count,
@@ -259,19 +307,22 @@ class VectorDatabaseManager:
     
     async def health_check(self) -> Dict[str, Any]:
         """Check vector database connectivity and status."""
-        if not self.pc:
+        if not (self._local_indexes if self.backend == "local" else self.pc):
             try:
                 await self.initialize()
             except Exception as e:
                 return {
                     "status": "unhealthy",
-                    "message": "Failed to initialize Pinecone connection",
+                    "message": f"Failed to initialize {self.backend} vector database",
                     "error": str(e)
                 }
         
         try:
             # Test by listing indexes
-            indexes = [index.name for index in self.pc.list_indexes()]
+            if self.backend == "local":
+                indexes = list(self._local_indexes)
+            else:
+                indexes = [index.name for index in await asyncio.to_thread(self.pc.list_indexes)]
             
             # Check if our required indexes exist
             missing_indexes = []
@@ -296,6 +347,7 @@ class VectorDatabaseManager:
             return {
                 "status": "healthy",
                 "message": "Vector database is working correctly",
+                "backend": self.backend,
                 "indexes": indexes,
                 "index_stats": index_stats
             }
@@ -348,7 +400,8 @@ class OpportunityVectorService:
         self,
         query_embedding: List[float],
         top_k: int = 10,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True
     ) -> List[Dict[str, Any]]:
         """Find opportunities similar to query embedding.
         
@@ -356,6 +409,8 @@ class OpportunityVectorService:
             query_embedding: Query vector for similarity search
             top_k: Number of similar opportunities to return
             filters: Metadata filters (e.g., industry, AI type)
+            include_metadata: Whether to return stored metadata (ids and
+                scores only are much cheaper for deep result lists)
             
         Returns:
             List of similar opportunities with similarity scores
@@ -365,7 +420,7 @@ class OpportunityVectorService:
             query_vector=query_embedding,
             top_k=top_k,
             filter_dict=filters,
-            include_metadata=True
+            include_metadata=include_metadata
         )
 
 
@@ -0,0 +1,470 @@
+"""Local, in-process vector index backend.
+
+Provides a drop-in replacement for a Pinecone index (``upsert``, ``query``,
+``delete`` and ``describe_index_stats`` with the same arguments and response
+shape) for single-node deployments and tests:
+- Vectors live in a memory-mapped NumPy matrix (float32 or float16) on disk
+- Metadata filters use the Pinecone operators and are resolved with
+  per-value bitmaps and numeric columns instead of scanning metadata
+- Large indexes are partitioned with an inverted-file (IVF) index so a
+  query only scores the vectors in the clusters closest to it
+
+Vectors are L2-normalised on insert, so the cosine score is a dot product.
+"""
+
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+
+@dataclass
+class VectorMatch:
+    """A single query match, shaped like a Pinecone match."""
+    id: str
+    score: float
+    metadata: Optional[Dict[str, Any]] = None
+    values: Optional[List[float]] = None
+
+
+@dataclass
+class QueryResponse:
+    matches: List[VectorMatch] = field(default_factory=list)
+
+
+@dataclass
+class IndexStats:
+    total_vector_count: int
+    dimension: int
+    index_fullness: float
+    namespaces: Dict[str, Any] = field(default_factory=dict)
+
+
+class LocalVectorIndex:
+    """Cosine-similarity vector index persisted under ``path``.
+
+    Every method is thread-safe, so callers can run them in a worker thread
+    to keep the event loop free. A vector's own id can be used in filters
+    as ``"id"`` when its metadata has no ``id`` field.
+
+    Vector rows are written straight to the memory-mapped file; ids and
+    metadata are saved at most every ``autosave_seconds`` and at exit.
+    Deleted slots are only reused once the deletion has been saved, so a
+    crash between saves never pairs a saved id with another vector's row.
+    """
+
+    VECTORS_FILE = "vectors.bin"
+    STATE_FILE = "index.json"
+    CENTROIDS_FILE = "centroids.npy"
+
+    def __init__(
+        self,
+        path: str,
+        dimension: int,
+        dtype: str = "float32",
+        initial_capacity: int = 1024,
+        ivf_min_vectors: int = 20000,
+        nprobe: int = 16,
+        exact_search_limit: int = 5000,
+        autosave_seconds: float = 5.0
+    ):
+        self.path = path
+        self.dimension = dimension
+        self.dtype = np.dtype(dtype)
+        self.ivf_min_vectors = ivf_min_vectors
+        self.nprobe = nprobe
+        self.exact_search_limit = exact_search_limit
+        self.autosave_seconds = autosave_seconds
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+        self._ids: List[Optional[str]] = []
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._unsaved_free: List[int] = []
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {}
+        self._numeric: Dict[str, np.ndarray] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, self.STATE_FILE)):
+            self._load()
+        else:
+            self._capacity = max(1, initial_capacity)
+            self._vectors = self._open_vectors(self._capacity, create=True)
+            self._live = np.zeros(self._capacity, dtype=bool)
+            self.save()
+        atexit.register(self.flush)
+
+    # -- Pinecone-compatible API -------------------------------------------
+
+    def upsert(self, vectors: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert or replace vectors given as ``{"id", "values", "metadata"}`` dicts."""
+        with self._lock:
+            for vector in vectors:
+                values = np.asarray(vector["values"], dtype=np.float32)
+                if values.shape != (self.dimension,):
+                    raise ValueError(
+                        f"Vector {vector['id']} has dimension {values.size}, expected {self.dimension}"
+                    )
+                norm = np.linalg.norm(values)
+                if norm > 0:
+                    values = values / norm
+
+                slot = self._slots.get(vector["id"])
+                if slot is not None:
+                    self._unindex_metadata(slot)
+                else:
+                    slot = self._allocate_slot()
+                    self._slots[vector["id"]] = slot
+
+                self._vectors[slot] = values
+                self._ids[slot] = vector["id"]
+                self._metadata[slot] = dict(vector.get("metadata") or {})
+                self._live[slot] = True
+                self._index_metadata(slot)
+                if self._centroids is not None:
+                    self._assignments[slot] = int(np.argmax(self._centroids @ values))
+
+            self._maybe_train()
+            self._mark_dirty()
+            return {"upserted_count": len(vectors)}
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = False,
+        include_values: bool = False
+    ) -> QueryResponse:
+        """Return the ``top_k`` most similar vectors matching ``filter``."""
+        with self._lock:
+            query = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+
+            size = len(self._ids)
+            mask = self._live[:size].copy()
+            if filter:
+                mask &= self._filter_mask(filter)
+
+            candidates = np.flatnonzero(mask)
+            if self._centroids is not None and len(candidates) > max(self.exact_search_limit, top_k):
+                candidates = self._probe(candidates, query, top_k)
+
+            if len(candidates) == 0 or top_k <= 0:
+                return QueryResponse()
+
+            scores = self._score(candidates, query)
+            if len(candidates) > top_k:
+                best = np.argpartition(-scores, top_k - 1)[:top_k]
+            else:
+                best = np.arange(len(candidates))
+            best = best[np.argsort(-scores[best], kind="stable")]
+
+            return QueryResponse(matches=[
+                VectorMatch(
+                    id=self._ids[candidates[position]],
+                    score=float(scores[position]),
+                    metadata=dict(self._metadata[candidates[position]]) if include_metadata else None,
+                    values=self._vectors[candidates[position]].astype(np.float32).tolist() if include_values else None
+                )
+                for position in best
+            ])
+
+    def delete(self, ids: Iterable[str]) -> Dict[str, Any]:
+        """Delete vectors by id; unknown ids are ignored."""
+        with self._lock:
+            for vector_id in ids:
+                slot = self._slots.pop(vector_id, None)
+                if slot is None:
+                    continue
+                self._unindex_metadata(slot)
+                self._ids[slot] = None
+                self._metadata[slot] = None
+                self._live[slot] = False
+                self._unsaved_free.append(slot)
+            self._mark_dirty()
+            return {}
+
+    def describe_index_stats(self) -> IndexStats:
+        with self._lock:
+            return IndexStats(
+                total_vector_count=len(self._slots),
+                dimension=self.dimension,
+                index_fullness=len(self._slots) / self._capacity,
+                namespaces={}
+            )
+
+    # -- Persistence ---------------------------------------------------------
+
+    def flush(self) -> None:
+        """Save the index if it changed since the last save."""
+        with self._lock:
+            if self._dirty:
+                self.save()
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if time.monotonic() - self._saved_at >= self.autosave_seconds:
+            self.save()
+
+    def save(self) -> None:
+        """Flush vectors and write the index state atomically."""
+        with self._lock:
+            self._vectors.flush()
+            state = {
+                "dimension": self.dimension,
+                "dtype": self.dtype.name,
+                "capacity": self._capacity,
+                "ids": self._ids,
+                "metadata": self._metadata,
+                "trained_size": self._trained_size,
+                "assignments": self._assignments[:len(self._ids)].tolist() if self._centroids is not None else None
+            }
+            state_path = os.path.join(self.path, self.STATE_FILE)
+            with open(state_path + ".tmp", "w") as state_file:
+                json.dump(state, state_file, default=str)
+            os.replace(state_path + ".tmp", state_path)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+            self._free.extend(self._unsaved_free)
+            self._unsaved_free.clear()
+
+    def _load(self) -> None:
+        with open(os.path.join(self.path, self.STATE_FILE)) as state_file:
+            state = json.load(state_file)
+        if state["dimension"] != self.dimension:
+            raise ValueError(
+                f"Index at {self.path} has dimension {state['dimension']}, expected {self.dimension}"
+            )
+
+        self.dtype = np.dtype(state["dtype"])
+        self._capacity = state["capacity"]
+        self._vectors = self._open_vectors(self._capacity)
+        self._live = np.zeros(self._capacity, dtype=bool)
+        self._ids = state["ids"]
+        self._metadata = state["metadata"]
+
+        for slot, vector_id in enumerate(self._ids):
+            if vector_id is None:
+                self._free.append(slot)
+                continue
+            self._slots[vector_id] = slot
+            self._live[slot] = True
+            self._index_metadata(slot)
+
+        centroids_path = os.path.join(self.path, self.CENTROIDS_FILE)
+        if state.get("assignments") is not None and os.path.exists(centroids_path):
+            self._centroids = np.load(centroids_path)
+            self._assignments = np.zeros(self._capacity, dtype=np.int32)
+            self._assignments[:len(state["assignments"])] = state["assignments"]
+            self._trained_size = state["trained_size"]
+
+    def _open_vectors(self, capacity: int, create: bool = False) -> np.memmap:
+        return np.memmap(
+            os.path.join(self.path, self.VECTORS_FILE),
+            dtype=self.dtype,
+            mode="w+" if create else "r+",
+            shape=(capacity, self.dimension)
+        )
+
+    # -- Storage -------------------------------------------------------------
+
+    def _allocate_slot(self) -> int:
+        if self._free:
+            return self._free.pop()
+
+        slot = len(self._ids)
+        if slot == self._capacity:
+            self._grow(self._capacity * 2)
+        self._ids.append(None)
+        self._metadata.append(None)
+        return slot
+
+    def _grow(self, capacity: int) -> None:
+        """Double the backing file; existing rows keep their slots."""
+        self._vectors.flush()
+        del self._vectors
+        with open(os.path.join(self.path, self.VECTORS_FILE), "r+b") as vectors_file:
+            vectors_file.truncate(capacity * self.dimension * self.dtype.itemsize)
+        self._vectors = self._open_vectors(capacity)
+
+        self._live = np.concatenate([self._live, np.zeros(capacity - self._capacity, dtype=bool)])
+        self._assignments = np.concatenate([
+            self._assignments, np.zeros(capacity - len(self._assignments), dtype=np.int32)
+        ])
+        for key, column in self._numeric.items():
+            self._numeric[key] = np.concatenate([column, np.full(capacity - len(column), np.nan)])
+        self._capacity = capacity
+
+    def _score(self, candidates: np.ndarray, query: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        """Dot products of ``query`` with candidate rows, chunked to bound memory."""
+        scores = np.empty(len(candidates), dtype=np.float32)
+        for start in range(0, len(candidates), chunk_size):
+            rows = candidates[start:start + chunk_size]
+            scores[start:start + chunk_size] = self._vectors[rows].astype(np.float32, copy=False) @ query
+        return scores
+
+    # -- IVF -----------------------------------------------------------------
+
+    def _probe(self, candidates: np.ndarray, query: np.ndarray, top_k: int) -> np.ndarray:
+        """Keep the candidates in the clusters closest to ``query``.
+
+        At least ``nprobe`` clusters are probed, and more are added in order
+        of closeness until they hold ``top_k`` filtered candidates, so a deep
+        or heavily filtered query is never cut short by the partitioning.
+        """
+        order = np.argsort(-(self._centroids @ query))
+        labels = self._assignments[candidates]
+        counts = np.bincount(labels, minlength=len(self._centroids))[order]
+        needed = int(np.searchsorted(np.cumsum(counts), top_k)) + 1
+        probed = order[:max(self.nprobe, needed)]
+        return candidates[np.isin(labels, probed)]
+
+    def _maybe_train(self) -> None:
+        """(Re)train the IVF partitioning once the index outgrows the last training."""
+        live = len(self._slots)
+        if live < self.ivf_min_vectors or live < 2 * self._trained_size:
+            return
+
+        slots = np.flatnonzero(self._live[:len(self._ids)])
+        nlist = max(16, int(4 * math.sqrt(live)))
+        generator = np.random.default_rng(0)
+        sample = generator.choice(slots, size=min(len(slots), 64 * nlist), replace=False)
+        vectors = self._vectors[np.sort(sample)].astype(np.float32)
+
+        # Spherical k-means on the sample
+        centroids = vectors[generator.choice(len(vectors), size=nlist, replace=False)]
+        for _ in range(10):
+            labels = np.argmax(vectors @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = vectors[labels == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[cluster] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+        assignments = np.zeros(self._capacity, dtype=np.int32)
+        for start in range(0, len(slots), 65536):
+            rows = slots[start:start + 65536]
+            assignments[rows] = np.argmax(self._vectors[rows].astype(np.float32) @ centroids.T, axis=1)
+
+        self._centroids = centroids
+        self._assignments = assignments
+        self._trained_size = live
+        np.save(os.path.join(self.path, self.CENTROIDS_FILE), centroids)
+
+    # -- Metadata filters ----------------------------------------------------
+
+    def _filter_fields(self, slot: int) -> Dict[str, Any]:
+        metadata = self._metadata[slot]
+        if "id" in metadata:
+            return metadata
+        return {**metadata, "id": self._ids[slot]}
+
+    def _index_metadata(self, slot: int) -> None:
+        for key, value in self._filter_fields(slot).items():
+            values = value if isinstance(value, list) else [value]
+            postings = self._postings.setdefault(key, {})
+            for item in values:
+                if isinstance(item, (str, int, float, bool)):
+                    postings.setdefault(item, set()).add(slot)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                column = self._numeric.get(key)
+                if column is None:
+                    column = self._numeric[key] = np.full(self._capacity, np.nan)
+                column[slot] = value
+
+    def _unindex_metadata(self, slot: int) -> None:
+        for key, value in self._filter_fields(slot).items():
+            values = value if isinstance(value, list) else [value]
+            postings = self._postings.get(key)
+            if postings is not None:
+                for item in values:
+                    if not isinstance(item, (str, int, float, bool)):
+                        continue
+                    slots = postings.get(item)
+                    if slots is not None:
+                        slots.discard(slot)
+                        if not slots:
+                            del postings[item]
+                if not postings:
+                    del self._postings[key]
+            if key in self._numeric:
+                self._numeric[key][slot] = np.nan
+
+    def _bitmap(self, key: str, values: Iterable[Any]) -> np.ndarray:
+        mask = np.zeros(len(self._ids), dtype=bool)
+        postings = self._postings.get(key, {})
+        for value in values:
+            slots = postings.get(value)
+            if slots:
+                mask[list(slots)] = True
+        return mask
+
+    def _filter_mask(self, filter_dict: Dict[str, Any]) -> np.ndarray:
+        """Evaluate a Pinecone-style metadata filter into a boolean slot mask."""
+        size = len(self._ids)
+        mask = np.ones(size, dtype=bool)
+
+        for key, condition in filter_dict.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._filter_mask(clause)
+                continue
+            if key == "$or":
+                any_mask = np.zeros(size, dtype=bool)
+                for clause in condition:
+                    any_mask |= self._filter_mask(clause)
+                mask &= any_mask
+                continue
+
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+
+            for operator, operand in condition.items():
+                if operator == "$eq":
+                    mask &= self._bitmap(key, [operand])
+                elif operator == "$ne":
+                    mask &= ~self._bitmap(key, [operand])
+                elif operator == "$in":
+                    mask &= self._bitmap(key, operand)
+                elif operator == "$nin":
+                    mask &= ~self._bitmap(key, operand)
+                elif operator == "$exists":
+                    exists = self._bitmap(key, self._postings.get(key, {}).keys())
+                    mask &= exists if operand else ~exists
+                elif operator in ("$gt", "$gte", "$lt", "$lte"):
+                    column = self._numeric.get(key)
+                    if column is None:
+                        mask[:] = False
+                        continue
+                    values = column[:size]
+                    with np.errstate(invalid="ignore"):
+                        if operator == "$gt":
+                            mask &= values > operand
+                        elif operator == "$gte":
+                            mask &= values >= operand
+                        elif operator == "$lt":
+                            mask &= values < operand
+                        else:
+                            mask &= values <= operand
+                else:
+                    raise ValueError(f"Unsupported filter operator: {operator}")
+
+        return mask
+
+    def __len__(self) -> int:
+        return len(self._slots)
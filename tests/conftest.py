@@ -1,5 +1,7 @@
 """Test configuration and fixtures."""
 
+import os
+import sys
 import pytest
 import asyncio
 import json
@@ -15,6 +17,9 @@ from shared.models.opportunity import Opportunity, OpportunityStatus
 from shared.models.user_interaction import UserInteraction, InteractionType
 from shared.auth import hash_password, create_access_token
 
+# The data ingestion service imports its modules relative to its own directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data-ingestion"))
+
 
 # Test database URL (in-memory SQLite)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -3,7 +3,7 @@
 import pytest
 import asyncio
 from datetime import timedelta
-from shared.cache import cache_manager, rate_limiter
+from shared.cache import CacheTags, cache_manager, rate_limiter
 from shared.session import session_manager
 
 
@@ -67,6 +67,22 @@ class TestCacheManager:
         await asyncio.sleep(1.1)
         assert await cache_manager.get(key) is None
     
+    @pytest.mark.asyncio
+    async def test_tag_set_outlives_its_members(self):
+        """Test a tag set made persistent by a member never gets a TTL back."""
+        await cache_manager.initialize()
+        tag_key = CacheTags.key("test_tag")
+        
+        assert await cache_manager.set("test_tagged_short", "a", expire=60, tags=["test_tag"])
+        assert 0 < await cache_manager.redis_client.ttl(tag_key) <= 60
+        
+        assert await cache_manager.set("test_tagged_forever", "b", tags=["test_tag"])
+        assert await cache_manager.set("test_tagged_later", "c", expire=60, tags=["test_tag"])
+        assert await cache_manager.redis_client.ttl(tag_key) == -1
+        
+        assert await cache_manager.invalidate_tags("test_tag") == 3
+        assert await cache_manager.get("test_tagged_forever") is None
+    
     @pytest.mark.asyncio
     async def test_cache_increment(self):
         """Test cache increment functionality."""
@@ -46,6 +46,18 @@ class TestEventHandler(EventHandler):
         await super().on_error(event, error)
 
 
+def sorted_set_range(timelines):
+    """Fake ZRANGEBYSCORE ... WITHSCORES over ``{key: [(member, score)]}``."""
+    async def zrangebyscore(key, min_score, max_score, start, num, withscores=False):
+        entries = sorted(
+            (entry for entry in timelines[key] if min_score <= entry[1] <= float(max_score)),
+            key=lambda entry: (entry[1], entry[0])
+        )
+        return entries[start:start + num]
+    
+    return zrangebyscore
+
+
 @pytest.fixture
 async def redis_mock():
     """Mock Redis client for testing."""
@@ -55,7 +67,7 @@ async def redis_mock():
     mock_redis.setex.return_value = True
     mock_redis.zadd.return_value = 1
     mock_redis.expire.return_value = True
-    mock_redis.zrangebyscore.return_value = ["event1", "event2"]
+    mock_redis.zrangebyscore.return_value = [("event1", 1.0), ("event2", 2.0)]
     mock_redis.get.return_value = json.dumps({
         "id": "event1",
         "event_type": "test.event",
@@ -65,6 +77,18 @@ async def redis_mock():
         "correlation_id": None,
         "metadata": {}
     })
+    mock_redis.mget.return_value = [
+        json.dumps({
+            "id": event_id,
+            "event_type": "test.event",
+            "payload": {"test": "data"},
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "source": "test",
+            "correlation_id": None,
+            "metadata": {}
+        })
+        for event_id in ["event1", "event2"]
+    ]
     mock_redis.zcard.return_value = 5
     mock_redis.close.return_value = None
     
@@ -186,6 +210,35 @@ class TestEventBus:
         redis_mock.setex.assert_called_once()
         redis_mock.zadd.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_publish_many(self, event_bus, redis_mock):
+        """Test batched publishing in a single pipeline."""
+        pipe = MagicMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.execute = AsyncMock(return_value=[])
+        redis_mock.pipeline = MagicMock(return_value=pipe)
+        
+        event_ids = await event_bus.publish_many([
+            {
+                "event_type": EventType.SIGNAL_DETECTED,
+                "payload": {"signal_id": f"signal-{i}"},
+                "source": "test_service"
+            }
+            for i in range(3)
+        ])
+        
+        assert len(event_ids) == 3
+        assert len(set(event_ids)) == 3
+        
+        # One MULTI/EXEC round-trip for the whole batch
+        redis_mock.pipeline.assert_called_once_with(transaction=True)
+        pipe.execute.assert_awaited_once()
+        assert pipe.publish.call_count == 3
+        assert pipe.setex.call_count == 3
+        assert pipe.zadd.call_count == 3
+        pipe.expire.assert_called_once()
+        redis_mock.publish.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_subscribe_to_events(self, event_bus):
         """Test event subscription."""
@@ -199,6 +252,56 @@ class TestEventBus:
         assert EventType.OPPORTUNITY_CREATED in event_bus._subscribers
         assert handler in event_bus._subscribers[EventType.OPPORTUNITY_CREATED]
     
+    @pytest.mark.asyncio
+    async def test_slow_handler_does_not_block_others(self, event_bus):
+        """Test handlers run concurrently and keep per-aggregate order."""
+        release = asyncio.Event()
+        
+        class BlockingHandler(TestEventHandler):
+            async def handle(self, event: Event) -> None:
+                await release.wait()
+                await super().handle(event)
+        
+        slow_handler = BlockingHandler("slow_handler")
+        fast_handler = TestEventHandler("fast_handler")
+        await event_bus.subscribe_to_events([EventType.OPPORTUNITY_CREATED], slow_handler)
+        await event_bus.subscribe_to_events([EventType.OPPORTUNITY_CREATED], fast_handler)
+        
+        for i in range(5):
+            event = Event(
+                id=f"event-{i}",
+                event_type=str(EventType.OPPORTUNITY_CREATED),
+                payload={"sequence": i},
+                timestamp=datetime.now(timezone.utc),
+                source="test",
+                metadata={"aggregate_id": "opp-123"}
+            )
+            await event_bus._process_message({"data": json.dumps(event.to_dict())})
+        
+        await asyncio.wait_for(event_bus._handler_pools[fast_handler].join(), timeout=1)
+        assert [e.payload["sequence"] for e in fast_handler.handled_events] == [0, 1, 2, 3, 4]
+        assert slow_handler.handled_events == []
+        assert event_bus.get_handler_metrics()["slow_handler"]["backlog"] > 0
+        
+        release.set()
+        await asyncio.wait_for(event_bus.drain_handlers(), timeout=1)
+        assert [e.payload["sequence"] for e in slow_handler.handled_events] == [0, 1, 2, 3, 4]
+        assert event_bus.get_handler_metrics()["slow_handler"]["processed"] == 5
+    
+    @pytest.mark.asyncio
+    async def test_subscribe_new_event_type_while_running(self, event_bus, redis_mock):
+        """Test later subscriptions add channels to the running pub/sub loop."""
+        await event_bus.subscribe_to_events([EventType.OPPORTUNITY_CREATED], TestEventHandler("first"))
+        event_bus._pubsub = redis_mock.pubsub.return_value
+        event_bus._subscribed_channels = {f"events:{EventType.OPPORTUNITY_CREATED}"}
+        redis_mock.pubsub.return_value.subscribe.reset_mock()
+        
+        await event_bus.subscribe_to_events([EventType.USER_REGISTERED], TestEventHandler("second"))
+        
+        redis_mock.pubsub.return_value.subscribe.assert_awaited_once_with(
+            f"events:{EventType.USER_REGISTERED}"
+        )
+    
     @pytest.mark.asyncio
     async def test_event_replay(self, event_bus, redis_mock):
         """Test event replay functionality."""
@@ -211,9 +314,97 @@ class TestEventBus:
         ):
             events.append(event)
         
-        assert len(events) > 0
+        assert len(events) == 2
         redis_mock.zrangebyscore.assert_called_once()
-        redis_mock.get.assert_called()
+        redis_mock.mget.assert_called_once_with(["event:event1", "event:event2"])
+        redis_mock.get.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_event_replay_merges_types_in_time_order(self, event_bus, redis_mock):
+        """Test paged replay of several event types as one ordered stream."""
+        base = datetime.now(timezone.utc) - timedelta(minutes=10)
+        
+        def body(event_id, event_type, minutes):
+            return json.dumps(Event(
+                id=event_id,
+                event_type=event_type,
+                payload={},
+                timestamp=base + timedelta(minutes=minutes),
+                source="test"
+            ).to_dict())
+        
+        def score(minutes):
+            return (base + timedelta(minutes=minutes)).timestamp()
+        
+        timelines = {
+            f"timeline:{EventType.OPPORTUNITY_CREATED}": [("o1", score(1)), ("o2", score(4)), ("o3", score(5))],
+            f"timeline:{EventType.USER_REGISTERED}": [("u1", score(2)), ("u2", score(3))]
+        }
+        bodies = {
+            "event:o1": body("o1", "opportunity.created", 1),
+            "event:o2": body("o2", "opportunity.created", 4),
+            "event:o3": body("o3", "opportunity.created", 5),
+            "event:u1": body("u1", "user.registered", 2),
+            "event:u2": body("u2", "user.registered", 3)
+        }
+        
+        async def mget(keys):
+            return [bodies[key] for key in keys]
+        
+        redis_mock.zrangebyscore.side_effect = sorted_set_range(timelines)
+        redis_mock.mget.side_effect = mget
+        
+        events = [
+            event async for event in event_bus.replay_events(
+                [EventType.OPPORTUNITY_CREATED, EventType.USER_REGISTERED],
+                base,
+                chunk_size=2
+            )
+        ]
+        
+        assert [event.id for event in events] == ["o1", "u1", "u2", "o2", "o3"]
+        # Two pages for the opportunity timeline, one for users
+        assert redis_mock.mget.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_event_replay_pages_by_score(self, event_bus, redis_mock):
+        """Test replay pages resume from the last score, across ties and concurrent inserts."""
+        base = datetime.now(timezone.utc) - timedelta(minutes=10)
+        start = base.timestamp()
+        timeline_key = f"timeline:{EventType.OPPORTUNITY_CREATED}"
+        timelines = {timeline_key: [
+            ("e1", start + 1), ("e2", start + 2), ("e3", start + 2), ("e4", start + 2), ("e5", start + 3)
+        ]}
+        
+        async def mget(keys):
+            if redis_mock.mget.call_count == 1:
+                # Published mid-replay behind the current position
+                timelines[timeline_key].append(("e0", start + 0.5))
+            return [
+                json.dumps(Event(
+                    id=key.split(":", 1)[1],
+                    event_type="opportunity.created",
+                    payload={},
+                    timestamp=base,
+                    source="test"
+                ).to_dict())
+                for key in keys
+            ]
+        
+        redis_mock.zrangebyscore.side_effect = sorted_set_range(timelines)
+        redis_mock.mget.side_effect = mget
+        
+        events = [
+            event async for event in event_bus.replay_events(
+                EventType.OPPORTUNITY_CREATED, base, chunk_size=2, prefetch=1
+            )
+        ]
+        
+        assert [event.id for event in events] == ["e1", "e2", "e3", "e4", "e5"]
+        # Every page after the first starts from the last score read, never an offset
+        calls = redis_mock.zrangebyscore.call_args_list
+        assert [call.args[1] - start for call in calls[1:]] == [2, 2]
+        assert all(call.kwargs["start"] == 0 for call in calls)
     
     @pytest.mark.asyncio
     async def test_get_event_stats(self, event_bus, redis_mock):
@@ -10,14 +10,16 @@ This module tests the event sourcing functionality including:
 """
 
 import asyncio
+import json
 import pytest
 import uuid
 from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from shared.event_bus import Event, EventType
 from shared.event_sourcing import (
-    EventStore, EventSourcingService, EventSnapshot, EventCheckpoint,
+    EventStore, EventSourcingService, EventSnapshot, EventCheckpoint, GroupCommitWriter, SnapshotPolicy,
     EventMigrator, EventVersion, EventSourceError, EventMigrationError,
     EventReplayError, get_event_sourcing_service
 )
@@ -136,6 +138,56 @@ class TestEventStore:
         assert retrieved.metadata == {"test": "data"}
 
 
+class TestGroupCommitWriter:
+    """Test cases for the group-commit writer."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_share_one_commit(self):
+        """Test buffered rows are written together, in submission order."""
+        written = []
+        
+        async def write_rows(rows):
+            written.append([row["sequence"] for row in rows])
+        
+        writer = GroupCommitWriter(write_rows, max_batch_size=100, max_delay_ms=5)
+        acknowledgements = [await writer.submit({"sequence": i}) for i in range(10)]
+        
+        await asyncio.wait_for(asyncio.gather(*acknowledgements), timeout=1)
+        
+        assert written == [list(range(10))]
+        assert writer.batches_written == 1
+        assert writer.rows_written == 10
+    
+    @pytest.mark.asyncio
+    async def test_full_batches_flush_in_order(self):
+        """Test size-triggered batches commit in submission order."""
+        written = []
+        
+        async def write_rows(rows):
+            await asyncio.sleep(0.01 if rows[0]["sequence"] == 0 else 0)
+            written.extend(row["sequence"] for row in rows)
+        
+        writer = GroupCommitWriter(write_rows, max_batch_size=3, max_delay_ms=1000)
+        acknowledgements = [await writer.submit({"sequence": i}) for i in range(7)]
+        await writer.flush()
+        
+        assert written == list(range(7))
+        assert all(ack.done() for ack in acknowledgements)
+    
+    @pytest.mark.asyncio
+    async def test_failed_commit_fails_acknowledgements(self):
+        """Test callers see the write error through their acknowledgement."""
+        async def write_rows(rows):
+            raise RuntimeError("database unavailable")
+        
+        writer = GroupCommitWriter(write_rows, max_batch_size=2)
+        acknowledgements = [await writer.submit({"sequence": i}) for i in range(2)]
+        
+        for acknowledgement in acknowledgements:
+            with pytest.raises(RuntimeError):
+                await acknowledgement
+
+
 class TestEventMigrators:
     """Test cases for event migrators."""
     
@@ -262,6 +314,36 @@ class TestEventMigrators:
         assert migrated.payload["result"]["data"] == "Analysis completed successfully"
 
 
+@pytest.fixture
+def sample_events():
+    """Create sample events for testing."""
+    base_time = datetime.now(timezone.utc)
+    aggregate_id = str(uuid.uuid4())
+
+    events = []
+    for i in range(5):
+        event = Event(
+            id=str(uuid.uuid4()),
+            event_type=EventType.OPPORTUNITY_UPDATED,
+            payload={
+                "opportunity_id": aggregate_id,
+                "changes": {"field": f"value_{i}"},
+                "version": i + 1
+            },
+            timestamp=base_time + timedelta(minutes=i),
+            source="test",
+            correlation_id=str(uuid.uuid4()),
+            metadata={
+                "aggregate_id": aggregate_id,
+                "aggregate_type": "opportunity",
+                "aggregate_version": i + 1
+            }
+        )
+        events.append(event)
+
+    return events, aggregate_id
+
+
 class TestEventSourcingService:
     """Test cases for EventSourcingService."""
     
@@ -274,44 +356,17 @@ class TestEventSourcingService:
             await service.initialize()
             yield service
     
-    @pytest.fixture
-    def sample_events(self):
-        """Create sample events for testing."""
-        base_time = datetime.now(timezone.utc)
-        aggregate_id = str(uuid.uuid4())
-        
-        events = []
-        for i in range(5):
-            event = Event(
-                id=str(uuid.uuid4()),
-                event_type=EventType.OPPORTUNITY_UPDATED,
-                payload={
-                    "opportunity_id": aggregate_id,
-                    "changes": {"field": f"value_{i}"},
-                    "version": i + 1
-                },
-                timestamp=base_time + timedelta(minutes=i),
-                source="test",
-                correlation_id=str(uuid.uuid4()),
-                metadata={
-                    "aggregate_id": aggregate_id,
-                    "aggregate_type": "opportunity",
-                    "aggregate_version": i + 1
-                }
-            )
-            events.append(event)
-        
-        return events, aggregate_id
-    
     @pytest.mark.asyncio
     async def test_event_replay(self, event_sourcing_service, sample_events):
         """Test event replay functionality."""
         events, aggregate_id = sample_events
         
-        # Mock event store to return our sample events
-        with patch.object(event_sourcing_service.event_store, 'get_events_by_type') as mock_get:
-            mock_get.return_value = events
-            
+        async def iter_events(*args, **kwargs):
+            for event in events:
+                yield event
+        
+        # Mock event store to stream our sample events
+        with patch.object(event_sourcing_service.event_store, 'iter_events', iter_events):
             replayed_events = []
             
             async def replay_handler(event):
@@ -330,6 +385,83 @@ class TestEventSourcingService:
             for event in replayed_events:
                 assert event.metadata.get('replay_id') == replay_id
     
+    @pytest.mark.asyncio
+    async def test_event_replay_checkpoints_last_event_position(self, event_sourcing_service, sample_events):
+        """Test replay resumes after the checkpointed (timestamp, id) position."""
+        events, aggregate_id = sample_events
+        previous = EventCheckpoint(
+            id=str(uuid.uuid4()),
+            name="projection",
+            timestamp=events[1].timestamp,
+            last_event_id=events[1].id,
+            event_count=2
+        )
+        calls = []
+        
+        async def iter_events(*args, **kwargs):
+            calls.append(kwargs)
+            for event in events[2:]:
+                yield event
+        
+        store = event_sourcing_service.event_store
+        with patch.object(store, 'iter_events', iter_events), \
+             patch.object(store, 'get_checkpoint', AsyncMock(return_value=previous)), \
+             patch.object(store, 'create_checkpoint', AsyncMock()) as mock_checkpoint:
+            
+            async def replay_handler(event):
+                pass
+            
+            await event_sourcing_service.replay_events(
+                replay_handler=replay_handler,
+                checkpoint_name="projection",
+                batch_size=2
+            )
+            
+            assert calls[0]['after'] == (events[1].timestamp, events[1].id)
+            
+            # One checkpoint per batch, each on the batch's last event
+            checkpoints = [call.args[0] for call in mock_checkpoint.call_args_list]
+            assert [c.last_event_id for c in checkpoints] == [events[3].id, events[4].id]
+            assert checkpoints[-1].timestamp == events[4].timestamp
+            assert checkpoints[-1].event_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_parallel_replay_keeps_aggregate_order(self, event_sourcing_service):
+        """Test partitioned replay preserves per-aggregate event order."""
+        base_time = datetime.now(timezone.utc)
+        events = [
+            Event(
+                id=str(uuid.uuid4()),
+                event_type=EventType.OPPORTUNITY_UPDATED,
+                payload={"sequence": i},
+                timestamp=base_time + timedelta(seconds=i),
+                source="test",
+                metadata={"aggregate_id": f"aggregate-{i % 3}"}
+            )
+            for i in range(12)
+        ]
+        
+        async def iter_events(*args, **kwargs):
+            for event in events:
+                yield event
+        
+        with patch.object(event_sourcing_service.event_store, 'iter_events', iter_events):
+            seen = {}
+            
+            async def replay_handler(event):
+                await asyncio.sleep(0)
+                seen.setdefault(event.metadata["aggregate_id"], []).append(event.payload["sequence"])
+            
+            await event_sourcing_service.replay_events(
+                replay_handler=replay_handler,
+                batch_size=5,
+                parallelism=3
+            )
+            
+            assert sum(len(sequence) for sequence in seen.values()) == 12
+            for sequence in seen.values():
+                assert sequence == sorted(sequence)
+    
     @pytest.mark.asyncio
     async def test_rebuild_aggregate(self, event_sourcing_service, sample_events):
         """Test aggregate rebuilding from events."""
@@ -396,6 +528,252 @@ class TestEventSourcingService:
             assert all(e.metadata.get('aggregate_id') == aggregate_id for e in audit_trail)
 
 
+class TestAggregateCache:
+    """Test cases for the aggregate cache and automatic snapshots."""
+    
+    @pytest.fixture
+    def event_sourcing_service(self):
+        """Create a service whose event store is never initialized against a database."""
+        service = EventSourcingService(event_store=EventStore(table_prefix="test_event_store"))
+        service.event_store.initialize = AsyncMock()
+        service.event_bus = AsyncMock()
+        service._initialized = True
+        return service
+    
+    @pytest.mark.asyncio
+    async def test_rebuild_aggregate_served_from_cache_and_advanced(self, event_sourcing_service, sample_events):
+        """Test cached aggregates are reused and advanced from bus events."""
+        events, aggregate_id = sample_events
+        
+        def aggregate_builder(events_list, base_state=None):
+            state = base_state or {"version": 0, "changes": []}
+            for event in events_list:
+                state["version"] = event.payload["version"]
+                state["changes"].append(event.payload["changes"])
+            return state
+        
+        event_sourcing_service.register_aggregate_builder("opportunity", aggregate_builder)
+        
+        with patch.object(event_sourcing_service.event_store, 'get_events_by_aggregate') as mock_get:
+            mock_get.return_value = events[:4]
+            
+            first = await event_sourcing_service.rebuild_aggregate(aggregate_id, aggregate_builder, use_snapshots=False)
+            first["changes"].clear()
+            
+            await event_sourcing_service._advance_cached_aggregate(events[4])
+            await event_sourcing_service._advance_cached_aggregate(events[4])
+            second = await event_sourcing_service.rebuild_aggregate(aggregate_id, aggregate_builder, use_snapshots=False)
+            
+            assert mock_get.call_count == 1
+            assert second["version"] == 5
+            assert len(second["changes"]) == 5
+    
+    @pytest.mark.asyncio
+    async def test_version_gap_invalidates_cached_aggregate(self, event_sourcing_service, sample_events):
+        """Test a missed event drops the cache entry instead of applying out of order."""
+        events, aggregate_id = sample_events
+        
+        def aggregate_builder(events_list, base_state=None):
+            state = base_state or {"version": 0}
+            for event in events_list:
+                state["version"] = event.payload["version"]
+            return state
+        
+        event_sourcing_service.register_aggregate_builder("opportunity", aggregate_builder)
+        
+        with patch.object(event_sourcing_service.event_store, 'get_events_by_aggregate') as mock_get:
+            mock_get.return_value = events[:3]
+            await event_sourcing_service.rebuild_aggregate(aggregate_id, aggregate_builder, use_snapshots=False)
+            
+            await event_sourcing_service._advance_cached_aggregate(events[4])
+            
+            mock_get.return_value = events
+            aggregate = await event_sourcing_service.rebuild_aggregate(aggregate_id, aggregate_builder, use_snapshots=False)
+            
+            assert mock_get.call_count == 2
+            assert aggregate["version"] == 5
+    
+    @pytest.mark.asyncio
+    async def test_stored_aggregate_version_enables_cache(self, event_sourcing_service, sample_events):
+        """Test events read back from the store carry the aggregate version columns."""
+        events, aggregate_id = sample_events
+        rows = [
+            SimpleNamespace(
+                id=event.id,
+                event_type=event.event_type,
+                payload=json.dumps(event.payload),
+                timestamp=event.timestamp,
+                source=event.source,
+                correlation_id=event.correlation_id,
+                metadata=json.dumps({}),
+                aggregate_id=aggregate_id,
+                aggregate_type="opportunity",
+                aggregate_version=index + 1
+            )
+            for index, event in enumerate(events)
+        ]
+        stored_events = [EventStore._row_to_event(row) for row in rows]
+        assert stored_events[-1].metadata["aggregate_version"] == 5
+        assert stored_events[-1].metadata["aggregate_type"] == "opportunity"
+        
+        def aggregate_builder(events_list, base_state=None):
+            state = base_state or {"version": 0}
+            for event in events_list:
+                state["version"] = event.payload["version"]
+            return state
+        
+        event_sourcing_service.register_aggregate_builder("opportunity", aggregate_builder)
+        
+        with patch.object(event_sourcing_service.event_store, 'get_events_by_aggregate') as mock_get:
+            mock_get.return_value = stored_events
+            await event_sourcing_service.rebuild_aggregate(aggregate_id, aggregate_builder, use_snapshots=False)
+            await event_sourcing_service.rebuild_aggregate(aggregate_id, aggregate_builder, use_snapshots=False)
+            
+            assert mock_get.call_count == 1
+            assert event_sourcing_service._aggregate_cache[aggregate_id].version == 5
+    
+    @pytest.mark.asyncio
+    async def test_distinct_builders_do_not_share_cache(self, event_sourcing_service, sample_events):
+        """Test a cached aggregate is only served to the builder name that built it."""
+        events, aggregate_id = sample_events
+        
+        def make_builder(field):
+            def aggregate_builder(events_list, base_state=None):
+                state = base_state or {field: 0}
+                for event in events_list:
+                    state[field] = event.payload["version"]
+                return state
+            return aggregate_builder
+        
+        event_sourcing_service.register_aggregate_builder("by_version", make_builder("version"))
+        event_sourcing_service.register_aggregate_builder("by_revision", make_builder("revision"))
+        
+        with patch.object(event_sourcing_service.event_store, 'get_events_by_aggregate') as mock_get:
+            mock_get.return_value = events
+            first = await event_sourcing_service.rebuild_aggregate(aggregate_id, "by_version", use_snapshots=False)
+            second = await event_sourcing_service.rebuild_aggregate(aggregate_id, "by_revision", use_snapshots=False)
+            
+            assert mock_get.call_count == 2
+            assert first == {"version": 5}
+            assert second == {"revision": 5}
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_policy_creates_snapshots(self, event_sourcing_service, sample_events):
+        """Test snapshots are written once the policy threshold is reached."""
+        events, aggregate_id = sample_events
+        event_sourcing_service.snapshot_policy = SnapshotPolicy(every_n_events=3)
+        
+        def aggregate_builder(events_list, base_state=None):
+            state = base_state or {"version": 0}
+            for event in events_list:
+                state["version"] = event.payload["version"]
+            return state
+        
+        event_sourcing_service.register_aggregate_builder("opportunity", aggregate_builder)
+        
+        with patch.object(event_sourcing_service.event_store, 'get_events_by_aggregate') as mock_get, \
+             patch.object(event_sourcing_service.event_store, 'store_snapshot') as mock_store:
+            mock_get.return_value = events[:2]
+            await event_sourcing_service.rebuild_aggregate(aggregate_id, aggregate_builder, use_snapshots=False)
+            assert mock_store.call_count == 0
+            
+            for event in events[2:]:
+                await event_sourcing_service._advance_cached_aggregate(event)
+            
+            mock_store.assert_called_once()
+            snapshot = mock_store.call_args[0][0]
+            assert snapshot.version == 3
+            assert snapshot.aggregate_type == "opportunity"
+            assert snapshot.data == {"version": 3}
+    
+    @pytest.mark.asyncio
+    async def test_builder_version_bump_rebuilds(self, event_sourcing_service, sample_events):
+        """Test re-registering a builder under a new version bypasses aggregates cached by the old one."""
+        events, aggregate_id = sample_events
+        
+        def make_builder(field):
+            def aggregate_builder(events_list, base_state=None):
+                state = base_state or {field: 0}
+                for event in events_list:
+                    state[field] = event.payload["version"]
+                return state
+            return aggregate_builder
+        
+        with patch.object(event_sourcing_service.event_store, 'get_events_by_aggregate') as mock_get:
+            mock_get.return_value = events
+            event_sourcing_service.register_aggregate_builder("opportunity", make_builder("version"))
+            assert await event_sourcing_service.rebuild_aggregate(aggregate_id, "opportunity", use_snapshots=False) == {"version": 5}
+            assert await event_sourcing_service.rebuild_aggregate(aggregate_id, "opportunity", use_snapshots=False) == {"version": 5}
+            assert mock_get.call_count == 1
+            
+            event_sourcing_service.register_aggregate_builder("opportunity", make_builder("revision"), version=2)
+            assert await event_sourcing_service.rebuild_aggregate(aggregate_id, "opportunity", use_snapshots=False) == {"revision": 5}
+            assert mock_get.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_unregistered_builder_is_not_cached(self, event_sourcing_service, sample_events):
+        """Test builders passed without registering are always rebuilt from the store."""
+        events, aggregate_id = sample_events
+        
+        def aggregate_builder(events_list, base_state=None):
+            state = base_state or {"version": 0}
+            for event in events_list:
+                state["version"] = event.payload["version"]
+            return state
+        
+        with patch.object(event_sourcing_service.event_store, 'get_events_by_aggregate') as mock_get:
+            mock_get.return_value = events
+            await event_sourcing_service.rebuild_aggregate(aggregate_id, aggregate_builder, use_snapshots=False)
+            await event_sourcing_service.rebuild_aggregate(aggregate_id, aggregate_builder, use_snapshots=False)
+            
+            assert mock_get.call_count == 2
+            assert aggregate_id not in event_sourcing_service._aggregate_cache
+        
+        with pytest.raises(ValueError, match="No aggregate builder registered"):
+            await event_sourcing_service.rebuild_aggregate(aggregate_id, "missing", use_snapshots=False)
+    
+    @pytest.mark.asyncio
+    async def test_cache_advances_only_after_commit(self, event_sourcing_service, sample_events):
+        """Test bus events reach the cache and snapshots only once they are stored."""
+        events, aggregate_id = sample_events
+        event_sourcing_service.snapshot_policy = SnapshotPolicy(every_n_events=1)
+        await event_sourcing_service._setup_event_storage()
+        handler = event_sourcing_service.event_bus.subscribe_to_events.call_args[0][1]
+        
+        def aggregate_builder(events_list, base_state=None):
+            state = base_state or {"version": 0}
+            for event in events_list:
+                state["version"] = event.payload["version"]
+            return state
+        
+        event_sourcing_service.register_aggregate_builder("opportunity", aggregate_builder)
+        
+        loop = asyncio.get_running_loop()
+        committed, failed = loop.create_future(), loop.create_future()
+        with patch.object(event_sourcing_service.event_store, 'get_events_by_aggregate') as mock_get, \
+             patch.object(event_sourcing_service.event_store, 'store_snapshot') as mock_store, \
+             patch.object(event_sourcing_service.event_store, 'enqueue_event', AsyncMock(side_effect=[committed, failed])):
+            mock_get.return_value = events[:3]
+            await event_sourcing_service.rebuild_aggregate(aggregate_id, aggregate_builder, use_snapshots=False)
+            mock_store.reset_mock()
+            
+            await handler.handle(events[3])
+            await asyncio.sleep(0)
+            assert event_sourcing_service._aggregate_cache[aggregate_id].version == 3
+            
+            committed.set_result(None)
+            await handler._acknowledgements.join()
+            assert event_sourcing_service._aggregate_cache[aggregate_id].version == 4
+            assert mock_store.call_args[0][0].version == 4
+            
+            await handler.handle(events[4])
+            failed.set_exception(RuntimeError("database unavailable"))
+            await handler._acknowledgements.join()
+            
+            assert aggregate_id not in event_sourcing_service._aggregate_cache
+            assert mock_store.call_count == 1
+
+
 class TestEventSourcingIntegration:
     """Integration tests for event sourcing system."""
     
@@ -0,0 +1,78 @@
+"""
+Tests for the incrementally maintained facet index used by search facets.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from shared.services.facet_index import FacetIndex
+
+
+FACETS = ["status", "tags"]
+
+
+def random_documents(generator, count):
+    return {
+        f"opp-{i}": {
+            "status": [generator.choice(["validated", "validating", "draft"])],
+            "tags": generator.sample(["nlp", "cv", "ml", "iot", "fintech"], generator.randint(0, 3)),
+        }
+        for i in range(count)
+    }
+
+
+def brute_force_counts(documents, doc_ids=None):
+    counts = {facet: Counter() for facet in FACETS}
+    for doc_id, values in documents.items():
+        if doc_ids is None or doc_id in doc_ids:
+            for facet in FACETS:
+                counts[facet].update(set(values[facet]))
+    return {facet: dict(facet_counts) for facet, facet_counts in counts.items()}
+
+
+@pytest.fixture
+def generator():
+    return random.Random(11)
+
+
+class TestFacetIndex:
+    """Test cases for FacetIndex."""
+
+    def test_incremental_updates_match_recount(self, generator):
+        """Counts stay exact through adds, replacements and removals."""
+        documents = random_documents(generator, 200)
+        index = FacetIndex(FACETS)
+        index.rebuild(documents.items())
+
+        for doc_id, values in random_documents(generator, 50).items():
+            documents[doc_id] = values
+            index.add(doc_id, values)
+        for doc_id in generator.sample(sorted(documents), 40):
+            del documents[doc_id]
+            index.remove(doc_id)
+
+        total, counts = index.counts()
+        assert total == len(documents)
+        assert counts == brute_force_counts(documents)
+
+    def test_subset_counts(self, generator):
+        """Counting a subset only includes indexed ids from that subset."""
+        documents = random_documents(generator, 100)
+        index = FacetIndex(FACETS)
+        index.rebuild(documents.items())
+
+        subset = set(generator.sample(sorted(documents), 25)) | {"unknown"}
+        total, counts = index.counts(subset)
+
+        assert total == 25
+        assert counts == brute_force_counts(documents, subset)
+
+    def test_missing_values_and_duplicates_are_ignored(self):
+        index = FacetIndex(FACETS)
+        index.add("opp-1", {"status": [None], "tags": ["ml", "ml"]})
+
+        assert index.counts() == (1, {"status": {}, "tags": {"ml": 1}})
+        index.remove("opp-1")
+        assert index.counts() == (0, {"status": {}, "tags": {}})
@@ -0,0 +1,158 @@
+"""
+Tests for concurrent plugin fan-out with per-source deadlines.
+"""
+
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from plugin_manager import FanOutResult, PluginManager
+from plugins.base import DataSourcePlugin, PluginConfig, PluginStatus
+from realtime_data_bridge import RealTimeDataBridge
+
+
+class TimedPlugin(DataSourcePlugin):
+    """Plugin yielding ``items`` with ``delay`` seconds between them."""
+
+    def __init__(self, items, delay=0.0, error=None):
+        super().__init__(PluginConfig())
+        self.items = items
+        self.delay = delay
+        self.error = error
+        self.status = PluginStatus.ACTIVE
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def health_check(self) -> bool:
+        return True
+
+    async def fetch_data(self, params: Dict[str, Any]):
+        for item in self.items:
+            await asyncio.sleep(self.delay)
+            yield item
+        if self.error is not None:
+            raise self.error
+
+    def get_metadata(self):
+        return None
+
+    def validate_config(self, config: Dict[str, Any]) -> bool:
+        return True
+
+
+@pytest.fixture
+def manager():
+    manager = PluginManager()
+    manager._plugins["fast"] = TimedPlugin(["a", "b"])
+    manager._plugins["slow"] = TimedPlugin(["c", "d", "e"], delay=0.1)
+    manager._plugins["broken"] = TimedPlugin(["f"], error=ConnectionError("upstream down"))
+    return manager
+
+
+class TestFanOutFetch:
+    """Test cases for PluginManager.fan_out_fetch."""
+
+    @pytest.mark.asyncio
+    async def test_late_and_failed_plugins_do_not_hold_back_the_rest(self, manager):
+        result = await manager.fan_out_fetch({}, timeout_seconds=0.15)
+
+        assert result.completed == ["fast"]
+        assert result.late == ["slow"]
+        assert list(result.failed) == ["broken"]
+        assert "upstream down" in result.failed["broken"]
+        assert result.data["fast"] == ["a", "b"]
+        # Late plugins keep what they produced before the deadline
+        assert result.data["slow"] == ["c"]
+        assert result.elapsed_seconds < 0.3
+
+    @pytest.mark.asyncio
+    async def test_per_plugin_deadlines_override_the_default(self, manager):
+        result = await manager.fan_out_fetch(
+            {}, timeout_seconds=0.05, plugin_timeouts={"slow": 1.0}, plugin_names=["fast", "slow"]
+        )
+
+        assert sorted(result.completed) == ["fast", "slow"]
+        assert result.data["slow"] == ["c", "d", "e"]
+        assert "broken" not in result.data
+
+    @pytest.mark.asyncio
+    async def test_configured_plugin_timeout_is_the_fallback(self):
+        manager = PluginManager()
+        manager._plugins["slow"] = TimedPlugin(["c", "d"], delay=0.1)
+        manager._plugins["slow"].config.timeout_seconds = 0.05
+
+        result = await manager.fan_out_fetch({})
+
+        assert result.late == ["slow"]
+        assert result.data["slow"] == []
+
+    @pytest.mark.asyncio
+    async def test_inactive_plugins_are_skipped(self, manager):
+        manager._plugins["fast"].status = PluginStatus.INACTIVE
+
+        data = await manager.fetch_data_from_all_plugins({}, concurrent=True, timeout_seconds=0.15)
+
+        assert "fast" not in data
+        assert data["slow"] == ["c"]
+
+
+class TestDataBridgeFanOut:
+    """Test cases for RealTimeDataBridge._fan_out."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fan_outs_get_their_own_report(self):
+        bridge = RealTimeDataBridge()
+
+        async def fetch(value, delay=0.0, error=None):
+            await asyncio.sleep(delay)
+            if error is not None:
+                raise error
+            return [value]
+
+        first, second = await asyncio.gather(
+            bridge._fan_out({
+                "hackernews": lambda: fetch("hn"),
+                "reddit": lambda: fetch("r", delay=1.0),
+            }, timeout=0.05),
+            bridge._fan_out({
+                "github": lambda: fetch("gh"),
+                "ycombinator": lambda: fetch("yc", error=RuntimeError("scrape failed")),
+            }, timeout=0.05),
+        )
+
+        assert isinstance(first, FanOutResult)
+        assert first.data == {"hackernews": ["hn"]}
+        assert first.completed == ["hackernews"]
+        assert first.late == ["reddit"]
+        assert first.failed == {}
+        assert second.data == {"github": ["gh"]}
+        assert second.late == []
+        assert second.failed == {"ycombinator": "scrape failed"}
+
+    @pytest.mark.asyncio
+    async def test_trending_topics_report_late_sources(self):
+        bridge = RealTimeDataBridge()
+        bridge.initialized = True
+        bridge.plugins = {"hackernews": object(), "reddit": object()}
+
+        async def hackernews_trends(limit):
+            return [{"title": "hn", "engagement_score": 5}]
+
+        async def reddit_trends(limit):
+            await asyncio.sleep(1.0)
+            return [{"title": "r", "engagement_score": 9}]
+
+        bridge._fetch_hackernews_trends = hackernews_trends
+        bridge._fetch_reddit_trends = reddit_trends
+
+        topics, report = await bridge.get_trending_topics_with_report(5, timeout=0.05)
+
+        assert [topic["title"] for topic in topics] == ["hn"]
+        assert report.completed == ["hackernews"]
+        assert report.late == ["reddit"]
+        assert await bridge.get_trending_topics(5, timeout=0.05) == topics
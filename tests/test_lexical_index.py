@@ -0,0 +1,59 @@
+"""
+Tests for the BM25 keyword index and reciprocal-rank fusion used by hybrid search.
+"""
+
+import pytest
+
+from shared.services.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize_terms
+
+
+@pytest.fixture
+def index():
+    index = BM25Index(field_weights={"title": 3.0})
+    index.rebuild([
+        ("opp-1", {"title": "Customer service chatbot", "description": "NLP assistant for support teams"}),
+        ("opp-2", {"title": "Quality control vision", "description": "Computer vision for factory quality"}),
+        ("opp-3", {"title": "Support ticket routing", "description": "Route customer tickets with a chatbot"}),
+    ])
+    return index
+
+
+class TestBM25Index:
+    """Test cases for BM25Index."""
+
+    def test_tokenize_terms_drops_stop_words_and_punctuation(self):
+        assert tokenize_terms("The AI-powered, chatbot for SMBs!") == ["ai", "powered", "chatbot", "smbs"]
+
+    def test_title_matches_rank_first(self, index):
+        """A title hit outweighs the same term in the description."""
+        results = index.search("chatbot")
+
+        assert [doc_id for doc_id, _ in results] == ["opp-1", "opp-3"]
+        assert results[0][1] > results[1][1] > 0
+        assert index.search("blockchain") == []
+
+    def test_unlimited_search_returns_every_match(self, index):
+        assert [doc_id for doc_id, _ in index.search("customer support", limit=1)] == ["opp-1"]
+        assert [doc_id for doc_id, _ in index.search("customer support", limit=None)] == ["opp-1", "opp-3"]
+
+    def test_add_replaces_and_remove_drops_documents(self, index):
+        index.add("opp-2", {"title": "Chatbot for manufacturing"})
+        assert "opp-2" in [doc_id for doc_id, _ in index.search("chatbot")]
+        assert index.search("vision") == []
+
+        index.remove("opp-2")
+        assert "opp-2" not in [doc_id for doc_id, _ in index.search("chatbot")]
+        assert len(index) == 2
+
+    def test_matching_requires_every_term(self, index):
+        assert index.matching("customer chatbot") == {"opp-1", "opp-3"}
+        assert index.matching("support routing") == {"opp-3"}
+        assert index.matching("chatbot vision") == set()
+        assert index.matching("the") == {"opp-1", "opp-2", "opp-3"}
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "d"]], k=60)
+
+    assert [item_id for item_id, _ in fused] == ["b", "c", "a", "d"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
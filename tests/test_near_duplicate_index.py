@@ -0,0 +1,118 @@
+"""
+Tests for the MinHash LSH indexes used by ingestion duplicate detection.
+"""
+
+import time
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from processing.near_duplicate_index import MinHasher, MinHashLSHIndex, RedisMinHashLSHIndex, _band_keys
+
+
+ORIGINAL = (
+    "Small retailers struggle to forecast inventory for seasonal products and "
+    "end up with stockouts during holidays and excess stock in january"
+)
+NEAR_DUPLICATE = ORIGINAL + " every single year"
+UNRELATED = (
+    "Radiologists spend hours triaging routine scans that an image classifier "
+    "could pre-sort by urgency before a specialist reviews them"
+)
+
+
+@pytest.fixture
+def hasher():
+    return MinHasher(num_perm=64)
+
+
+class TestMinHasher:
+    """Test cases for MinHasher."""
+
+    def test_signatures_are_stable_across_instances(self, hasher):
+        assert (hasher.signature(ORIGINAL) == MinHasher(num_perm=64).signature(ORIGINAL)).all()
+        assert hasher.signature("") is None
+
+    def test_jaccard_estimate_separates_near_duplicates(self, hasher):
+        original = hasher.signature(ORIGINAL)
+
+        assert MinHasher.jaccard(original, hasher.signature(NEAR_DUPLICATE)) > 0.7
+        assert MinHasher.jaccard(original, hasher.signature(UNRELATED)) < 0.2
+
+
+class TestMinHashLSHIndex:
+    """Test cases for the in-memory MinHashLSHIndex."""
+
+    @pytest.mark.asyncio
+    async def test_query_finds_near_duplicates_only(self, hasher):
+        index = MinHashLSHIndex(hasher, bands=16)
+        await index.insert("doc-1", hasher.signature(ORIGINAL))
+        await index.insert("doc-2", hasher.signature(UNRELATED))
+
+        matches = await index.query(hasher.signature(NEAR_DUPLICATE), threshold=0.7)
+
+        assert [data_id for data_id, _ in matches] == ["doc-1"]
+        assert matches[0][1] > 0.7
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_and_stay_bounded(self, hasher):
+        expiring = MinHashLSHIndex(hasher, bands=16, ttl_seconds=0)
+        await expiring.insert("doc-1", hasher.signature(ORIGINAL))
+
+        assert await expiring.query(hasher.signature(ORIGINAL), threshold=0.5) == []
+        assert len(expiring) == 0
+
+        bounded = MinHashLSHIndex(hasher, bands=16, max_entries=1)
+        await bounded.insert("doc-1", hasher.signature(ORIGINAL))
+        await bounded.insert("doc-2", hasher.signature(UNRELATED))
+
+        assert len(bounded) == 1
+        assert await bounded.query(hasher.signature(ORIGINAL), threshold=0.5) == []
+        assert bounded._buckets and all("doc-1" not in bucket for bucket in bounded._buckets.values())
+
+    def test_bands_must_divide_permutations(self, hasher):
+        with pytest.raises(ValueError):
+            MinHashLSHIndex(hasher, bands=10)
+
+
+class TestRedisMinHashLSHIndex:
+    """Test cases for the Redis-backed RedisMinHashLSHIndex."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("decode_responses", [False, True])
+    async def test_query_finds_near_duplicates_only(self, hasher, decode_responses):
+        redis_client = fakeredis.FakeAsyncRedis(decode_responses=decode_responses)
+        index = RedisMinHashLSHIndex(redis_client, "test:lsh", hasher, bands=16, ttl_seconds=60)
+        await index.insert("doc-1", hasher.signature(ORIGINAL))
+        await index.insert("doc-2", hasher.signature(UNRELATED))
+
+        matches = await index.query(hasher.signature(NEAR_DUPLICATE), threshold=0.7)
+
+        assert [data_id for data_id, _ in matches] == ["doc-1"]
+        assert 0 < await redis_client.ttl("test:lsh:sig:doc-1") <= 60
+
+    @pytest.mark.asyncio
+    async def test_expired_signatures_are_ignored(self, hasher):
+        redis_client = fakeredis.FakeAsyncRedis()
+        index = RedisMinHashLSHIndex(redis_client, "test:lsh", hasher, bands=16)
+        await index.insert("doc-1", hasher.signature(ORIGINAL))
+        await redis_client.delete("test:lsh:sig:doc-1")
+
+        assert await index.query(hasher.signature(ORIGINAL), threshold=0.5) == []
+
+    @pytest.mark.asyncio
+    async def test_busy_buckets_drop_members_older_than_the_ttl(self, hasher):
+        redis_client = fakeredis.FakeAsyncRedis()
+        index = RedisMinHashLSHIndex(redis_client, "test:lsh", hasher, bands=16, ttl_seconds=60)
+        signature = hasher.signature(ORIGINAL)
+        with patch("processing.near_duplicate_index.time.time", return_value=time.time() - 120):
+            await index.insert("doc-old", signature)
+        # Keep the old signature around so only the bucket scores can exclude it
+        await redis_client.persist("test:lsh:sig:doc-old")
+
+        await index.insert("doc-new", signature)
+
+        bucket_key = f"test:lsh:bucket:{_band_keys(signature, 16)[0]}"
+        assert await redis_client.zrange(bucket_key, 0, -1) == [b"doc-new"]
+        assert [data_id for data_id, _ in await index.query(signature, threshold=0.5)] == ["doc-new"]
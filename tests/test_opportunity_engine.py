@@ -139,6 +139,42 @@ class TestOpportunityEngine:
             assert 0 <= cluster.market_potential <= 100, "Market potential should be 0-100"
             assert 0 <= cluster.ai_opportunity_score <= 100, "AI opportunity score should be 0-100"
     
+    @pytest.mark.asyncio
+    async def test_signal_clustering_matches_pairwise_similarity(self, engine):
+        """Test indexed clustering finds the same groups as comparing every pair."""
+        topics = [
+            "manual invoice processing takes hours every week for our finance team",
+            "customer support tickets pile up because nobody can triage them quickly",
+            "scheduling delivery routes by hand wastes fuel and driver time daily",
+        ]
+        signals = []
+        for topic_index, topic in enumerate(topics):
+            words = topic.split()
+            for variant in range(4):
+                signals.append({
+                    "signal_id": f"signal_{topic_index}_{variant}",
+                    "content": " ".join(words[:len(words) - variant]),
+                    "signal_type": "pain_point",
+                    "source": "reddit",
+                })
+        signals.append({"signal_id": "signal_noise", "content": "unrelated words here", "signal_type": "other"})
+        signals.append({"signal_id": "signal_empty", "content": "", "signal_type": "pain_point"})
+        
+        clusters = await engine._cluster_related_signals(signals)
+        
+        groups = sorted(sorted(s["signal_id"] for s in cluster.signals) for cluster in clusters)
+        assert groups == [
+            [f"signal_{topic_index}_{variant}" for variant in range(4)]
+            for topic_index in range(3)
+        ]
+        for cluster in clusters:
+            for signal in cluster.signals:
+                similarities = [
+                    await engine._calculate_signal_similarity(signal, other)
+                    for other in cluster.signals if other is not signal
+                ]
+                assert max(similarities) >= engine.similarity_threshold
+    
     @pytest.mark.asyncio
     async def test_opportunity_candidate_generation(self, engine, sample_cluster):
         """Test opportunity candidate generation from cluster."""
@@ -240,14 +276,14 @@ class TestOpportunityEngine:
         
         # Mock database session and existing opportunity
         mock_db = AsyncMock()
-        mock_result = AsyncMock()
+        mock_result = MagicMock()
         mock_existing_opp = MagicMock()
         mock_existing_opp.id = "existing_opp_1"
         mock_existing_opp.title = "AI Data Processing Solution"  # Exact match
         mock_existing_opp.description = "Existing description"
         mock_existing_opp.created_at = datetime.utcnow()
         
-        mock_result.scalars.return_value.all.return_value = [mock_existing_opp]
+        mock_result.all.return_value = [mock_existing_opp]
         mock_db.execute.return_value = mock_result
         
         duplication_result = await engine._check_opportunity_duplication(mock_db, candidate)
@@ -277,7 +313,7 @@ class TestOpportunityEngine:
         
         # Mock database session with different existing opportunity
         mock_db = AsyncMock()
-        mock_result = AsyncMock()
+        mock_result = MagicMock()
         mock_existing_opp = MagicMock()
         mock_existing_opp.id = "existing_opp_1"
         mock_existing_opp.title = "Finance Trading Bot"  # Completely different
@@ -285,7 +321,7 @@ class TestOpportunityEngine:
         mock_existing_opp.ai_solution_types = '["machine_learning"]'
         mock_existing_opp.created_at = datetime.utcnow()
         
-        mock_result.scalars.return_value.all.return_value = [mock_existing_opp]
+        mock_result.all.return_value = [mock_existing_opp]
         mock_db.execute.return_value = mock_result
         
         duplication_result = await engine._check_opportunity_duplication(mock_db, candidate)
@@ -293,6 +329,51 @@ class TestOpportunityEngine:
         assert not duplication_result.is_duplicate, "Should not detect duplicate"
         assert duplication_result.similarity_score < 0.5, "Similarity should be low"
     
+    @pytest.mark.asyncio
+    async def test_deduplication_loads_index_once(self, engine):
+        """Test one index load serves every candidate, including in-batch duplicates."""
+        def make_candidate(candidate_id, title, description):
+            return OpportunityCandidate(
+                candidate_id=candidate_id,
+                title=title,
+                description=description,
+                problem_statement="Test problem",
+                proposed_solution="Test solution",
+                ai_solution_types=["automation"],
+                target_industries=["technology"],
+                market_signals=["signal_1"],
+                confidence_score=0.8,
+                market_validation_score=75.0,
+                ai_feasibility_score=85.0,
+                source_cluster=None
+            )
+        
+        existing_rows = []
+        for i in range(250):
+            row = MagicMock()
+            row.id = f"existing_opp_{i}"
+            row.title = f"Existing opportunity {i}"
+            row.description = f"Automate workflow number {i} for operations teams"
+            row.ai_solution_types = '["automation"]'
+            existing_rows.append(row)
+        
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = existing_rows
+        mock_db.execute.return_value = mock_result
+        
+        candidates = [
+            make_candidate("old_title", "Existing Opportunity 249!", "Anything"),
+            make_candidate("old_text", "Opportunity 200", "Automate workflow number 200 for operations teams"),
+            make_candidate("new", "Invoice reconciliation assistant", "Match bank statements with invoices automatically"),
+            make_candidate("new_again", "Invoice reconciliation assistant", "Match statements to invoices"),
+        ]
+        
+        unique = await engine._deduplicate_opportunities(mock_db, candidates)
+        
+        assert [candidate.candidate_id for candidate in unique] == ["new"]
+        assert mock_db.execute.await_count == 1
+    
     @pytest.mark.asyncio
     async def test_empty_signals_handling(self, engine):
         """Test handling of empty signal list."""
@@ -90,7 +90,7 @@ class TestOpportunityService:
         mock_db_session.refresh = AsyncMock()
         
         with patch.object(opportunity_service, '_clear_opportunity_caches', return_value=None), \
-             patch.object(opportunity_service, '_initiate_validation_workflow', return_value=None):
+             patch.object(opportunity_service, '_initiate_validation_workflow', return_value=None) as mock_workflow:
             
             opportunity = await opportunity_service.create_opportunity(
                 mock_db_session, 
@@ -107,6 +107,20 @@ class TestOpportunityService:
             assert opportunity.ai_solution_types is not None
             assert opportunity.target_industries is not None
             assert opportunity.tags is not None
+            
+            # Validation workflow starts for the new opportunity (Requirement 2.1)
+            mock_workflow.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_clear_caches_survives_cache_outage(self, opportunity_service):
+        """Test a Redis outage during tag invalidation does not fail the caller."""
+        with patch('shared.services.opportunity_service.cache_manager') as mock_cache:
+            mock_cache.delete = AsyncMock(side_effect=ConnectionError("Redis unavailable"))
+            mock_cache.invalidate_tags = AsyncMock(side_effect=ConnectionError("Redis unavailable"))
+            
+            await opportunity_service._clear_opportunity_caches("opp-1")
+            
+            mock_cache.invalidate_tags.assert_awaited_once()
     
     @pytest.mark.asyncio
     async def test_get_opportunity_by_id_with_cache(self, opportunity_service, mock_db_session):
@@ -6,6 +6,7 @@ Tests ranking algorithms, filtering capabilities, and personalization features.
 import pytest
 import asyncio
 import json
+import os
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 from typing import List, Dict, Any
@@ -18,13 +19,43 @@ from shared.services.ranking_system import (
     RankingCriteria,
     SortOrder,
     RankedOpportunity,
-    RankingResult
+    RankingResult,
+    RankingInvalidationHandler
 )
 from shared.models.opportunity import Opportunity, OpportunityStatus
 from shared.models.user import User
 from shared.models.validation import ValidationResult
 
 
+def mock_ranking_db(opportunities: List[Opportunity]) -> AsyncMock:
+    """Mock session answering the id query and the opportunity loads."""
+    async def execute_side_effect(query):
+        result = MagicMock()
+        if len(query.selected_columns) == 1:
+            result.scalars.return_value.all.return_value = sorted(opp.id for opp in opportunities)
+        else:
+            result.scalars.return_value.all.return_value = opportunities
+        return result
+    
+    mock_db = AsyncMock()
+    mock_db.execute.side_effect = execute_side_effect
+    return mock_db
+
+
+async def score_opportunities(
+    ranking_system: OpportunityRankingSystem,
+    opportunities: List[Opportunity],
+    ranking_config: RankingConfig,
+    user_preferences: UserPreferences = None
+):
+    """Index ``opportunities`` and score them the way rank_opportunities does."""
+    opportunity_ids = [opp.id for opp in opportunities]
+    await ranking_system._load_features(mock_ranking_db(opportunities), opportunity_ids)
+    rows, missing = ranking_system.feature_index.lookup(opportunity_ids)
+    assert not missing
+    return ranking_system._score_candidates(opportunity_ids, rows, ranking_config, user_preferences)
+
+
 class TestFilterCriteria:
     """Test cases for FilterCriteria."""
     
@@ -251,36 +282,29 @@ class TestOpportunityRankingSystem:
         assert date_score > 90  # Should be high for recent opportunity
     
     @pytest.mark.asyncio
-    async def test_calculate_base_score(self, ranking_system, sample_opportunities):
-        """Test base score calculation."""
-        opp = sample_opportunities[0]  # High-scoring opportunity
-        config = RankingConfig()
-        
-        base_score = await ranking_system._calculate_base_score(opp, config)
+    async def test_score_candidates_base_score(self, ranking_system, sample_opportunities):
+        """Test base scores computed from the feature index."""
+        scored = await score_opportunities(ranking_system, sample_opportunities, RankingConfig())
         
-        assert 0 <= base_score <= 100
-        assert base_score > 70  # Should be high for high-scoring opportunity
+        assert all(0 <= score <= 100 for score in scored.base_scores)
+        assert scored.base_scores[0] > 70  # Should be high for high-scoring opportunity
     
     @pytest.mark.asyncio
-    async def test_calculate_personalization_score(self, ranking_system, sample_opportunities, sample_user_preferences):
-        """Test personalization score calculation."""
-        opp = sample_opportunities[0]  # Has matching AI types and industries
-        
-        personalization_score = await ranking_system._calculate_personalization_score(
-            opp, sample_user_preferences
+    async def test_score_candidates_personalization_score(self, ranking_system, sample_opportunities, sample_user_preferences):
+        """Test personalization scores computed from the stored opportunity profiles."""
+        scored = await score_opportunities(
+            ranking_system, sample_opportunities, RankingConfig(enable_personalization=True), sample_user_preferences
         )
         
-        assert 0 <= personalization_score <= 100
-        assert personalization_score > 50  # Should be high due to matching preferences and bookmark
+        assert all(0 <= score <= 100 for score in scored.personalization_scores)
+        assert scored.personalization_scores[0] > 50  # Matching preferences and bookmark
     
-    def test_calculate_freshness_score(self, ranking_system, sample_opportunities):
-        """Test freshness score calculation."""
-        recent_opp = sample_opportunities[0]  # Created 5 days ago
-        old_opp = sample_opportunities[2]     # Created 30 days ago
-        
-        recent_score = ranking_system._calculate_freshness_score(recent_opp)
-        old_score = ranking_system._calculate_freshness_score(old_opp)
+    @pytest.mark.asyncio
+    async def test_score_candidates_freshness_score(self, ranking_system, sample_opportunities):
+        """Test freshness scores favour recently created and updated opportunities."""
+        scored = await score_opportunities(ranking_system, sample_opportunities, RankingConfig())
         
+        recent_score, old_score = scored.freshness_scores[0], scored.freshness_scores[2]
         assert 0 <= recent_score <= 100
         assert 0 <= old_score <= 100
         assert recent_score > old_score  # Recent should score higher
@@ -311,73 +335,46 @@ class TestOpportunityRankingSystem:
         assert trending_score > 0  # Should have some trending score
     
     @pytest.mark.asyncio
-    async def test_calculate_ranking_scores(self, ranking_system, sample_opportunities, sample_user_preferences):
-        """Test ranking score calculation for multiple opportunities."""
-        config = RankingConfig(enable_personalization=True)
-        
-        ranked_opportunities = await ranking_system._calculate_ranking_scores(
-            sample_opportunities, config, sample_user_preferences
+    async def test_score_candidates(self, ranking_system, sample_opportunities, sample_user_preferences):
+        """Test every score component of a candidate set stays in range."""
+        scored = await score_opportunities(
+            ranking_system, sample_opportunities, RankingConfig(enable_personalization=True), sample_user_preferences
         )
         
-        assert len(ranked_opportunities) == 3
+        assert scored.opportunity_ids == ["opp1", "opp2", "opp3"]
+        for scores in (
+            scored.final_scores, scored.base_scores, scored.personalization_scores,
+            scored.freshness_scores, scored.trending_scores
+        ):
+            assert len(scores) == 3
+            assert all(0 <= score <= 100 for score in scores)
         
-        for ranked_opp in ranked_opportunities:
-            assert isinstance(ranked_opp, RankedOpportunity)
-            assert 0 <= ranked_opp.rank_score <= 100
-            assert 0 <= ranked_opp.base_score <= 100
-            assert 0 <= ranked_opp.personalization_score <= 100
-            assert 0 <= ranked_opp.freshness_score <= 100
-            assert 0 <= ranked_opp.trending_score <= 100
-            assert isinstance(ranked_opp.ranking_factors, dict)
-        
-        # First opportunity should have highest personalization score (bookmarked + matching prefs)
-        first_opp = next(r for r in ranked_opportunities if r.opportunity.id == "opp1")
-        assert first_opp.personalization_score > 0
+        # First opportunity should have the highest personalization score (bookmarked + matching prefs)
+        assert scored.personalization_scores.argmax() == 0
     
     @pytest.mark.asyncio
-    async def test_get_filtered_opportunities_basic(self, ranking_system):
-        """Test basic opportunity filtering."""
-        # Mock database session and query results
-        mock_db = AsyncMock()
-        
-        # Mock opportunities
-        mock_opportunities = [
-            Opportunity(id="opp1", title="Test 1", status=OpportunityStatus.VALIDATED),
-            Opportunity(id="opp2", title="Test 2", status=OpportunityStatus.VALIDATING)
+    async def test_rank_opportunities_applies_filters(self, ranking_system):
+        """Test filter criteria are pushed into the candidate id query."""
+        opportunities = [
+            Opportunity(id="opp1", title="Test 1", status=OpportunityStatus.VALIDATED,
+                        created_at=datetime.utcnow(), updated_at=datetime.utcnow()),
+            Opportunity(id="opp2", title="Test 2", status=OpportunityStatus.VALIDATING,
+                        created_at=datetime.utcnow(), updated_at=datetime.utcnow())
         ]
-        
-        # Mock query execution
-        mock_result = AsyncMock()
-        mock_result.scalars.return_value.all.return_value = mock_opportunities
-        mock_db.execute.return_value = mock_result
-        
-        # Mock count query
-        mock_count_result = AsyncMock()
-        mock_count_result.scalar.return_value = 2
-        
-        # Set up side effects for different queries
-        async def execute_side_effect(query):
-            # Check if it's a count query by looking for func.count
-            query_str = str(query)
-            if "count" in query_str.lower():
-                return mock_count_result
-            else:
-                return mock_result
-        
-        mock_db.execute.side_effect = execute_side_effect
-        
-        # Test filtering
+        mock_db = mock_ranking_db(opportunities)
         filter_criteria = FilterCriteria(
             status=[OpportunityStatus.VALIDATED, OpportunityStatus.VALIDATING]
         )
         
-        opportunities, total_count = await ranking_system._get_filtered_opportunities(
-            mock_db, filter_criteria, page=1, page_size=10
-        )
+        with patch('shared.services.ranking_system.cache_manager'):
+            result = await ranking_system.rank_opportunities(
+                mock_db, filter_criteria=filter_criteria, page_size=10
+            )
         
-        assert len(opportunities) == 2
-        assert total_count == 2
-        assert all(isinstance(opp, Opportunity) for opp in opportunities)
+        assert result.total_count == 2
+        assert {r.opportunity.id for r in result.ranked_opportunities} == {"opp1", "opp2"}
+        id_query = mock_db.execute.call_args_list[0].args[0]
+        assert "status" in str(id_query).lower()
     
     def test_generate_cache_key(self, ranking_system):
         """Test cache key generation."""
@@ -402,6 +399,29 @@ class TestOpportunityRankingSystem:
         
         assert cache_key != different_key
     
+    def test_cache_key_is_stable_across_processes(self, ranking_system):
+        """Cache keys must not depend on the interpreter's hash seed."""
+        import subprocess
+        import sys
+        
+        filter_criteria = FilterCriteria(ai_solution_types=["ml"])
+        payload = ranking_system._ranking_query(filter_criteria, RankingConfig(), None)
+        script = (
+            "import json, sys\n"
+            "from shared.cache import CacheKeys\n"
+            "print(CacheKeys.hashed_key(CacheKeys.OPPORTUNITY_RANKING, json.loads(sys.argv[1]), page=1, page_size=20))"
+        )
+        keys = {
+            subprocess.run(
+                [sys.executable, "-c", script, json.dumps(payload)],
+                capture_output=True, text=True, check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed}
+            ).stdout.strip()
+            for seed in ("1", "2")
+        }
+        
+        assert keys == {ranking_system._generate_cache_key(filter_criteria, RankingConfig(), None, 1, 20)}
+    
     @pytest.mark.asyncio
     async def test_get_user_preferences_default(self, ranking_system):
         """Test getting default user preferences."""
@@ -504,8 +524,6 @@ class TestRankingIntegration:
     @pytest.mark.asyncio
     async def test_ranking_with_different_configs(self, ranking_system):
         """Test ranking with different configurations."""
-        mock_db = AsyncMock()
-        
         # Mock opportunities
         opportunities = [
             Opportunity(
@@ -528,20 +546,7 @@ class TestRankingIntegration:
             )
         ]
         
-        # Mock database responses
-        mock_result = AsyncMock()
-        mock_result.scalars.return_value.all.return_value = opportunities
-        mock_count_result = AsyncMock()
-        mock_count_result.scalar.return_value = 2
-        
-        async def execute_side_effect(query):
-            query_str = str(query)
-            if "count" in query_str.lower():
-                return mock_count_result
-            else:
-                return mock_result
-        
-        mock_db.execute.side_effect = execute_side_effect
+        mock_db = mock_ranking_db(opportunities)
         
         # Test ranking prioritizing validation score
         validation_config = RankingConfig(
@@ -590,8 +595,6 @@ class TestRankingIntegration:
     @pytest.mark.asyncio
     async def test_personalized_ranking(self, ranking_system):
         """Test personalized ranking with user preferences."""
-        mock_db = AsyncMock()
-        
         # Mock opportunities with different characteristics
         opportunities = [
             Opportunity(
@@ -618,20 +621,7 @@ class TestRankingIntegration:
             )
         ]
         
-        # Mock database responses
-        mock_result = AsyncMock()
-        mock_result.scalars.return_value.all.return_value = opportunities
-        mock_count_result = AsyncMock()
-        mock_count_result.scalar.return_value = 2
-        
-        async def execute_side_effect(query):
-            query_str = str(query)
-            if "count" in query_str.lower():
-                return mock_count_result
-            else:
-                return mock_result
-        
-        mock_db.execute.side_effect = execute_side_effect
+        mock_db = mock_ranking_db(opportunities)
         
         # User preferences favoring ML and healthcare
         user_preferences = UserPreferences(
@@ -664,6 +654,192 @@ class TestRankingIntegration:
             first_opp = result.ranked_opportunities[0]
             assert first_opp.opportunity.id == "ml_opp"
             assert first_opp.personalization_score > 0
+    
+    @pytest.fixture
+    def caching_ranking_system(self):
+        """Ranking system with result caching enabled and Redis patched out."""
+        with patch('shared.services.ranking_system.cache_manager') as mock_cache:
+            mock_cache.get = AsyncMock(return_value=None)
+            mock_cache.set = AsyncMock()
+            yield OpportunityRankingSystem({"enable_caching": True})
+    
+    @pytest.mark.asyncio
+    async def test_pages_follow_global_ranking(self, caching_ranking_system):
+        """Test every page is a slice of one ranking over all matching opportunities."""
+        opportunities = [
+            Opportunity(
+                id=f"opp{i:02d}",
+                title=f"Opportunity {i}",
+                validation_score=float((i * 7) % 30),
+                ai_feasibility_score=5.0,
+                status=OpportunityStatus.VALIDATED,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+                validations=[],
+                market_signals=[]
+            )
+            for i in range(30)
+        ]
+        mock_db = mock_ranking_db(opportunities)
+        ranking_system = caching_ranking_system
+        config = RankingConfig(primary_criteria=RankingCriteria.VALIDATION_SCORE, primary_weight=0.8)
+        
+        pages = [
+            await ranking_system.rank_opportunities(db=mock_db, ranking_config=config, page=page, page_size=10)
+            for page in (1, 2, 3)
+        ]
+        
+        ranked = [r for result in pages for r in result.ranked_opportunities]
+        scores = [r.opportunity.validation_score for r in ranked]
+        assert scores == sorted(scores, reverse=True)
+        assert [r.rank_position for r in ranked] == list(range(1, 31))
+        assert {r.opportunity.id for r in ranked} == {opp.id for opp in opportunities}
+        assert all(result.total_count == 30 for result in pages)
+        
+        # Later pages reuse the scores computed for the first one
+        id_queries = [
+            call for call in mock_db.execute.call_args_list
+            if len(call.args[0].selected_columns) == 1
+        ]
+        assert len(id_queries) == 1
+    
+    @pytest.mark.asyncio
+    async def test_opportunity_event_invalidates_cached_scores(self, caching_ranking_system):
+        """Test opportunity changes force the next ranking to be recomputed."""
+        ranking_system = caching_ranking_system
+        opportunity = Opportunity(
+            id="opp1",
+            title="Opportunity",
+            validation_score=5.0,
+            status=OpportunityStatus.VALIDATED,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            validations=[],
+            market_signals=[]
+        )
+        mock_db = mock_ranking_db([opportunity])
+        
+        first = await ranking_system.rank_opportunities(db=mock_db)
+        opportunity.validation_score = 9.0
+        cached = await ranking_system.rank_opportunities(db=mock_db)
+        assert cached.ranked_opportunities[0].base_score == first.ranked_opportunities[0].base_score
+        
+        await RankingInvalidationHandler(ranking_system).handle(
+            MagicMock(payload={"opportunity_id": "opp1"})
+        )
+        refreshed = await ranking_system.rank_opportunities(db=mock_db)
+        assert refreshed.ranked_opportunities[0].base_score > first.ranked_opportunities[0].base_score
+    
+    @pytest.mark.asyncio
+    async def test_invalidation_during_feature_load_keeps_every_candidate(self, caching_ranking_system):
+        """Test features dropped by a concurrent invalidation are reloaded, not skipped."""
+        ranking_system = caching_ranking_system
+        opportunities = [
+            Opportunity(
+                id=f"opp{i}",
+                title=f"Opportunity {i}",
+                validation_score=float(i),
+                status=OpportunityStatus.VALIDATED,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+                validations=[],
+                market_signals=[]
+            )
+            for i in range(3)
+        ]
+        mock_db = mock_ranking_db(opportunities)
+        load_features = ranking_system._load_features
+        
+        async def load_then_invalidate(db, opportunity_ids):
+            await load_features(db, opportunity_ids)
+            if ranking_system._load_features.await_count == 1:
+                ranking_system.invalidate()
+        
+        with patch.object(ranking_system, "_load_features", AsyncMock(side_effect=load_then_invalidate)):
+            result = await ranking_system.rank_opportunities(db=mock_db)
+        
+        assert {r.opportunity.id for r in result.ranked_opportunities} == {opp.id for opp in opportunities}
+        assert result.total_count == 3
+        # The ranking overlapped an invalidation, so it is not reused
+        assert not ranking_system._scored_cache
+
+    
+    @pytest.mark.asyncio
+    async def test_stale_trending_refreshes_in_background(self, caching_ranking_system):
+        """Test stale trending scores are refreshed by one aggregate query, not a reload."""
+        from contextlib import asynccontextmanager
+        
+        ranking_system = caching_ranking_system
+        opportunities = [
+            Opportunity(
+                id=f"opp{i}",
+                title=f"Opportunity {i}",
+                validation_score=5.0,
+                status=OpportunityStatus.VALIDATED,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+                validations=[],
+                market_signals=[]
+            )
+            for i in range(2)
+        ]
+        mock_db = mock_ranking_db(opportunities)
+        await ranking_system.rank_opportunities(db=mock_db)
+        loads = mock_db.execute.call_count
+        
+        refresh_result = MagicMock()
+        refresh_result.all.return_value = [("opp1", 3, 8.0)]
+        refresh_db = AsyncMock()
+        refresh_db.execute.return_value = refresh_result
+        
+        @asynccontextmanager
+        async def get_db_session():
+            yield refresh_db
+        
+        with patch('shared.database.get_db_session', get_db_session):
+            ranking_system._trending_refreshed_at -= ranking_system.feature_ttl
+            await ranking_system.rank_opportunities(db=mock_db, page=2)
+            await ranking_system._trending_refresh_task
+        assert refresh_db.execute.call_count == 1
+        
+        result = await ranking_system.rank_opportunities(db=mock_db, page_size=5)
+        # Only the id query and the page load ran; features came from the index
+        assert mock_db.execute.call_count == loads + 2
+        trending = {r.opportunity.id: r.trending_score for r in result.ranked_opportunities}
+        assert trending == {"opp0": 0.0, "opp1": 70.0}
+    
+    @pytest.mark.asyncio
+    async def test_failed_trending_refresh_keeps_serving(self, caching_ranking_system):
+        """Test a failing trending refresh is logged and the old scores keep serving."""
+        from contextlib import asynccontextmanager
+        
+        ranking_system = caching_ranking_system
+        opportunity = Opportunity(
+            id="opp1",
+            title="Opportunity",
+            validation_score=5.0,
+            status=OpportunityStatus.VALIDATED,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            validations=[],
+            market_signals=[]
+        )
+        mock_db = mock_ranking_db([opportunity])
+        await ranking_system.rank_opportunities(db=mock_db)
+        
+        @asynccontextmanager
+        async def get_db_session():
+            raise ConnectionError("database unavailable")
+            yield
+        
+        with patch('shared.database.get_db_session', get_db_session):
+            ranking_system._trending_refreshed_at -= ranking_system.feature_ttl
+            await ranking_system.rank_opportunities(db=mock_db)
+            await ranking_system._trending_refresh_task
+        
+        assert ranking_system._trending_refresh_task.exception() is None
+        result = await ranking_system.rank_opportunities(db=mock_db)
+        assert [r.opportunity.id for r in result.ranked_opportunities] == ["opp1"]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+"""
+Tests for the recommendation service's hybrid scoring and collaborative
+filtering index upkeep.
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from shared.models.user_interaction import InteractionType
+from shared.services.recommendation_service import RecommendationService
+from shared.services.user_similarity import UserSimilarityIndex
+
+
+def mock_db(rows=None, count=1):
+    """Async session double whose queries return ``rows`` and ``count``."""
+    db = MagicMock()
+    db.add = MagicMock()
+    db.commit = AsyncMock()
+    db.refresh = AsyncMock()
+    result = MagicMock()
+    result.all.return_value = rows or []
+    result.scalar.return_value = count
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+class TestUserSimilarityRebuild:
+    """Test cases for rebuilding the user similarity index."""
+
+    @pytest.mark.asyncio
+    async def test_rebuild_runs_off_the_event_loop(self):
+        service = RecommendationService()
+        previous = service.user_similarity
+
+        await service.rebuild_user_similarity(mock_db([("user-1", "opp-1"), ("user-2", "opp-1")]))
+
+        assert service.user_similarity is not previous
+        assert service.user_similarity.built
+        assert service.user_similarity.neighbors("user-1") == [("user-2", 1.0)]
+
+    @pytest.mark.asyncio
+    async def test_interactions_recorded_during_rebuild_are_replayed(self):
+        service = RecommendationService()
+        service.user_similarity.rebuild([("user-1", "opp-1")])
+        previous = service.user_similarity
+        release = threading.Event()
+        rebuild = UserSimilarityIndex.rebuild
+
+        def blocking_rebuild(index, interactions):
+            release.wait(5)
+            rebuild(index, interactions)
+
+        with patch.object(UserSimilarityIndex, "rebuild", blocking_rebuild):
+            task = asyncio.create_task(
+                service.rebuild_user_similarity(mock_db([("user-1", "opp-1"), ("user-2", "opp-1")]))
+            )
+            await asyncio.sleep(0.05)
+
+            # The old index keeps serving while the worker thread is busy
+            await service.record_interaction(mock_db(), "user-3", InteractionType.VIEW, opportunity_id="opp-1")
+            assert service.user_similarity is previous
+            assert service.user_similarity.neighbors("user-3") == [("user-1", 1.0)]
+
+            release.set()
+            await task
+
+        assert service.user_similarity is not previous
+        assert [user_id for user_id, _ in service.user_similarity.neighbors("user-3")] == ["user-1", "user-2"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cold_requests_build_the_index_once(self):
+        service = RecommendationService()
+        db = mock_db([("user-1", "opp-1"), ("user-2", "opp-1")])
+
+        results = await asyncio.gather(*(service._find_similar_users(db, "user-1") for _ in range(5)))
+
+        assert db.execute.await_count == 1
+        assert all(similar == [{"user_id": "user-2", "similarity": 1.0}] for similar in results)
+
+
+class TestHybridRecommendations:
+    """Test cases for combining the hybrid scorers."""
+
+    @pytest.mark.asyncio
+    async def test_late_and_failed_scorers_drop_out_and_weights_rescale(self):
+        service = RecommendationService()
+        service.algorithm_budgets = {"semantic_similarity": 0.01}
+        opportunities = [SimpleNamespace(id="opp-a"), SimpleNamespace(id="opp-b")]
+        combined = {}
+        combine_scores = service._combine_scores
+
+        def capture(completed):
+            assert set(completed) == {"collaborative_filtering", "popularity_based"}
+            combined.update(combine_scores(completed))
+            return combined
+
+        async def slow_scores(features):
+            await asyncio.sleep(1)
+            return {"opp-a": 1.0, "opp-b": 1.0}
+
+        with patch.object(service, "_get_base_opportunities", AsyncMock(return_value=opportunities)), \
+             patch.object(service, "_load_recommendation_features", AsyncMock()), \
+             patch.object(service, "_apply_diversity_and_freshness", AsyncMock(side_effect=lambda db, opps, *args: opps)), \
+             patch.object(service, "_collaborative_filtering_scores", AsyncMock(return_value={"opp-a": 1.0, "opp-b": 0.0})), \
+             patch.object(service, "_popularity_based_scores", AsyncMock(return_value={"opp-a": 0.0, "opp-b": 1.0})), \
+             patch.object(service, "_content_based_scores", AsyncMock(side_effect=RuntimeError("bad preferences"))), \
+             patch.object(service, "_semantic_similarity_scores", slow_scores), \
+             patch.object(service, "_combine_scores", capture):
+            recommendations = await service._generate_hybrid_recommendations(
+                mock_db(), SimpleNamespace(user_id="user-1", limit=10), MagicMock()
+            )
+
+        # Collaborative (0.3) and popularity (0.2) remain, rescaled to 0.6 and 0.4
+        assert combined == {"opp-a": pytest.approx(0.6), "opp-b": pytest.approx(0.4)}
+        assert [opp.id for opp in recommendations] == ["opp-a", "opp-b"]
@@ -98,7 +98,7 @@ class TestSemanticSearch:
             
             # Setup mocks
             mock_db.return_value = AsyncMock()
-            mock_search.return_value = (sample_opportunities[:2], 2)
+            mock_search.return_value = (sample_opportunities[:2], 2, False)
             
             # Make request
             response = client.post("/api/v1/opportunities/search/semantic", json={
@@ -118,6 +118,7 @@ class TestSemanticSearch:
             assert len(data["items"]) == 2
             assert data["metadata"]["search_type"] == "semantic"
             assert data["metadata"]["embedding_based"] is True
+            assert data["metadata"]["results_truncated"] is False
             
             # Verify search was called with correct parameters
             mock_search.assert_called_once()
@@ -151,7 +152,7 @@ class TestSemanticSearch:
              patch.object(opportunity_service, 'semantic_search_opportunities') as mock_search:
             
             mock_db.return_value = AsyncMock()
-            mock_search.return_value = (sample_opportunities[:1], 1)
+            mock_search.return_value = (sample_opportunities[:1], 1, False)
             
             # Make request with filters
             response = client.post("/api/v1/opportunities/search/semantic", json={
@@ -315,10 +316,12 @@ class TestOpportunityServiceSemanticSearch:
              patch.object(opportunity_vector_service, 'find_similar_opportunities', return_value=mock_vector_results), \
              patch('shared.services.opportunity_service.select') as mock_select:
             
-            # Mock database query
+            # Mock database queries: the id re-check, then the page load
+            id_result = MagicMock()
+            id_result.scalars.return_value.all.return_value = ["opp-1", "opp-2"]
             mock_result = MagicMock()
             mock_result.scalars.return_value.all.return_value = sample_opportunities[:2]
-            mock_db.execute.return_value = mock_result
+            mock_db.execute.side_effect = [id_result, mock_result]
             
             # Create search request
             search_request = OpportunitySearchRequest(
@@ -328,7 +331,7 @@ class TestOpportunityServiceSemanticSearch:
             )
             
             # Execute semantic search
-            opportunities, total_count = await opportunity_service.semantic_search_opportunities(
+            opportunities, total_count, _ = await opportunity_service.semantic_search_opportunities(
                 mock_db, search_request, "user-123"
             )
             
@@ -4,12 +4,13 @@ Tests Requirements 6.1.2 (Semantic search with vector similarity and faceted sea
 """
 
 import pytest
+from datetime import datetime
 from unittest.mock import AsyncMock, patch, MagicMock
 import json
 
 from shared.models.opportunity import Opportunity, OpportunityStatus
-from shared.schemas.opportunity import OpportunitySearchRequest
-from shared.services.opportunity_service import opportunity_service
+from shared.schemas.opportunity import OpportunityCreate, OpportunitySearchRequest
+from shared.services.opportunity_service import OpportunityService, opportunity_service
 from shared.services.ai_service import ai_service
 from shared.vector_db import opportunity_vector_service
 
@@ -71,6 +72,17 @@ def sample_opportunities():
     ]
 
 
+def semantic_search_results(opportunities, allowed_ids=None):
+    """Execute results for a semantic search's id re-check and page load."""
+    id_result = MagicMock()
+    id_result.scalars.return_value.all.return_value = (
+        [opp.id for opp in opportunities] if allowed_ids is None else allowed_ids
+    )
+    page_result = MagicMock()
+    page_result.scalars.return_value.all.return_value = opportunities
+    return [id_result, page_result]
+
+
 class TestSemanticSearchService:
     """Test semantic search functionality in opportunity service."""
     
@@ -92,10 +104,8 @@ class TestSemanticSearchService:
              patch.object(opportunity_vector_service, 'find_similar_opportunities', return_value=mock_vector_results), \
              patch('shared.services.opportunity_service.select') as mock_select:
             
-            # Mock database query
-            mock_result = MagicMock()
-            mock_result.scalars.return_value.all.return_value = sample_opportunities[:2]
-            mock_db.execute.return_value = mock_result
+            # Mock database queries
+            mock_db.execute.side_effect = semantic_search_results(sample_opportunities[:2])
             
             # Create search request
             search_request = OpportunitySearchRequest(
@@ -105,13 +115,14 @@ class TestSemanticSearchService:
             )
             
             # Execute semantic search
-            opportunities, total_count = await opportunity_service.semantic_search_opportunities(
+            opportunities, total_count, truncated = await opportunity_service.semantic_search_opportunities(
                 mock_db, search_request, "user-123"
             )
             
             # Assertions
             assert len(opportunities) == 2
             assert total_count == 2
+            assert truncated is False
             assert opportunities[0].id == "opp-1"
             assert opportunities[1].id == "opp-2"
             
@@ -121,8 +132,9 @@ class TestSemanticSearchService:
             # Verify vector search was called
             opportunity_vector_service.find_similar_opportunities.assert_called_once_with(
                 query_embedding=mock_embedding,
-                top_k=30,  # page_size * 3
-                filters={}
+                top_k=opportunity_service.semantic_search_batch_size,
+                filters={},
+                include_metadata=False
             )
     
     @pytest.mark.asyncio
@@ -138,9 +150,7 @@ class TestSemanticSearchService:
              patch.object(opportunity_vector_service, 'find_similar_opportunities', return_value=mock_vector_results), \
              patch('shared.services.opportunity_service.select') as mock_select:
             
-            mock_result = MagicMock()
-            mock_result.scalars.return_value.all.return_value = sample_opportunities[:1]
-            mock_db.execute.return_value = mock_result
+            mock_db.execute.side_effect = semantic_search_results(sample_opportunities[:1])
             
             # Create search request with filters
             search_request = OpportunitySearchRequest(
@@ -154,7 +164,7 @@ class TestSemanticSearchService:
             )
             
             # Execute semantic search
-            opportunities, total_count = await opportunity_service.semantic_search_opportunities(
+            opportunities, total_count, _ = await opportunity_service.semantic_search_opportunities(
                 mock_db, search_request, "user-123"
             )
             
@@ -167,6 +177,53 @@ class TestSemanticSearchService:
             filters = call_args[1]["filters"]
             assert "status" in filters
             assert filters["status"]["$in"] == ["validated"]
+            assert filters["validation_score"] == {"$gte": 8.0}
+            assert filters["ai_solution_types"] == {"$in": ["NLP", "ML"]}
+            assert filters["target_industries"] == {"$in": ["Technology"]}
+    
+    @pytest.mark.asyncio
+    async def test_semantic_search_cursor_pagination(self, sample_opportunities):
+        """Test that a cursor continues after the previous page's last result."""
+        mock_db = AsyncMock()
+        mock_embedding = [0.1] * 1536
+        mock_vector_results = [
+            {"id": "opp-2", "score": 0.9},
+            {"id": "opp-3", "score": 0.8},
+            {"id": "opp-1", "score": 0.9}
+        ]
+        all_ids = [opp.id for opp in sample_opportunities]
+        
+        with patch.object(ai_service, 'generate_search_query_embedding', return_value=mock_embedding), \
+             patch.object(opportunity_vector_service, 'find_similar_opportunities', return_value=mock_vector_results), \
+             patch('shared.services.opportunity_service.select'):
+            
+            mock_db.execute.side_effect = semantic_search_results(sample_opportunities[:2], all_ids)
+            search_request = OpportunitySearchRequest(query="AI automation", page_size=2)
+            first_page, total_count, _ = await opportunity_service.semantic_search_opportunities(
+                mock_db, search_request
+            )
+            
+            # Equal scores are ordered by id
+            assert [opp.id for opp in first_page] == ["opp-1", "opp-2"]
+            assert total_count == 3
+            cursor = opportunity_service.semantic_search_cursor(search_request, first_page)
+            assert cursor is not None
+            
+            mock_db.execute.side_effect = semantic_search_results(sample_opportunities[2:], all_ids)
+            next_request = OpportunitySearchRequest(query="AI automation", page_size=2, cursor=cursor)
+            second_page, _, _ = await opportunity_service.semantic_search_opportunities(
+                mock_db, next_request
+            )
+            
+            assert [opp.id for opp in second_page] == ["opp-3"]
+            assert opportunity_service.semantic_search_cursor(next_request, second_page) is None
+            
+            # A cursor cannot be reused with different filters
+            with pytest.raises(ValueError):
+                await opportunity_service.semantic_search_opportunities(
+                    mock_db,
+                    OpportunitySearchRequest(query="AI automation", tags=["ml"], cursor=cursor)
+                )
     
     @pytest.mark.asyncio
     async def test_semantic_search_no_query_raises_error(self):
@@ -198,7 +255,7 @@ class TestSemanticSearchService:
             )
             
             # Execute semantic search (should fallback)
-            opportunities, total_count = await opportunity_service.semantic_search_opportunities(
+            opportunities, total_count, truncated = await opportunity_service.semantic_search_opportunities(
                 mock_db, search_request, "user-123"
             )
             
@@ -206,6 +263,156 @@ class TestSemanticSearchService:
             mock_fallback.assert_called_once_with(mock_db, search_request, "user-123")
             assert len(opportunities) == 3
             assert total_count == 3
+            assert truncated is False
+    
+    @pytest.mark.asyncio
+    async def test_semantic_search_counts_matches_after_database_recheck(self, sample_opportunities):
+        """Test that matches the database no longer accepts are left out of the page and the total."""
+        mock_db = AsyncMock()
+        mock_vector_results = [
+            {"id": "opp-1", "score": 0.9},
+            {"id": "opp-2", "score": 0.8},
+            {"id": "opp-3", "score": 0.7}
+        ]
+        # Vector metadata still lists opp-2 as validated; the database does not
+        mock_db.execute.side_effect = semantic_search_results(
+            [sample_opportunities[0], sample_opportunities[2]], ["opp-1", "opp-3"]
+        )
+        
+        with patch.object(ai_service, 'generate_search_query_embedding', return_value=[0.1] * 1536), \
+             patch.object(opportunity_vector_service, 'find_similar_opportunities', return_value=mock_vector_results):
+            
+            search_request = OpportunitySearchRequest(
+                query="AI automation",
+                status=[OpportunityStatus.VALIDATED],
+                page_size=2
+            )
+            opportunities, total_count, truncated = await opportunity_service.semantic_search_opportunities(
+                mock_db, search_request
+            )
+        
+        assert [opp.id for opp in opportunities] == ["opp-1", "opp-3"]
+        assert total_count == 2
+        assert truncated is False
+    
+    @pytest.mark.asyncio
+    async def test_semantic_search_grows_the_vector_query_to_cover_the_page(self):
+        """Test that deep pages widen the vector query and flag a total cut off at the limit."""
+        mock_db = AsyncMock()
+        vector_results = [{"id": f"opp-{n}", "score": 1.0 - n / 100} for n in range(1, 9)]
+        
+        def find_similar(query_embedding, top_k, filters, include_metadata):
+            return vector_results[:top_k]
+        
+        mock_db.execute.side_effect = [
+            *semantic_search_results([], [f"opp-{n}" for n in range(1, 3)])[:1],
+            *semantic_search_results([], [f"opp-{n}" for n in range(3, 5)])[:1],
+            *semantic_search_results([], [f"opp-{n}" for n in range(5, 9)])
+        ]
+        
+        with patch.object(ai_service, 'generate_search_query_embedding', return_value=[0.1] * 1536), \
+             patch.object(opportunity_vector_service, 'find_similar_opportunities', side_effect=find_similar) as find, \
+             patch.object(opportunity_service, 'semantic_search_batch_size', 2), \
+             patch.object(opportunity_service, 'semantic_search_max_results', 8):
+            
+            search_request = OpportunitySearchRequest(query="AI automation", page=3, page_size=2)
+            _, total_count, truncated = await opportunity_service.semantic_search_opportunities(
+                mock_db, search_request
+            )
+        
+        # 2 -> 4 -> 8 matches; only new ids are re-checked each round
+        assert [call.kwargs["top_k"] for call in find.call_args_list] == [2, 4, 8]
+        assert mock_db.execute.await_count == 4
+        assert total_count == 8
+        # The limit was reached with every slot filled, so more matches may exist
+        assert truncated is True
+
+
+class TestHybridSearchService:
+    """Test BM25 and hybrid search in opportunity service."""
+    
+    @pytest.mark.asyncio
+    async def test_hybrid_search_fuses_keyword_and_vector_rankings(self, sample_opportunities):
+        """Test that filtered candidates are ranked by reciprocal-rank fusion."""
+        from shared.services.lexical_index import BM25Index
+        
+        mock_db = AsyncMock()
+        keyword_index = BM25Index()
+        keyword_index.rebuild([(opp.id, {"title": opp.title}) for opp in sample_opportunities])
+        mock_vector_results = [
+            {"id": "opp-2", "score": 0.9},
+            {"id": "opp-3", "score": 0.8},
+            {"id": "opp-1", "score": 0.7}
+        ]
+        
+        # First query filters candidate ids, second loads the page
+        candidate_result = MagicMock()
+        candidate_result.all.return_value = [
+            (opp.id, opp.ai_solution_types, opp.target_industries, opp.tags)
+            for opp in sample_opportunities
+        ]
+        page_result = MagicMock()
+        page_result.scalars.return_value.all.return_value = sample_opportunities[:2]
+        mock_db.execute.side_effect = [candidate_result, page_result]
+        
+        with patch.object(opportunity_service, 'lexical_index', keyword_index), \
+             patch.object(opportunity_service, '_ensure_search_indexes', AsyncMock()), \
+             patch.object(ai_service, 'generate_search_query_embedding', return_value=[0.1] * 1536), \
+             patch.object(opportunity_vector_service, 'find_similar_opportunities', return_value=mock_vector_results):
+            
+            search_request = OpportunitySearchRequest(
+                query="customer service chatbot",
+                search_mode="hybrid",
+                ai_solution_types=["NLP"],
+                page_size=10
+            )
+            opportunities, total_count = await opportunity_service.hybrid_search_opportunities(
+                mock_db, search_request
+            )
+            
+            # Only opp-1 has the NLP type; it ranks first on keywords and last on vectors
+            assert total_count == 1
+            assert [opp.id for opp in opportunities] == ["opp-1"]
+            filters = opportunity_vector_service.find_similar_opportunities.call_args[1]["filters"]
+            assert filters["ai_solution_types"] == {"$in": ["NLP"]}
+    
+    @pytest.mark.asyncio
+    async def test_bm25_search_filters_every_keyword_match(self, sample_opportunities):
+        """Test that filters and totals cover all keyword matches, not just the top ones."""
+        from shared.services.lexical_index import BM25Index
+        
+        mock_db = AsyncMock()
+        keyword_index = BM25Index()
+        keyword_index.rebuild([(opp.id, {"title": opp.title}) for opp in sample_opportunities])
+        
+        # The filter drops the best keyword match (opp-1)
+        candidate_result = MagicMock()
+        candidate_result.all.return_value = [
+            (opp.id, opp.ai_solution_types, opp.target_industries, opp.tags)
+            for opp in sample_opportunities[1:]
+        ]
+        page_result = MagicMock()
+        page_result.scalars.return_value.all.return_value = [sample_opportunities[1]]
+        mock_db.execute.side_effect = [candidate_result, page_result]
+        
+        with patch.object(opportunity_service, 'lexical_index', keyword_index), \
+             patch.object(opportunity_service, 'semantic_search_max_results', 1), \
+             patch.object(opportunity_service, '_ensure_search_indexes', AsyncMock()):
+            
+            search_request = OpportunitySearchRequest(
+                query="chatbot quality healthcare",
+                search_mode="bm25",
+                status=[OpportunityStatus.VALIDATED, OpportunityStatus.VALIDATING],
+                page=2,
+                page_size=1
+            )
+            opportunities, total_count = await opportunity_service.hybrid_search_opportunities(
+                mock_db, search_request
+            )
+        
+        # opp-3's shorter title ranks it first; page 2 holds opp-2
+        assert total_count == 2
+        assert [opp.id for opp in opportunities] == ["opp-2"]
 
 
 class TestFacetedSearchService:
@@ -215,15 +422,16 @@ class TestFacetedSearchService:
     async def test_get_search_facets(self, sample_opportunities):
         """Test faceted search data generation."""
         mock_db = AsyncMock()
+        service = OpportunityService()
         
         with patch('shared.services.opportunity_service.select') as mock_select:
-            # Mock database query
+            # Mock the index build query
             mock_result = MagicMock()
-            mock_result.scalars.return_value.all.return_value = sample_opportunities
+            mock_result.all.return_value = sample_opportunities
             mock_db.execute.return_value = mock_result
             
             # Execute facets generation
-            facets = await opportunity_service.get_search_facets(mock_db, None)
+            facets = await service.get_search_facets(mock_db, None)
             
             # Assertions
             assert "status" in facets
@@ -254,16 +462,16 @@ class TestFacetedSearchService:
     async def test_get_search_facets_with_query(self, sample_opportunities):
         """Test faceted search with query filter."""
         mock_db = AsyncMock()
+        service = OpportunityService()
         
         with patch('shared.services.opportunity_service.select') as mock_select:
-            # Mock database query with filtered results
-            filtered_opportunities = [sample_opportunities[0]]  # Only chatbot opportunity
+            # Mock the index build query; only the first opportunity mentions chatbots
             mock_result = MagicMock()
-            mock_result.scalars.return_value.all.return_value = filtered_opportunities
+            mock_result.all.return_value = sample_opportunities
             mock_db.execute.return_value = mock_result
             
             # Execute facets generation with query
-            facets = await opportunity_service.get_search_facets(mock_db, "chatbot")
+            facets = await service.get_search_facets(mock_db, "chatbot")
             
             # Assertions
             assert facets["_metadata"]["total_opportunities"] == 1
@@ -273,15 +481,37 @@ class TestFacetedSearchService:
             assert facets["status"]["validated"] == 1
             assert "validating" not in facets["status"]
     
+    @pytest.mark.asyncio
+    async def test_get_search_facets_query_matches_whole_terms(self, sample_opportunities):
+        """Test that facet queries match every term as a whole word, not as a substring."""
+        mock_db = AsyncMock()
+        service = OpportunityService()
+        
+        with patch('shared.services.opportunity_service.select'):
+            mock_result = MagicMock()
+            mock_result.all.return_value = sample_opportunities
+            mock_db.execute.return_value = mock_result
+            
+            whole_word = await service.get_search_facets(mock_db, "Automation")
+            partial_word = await service.get_search_facets(mock_db, "automat")
+            all_terms = await service.get_search_facets(mock_db, "quality healthcare")
+        
+        # Only opp-1 mentions automation (in its description and tags)
+        assert whole_word["_metadata"]["total_opportunities"] == 1
+        assert partial_word["_metadata"]["total_opportunities"] == 0
+        # No single opportunity mentions both terms
+        assert all_terms["_metadata"]["total_opportunities"] == 0
+    
     @pytest.mark.asyncio
     async def test_get_search_facets_error_handling(self):
         """Test faceted search error handling."""
         mock_db = AsyncMock()
+        service = OpportunityService()
         
         with patch('shared.services.opportunity_service.select', side_effect=Exception("Database error")):
             
             # Execute facets generation (should handle error gracefully)
-            facets = await opportunity_service.get_search_facets(mock_db, "test")
+            facets = await service.get_search_facets(mock_db, "test")
             
             # Should return empty facets structure with error info
             assert facets["_metadata"]["total_opportunities"] == 0
@@ -292,6 +522,86 @@ class TestFacetedSearchService:
             assert facets["status"] == {}
             assert facets["ai_solution_types"] == {}
             assert facets["target_industries"] == {}
+    
+    @pytest.mark.asyncio
+    async def test_facets_follow_opportunity_updates(self, sample_opportunities):
+        """Test that indexed facet counts change without another database scan."""
+        mock_db = AsyncMock()
+        service = OpportunityService()
+        
+        with patch('shared.services.opportunity_service.select'):
+            mock_result = MagicMock()
+            mock_result.all.return_value = sample_opportunities
+            mock_db.execute.return_value = mock_result
+            await service.get_search_facets(mock_db, None)
+            
+            # Opportunity moves to validated with a higher score, another is rejected
+            updated = sample_opportunities[2]
+            updated.status = OpportunityStatus.VALIDATED
+            updated.validation_score = 8.1
+            service._index_opportunity(updated)
+            rejected = sample_opportunities[0]
+            rejected.status = OpportunityStatus.REJECTED
+            service._index_opportunity(rejected)
+            
+            facets = await service.get_search_facets(mock_db, None)
+        
+        assert mock_db.execute.call_count == 1
+        assert facets["status"] == {"validated": 2}
+        assert facets["validation_score_ranges"]["8-10"] == 2
+        assert facets["validation_score_ranges"]["6-8"] == 0
+        assert "NLP" not in facets["ai_solution_types"]
+        assert facets["_metadata"]["total_opportunities"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_stale_indexes_rebuild_in_background_and_keep_updates(self, sample_opportunities):
+        """Test that a stale index keeps serving and updates made during its rebuild survive."""
+        import asyncio
+        from contextlib import asynccontextmanager
+        
+        mock_db = AsyncMock()
+        service = OpportunityService()
+        release = asyncio.Event()
+        
+        refresh_result = MagicMock()
+        refresh_result.all.return_value = sample_opportunities
+        refresh_db = AsyncMock()
+        
+        async def slow_execute(*args, **kwargs):
+            await release.wait()
+            return refresh_result
+        
+        refresh_db.execute.side_effect = slow_execute
+        
+        @asynccontextmanager
+        async def get_db_session():
+            yield refresh_db
+        
+        with patch('shared.services.opportunity_service.select'), \
+             patch('shared.database.get_db_session', get_db_session):
+            mock_result = MagicMock()
+            mock_result.all.return_value = sample_opportunities
+            mock_db.execute.return_value = mock_result
+            await service.get_search_facets(mock_db, None)
+            
+            # Once stale, searches are served from the old index while it rebuilds
+            service.search_index_refresh_seconds = 0
+            facets = await service.get_search_facets(mock_db, None)
+            assert facets["_metadata"]["total_opportunities"] == 3
+            await asyncio.sleep(0)
+            
+            # Rejected while the rebuild's scan is still in flight
+            service._index_opportunity(Opportunity(id="opp-1", title="Chatbot", status=OpportunityStatus.REJECTED))
+            release.set()
+            await service._search_index_refresh_task
+            
+            service.search_index_refresh_seconds = 600
+            facets = await service.get_search_facets(mock_db, None)
+        
+        assert mock_db.execute.call_count == 1
+        assert refresh_db.execute.call_count == 1
+        assert facets["_metadata"]["total_opportunities"] == 2
+        assert "opp-1" not in service.facet_index
 
 
 class TestEmbeddingGeneration:
@@ -325,6 +635,34 @@ class TestEmbeddingGeneration:
             assert metadata["status"] == opportunity.status.value
             assert metadata["validation_score"] == opportunity.validation_score
     
+    @pytest.mark.asyncio
+    async def test_created_opportunities_are_embedded(self):
+        """Test new opportunities reach the vector index under their stored ID."""
+        service = OpportunityService()
+        created_at = datetime(2024, 1, 1)
+        result = MagicMock()
+        result.fetchone.return_value = ("ignored", created_at, created_at)
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+        db.commit = AsyncMock()
+        opportunity_data = OpportunityCreate(
+            title="AI invoice reconciliation",
+            description="Match supplier invoices to purchase orders and flag mismatches automatically",
+            ai_solution_types=["nlp"],
+            tags=["finance"]
+        )
+        
+        with patch.object(service, '_clear_opportunity_caches', AsyncMock()), \
+             patch.object(ai_service, 'generate_opportunity_embedding', AsyncMock(return_value=[0.1] * 8)), \
+             patch.object(opportunity_vector_service, 'store_opportunity_embedding', AsyncMock(return_value=True)) as mock_store:
+            created = await service.create_opportunity(db, opportunity_data, discovered_by_agent="agent")
+        
+        mock_store.assert_awaited_once()
+        assert mock_store.await_args.kwargs["opportunity_id"] == created.id
+        metadata = mock_store.await_args.kwargs["metadata"]
+        assert metadata["ai_solution_types"] == ["nlp"]
+        assert metadata["created_at"] == created_at.isoformat()
+    
     @pytest.mark.asyncio
     async def test_embedding_generation_failure_handling(self, sample_opportunities):
         """Test that embedding generation failures don't break opportunity creation."""
@@ -410,6 +748,64 @@ class TestAIServiceEmbedding:
             assert "AI Solution Types: NLP, ML" in call_args
             assert "Target Industries: Technology" in call_args
             assert "Tags: chatbot, automation" in call_args
+    
+    @pytest.mark.asyncio
+    async def test_identical_texts_are_embedded_once(self):
+        """Test that concurrent and repeated requests share provider calls."""
+        import asyncio
+        from shared.services.ai_service import AIService, MockEmbeddingProvider
+        
+        service = AIService()
+        service.embedding_cache.cache_manager = None  # In-process cache only
+        provider = MockEmbeddingProvider(dimension=8)
+        service.embedding_provider = provider
+        
+        with patch.object(provider, 'generate_embeddings', wraps=provider.generate_embeddings) as generate:
+            first, second, third = await asyncio.gather(
+                service.generate_text_embedding("AI chatbot"),
+                service.generate_text_embedding("AI chatbot"),
+                service.generate_text_embedding("fraud detection")
+            )
+            
+            # Concurrent single-text calls are merged into one batch
+            generate.assert_called_once()
+            assert sorted(generate.call_args[0][0]) == ["AI chatbot", "fraud detection"]
+            assert first == second
+            
+            # Repeated texts are served from the cache with the vectors a miss returned
+            cached = await service.generate_text_embeddings(["fraud detection", "AI chatbot"])
+            
+            generate.assert_called_once()
+            assert cached == [third, first]
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_embedding(self):
+        """Test that a waiter still gets its embedding when the first caller is cancelled."""
+        import asyncio
+        from shared.services.ai_service import AIService, MockEmbeddingProvider
+        
+        service = AIService()
+        service.embedding_cache.cache_manager = None  # In-process cache only
+        provider = MockEmbeddingProvider(dimension=8)
+        service.embedding_provider = provider
+        release = asyncio.Event()
+        
+        async def slow_embeddings(texts):
+            await release.wait()
+            return [[0.5] * 8 for _ in texts]
+        
+        with patch.object(provider, 'generate_embeddings', side_effect=slow_embeddings) as generate:
+            first = asyncio.create_task(service.generate_text_embeddings(["AI chatbot"]))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(service.generate_text_embeddings(["AI chatbot"]))
+            await asyncio.sleep(0)
+            
+            first.cancel()
+            release.set()
+            
+            assert await second == [[0.5] * 8]
+            assert first.cancelled()
+            generate.assert_called_once()
 
 
 if __name__ == "__main__":
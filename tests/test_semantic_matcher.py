@@ -0,0 +1,117 @@
+"""
+Tests for the incremental TF-IDF semantic matcher used by duplicate detection.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from processing.duplicate_detection import SemanticMatcher
+
+
+INVENTORY = "retail inventory forecasting for seasonal products with holiday stockouts"
+INVENTORY_REWORDED = "seasonal products inventory forecasting for retail holiday stockouts"
+RADIOLOGY = "radiology scan triage using image classification to prioritise urgent cases"
+INVOICES = "small business invoice processing automation with optical character recognition"
+
+
+@pytest.fixture
+def matcher():
+    return SemanticMatcher(similarity_threshold=0.5, n_features=2 ** 12)
+
+
+class TestIncrementalFit:
+    """Test cases for adding documents batch by batch."""
+
+    def test_document_frequencies_accumulate_across_batches(self, matcher):
+        matcher.add_documents([("doc-1", INVENTORY), ("doc-2", RADIOLOGY)])
+        after_first = matcher._doc_freq.sum()
+        matcher.fit_documents([("doc-3", INVOICES)])
+
+        assert matcher._n_docs == 3
+        assert matcher._corpus_size == 3
+        assert matcher._doc_freq.sum() > after_first
+
+    def test_segments_stay_logarithmic_and_bounded(self):
+        matcher = SemanticMatcher(similarity_threshold=0.5, n_features=2 ** 12, max_documents=40)
+        for n in range(100):
+            matcher.add_documents([(f"doc-{n}", INVOICES)])
+
+        assert len(matcher._segments) <= 7
+        assert sum(len(segment.doc_ids) for segment in matcher._segments) < 2 * 40
+        found = {doc_id for doc_id, _ in matcher.find_similar_documents(INVOICES, "query", top_k=100)}
+        # Only the newest max_documents documents are searchable
+        assert found == {f"doc-{n}" for n in range(60, 100)}
+
+
+class TestSimilarityLookup:
+    """Test cases for SemanticMatcher.find_similar_documents."""
+
+    def test_finds_reworded_document_only(self, matcher):
+        matcher.add_documents([("doc-1", INVENTORY), ("doc-2", RADIOLOGY)])
+        matcher.add_documents([("doc-3", INVOICES)])
+
+        matches = matcher.find_similar_documents(INVENTORY_REWORDED, "doc-new")
+
+        assert [doc_id for doc_id, _ in matches] == ["doc-1"]
+        assert matches[0][1] == pytest.approx(matcher.calculate_similarity(INVENTORY, INVENTORY_REWORDED), rel=0.2)
+
+    def test_excludes_itself_and_respects_top_k(self, matcher):
+        matcher.add_documents([(f"doc-{n}", INVENTORY) for n in range(5)])
+
+        matches = matcher.find_similar_documents(INVENTORY, "doc-0", top_k=3)
+
+        assert len(matches) == 3
+        assert "doc-0" not in {doc_id for doc_id, _ in matches}
+        assert all(similarity == pytest.approx(1.0) for _, similarity in matches)
+
+    def test_unfitted_or_empty_queries_return_nothing(self, matcher):
+        assert matcher.find_similar_documents(INVENTORY, "doc-1") == []
+        matcher.add_documents([("doc-1", INVENTORY)])
+        assert matcher.find_similar_documents("", "doc-2") == []
+        assert matcher.find_similar_documents("the and of", "doc-2") == []
+
+
+class TestModelPersistence:
+    """Test cases for saving and loading document frequencies."""
+
+    def test_load_restores_saved_statistics(self, matcher, tmp_path):
+        matcher.add_documents([("doc-1", INVENTORY), ("doc-2", RADIOLOGY)])
+        matcher.save_model(str(tmp_path))
+
+        loaded = SemanticMatcher(n_features=2 ** 12, model_path=str(tmp_path))
+
+        assert loaded._n_docs == 2
+        assert np.array_equal(loaded._doc_freq, matcher._doc_freq)
+        assert sorted(os.listdir(tmp_path)) == ["doc_freq.npy", "meta.json", "model.lock"]
+
+    def test_workers_merge_rather_than_overwrite_counts(self, tmp_path):
+        first = SemanticMatcher(n_features=2 ** 12, model_path=str(tmp_path))
+        second = SemanticMatcher(n_features=2 ** 12, model_path=str(tmp_path))
+        first.add_documents([("doc-1", INVENTORY)])
+        second.add_documents([("doc-2", RADIOLOGY), ("doc-3", INVOICES)])
+
+        first.save_model()
+        second.save_model()
+        # A second save only adds what was added since the previous one
+        first.add_documents([("doc-4", INVENTORY_REWORDED)])
+        first.save_model()
+
+        with open(tmp_path / "meta.json") as f:
+            assert json.load(f)["n_docs"] == 4
+        expected = SemanticMatcher(n_features=2 ** 12)
+        expected.add_documents([("doc-1", INVENTORY), ("doc-2", RADIOLOGY), ("doc-3", INVOICES)])
+        expected.add_documents([("doc-4", INVENTORY_REWORDED)])
+        assert np.array_equal(np.load(tmp_path / "doc_freq.npy"), expected._doc_freq)
+        assert np.array_equal(first._doc_freq, expected._doc_freq)
+
+    def test_mismatched_feature_size_is_ignored(self, matcher, tmp_path):
+        matcher.add_documents([("doc-1", INVENTORY)])
+        matcher.save_model(str(tmp_path))
+
+        other = SemanticMatcher(n_features=2 ** 10)
+
+        assert other.load_model(str(tmp_path)) is False
+        assert other._n_docs == 0
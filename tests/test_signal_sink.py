@@ -0,0 +1,121 @@
+"""
+Tests for the batched market signal sink.
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from processing.signal_sink import MarketSignalBulkSink
+
+
+class FakeDatabase:
+    """Stands in for ``get_db_session``, recording one entry per transaction."""
+
+    def __init__(self, bad_ids=(), outage=False):
+        self.bad_ids = set(bad_ids)
+        self.outage = outage
+        self.transactions = []
+        self.stored = []
+
+    @asynccontextmanager
+    async def session(self):
+        session = MagicMock()
+        yield session
+        rows = session.add_all.call_args[0][0]
+        self.transactions.append([row.id for row in rows])
+        if self.outage:
+            raise OperationalError("INSERT", {}, ConnectionRefusedError("connection refused"))
+        if self.bad_ids & {row.id for row in rows}:
+            raise IntegrityError("INSERT", {}, ValueError("duplicate key"))
+        self.stored.extend(row.id for row in rows)
+
+
+def signal(n):
+    return SimpleNamespace(id=f"signal-{n}")
+
+
+async def fill(sink, count):
+    for n in range(count):
+        await sink.add(signal(n), f"text {n}", {"source": "test", "empty": None})
+
+
+@pytest.fixture
+def vector_db():
+    vector_db = MagicMock()
+    vector_db.upsert_vectors = AsyncMock(return_value=True)
+    return vector_db
+
+
+@pytest.fixture
+def ai_service():
+    ai_service = MagicMock()
+    ai_service.generate_text_embeddings = AsyncMock(side_effect=lambda texts: [[0.1, 0.2] for _ in texts])
+    return ai_service
+
+
+class TestMarketSignalBulkSink:
+    """Test cases for MarketSignalBulkSink."""
+
+    @pytest.mark.asyncio
+    async def test_signals_are_written_in_batches(self, vector_db, ai_service):
+        database = FakeDatabase()
+        sink = MarketSignalBulkSink(vector_db=vector_db, ai_service=ai_service, batch_size=4)
+
+        with patch("processing.signal_sink.get_db_session", database.session):
+            await fill(sink, 10)
+            stats = await sink.close()
+
+        assert [len(rows) for rows in database.transactions] == [4, 4, 2]
+        assert stats.batches == 3
+        assert stats.written == stats.vectors_written == 10
+        assert ai_service.generate_text_embeddings.await_count == 3
+        vectors = vector_db.upsert_vectors.await_args_list[0].args[1]
+        assert vectors[0]["metadata"] == {"source": "test", "id": "signal-0"}
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_halved_down_to_the_bad_row(self, vector_db, ai_service):
+        database = FakeDatabase(bad_ids={"signal-5"})
+        sink = MarketSignalBulkSink(vector_db=vector_db, ai_service=ai_service, batch_size=8)
+
+        with patch("processing.signal_sink.get_db_session", database.session):
+            await fill(sink, 8)
+
+        assert sorted(database.stored) == sorted(f"signal-{n}" for n in range(8) if n != 5)
+        # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1, splitting only the halves that hold the bad row
+        assert len(database.transactions) == 7
+        assert ["signal-5"] in database.transactions
+        assert sink.stats.written == 7
+        assert sink.stats.failed == 1
+        # Only the persisted rows get vectors
+        vectors = vector_db.upsert_vectors.await_args.args[1]
+        assert "signal-5" not in {vector["id"] for vector in vectors}
+        assert sink.stats.vectors_written == 7
+
+    @pytest.mark.asyncio
+    async def test_outage_drops_the_batch_without_splitting(self, vector_db, ai_service):
+        database = FakeDatabase(outage=True)
+        sink = MarketSignalBulkSink(vector_db=vector_db, ai_service=ai_service, batch_size=16)
+
+        with patch("processing.signal_sink.get_db_session", database.session):
+            await fill(sink, 16)
+
+        assert len(database.transactions) == 1
+        assert sink.stats.written == 0
+        assert sink.stats.failed == 16
+        vector_db.upsert_vectors.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_vector_failures_do_not_fail_the_batch(self, vector_db, ai_service):
+        database = FakeDatabase()
+        ai_service.generate_text_embeddings.side_effect = RuntimeError("embedding service down")
+        sink = MarketSignalBulkSink(vector_db=vector_db, ai_service=ai_service, batch_size=3)
+
+        with patch("processing.signal_sink.get_db_session", database.session):
+            await fill(sink, 3)
+
+        assert sink.stats.written == 3
+        assert sink.stats.vector_failures == 3
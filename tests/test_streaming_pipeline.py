@@ -0,0 +1,164 @@
+"""
+Tests for the bounded-queue streaming ingestion pipeline.
+"""
+
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from plugin_manager import PluginManager
+from plugins.base import DataSourcePlugin, PluginConfig, PluginError, PluginStatus
+from processing.pipeline import PipelineStage, StreamingPipeline
+
+
+async def numbers(count, produced=None):
+    for n in range(count):
+        if produced is not None:
+            produced.append(n)
+        yield n
+
+
+class StubPlugin(DataSourcePlugin):
+    """Plugin yielding a fixed list of items, optionally failing afterwards."""
+
+    def __init__(self, items, error=None):
+        super().__init__(PluginConfig())
+        self.items = items
+        self.error = error
+        self.status = PluginStatus.ACTIVE
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def health_check(self) -> bool:
+        return True
+
+    async def fetch_data(self, params: Dict[str, Any]):
+        for item in self.items:
+            yield item
+        if self.error is not None:
+            raise self.error
+
+    def get_metadata(self):
+        return None
+
+    def validate_config(self, config: Dict[str, Any]) -> bool:
+        return True
+
+
+class TestStreamingPipeline:
+    """Test cases for StreamingPipeline."""
+
+    @pytest.mark.asyncio
+    async def test_items_flow_through_every_stage(self):
+        seen = []
+
+        async def double(item):
+            return item * 2
+
+        async def collect(item):
+            seen.append(item)
+            return item
+
+        stats = await StreamingPipeline([
+            PipelineStage("double", double, concurrency=3),
+            PipelineStage("collect", collect),
+        ]).run(numbers(20))
+
+        assert sorted(seen) == [n * 2 for n in range(20)]
+        assert stats.items_in == stats.items_out == 20
+        assert stats.stages["double"].passed == 20
+        assert stats.time_to_first_output is not None
+
+    @pytest.mark.asyncio
+    async def test_bounded_queue_blocks_the_producer(self):
+        release = asyncio.Event()
+        produced = []
+
+        async def blocked(item):
+            await release.wait()
+            return item
+
+        pipeline = StreamingPipeline([PipelineStage("blocked", blocked, queue_size=2)])
+        task = asyncio.create_task(pipeline.run(numbers(100, produced)))
+        await asyncio.sleep(0.05)
+
+        # One item in the worker, two queued and one waiting on put()
+        assert len(produced) == 4
+
+        release.set()
+        stats = await task
+
+        assert len(produced) == 100
+        assert stats.items_out == 100
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_counted_and_dropped(self):
+        async def check(item):
+            if item % 3 == 0:
+                raise ValueError("bad item")
+            return item if item % 2 else None
+
+        stats = await StreamingPipeline([PipelineStage("check", check, concurrency=2)]).run(numbers(12))
+
+        stage = stats.stages["check"]
+        assert stage.processed == 12
+        assert stage.errors == 4
+        assert stage.dropped == 4
+        assert stage.passed == stats.items_out == 4
+
+    @pytest.mark.asyncio
+    async def test_source_errors_propagate_and_workers_shut_down(self):
+        async def failing_source():
+            yield 1
+            yield 2
+            raise RuntimeError("crawl failed")
+
+        async def identity(item):
+            return item
+
+        before = asyncio.all_tasks()
+        with pytest.raises(RuntimeError, match="crawl failed"):
+            await StreamingPipeline([
+                PipelineStage("first", identity, concurrency=2),
+                PipelineStage("second", identity),
+            ]).run(failing_source())
+
+        assert asyncio.all_tasks() == before
+
+    @pytest.mark.asyncio
+    async def test_stages_are_required(self):
+        with pytest.raises(ValueError):
+            StreamingPipeline([])
+
+
+class TestPluginStreaming:
+    """Test cases for PluginManager.stream_data_from_plugin."""
+
+    @pytest.mark.asyncio
+    async def test_streams_items_and_reports_plugin_errors(self):
+        manager = PluginManager()
+        plugin = StubPlugin([1, 2], error=ConnectionError("rate limited"))
+        manager._plugins["stub"] = plugin
+        received = []
+
+        with pytest.raises(PluginError, match="rate limited"):
+            async for item in manager.stream_data_from_plugin("stub", {}):
+                received.append(item)
+
+        assert received == [1, 2]
+        assert plugin.status == PluginStatus.ERROR
+
+    @pytest.mark.asyncio
+    async def test_rejects_inactive_plugins(self):
+        manager = PluginManager()
+        manager._plugins["stub"] = StubPlugin([1])
+        manager._plugins["stub"].status = PluginStatus.INACTIVE
+
+        with pytest.raises(PluginError, match="not active"):
+            async for _ in manager.stream_data_from_plugin("stub", {}):
+                pass
@@ -0,0 +1,173 @@
+"""
+Tests for the Redis-backed task queue, run against fakeredis.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import fakeredis
+import pytest
+
+from processing.task_queue import (
+    CLAIM_TASK_SCRIPT,
+    Task,
+    TaskPriority,
+    TaskQueue,
+    TaskStatus,
+    _pack_value,
+    _unpack_value,
+)
+
+
+@pytest.fixture
+def queue():
+    queue = TaskQueue(queue_name="test_queue")
+    queue._redis = fakeredis.FakeAsyncRedis()
+    queue._claim_script = queue._redis.register_script(CLAIM_TASK_SCRIPT)
+    queue.block_timeout_seconds = 0.05
+    return queue
+
+
+class TestTaskClaims:
+    """Test cases for claiming tasks."""
+
+    @pytest.mark.asyncio
+    async def test_claims_follow_priority_then_fifo(self, queue):
+        low = await queue.enqueue_task("work", {"n": 1}, priority=TaskPriority.LOW)
+        first = await queue.enqueue_task("work", {"n": 2})
+        time.sleep(0.002)
+        second = await queue.enqueue_task("work", {"n": 3})
+        high = await queue.enqueue_task("work", {"n": 4}, priority=TaskPriority.HIGH)
+
+        claimed = [await queue._claim_next_task() for _ in range(4)]
+
+        assert [task.id for task in claimed] == [high, first, second, low]
+        assert all(task.status == TaskStatus.PROCESSING for task in claimed)
+        assert await queue._claim_next_task() is None
+
+    @pytest.mark.asyncio
+    async def test_claimed_task_reports_processing(self, queue):
+        task_id = await queue.enqueue_task("work", {})
+        await queue._claim_next_task()
+
+        task = await queue.get_task_status(task_id)
+
+        assert task.status == TaskStatus.PROCESSING
+        assert task.started_at is not None
+        assert (await queue.get_queue_stats())["processing"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_tasks_are_skipped(self, queue):
+        cancelled = await queue.enqueue_task("work", {}, priority=TaskPriority.HIGH)
+        kept = await queue.enqueue_task("work", {})
+
+        assert await queue.cancel_task(cancelled)
+        task = await queue._claim_next_task()
+
+        assert task.id == kept
+
+
+class TestTaskRecovery:
+    """Test cases for recovering tasks abandoned by crashed workers."""
+
+    @pytest.mark.asyncio
+    async def test_task_past_its_timeout_is_requeued(self, queue):
+        queue.recovery_grace_seconds = 0
+        abandoned = await queue.enqueue_task("work", {}, timeout_seconds=0)
+        await queue._claim_next_task()
+        running = await queue.enqueue_task("work", {}, timeout_seconds=300)
+        await queue._claim_next_task()
+
+        await queue._recover_abandoned_tasks()
+
+        reclaimed = await queue._claim_next_task()
+        assert reclaimed.id == abandoned
+        assert await queue._claim_next_task() is None
+        assert (await queue.get_task_status(running)).status == TaskStatus.PROCESSING
+
+    @pytest.mark.asyncio
+    async def test_failed_task_is_scheduled_for_retry(self, queue):
+        async def fail(payload):
+            raise RuntimeError("boom")
+
+        queue.register_handler("work", fail)
+        task_id = await queue.enqueue_task("work", {}, max_retries=1)
+        await queue._process_task(await queue._claim_next_task(), "worker-0")
+
+        task = await queue.get_task_status(task_id)
+        assert task.status == TaskStatus.RETRYING
+        assert task.error == "boom"
+        assert await queue._redis.zscore("test_queue:scheduled", task_id) is not None
+        assert await queue._redis.zscore("test_queue:processing", task_id) is None
+
+
+class TestWaitForTasks:
+    """Test cases for waiting on task completion."""
+
+    @pytest.mark.asyncio
+    async def test_returns_once_every_task_finishes(self, queue):
+        async def double(payload):
+            return payload["n"] * 2
+
+        queue.register_handler("double", double)
+        task_ids = [await queue.enqueue_task("double", {"n": n}) for n in (1, 2)]
+        waiter = asyncio.create_task(queue.wait_for_tasks(task_ids, timeout=5))
+        await asyncio.sleep(0.01)
+
+        for _ in task_ids:
+            await queue._process_task(await queue._claim_next_task(), "worker-0")
+        tasks = await asyncio.wait_for(waiter, timeout=5)
+
+        assert {task.status for task in tasks.values()} == {TaskStatus.COMPLETED}
+        assert [await queue.get_task_result(task_id) for task_id in task_ids] == [2, 4]
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_unfinished_tasks(self, queue):
+        task_id = await queue.enqueue_task("work", {})
+
+        tasks = await queue.wait_for_tasks([task_id, "missing"], timeout=0.1)
+
+        assert tasks[task_id].status == TaskStatus.PENDING
+        assert tasks["missing"] is None
+
+
+class TestTaskEncoding:
+    """Test cases for the stored task and result encodings."""
+
+    def test_packed_task_round_trips(self):
+        task = Task(
+            id="task-1",
+            name="work",
+            payload={"text": "x" * 1000},
+            priority=TaskPriority.HIGH,
+            created_at=datetime(2024, 1, 1, 12, 0, 0),
+            status=TaskStatus.RETRYING,
+            error="boom"
+        )
+
+        packed = task.pack()
+
+        assert packed[:1] == b"\x02"  # Large payloads are compressed
+        assert Task.unpack(packed) == task
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_tasks_are_unpacked(self, queue):
+        legacy = Task(
+            id="legacy-1",
+            name="work",
+            payload={"n": 1},
+            created_at=datetime(2024, 1, 1, 12, 0, 0),
+            status=TaskStatus.COMPLETED
+        )
+        await queue._redis.hset("test_queue:tasks", legacy.id, legacy.json())
+        await queue._redis.hset("test_queue:results", legacy.id, '{"ok": true}')
+
+        task = await queue.get_task_status(legacy.id)
+
+        assert task == legacy
+        assert await queue.get_task_result(legacy.id) == {"ok": True}
+
+    def test_unpack_value_accepts_packed_and_legacy_text(self):
+        assert _unpack_value(_pack_value({"a": [1, 2]})) == {"a": [1, 2]}
+        assert _unpack_value('{"a": [1, 2]}') == {"a": [1, 2]}
@@ -0,0 +1,74 @@
+"""
+Tests for the user-user similarity index used by collaborative filtering.
+"""
+
+import random
+
+import pytest
+
+from shared.services.user_similarity import UserSimilarityIndex
+
+
+def brute_force_neighbors(interactions, user_id, min_similarity=0.1):
+    """Pairwise Jaccard similarity from one user to every other user."""
+    user_items = {}
+    for interaction_user_id, opportunity_id in interactions:
+        user_items.setdefault(interaction_user_id, set()).add(opportunity_id)
+
+    items = user_items.get(user_id, set())
+    neighbors = []
+    for other_id, other_items in user_items.items():
+        if other_id == user_id:
+            continue
+        similarity = len(items & other_items) / len(items | other_items)
+        if similarity > min_similarity:
+            neighbors.append((other_id, similarity))
+    return sorted(neighbors, key=lambda entry: (-entry[1], entry[0]))
+
+
+@pytest.fixture
+def interactions():
+    generator = random.Random(7)
+    return [
+        (f"user-{generator.randrange(60)}", f"opp-{generator.randrange(40)}")
+        for _ in range(600)
+    ]
+
+
+class TestUserSimilarityIndex:
+    """Test cases for UserSimilarityIndex."""
+
+    def test_rebuild_matches_pairwise_jaccard(self, interactions):
+        """Sparse-product neighbours equal the pairwise computation."""
+        index = UserSimilarityIndex(top_k=1000, block_size=16)
+        index.rebuild(interactions)
+
+        for user_id in {user_id for user_id, _ in interactions}:
+            expected = brute_force_neighbors(interactions, user_id)
+            actual = index.neighbors(user_id)
+            assert [other for other, _ in actual] == [other for other, _ in expected]
+            assert [similarity for _, similarity in actual] == pytest.approx(
+                [similarity for _, similarity in expected]
+            )
+
+    def test_incremental_updates_match_rebuild(self, interactions):
+        """Adding interactions one by one keeps neighbour lists exact."""
+        incremental = UserSimilarityIndex(top_k=1000)
+        incremental.rebuild(interactions[:300])
+        for user_id, opportunity_id in interactions[300:]:
+            incremental.add_interaction(user_id, opportunity_id)
+
+        rebuilt = UserSimilarityIndex(top_k=1000)
+        rebuilt.rebuild(interactions)
+
+        for user_id in {user_id for user_id, _ in interactions}:
+            assert incremental.neighbors(user_id) == pytest.approx(rebuilt.neighbors(user_id))
+
+    def test_neighbors_are_limited(self, interactions):
+        """Only the top-k neighbours are kept and unknown users have none."""
+        index = UserSimilarityIndex(top_k=3)
+        index.rebuild(interactions)
+
+        assert all(len(index.neighbors(user_id)) <= 3 for user_id, _ in interactions)
+        assert index.neighbors("user-0", limit=1) == index.neighbors("user-0")[:1]
+        assert index.neighbors("unknown-user") == []
@@ -8,6 +8,7 @@ from shared.vector_db import (
     MarketSignalVectorService,
     UserPreferenceVectorService
 )
+from shared.vector_index import LocalVectorIndex
 
 
 class TestVectorDatabaseManager:
@@ -46,13 +47,47 @@ class TestVectorDatabaseManager:
     
     @pytest.mark.asyncio
     async def test_initialization_missing_api_key(self):
-        """Test initialization fails without API key."""
-        with patch.dict('os.environ', {}, clear=True):
+        """Test Pinecone initialization fails without API key."""
+        with patch.dict('os.environ', {'VECTOR_DB_BACKEND': 'pinecone'}, clear=True):
             vector_db = VectorDatabaseManager()
             
             with pytest.raises(ValueError, match="PINECONE_API_KEY"):
                 await vector_db.initialize()
     
+    @pytest.mark.asyncio
+    async def test_local_backend_without_api_key(self, tmp_path):
+        """Test the local backend is used and persisted when no API key is set."""
+        with patch.dict('os.environ', {'VECTOR_DB_PATH': str(tmp_path)}, clear=True):
+            vector_db = VectorDatabaseManager()
+            vector_db.indexes["opportunities"]["dimension"] = 3
+            assert vector_db.backend == "local"
+            
+            vectors = [
+                {"id": "opp-1", "values": [1.0, 0.0, 0.0], "metadata": {"status": "validated", "validation_score": 8.0}},
+                {"id": "opp-2", "values": [0.9, 0.1, 0.0], "metadata": {"status": "draft", "validation_score": 9.0}},
+                {"id": "opp-3", "values": [0.0, 1.0, 0.0], "metadata": {"status": "validated", "validation_score": 6.0}}
+            ]
+            assert await vector_db.upsert_vectors("opportunities", vectors) is True
+            
+            results = await vector_db.query_vectors(
+                "opportunities",
+                [1.0, 0.0, 0.0],
+                top_k=2,
+                filter_dict={"status": {"$in": ["validated"]}, "validation_score": {"$gte": 5}}
+            )
+            assert [result["id"] for result in results] == ["opp-1", "opp-3"]
+            assert results[0]["score"] == pytest.approx(1.0)
+            assert results[0]["metadata"]["status"] == "validated"
+            
+            assert await vector_db.delete_vectors("opportunities", ["opp-1"]) is True
+            vector_db.get_index("opportunities").save()
+            
+            # A new manager reopens the persisted index
+            reopened = VectorDatabaseManager()
+            reopened.indexes["opportunities"]["dimension"] = 3
+            results = await reopened.query_vectors("opportunities", [1.0, 0.0, 0.0], top_k=5)
+            assert [result["id"] for result in results] == ["opp-2", "opp-3"]
+    
     @pytest.mark.asyncio
     async def test_upsert_vectors(self, mock_pinecone):
         """Test vector upsert functionality."""
@@ -146,6 +181,50 @@ class TestVectorDatabaseManager:
             assert stats["total_vector_count"] == 100
             assert stats["dimension"] == 1536
             assert stats["index_fullness"] == 0.1
+    
+    def test_local_ivf_query_fills_top_k(self, tmp_path):
+        """Test a partitioned index probes extra clusters until top_k matches are found."""
+        import numpy as np
+        
+        index = LocalVectorIndex(
+            str(tmp_path), dimension=8, ivf_min_vectors=2000, nprobe=2,
+            exact_search_limit=100, autosave_seconds=3600
+        )
+        generator = np.random.default_rng(1)
+        index.upsert([
+            {"id": f"vec-{i}", "values": generator.normal(size=8).tolist(), "metadata": {"bucket": i % 4}}
+            for i in range(4000)
+        ])
+        assert index._centroids is not None
+        
+        query = generator.normal(size=8).tolist()
+        response = index.query(query, top_k=1000)
+        assert len(response.matches) == 1000
+        scores = [match.score for match in response.matches]
+        assert scores == sorted(scores, reverse=True)
+        
+        filtered = index.query(query, top_k=900, filter={"bucket": {"$eq": 1}})
+        assert len(filtered.matches) == 900
+        assert all(int(match.id.split("-")[1]) % 4 == 1 for match in filtered.matches)
+        
+        # A shallow query still only scores the nearest clusters
+        assert len(index.query(query, top_k=5).matches) == 5
+    
+    def test_local_delete_drops_empty_postings(self, tmp_path):
+        """Test deleted vectors leave no empty metadata postings behind."""
+        index = LocalVectorIndex(str(tmp_path), dimension=3, autosave_seconds=3600)
+        index.upsert([
+            {"id": f"vec-{i}", "values": [1.0, float(i), 0.0], "metadata": {"status": "draft", "tags": [f"tag-{i}"]}}
+            for i in range(3)
+        ])
+        
+        index.delete(["vec-0", "vec-1"])
+        assert set(index._postings["id"]) == {"vec-2"}
+        assert set(index._postings["tags"]) == {"tag-2"}
+        assert index.query([1.0, 0.0, 0.0], top_k=5, filter={"status": "draft"}).matches[0].id == "vec-2"
+        
+        index.delete(["vec-2"])
+        assert index._postings == {}
 
 
 class TestOpportunityVectorService: